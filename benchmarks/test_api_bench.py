@@ -0,0 +1,40 @@
+# benchmarks/test_api_bench.py
+# pylint: disable=redefined-outer-name
+"""Benchmarks for API hot paths through the full app (auth, load, score)."""
+
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from conftest import Bench
+from fastapi.testclient import TestClient
+
+from motido.api.deps import create_access_token, get_manager
+from motido.api.main import app
+from motido.core.models import User
+from motido.data.json_manager import JsonDataManager
+
+
+@pytest.fixture
+def client(user: User, tmp_path: Path) -> Generator[TestClient, None, None]:
+    """A client authenticated as the generated user, stored as JSON."""
+    with patch(
+        "motido.data.json_manager.get_config_path",
+        return_value=str(tmp_path / "config.json"),
+    ):
+        manager = JsonDataManager()
+        manager.initialize()
+        manager.save_user(user)
+        app.dependency_overrides[get_manager] = lambda: manager
+        token = create_access_token({"sub": user.username})
+        test_client = TestClient(app, headers={"Authorization": f"Bearer {token}"})
+        yield test_client
+        app.dependency_overrides.clear()
+
+
+def test_list_tasks(bench: Bench, client: TestClient) -> None:
+    """GET /api/tasks for the whole account."""
+    response = bench(client.get, setup=lambda: ("/api/tasks",))
+    assert response.status_code == 200
+    assert response.json()
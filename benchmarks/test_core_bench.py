@@ -0,0 +1,59 @@
+# benchmarks/test_core_bench.py
+"""Benchmarks for scoring, daily processing and recurrence generation."""
+
+import copy
+from datetime import timedelta
+from typing import Any
+from unittest.mock import MagicMock
+
+from conftest import END_DATE, Bench
+
+from motido.core.models import User
+from motido.core.scoring import calculate_score, get_default_scoring_config
+from motido.core.utils import _process_recurrences, advance_user_to, process_day
+from motido.data.abstraction import DataManager
+
+CONFIG = get_default_scoring_config()
+
+
+def _fresh(user: User) -> Any:
+    return lambda: (copy.deepcopy(user),)
+
+
+def test_calculate_score_all_tasks(bench: Bench, user: User) -> None:
+    """Score every open task, as list views do."""
+    all_tasks = {task.id: task for task in user.tasks}
+    open_tasks = [task for task in user.tasks if not task.is_complete]
+
+    def score_all() -> int:
+        return sum(
+            calculate_score(task, all_tasks, CONFIG, END_DATE) for task in open_tasks
+        )
+
+    assert bench(score_all) >= 0
+
+
+def test_process_day(bench: Bench, user: User) -> None:
+    """Penalties and recurrences for the day after the account's today."""
+    manager = MagicMock(spec=DataManager)
+    next_day = END_DATE + timedelta(days=1)
+    bench(
+        lambda u: process_day(u, manager, next_day, CONFIG, persist=False),
+        setup=_fresh(user),
+    )
+
+
+def test_advance_week(bench: Bench, user: User) -> None:
+    """Catch up seven days at once, as `advance` and the API do."""
+    manager = MagicMock(spec=DataManager)
+    target = END_DATE + timedelta(days=7)
+    days = bench(
+        lambda u: advance_user_to(u, manager, target, CONFIG), setup=_fresh(user)
+    )
+    assert days == 7
+
+
+def test_process_recurrences(bench: Bench, user: User) -> None:
+    """Habit instance generation alone, a month past the account's today."""
+    month_later = END_DATE + timedelta(days=30)
+    bench(lambda u: _process_recurrences(u, month_later), setup=_fresh(user))
@@ -0,0 +1,28 @@
+# benchmarks/test_memory_bench.py
+"""Benchmarks for the memory a loaded account keeps alive."""
+
+import copy
+import json
+
+from conftest import Bench
+
+from motido.core.models import User
+from motido.data.backup import build_backup
+from motido.data.json_manager import JsonDataManager
+
+
+def test_loaded_user_memory(bench: Bench, user: User) -> None:
+    """Retained size of a user deserialized from its stored JSON."""
+    stored = json.dumps(build_backup(user), default=str)
+    manager = JsonDataManager()
+
+    loaded = bench.memory(
+        lambda: manager.deserialize_user_data(json.loads(stored), user.username)
+    )
+    assert len(loaded.tasks) == len(user.tasks)
+
+
+def test_user_copy_memory(bench: Bench, user: User) -> None:
+    """Retained size of a copy of the in-memory model graph."""
+    copied = bench.memory(lambda: copy.deepcopy(user))
+    assert copied == user
@@ -0,0 +1,82 @@
+# benchmarks/test_persistence_bench.py
+# pylint: disable=redefined-outer-name
+"""Benchmarks for load_user/save_user on each storage backend."""
+
+import os
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from conftest import Bench
+
+from motido.core.models import User
+from motido.data.abstraction import DataManager
+from motido.data.database_manager import DatabaseDataManager
+from motido.data.json_manager import JsonDataManager
+
+POSTGRES_URL_ENV = "MOTIDO_BENCH_DATABASE_URL"
+
+# SQLite's own defaults, to compare DatabaseDataManager's tuning against
+STOCK_SQLITE_PRAGMAS = {
+    "journal_mode": "delete",
+    "synchronous": "full",
+    "cache_size": "-2000",
+    "mmap_size": "0",
+    "temp_store": "default",
+}
+
+
+@pytest.fixture(params=["json", "sqlite", "sqlite-stock", "postgres"])
+def manager(
+    request: pytest.FixtureRequest, tmp_path: Path
+) -> Generator[DataManager, None, None]:
+    """An initialized manager for each backend, storing under tmp_path."""
+    if request.param == "json":
+        with patch(
+            "motido.data.json_manager.get_config_path",
+            return_value=str(tmp_path / "config.json"),
+        ):
+            json_manager = JsonDataManager()
+            json_manager.initialize()
+            yield json_manager
+    elif request.param.startswith("sqlite"):
+        pragmas = STOCK_SQLITE_PRAGMAS if request.param == "sqlite-stock" else None
+        with patch.object(
+            DatabaseDataManager,
+            "_get_db_path",
+            return_value=str(tmp_path / "motido.db"),
+        ):
+            db_manager = DatabaseDataManager(pragmas)
+            db_manager.initialize()
+            yield db_manager
+            db_manager.close()
+    else:
+        url = os.getenv(POSTGRES_URL_ENV)
+        if not url:
+            pytest.skip(f"set {POSTGRES_URL_ENV} to benchmark Postgres")
+        # pylint: disable=import-outside-toplevel
+        from motido.data.postgres_manager import PostgresDataManager
+
+        pg_manager = PostgresDataManager(url)
+        pg_manager.initialize()
+        yield pg_manager
+
+
+def test_save_user(bench: Bench, manager: DataManager, user: User) -> None:
+    """Write the whole account."""
+    bench(manager.save_user, setup=lambda: (user,))
+
+
+def test_load_user(bench: Bench, manager: DataManager, user: User) -> None:
+    """Read the whole account back."""
+    manager.save_user(user)
+    loaded = bench(manager.load_user, setup=lambda: (user.username,))
+    assert len(loaded.tasks) == len(user.tasks)
+
+
+def test_load_active_user(bench: Bench, manager: DataManager, user: User) -> None:
+    """Read only the active set, leaving completed history in storage."""
+    manager.save_user(user)
+    loaded = bench(manager.load_active_user, setup=lambda: (user.username,))
+    assert len(loaded.tasks) < len(user.tasks)
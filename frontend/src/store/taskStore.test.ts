@@ -219,7 +219,7 @@ describe('TaskStore', () => {
         await result.current.fetchTasks();
       });
 
-      expect(spy).toHaveBeenCalledWith({ status_filter: 'pending', include_completed: false });
+      expect(spy).toHaveBeenCalledWith(undefined);
       expect(result.current.tasks).toHaveLength(3);
       expect(result.current.hasCompletedData).toBe(false);
       expect(result.current.isLoading).toBe(false);
@@ -237,7 +237,7 @@ describe('TaskStore', () => {
         await result.current.fetchTasks({ includeCompleted: true });
       });
 
-      expect(spy).toHaveBeenCalledWith(undefined);
+      expect(spy).toHaveBeenCalledWith({ include_completed: true });
       expect(result.current.hasCompletedData).toBe(true);
       expect(result.current.tasks).toHaveLength(3);
 
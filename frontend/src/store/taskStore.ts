@@ -193,8 +193,9 @@ export const useTaskStore = create<TaskState>()(
           const includeCompleted = options?.includeCompleted ?? false;
           set({ isLoading: true, error: null });
           try {
+            // The API lists open tasks only unless history is asked for
             const tasks = await taskApi.getTasks(
-              includeCompleted ? undefined : { status_filter: 'pending', include_completed: false }
+              includeCompleted ? { include_completed: true } : undefined
             );
 
             set((state) => {
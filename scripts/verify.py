@@ -50,6 +50,7 @@ class VerifyConfig:
     use_docker: bool
     keep_db: bool
     playwright_args: List[str]
+    run_load_test: bool = False
 
 
 @dataclass
@@ -273,6 +274,7 @@ def write_checkpoint(
         "use_docker": config.use_docker,
         "keep_db": config.keep_db,
         "playwright_args": list(config.playwright_args),
+        "run_load_test": config.run_load_test,
     }
 
     CHECKPOINT_FILE.write_text(
@@ -314,12 +316,14 @@ def require_checkpoint_match(
     checkpoint_use_docker = checkpoint.get("use_docker")
     checkpoint_keep_db = checkpoint.get("keep_db")
     checkpoint_playwright_args = checkpoint.get("playwright_args")
+    checkpoint_run_load_test = bool(checkpoint.get("run_load_test"))
 
     mismatch = (
         checkpoint_run_e2e != config.run_e2e
         or checkpoint_use_docker != config.use_docker
         or checkpoint_keep_db != config.keep_db
         or list(checkpoint_playwright_args or []) != list(config.playwright_args)
+        or checkpoint_run_load_test != config.run_load_test
     )
 
     if not mismatch:
@@ -333,6 +337,7 @@ def require_checkpoint_match(
     print(f"- run_e2e:     {checkpoint_run_e2e!r} vs {config.run_e2e!r}")
     print(f"- use_docker:  {checkpoint_use_docker!r} vs {config.use_docker!r}")
     print(f"- keep_db:     {checkpoint_keep_db!r} vs {config.keep_db!r}")
+    print(f"- run_load_test: {checkpoint_run_load_test!r} vs {config.run_load_test!r}")
     print(
         f"- playwright_args: {' '.join(list(checkpoint_playwright_args or [])) or '<none>'} "
         f"vs {' '.join(config.playwright_args) or '<none>'}"
@@ -684,6 +689,26 @@ def build_steps(config: VerifyConfig) -> List[Step]:
             cwd=PROJECT_ROOT,
             env={"PYTHONPATH": str(PROJECT_ROOT / "src")},
         ),
+    ]
+
+    if config.run_load_test:
+        # Optional: short SQLite load test (see scripts/load_test.py)
+        steps.append(
+            CommandStep(
+                step_id="backend:load-test",
+                label="API load test (SQLite)",
+                command=[
+                    sys.executable,
+                    "scripts/load_test.py",
+                    "--duration",
+                    "15",
+                ],
+                cwd=PROJECT_ROOT,
+                env={"PYTHONPATH": str(PROJECT_ROOT / "src")},
+            )
+        )
+
+    steps += [
         CommandStep(
             step_id="frontend:npm-ci",
             label="Installing dependencies",
@@ -788,6 +813,11 @@ def parse_args(argv: Sequence[str]) -> argparse.Namespace:
         action="store_true",
         help="Skip Docker; force JSON storage for E2E.",
     )
+    parser.add_argument(
+        "--load-test",
+        action="store_true",
+        help="Also run the API load test (scripts/load_test.py) after unit tests.",
+    )
 
     # Everything else is passed to Playwright.
     parser.add_argument(
@@ -809,6 +839,7 @@ def main(argv: Sequence[str]) -> int:
         use_docker=not bool(args.no_docker),
         keep_db=bool(args.keep_db),
         playwright_args=list(args.playwright_args or []),
+        run_load_test=bool(args.load_test),
     )
 
     ensure_run_dir()
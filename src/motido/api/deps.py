@@ -5,12 +5,11 @@ FastAPI dependencies for authentication and data access.
 
 import os
 from datetime import datetime, timedelta, timezone
-from typing import Annotated
+from typing import Annotated, Any
 
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from passlib.context import CryptContext
 
 from motido.core.models import User
 from motido.data.abstraction import DEFAULT_USERNAME, DataManager
@@ -20,15 +19,40 @@ from motido.data.backend_factory import get_data_manager
 SECRET_KEY = os.getenv("JWT_SECRET", "dev-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 1 week
+# Event stream tickets travel in the URL, where proxies and access logs
+# record them, so they expire quickly and open nothing but the stream
+STREAM_TICKET_EXPIRE_SECONDS = 60
+STREAM_TICKET_SCOPE = "stream"
 
-# Password hashing
-# Use PBKDF2-SHA256 for serverless compatibility (pure Python, no C extensions)
-# PBKDF2 is built into Python's hashlib - no external dependencies required
-pwd_context = CryptContext(
-    schemes=["pbkdf2_sha256"],
-    deprecated="auto",
-    pbkdf2_sha256__default_rounds=260000,  # OWASP recommended (2023)
-)
+
+class _LazyCryptContext:  # pylint: disable=too-few-public-methods
+    """
+    Proxy that builds the passlib CryptContext on first use.
+
+    Importing passlib costs ~20ms, which every serverless cold start would pay
+    even for requests that never hash a password.
+    """
+
+    def __init__(self) -> None:
+        self._context: Any = None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._context is None:
+            # pylint: disable-next=import-outside-toplevel
+            from passlib.context import CryptContext
+
+            # Password hashing
+            # Use PBKDF2-SHA256 for serverless compatibility (pure Python, no C
+            # extensions). PBKDF2 is built into Python's hashlib.
+            self._context = CryptContext(
+                schemes=["pbkdf2_sha256"],
+                deprecated="auto",
+                pbkdf2_sha256__default_rounds=260000,  # OWASP recommended (2023)
+            )
+        return getattr(self._context, name)
+
+
+pwd_context = _LazyCryptContext()
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
@@ -59,6 +83,20 @@ def save_user(user: User, manager: DataManager = Depends(get_manager)) -> None:
     manager.save_user(user)
 
 
+def persist_user_progress(manager: DataManager, user: User) -> None:
+    """
+    Save user-level fields and XP, using the backend's cheap path if it has one.
+
+    Backends may provide save_user_progress() to skip rewriting tasks; others
+    fall back to a full save_user().
+    """
+    save_progress = getattr(manager, "save_user_progress", None)
+    if callable(save_progress):
+        save_progress(user)
+    else:
+        manager.save_user(user)
+
+
 # Type aliases for dependency injection
 ManagerDep = Annotated[DataManager, Depends(get_manager)]
 UserDep = Annotated[User, Depends(get_user)]
@@ -78,6 +116,14 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     return encoded_jwt
 
 
+def create_stream_ticket(username: str) -> str:
+    """Create a short-lived token that only authenticates the event stream."""
+    return create_access_token(
+        {"sub": username, "scope": STREAM_TICKET_SCOPE},
+        timedelta(seconds=STREAM_TICKET_EXPIRE_SECONDS),
+    )
+
+
 def verify_token(token: str) -> dict[str, str] | None:
     """Verify a JWT token and return its payload."""
     try:
@@ -99,7 +145,7 @@ async def get_current_user_optional(
         return None
 
     payload = verify_token(token)
-    if payload is None:
+    if payload is None or "scope" in payload:
         return None
 
     username: str = payload.get("sub", DEFAULT_USERNAME)
@@ -107,23 +153,21 @@ async def get_current_user_optional(
     return user
 
 
-async def get_current_user(
-    token: Annotated[str | None, Depends(oauth2_scheme)],
-    manager: ManagerDep,
-) -> User:
+def _is_dev_mode() -> bool:
+    # IMPORTANT: Defaults to false for security
+    return os.getenv("MOTIDO_DEV_MODE", "false").lower() == "true"
+
+
+def _resolve_username(token: str | None, scope: str | None = None) -> str:
     """
-    Get the current authenticated user (required).
-    Production mode (default): Authentication required.
-    Dev mode: Set MOTIDO_DEV_MODE=true to bypass auth.
+    Authenticate the request and return its username, loading nothing.
+
+    The token must carry the given scope; access tokens carry none, so a
+    stream ticket cannot stand in for one.
     """
     # In development mode, allow access without authentication
-    # IMPORTANT: Defaults to false for security
-    if os.getenv("MOTIDO_DEV_MODE", "false").lower() == "true":
-        user = manager.load_user(DEFAULT_USERNAME)
-        if user is None:
-            user = User(username=DEFAULT_USERNAME)
-            manager.save_user(user)
-        return user
+    if _is_dev_mode():
+        return DEFAULT_USERNAME
 
     # In production, require authentication
     if token is None:
@@ -134,15 +178,31 @@ async def get_current_user(
         )
 
     payload = verify_token(token)
-    if payload is None:
+    if payload is None or payload.get("scope") != scope:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    username: str = payload.get("sub", DEFAULT_USERNAME)
-    user = manager.load_user(username)
+    return payload.get("sub", DEFAULT_USERNAME)
+
+
+def _resolve_current_user(
+    token: str | None, manager: DataManager, *, active_only: bool
+) -> User:
+    """Authenticate the request and load its user (see get_current_user)."""
+    load = manager.load_active_user if active_only else manager.load_user
+    username = _resolve_username(token)
+
+    if _is_dev_mode():
+        user = load(username)
+        if user is None:
+            user = User(username=username)
+            manager.save_user(user)
+        return user
+
+    user = load(username)
 
     if user is None:
         raise HTTPException(
@@ -153,8 +213,66 @@ async def get_current_user(
     return user
 
 
+async def get_current_user(
+    token: Annotated[str | None, Depends(oauth2_scheme)],
+    manager: ManagerDep,
+) -> User:
+    """
+    Get the current authenticated user (required).
+    Production mode (default): Authentication required.
+    Dev mode: Set MOTIDO_DEV_MODE=true to bypass auth.
+    """
+    return _resolve_current_user(token, manager, active_only=False)
+
+
+async def get_current_active_user(
+    token: Annotated[str | None, Depends(oauth2_scheme)],
+    manager: ManagerDep,
+) -> User:
+    """
+    Get the current authenticated user with only their active tasks loaded.
+
+    Completed history stays in storage behind user.inactive_tasks until
+    something iterates it, so endpoints that only touch open tasks skip
+    materializing it.
+    """
+    return _resolve_current_user(token, manager, active_only=True)
+
+
+async def get_current_username(
+    token: Annotated[str | None, Depends(oauth2_scheme)],
+) -> str:
+    """
+    Get the current authenticated username without loading the user.
+
+    For endpoints reading storage by username (the XP log), which would
+    otherwise load every task and XP transaction just to authenticate.
+    """
+    return _resolve_username(token)
+
+
+async def get_stream_username(
+    token: Annotated[str | None, Depends(oauth2_scheme)],
+    ticket: str | None = None,
+) -> str:
+    """
+    Get the authenticated username of an event stream request.
+
+    Browsers' EventSource cannot send an Authorization header, so it passes
+    a stream ticket (see create_stream_ticket) as the ticket query parameter
+    instead. Access tokens are never accepted in the URL. Only the token is
+    checked: streaming events needs the username, not the user's data.
+    """
+    if token is not None:
+        return _resolve_username(token)
+    return _resolve_username(ticket, STREAM_TICKET_SCOPE)
+
+
 # Type alias for authenticated user dependency
 CurrentUser = Annotated[User, Depends(get_current_user)]
+ActiveUser = Annotated[User, Depends(get_current_active_user)]
+CurrentUsername = Annotated[str, Depends(get_current_username)]
+StreamUsername = Annotated[str, Depends(get_stream_username)]
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -0,0 +1,217 @@
+# motido/api/events.py
+"""
+Per-user change events and the pub/sub brokers that deliver them.
+
+Routes publish a ChangeEvent after the user has been saved. The SSE endpoint
+in ``motido.api.main`` subscribes to the broker and forwards each event to
+the connected client, so the frontend no longer has to poll list endpoints.
+
+The default broker is in-process, which is correct for a single worker. For
+multi-worker deployments, implement EventBroker on top of a shared channel
+(e.g. Postgres LISTEN/NOTIFY or Redis pub/sub) and install it with
+set_event_broker() at startup.
+"""
+
+import asyncio
+import json
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Optional
+
+# Event types published by the API
+TASK_CREATED = "task_created"
+TASK_UPDATED = "task_updated"
+TASK_COMPLETED = "task_completed"
+TASK_UNCOMPLETED = "task_uncompleted"
+TASK_DELETED = "task_deleted"
+XP_CHANGED = "xp_changed"
+BADGE_EARNED = "badge_earned"
+DATE_ADVANCED = "date_advanced"
+JOB_FINISHED = "job_finished"
+
+# Per-subscriber queue bound; the oldest event is dropped when a slow client
+# falls this far behind.
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# Seconds between SSE keep-alive comments when no events are flowing
+DEFAULT_HEARTBEAT_SECONDS = 15.0
+
+
+@dataclass
+class ChangeEvent:
+    """A single change to a user's data."""
+
+    type: str
+    username: str
+    data: dict[str, Any] = field(default_factory=dict)
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    timestamp: datetime = field(default_factory=datetime.now)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the event payload sent to clients."""
+        return {
+            "id": self.id,
+            "type": self.type,
+            "timestamp": self.timestamp.isoformat(),
+            "data": self.data,
+        }
+
+    def to_sse(self) -> str:
+        """Format the event as a Server-Sent Events message."""
+        payload = json.dumps(self.to_dict(), default=str)
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+class Subscription:
+    """A single client's view of a user's event stream."""
+
+    def __init__(self, username: str, maxsize: int = SUBSCRIBER_QUEUE_SIZE) -> None:
+        self.username = username
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue[ChangeEvent] = asyncio.Queue(maxsize=maxsize)
+
+    def deliver(self, event: ChangeEvent) -> None:
+        """Queue an event for this subscriber (safe to call from any thread)."""
+        self._loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event: ChangeEvent) -> None:
+        if self._queue.full():
+            # Drop the oldest event rather than blocking the publisher
+            self._queue.get_nowait()
+        self._queue.put_nowait(event)
+
+    async def get(self, timeout: float | None = None) -> ChangeEvent | None:
+        """Wait for the next event, returning None if the timeout expires."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBroker(ABC):
+    """
+    Abstract Base Class for change-event pub/sub.
+    Implementations decide how events travel between publishers and streams.
+    """
+
+    @abstractmethod
+    def publish(self, event: ChangeEvent) -> None:
+        """Deliver an event to every subscriber of event.username."""
+
+    @abstractmethod
+    def subscribe(self, username: str) -> Subscription:
+        """Register a new subscriber for a user's events."""
+
+    @abstractmethod
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscriber. Must be safe to call more than once."""
+
+
+class InProcessEventBroker(EventBroker):
+    """Fan-out broker for a single worker process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, list[Subscription]] = {}
+
+    def publish(self, event: ChangeEvent) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(event.username, []))
+        for subscription in subscribers:
+            subscription.deliver(event)
+
+    def subscribe(self, username: str) -> Subscription:
+        subscription = Subscription(username)
+        with self._lock:
+            self._subscribers.setdefault(username, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.username, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+            if not subscribers:
+                self._subscribers.pop(subscription.username, None)
+
+    def subscriber_count(self, username: str) -> int:
+        """Return the number of active subscribers for a user."""
+        with self._lock:
+            return len(self._subscribers.get(username, []))
+
+
+class RecordingEventBroker(InProcessEventBroker):
+    """
+    Local stand-in for an external broker.
+
+    Behaves like the in-process broker and also keeps every published event,
+    which lets tests assert on what a route emitted without opening a stream.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.published: list[ChangeEvent] = []
+
+    def publish(self, event: ChangeEvent) -> None:
+        self.published.append(event)
+        super().publish(event)
+
+    def types(self) -> list[str]:
+        """Return the published event types in order."""
+        return [event.type for event in self.published]
+
+
+# Singleton broker instance - mutable module-level state (not a constant)
+# pylint: disable=invalid-name
+_event_broker: Optional[EventBroker] = None
+# pylint: enable=invalid-name
+
+
+def get_event_broker() -> EventBroker:
+    """Return the installed broker, creating the in-process default if needed."""
+    global _event_broker  # pylint: disable=global-statement
+    if _event_broker is None:
+        _event_broker = InProcessEventBroker()
+    return _event_broker
+
+
+def set_event_broker(broker: EventBroker | None) -> None:
+    """Install a broker (e.g. a shared one for multi-worker deployments)."""
+    global _event_broker  # pylint: disable=global-statement
+    _event_broker = broker
+
+
+def publish_event(username: str, event_type: str, **data: Any) -> ChangeEvent:
+    """Build and publish a change event for a user."""
+    event = ChangeEvent(type=event_type, username=username, data=data)
+    get_event_broker().publish(event)
+    return event
+
+
+async def stream_events(
+    broker: EventBroker,
+    username: str,
+    is_disconnected: Callable[[], Awaitable[bool]],
+    heartbeat_seconds: float = DEFAULT_HEARTBEAT_SECONDS,
+) -> AsyncIterator[str]:
+    """
+    Yield SSE-formatted messages for a user until the client disconnects.
+
+    A comment line is sent whenever no event arrives within heartbeat_seconds
+    so that proxies keep the connection open.
+    """
+    subscription = broker.subscribe(username)
+    try:
+        yield ": connected\n\n"
+        while not await is_disconnected():
+            event = await subscription.get(timeout=heartbeat_seconds)
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield event.to_sse()
+    finally:
+        broker.unsubscribe(subscription)
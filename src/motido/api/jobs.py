@@ -0,0 +1,378 @@
+# motido/api/jobs.py
+# pylint: disable=import-outside-toplevel
+"""
+Background job runner for operations too heavy for a request thread.
+
+Jobs are submitted by the jobs router, persisted in the backend's job store
+(see ``motido.data.job_store``) and executed on an in-process thread pool.
+Handlers report progress through their JobContext, and clients poll the job
+status endpoint (or listen for ``job_finished`` on the event stream).
+
+Jobs for the same user run one at a time so that, for example, a long date
+catch-up and an import never interleave their saves.
+
+Export jobs write their backup to a file in MOTIDO_JOB_EXPORT_DIR (the
+system temp directory by default) rather than into the job's result, which
+only names the file; clients download it from GET /api/jobs/{id}/download.
+Finished jobs are pruned from the store after MOTIDO_JOB_RETENTION_DAYS
+(7 by default), and an export's file is deleted with its job.
+
+Note: serverless platforms may freeze the process once the response is sent,
+so long jobs need a long-lived API worker to make progress.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from time import monotonic
+from typing import Any, Optional
+
+from motido.api.deps import persist_user_progress
+from motido.api.events import (
+    DATE_ADVANCED,
+    JOB_FINISHED,
+    XP_CHANGED,
+    publish_event,
+)
+from motido.core.models import User
+from motido.data.abstraction import DataManager
+from motido.data.job_store import (
+    JOB_FAILED,
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+    InMemoryJobStore,
+    JobRecord,
+    JobStore,
+)
+
+# Job kinds
+JOB_ADVANCE = "advance"
+JOB_IMPORT = "import"
+JOB_EXPORT = "export"
+JOB_RESCORE = "rescore"
+
+# Worker threads per process
+DEFAULT_JOB_WORKERS = int(os.getenv("MOTIDO_JOB_WORKERS", "2"))
+
+# Minimum seconds between persisted progress updates
+PROGRESS_SAVE_INTERVAL = 0.5
+
+JOB_EXPORT_DIR_ENV = "MOTIDO_JOB_EXPORT_DIR"
+
+# How long finished jobs (and export files) are kept
+JOB_RETENTION = timedelta(days=int(os.getenv("MOTIDO_JOB_RETENTION_DAYS", "7")))
+
+
+def export_path(job_id: str) -> str:
+    """The file an export job writes its backup to."""
+    directory = os.getenv(
+        JOB_EXPORT_DIR_ENV, os.path.join(tempfile.gettempdir(), "motido-exports")
+    )
+    return os.path.join(directory, f"{job_id}.json")
+
+
+class JobContext:
+    """Handle passed to a job handler for loading data and reporting progress."""
+
+    def __init__(
+        self,
+        job: JobRecord,
+        store: JobStore,
+        manager: DataManager,
+        payload: Any = None,
+    ) -> None:
+        self.job = job
+        self.manager = manager
+        self.payload = payload
+        self._store = store
+        self._last_saved = 0.0
+
+    @property
+    def params(self) -> dict[str, Any]:
+        """The job's persisted parameters."""
+        return self.job.params
+
+    def load_user(self) -> User:
+        """Load a fresh copy of the job's user."""
+        user = self.manager.load_user(self.job.username)
+        if user is None:
+            raise ValueError(f"User '{self.job.username}' not found")
+        return user
+
+    def report(
+        self, progress: int, total: int | None = None, message: str | None = None
+    ) -> None:
+        """
+        Record progress. Saves are throttled except when progress reaches total.
+        """
+        self.job.progress = progress
+        if total is not None:
+            self.job.total = total
+        if message is not None:
+            self.job.message = message
+        now = monotonic()
+        if (
+            self.job.total is not None and progress >= self.job.total
+        ) or now - self._last_saved >= PROGRESS_SAVE_INTERVAL:
+            self.job.updated_at = datetime.now()
+            self._store.save(self.job)
+            self._last_saved = now
+
+
+JobHandler = Callable[[JobContext], dict[str, Any]]
+
+
+def run_advance_job(ctx: JobContext) -> dict[str, Any]:
+    """Advance the processed date without the per-request day cap."""
+    from motido.core import scoring
+    from motido.core.utils import advance_user_to, get_today_for_timezone
+
+    user = ctx.load_user()
+    current = get_today_for_timezone(user.timezone)
+    if ctx.params.get("to_date"):
+        target_date = date.fromisoformat(ctx.params["to_date"])
+    elif ctx.params.get("days"):
+        target_date = user.last_processed_date + timedelta(days=int(ctx.params["days"]))
+    else:
+        target_date = current
+    # Don't advance past today
+    target_date = min(target_date, current)
+
+    initial_xp = user.total_xp
+    config = scoring.load_scoring_config()
+    days_processed = advance_user_to(
+        user,
+        ctx.manager,
+        target_date,
+        config,
+        on_day=ctx.report,
+    )
+    persist_user_progress(ctx.manager, user)
+
+    if days_processed:
+        publish_event(
+            user.username,
+            DATE_ADVANCED,
+            last_processed_date=user.last_processed_date.isoformat(),
+            days_processed=days_processed,
+        )
+    if user.total_xp != initial_xp:
+        publish_event(
+            user.username,
+            XP_CHANGED,
+            delta=user.total_xp - initial_xp,
+            total_xp=user.total_xp,
+        )
+
+    return {
+        "days_processed": days_processed,
+        "last_processed_date": user.last_processed_date.isoformat(),
+        "pending_days": max(0, (current - user.last_processed_date).days - 1),
+        "xp_change": user.total_xp - initial_xp,
+    }
+
+
+def run_import_job(ctx: JobContext) -> dict[str, Any]:
+    """Replace the user's data with the uploaded backup bytes in ctx.payload."""
+    from motido.api.routers.user import (
+        build_imported_user,
+        import_summary,
+        read_import_upload,
+    )
+    from motido.data.backup import save_imported_user
+
+    user = ctx.load_user()
+    ctx.report(0, 2, "Parsing backup")
+    imported_user = build_imported_user(read_import_upload(ctx.payload), user)
+    ctx.report(1, 2, "Saving imported data")
+    save_imported_user(ctx.manager, imported_user)
+    ctx.report(2, 2, "Imported")
+    return import_summary(imported_user)
+
+
+def run_export_job(ctx: JobContext) -> dict[str, Any]:
+    """Write the user's data in the backup format to the job's export file."""
+    from motido.data.backup import build_backup
+
+    user = ctx.load_user()
+    path = export_path(ctx.job.id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(build_backup(user), f)
+    return {
+        "file": os.path.basename(path),
+        "size_bytes": os.path.getsize(path),
+        "tasks_count": len(user.tasks),
+    }
+
+
+def run_rescore_job(ctx: JobContext) -> dict[str, Any]:
+    """Recalculate the score of every incomplete task."""
+    from motido.core.scoring import (
+        build_scoring_config_with_user_multipliers,
+        calculate_score,
+        load_scoring_config,
+    )
+
+    user = ctx.load_user()
+    config = build_scoring_config_with_user_multipliers(load_scoring_config(), user)
+    all_tasks = {task.id: task for task in user.tasks}
+    pending = [task for task in user.tasks if not task.is_complete]
+    effective_date = date.today()
+
+    scores: dict[str, float] = {}
+    for index, task in enumerate(pending, start=1):
+        scores[task.id] = calculate_score(task, all_tasks, config, effective_date)
+        ctx.report(index, len(pending))
+    return {"scores": scores, "count": len(scores)}
+
+
+DEFAULT_JOB_HANDLERS: dict[str, JobHandler] = {
+    JOB_ADVANCE: run_advance_job,
+    JOB_IMPORT: run_import_job,
+    JOB_EXPORT: run_export_job,
+    JOB_RESCORE: run_rescore_job,
+}
+
+
+class JobRunner:
+    """Submits jobs to a thread pool and records their outcome in a JobStore."""
+
+    def __init__(
+        self,
+        store: JobStore,
+        manager: DataManager,
+        max_workers: int = DEFAULT_JOB_WORKERS,
+        handlers: dict[str, JobHandler] | None = None,
+    ) -> None:
+        self.store = store
+        self.manager = manager
+        self.handlers = dict(DEFAULT_JOB_HANDLERS if handlers is None else handlers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="motido-job"
+        )
+        self._lock = threading.Lock()
+        self._user_locks: dict[str, threading.Lock] = {}
+        self._futures: dict[str, Future] = {}
+
+    def submit(
+        self,
+        username: str,
+        kind: str,
+        params: dict[str, Any] | None = None,
+        payload: Any = None,
+    ) -> JobRecord:
+        """
+        Queue a job and return its record.
+
+        payload is handed to the handler in memory only; params are persisted.
+
+        Raises:
+            ValueError: If no handler is registered for kind.
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: '{kind}'")
+        self.prune()
+        job = JobRecord(username=username, kind=kind, params=params or {})
+        self.store.save(job)
+        future = self._executor.submit(self._run, job, payload)
+        with self._lock:
+            self._futures[job.id] = future
+        future.add_done_callback(lambda _f: self._forget(job.id))
+        return job
+
+    def get(self, job_id: str) -> JobRecord | None:
+        """Return the latest persisted state of a job."""
+        return self.store.get(job_id)
+
+    def list_for_user(self, username: str, limit: int = 50) -> list[JobRecord]:
+        """Return a user's most recent jobs, newest first."""
+        return self.store.list_for_user(username, limit)
+
+    def prune(self, now: datetime | None = None) -> list[JobRecord]:
+        """Drop jobs finished more than JOB_RETENTION ago, with their exports."""
+        pruned = self.store.prune((now or datetime.now()) - JOB_RETENTION)
+        for job in pruned:
+            if job.kind == JOB_EXPORT and os.path.exists(export_path(job.id)):
+                os.remove(export_path(job.id))
+        return pruned
+
+    def wait(self, job_id: str, timeout: float | None = None) -> JobRecord | None:
+        """Block until a job submitted by this runner finishes."""
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            future.result(timeout)
+        return self.store.get(job_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs and optionally wait for running ones."""
+        self._executor.shutdown(wait=wait)
+
+    def _forget(self, job_id: str) -> None:
+        with self._lock:
+            self._futures.pop(job_id, None)
+
+    def _user_lock(self, username: str) -> threading.Lock:
+        with self._lock:
+            return self._user_locks.setdefault(username, threading.Lock())
+
+    def _run(self, job: JobRecord, payload: Any) -> None:
+        with self._user_lock(job.username):
+            job.status = JOB_RUNNING
+            job.updated_at = datetime.now()
+            self.store.save(job)
+
+            ctx = JobContext(job, self.store, self.manager, payload)
+            try:
+                job.result = self.handlers[job.kind](ctx)
+                job.status = JOB_SUCCEEDED
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                # HTTPException carries its message in detail
+                job.error = str(getattr(e, "detail", None) or e)
+                job.status = JOB_FAILED
+            job.updated_at = datetime.now()
+            self.store.save(job)
+
+        publish_event(
+            job.username,
+            JOB_FINISHED,
+            job_id=job.id,
+            kind=job.kind,
+            status=job.status,
+        )
+
+
+# Singleton runner instance - mutable module-level state (not a constant)
+# pylint: disable=invalid-name
+_job_runner: Optional[JobRunner] = None
+# pylint: enable=invalid-name
+
+
+def get_job_runner(manager: DataManager) -> JobRunner:
+    """
+    Return the process-wide job runner, creating it for manager if needed.
+
+    The store comes from the manager's create_job_store() when the backend
+    has one (SQLite, PostgreSQL); otherwise jobs are kept in memory.
+    """
+    global _job_runner  # pylint: disable=global-statement
+    if _job_runner is None:
+        store: JobStore = InMemoryJobStore()
+        create_store = getattr(manager, "create_job_store", None)
+        if callable(create_store):
+            store = create_store()
+        store.initialize()
+        _job_runner = JobRunner(store, manager)
+        _job_runner.prune()
+    return _job_runner
+
+
+def set_job_runner(runner: JobRunner | None) -> None:
+    """Install a runner (or clear it so the next call creates a new one)."""
+    global _job_runner  # pylint: disable=global-statement
+    _job_runner = runner
@@ -4,27 +4,67 @@
 Main FastAPI application for Moti-Do.
 """
 
+import logging
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import timedelta
 from time import perf_counter
 
-from dotenv import load_dotenv
+# Load environment variables from .env file. Vercel injects the environment
+# itself, so serverless cold starts skip importing python-dotenv.
+if not os.getenv("VERCEL"):  # pragma: no branch
+    from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+    load_dotenv()
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-
-from motido.api.deps import CurrentUser, ManagerDep
+from fastapi.responses import PlainTextResponse, StreamingResponse
+
+from motido.api.deps import (
+    STREAM_TICKET_EXPIRE_SECONDS,
+    CurrentUser,
+    CurrentUsername,
+    ManagerDep,
+    StreamUsername,
+    create_stream_ticket,
+    persist_user_progress,
+)
+from motido.api.events import (
+    DATE_ADVANCED,
+    XP_CHANGED,
+    get_event_broker,
+    publish_event,
+    stream_events,
+)
+from motido.api.middleware.lazy_routers import LazyRouterMiddleware, LazyRouterRegistry
+from motido.api.middleware.metrics import MetricsMiddleware
+from motido.api.middleware.profiling import ProfilingMiddleware
 from motido.api.middleware.rate_limit import RateLimitMiddleware
 from motido.api.routers import auth, tasks, user, views
-from motido.api.schemas import AdvanceRequest, SystemStatus
+from motido.api.schemas import AdvanceRequest, StreamTicketResponse, SystemStatus
 from motido.core import scoring
-from motido.core.utils import get_today_for_timezone, process_day
+from motido.core.logs import FORMAT_ENV, LEVEL_ENV, configure_logging
+from motido.core.metrics import get_metrics
+from motido.core.utils import advance_user_to, get_today_for_timezone
+from motido.data.backend_factory import close_data_manager
+
+# Structured JSON logs at INFO by default; the env vars still override
+configure_logging(level=os.getenv(LEVEL_ENV, "INFO"), fmt=os.getenv(FORMAT_ENV, "json"))
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """Closes the data manager's connections when the server shuts down."""
+    yield
+    close_data_manager()
+
 
 # Create FastAPI app
 app = FastAPI(
+    lifespan=lifespan,
     title="Moti-Do API",
     description="Backend API for the Moti-Do task and habit tracker",
     version="0.8.8",
@@ -69,6 +109,29 @@ app.include_router(tasks.router, prefix="/api")
 app.include_router(user.router, prefix="/api")
 app.include_router(views.router, prefix="/api")
 
+# Rarely used routers are imported on their first request (see
+# motido.api.middleware.lazy_routers) to keep serverless cold starts fast.
+LAZY_ROUTERS = {
+    "/api/jobs": "motido.api.routers.jobs",
+}
+lazy_routers = LazyRouterRegistry(app, LAZY_ROUTERS, prefix="/api")
+app.add_middleware(LazyRouterMiddleware, registry=lazy_routers)
+_build_openapi = app.openapi
+
+
+def openapi_with_lazy_routers() -> dict:
+    """Build the OpenAPI schema with every lazy router included."""
+    lazy_routers.load_all()
+    return _build_openapi()
+
+
+app.openapi = openapi_with_lazy_routers  # type: ignore[method-assign]
+
+# Opt-in cProfile/tracemalloc profiling (X-Motido-Profile or dev mode)
+app.add_middleware(ProfilingMiddleware)
+# Outermost middleware: per-route latency metrics and Server-Timing headers
+app.add_middleware(MetricsMiddleware)
+
 
 # === System endpoints ===
 
@@ -137,40 +200,41 @@ async def advance_date(
         target_date = min(target_date, max_target_date)
 
     start_time = perf_counter()
+    initial_xp = user.total_xp
 
     # Process each day
     config = scoring.load_scoring_config()
-    processing_date = user.last_processed_date
-    days_processed = 0
-
-    while processing_date < target_date:
-        processing_date += timedelta(days=1)
-        # Update date BEFORE penalties so all saves during apply_penalties have correct date
-        user.last_processed_date = processing_date
-        days_processed += 1
-
-        if not user.vacation_mode:
-            # Apply penalties and generate recurrences for the current day
-            process_day(
-                user,
-                manager,
-                processing_date,
-                config,
-                persist=False,
-            )
-
-    save_progress = getattr(manager, "save_user_progress", None)
-    if callable(save_progress):
-        save_progress(user)
-    else:
-        manager.save_user(user)
+    days_processed = advance_user_to(user, manager, target_date, config)
+    persist_user_progress(manager, user)
 
     elapsed_ms = int((perf_counter() - start_time) * 1000)
-    print(
-        f"advance_date: processed={days_processed} days, "
-        f"target={target_date.isoformat()}, elapsed_ms={elapsed_ms}"
+    logger.info(
+        "advance_date: processed=%d days, target=%s, elapsed_ms=%d",
+        days_processed,
+        target_date.isoformat(),
+        elapsed_ms,
+        extra={
+            "days_processed": days_processed,
+            "target_date": target_date.isoformat(),
+            "elapsed_ms": elapsed_ms,
+        },
     )
 
+    if days_processed:
+        publish_event(
+            user.username,
+            DATE_ADVANCED,
+            last_processed_date=user.last_processed_date.isoformat(),
+            days_processed=days_processed,
+        )
+    if user.total_xp != initial_xp:
+        publish_event(
+            user.username,
+            XP_CHANGED,
+            delta=user.total_xp - initial_xp,
+            total_xp=user.total_xp,
+        )
+
     # pending_days = 0 means "up to date" (last_processed_date is yesterday or today)
     pending_days = max(0, (current - user.last_processed_date).days - 1)
     return SystemStatus(
@@ -203,16 +267,15 @@ async def reset_score_tracking(
     Reset score-oriented progress and align processing with the real date.
     """
     current = get_today_for_timezone(user.timezone)
+    initial_xp = user.total_xp
     user.total_xp = 0
     user.xp_transactions.clear()
     user.badges.clear()
     user.last_processed_date = current
 
-    save_progress = getattr(manager, "save_user_progress", None)
-    if callable(save_progress):
-        save_progress(user)
-    else:
-        manager.save_user(user)
+    persist_user_progress(manager, user)
+
+    publish_event(user.username, XP_CHANGED, delta=-initial_xp, total_xp=0)
 
     return SystemStatus(
         last_processed_date=user.last_processed_date,
@@ -223,6 +286,61 @@ async def reset_score_tracking(
     )
 
 
+# === Metrics ===
+
+
+@app.get("/api/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics(request: Request) -> PlainTextResponse:
+    """
+    Prometheus text-format metrics for this process.
+
+    Set MOTIDO_METRICS_TOKEN to require ``Authorization: Bearer <token>``.
+    """
+    token = os.getenv("MOTIDO_METRICS_TOKEN")
+    if token and request.headers.get("authorization") != f"Bearer {token}":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token"
+        )
+    return PlainTextResponse(
+        get_metrics().render(), media_type="text/plain; version=0.0.4"
+    )
+
+
+# === Change event stream ===
+
+
+@app.post("/api/events/ticket", response_model=StreamTicketResponse)
+async def create_event_stream_ticket(username: CurrentUsername) -> StreamTicketResponse:
+    """
+    Issue a short-lived ticket for opening the event stream.
+
+    EventSource cannot send an Authorization header, so clients exchange
+    their access token for a ticket and pass that in the stream URL instead.
+    """
+    return StreamTicketResponse(
+        ticket=create_stream_ticket(username),
+        expires_in=STREAM_TICKET_EXPIRE_SECONDS,
+    )
+
+
+@app.get("/api/events/stream")
+async def stream_change_events(
+    request: Request, username: StreamUsername
+) -> StreamingResponse:
+    """
+    Stream the current user's change events as Server-Sent Events.
+
+    Each message's event name is the change type (task_created, task_completed,
+    xp_changed, badge_earned, date_advanced, ...) and its data is a JSON object.
+    EventSource clients pass a ticket from /api/events/ticket as ?ticket=.
+    """
+    return StreamingResponse(
+        stream_events(get_event_broker(), username, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # Entry point for running with uvicorn
 def run_server(
     host: str = "127.0.0.1", port: int = 8000, reload: bool = True
@@ -0,0 +1,68 @@
+"""
+Middleware that imports rarely used routers on their first request.
+
+Serverless cold starts pay for every module imported by the entry point, so
+routers that most requests never touch (e.g. background jobs) are registered
+by path prefix and only imported and included when a request needs them.
+"""
+
+import importlib
+import threading
+from typing import Any
+
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class LazyRouterRegistry:
+    """Maps path prefixes to router modules and includes them on demand."""
+
+    def __init__(self, app: FastAPI, routers: dict[str, str], prefix: str = "") -> None:
+        """
+        Args:
+            app: The application to include routers into.
+            routers: Request path prefix -> module exposing a ``router``.
+            prefix: Prefix passed to ``include_router`` (e.g. "/api").
+        """
+        self.app = app
+        self.prefix = prefix
+        self._pending = dict(routers)
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> list[str]:
+        """Path prefixes whose routers have not been included yet."""
+        return list(self._pending)
+
+    def load_for_path(self, path: str) -> None:
+        """Include the router serving path, if it is still pending."""
+        for path_prefix in self.pending:
+            if path == path_prefix or path.startswith(path_prefix + "/"):
+                self._include(path_prefix)
+
+    def load_all(self) -> None:
+        """Include every pending router (needed before building OpenAPI)."""
+        for path_prefix in self.pending:
+            self._include(path_prefix)
+
+    def _include(self, path_prefix: str) -> None:
+        with self._lock:
+            module_name = self._pending.get(path_prefix)
+            if module_name is None:
+                return
+            module: Any = importlib.import_module(module_name)
+            self.app.include_router(module.router, prefix=self.prefix)
+            del self._pending[path_prefix]
+
+
+class LazyRouterMiddleware:  # pylint: disable=too-few-public-methods
+    """Pure ASGI middleware that loads lazy routers before routing a request."""
+
+    def __init__(self, app: ASGIApp, registry: LazyRouterRegistry) -> None:
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and self.registry.pending:
+            self.registry.load_for_path(scope["path"])
+        await self.app(scope, receive, send)
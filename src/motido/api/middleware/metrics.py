@@ -0,0 +1,59 @@
+"""
+Middleware that times every API request.
+
+Records a per-route latency histogram in the process-wide metrics registry
+and returns the request's internal phases (load_user, scoring, save_user,
+...) in a ``Server-Timing`` header so browser dev tools can show them.
+"""
+
+from time import perf_counter
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from motido.core.metrics import (
+    HTTP_LATENCY,
+    collect_request_timings,
+    format_server_timing,
+    get_metrics,
+)
+
+
+class MetricsMiddleware:  # pylint: disable=too-few-public-methods
+    """Pure ASGI middleware recording request latency and Server-Timing."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter()
+        status = 500
+
+        with collect_request_timings() as timings:
+
+            async def send_with_timing(message: Message) -> None:
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing",
+                        format_server_timing(timings, perf_counter() - start),
+                    )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                # Label by route template, not raw path, to bound cardinality
+                route = getattr(scope.get("route"), "path", "unmatched")
+                get_metrics().observe(
+                    HTTP_LATENCY,
+                    perf_counter() - start,
+                    method=scope["method"],
+                    route=route,
+                    status=status,
+                )
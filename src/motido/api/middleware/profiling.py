@@ -0,0 +1,99 @@
+"""
+Middleware that profiles individual API requests on demand.
+
+A request is profiled when it carries ``X-Motido-Profile: <token>`` matching
+MOTIDO_PROFILE_TOKEN (admin only), or for every request when
+MOTIDO_PROFILE_REQUESTS=1 (dev mode, ignored in production). The report is
+written to MOTIDO_PROFILE_DIR and summarized in the response headers.
+
+cProfile only sees the event-loop thread, so sync dependencies and endpoints
+run in the threadpool appear as a single await; their time and memory are
+still attributed through the ``timed`` phases (load_user, scoring,
+save_user). Only one request is profiled at a time.
+"""
+
+import hmac
+import logging
+import os
+import threading
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from motido.core.profiling import ProfileSession
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Motido-Profile"
+REPORT_HEADER = "X-Motido-Profile-Report"
+TOKEN_ENV = "MOTIDO_PROFILE_TOKEN"
+DEV_MODE_ENV = "MOTIDO_PROFILE_REQUESTS"
+
+# cProfile and tracemalloc are process-wide: one profiled request at a time
+_profile_lock = threading.Lock()
+
+
+def should_profile(scope: Scope) -> bool:
+    """Whether this request asked for (and is allowed) a profile."""
+    if os.getenv(DEV_MODE_ENV) == "1" and os.getenv("VERCEL_ENV") != "production":
+        return True
+    token = os.getenv(TOKEN_ENV)
+    if not token:
+        return False
+    header = PROFILE_HEADER.lower().encode("latin-1")
+    requested = dict(scope.get("headers", [])).get(header, b"")
+    return hmac.compare_digest(requested, token.encode("latin-1"))
+
+
+class ProfilingMiddleware:  # pylint: disable=too-few-public-methods
+    """Pure ASGI middleware running opted-in requests under a ProfileSession."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        # Not a with-block: a busy lock means "serve unprofiled", not "wait"
+        acquired = _profile_lock.acquire(  # pylint: disable=consider-using-with
+            blocking=False
+        )
+        if not acquired:
+
+            async def send_busy(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message).append(PROFILE_HEADER, "busy")
+                await send(message)
+
+            await self.app(scope, receive, send_busy)
+            return
+
+        # Hold the response until the session ends so its summary fits in headers
+        messages: list[Message] = []
+
+        async def buffer(message: Message) -> None:
+            messages.append(message)
+
+        session = ProfileSession(f"api-{scope['method']}-{scope['path']}")
+        try:
+            with session:
+                await self.app(scope, receive, buffer)
+            _, report_path = session.write()
+        finally:
+            _profile_lock.release()
+
+        logger.info(
+            "Profiled %s %s: %s",
+            scope["method"],
+            scope["path"],
+            session.summary(),
+            extra={"profile_report": report_path},
+        )
+        for message in messages:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(PROFILE_HEADER, session.summary())
+                headers.append(REPORT_HEADER, os.path.basename(report_path))
+            await send(message)
@@ -0,0 +1,185 @@
+# motido/api/routers/jobs.py
+"""
+Background job API endpoints (submit, status, result, export download).
+"""
+
+import os
+
+from fastapi import APIRouter, File, HTTPException, UploadFile, status
+from fastapi.responses import FileResponse
+from pydantic import ValidationError
+
+from motido.api.deps import CurrentUsername, ManagerDep
+from motido.api.jobs import (
+    JOB_ADVANCE,
+    JOB_EXPORT,
+    JOB_IMPORT,
+    export_path,
+    get_job_runner,
+)
+from motido.api.schemas import (
+    AdvanceRequest,
+    JobResponse,
+    JobResultResponse,
+    JobSubmitRequest,
+)
+from motido.data.job_store import JOB_SUCCEEDED, JobRecord
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+def job_to_response(job: JobRecord) -> JobResponse:
+    """Convert a job record to its API response."""
+    return JobResponse(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        progress=job.progress,
+        total=job.total,
+        message=job.message,
+        error=job.error,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+    )
+
+
+def _get_user_job(job_id: str, username: str, manager: ManagerDep) -> JobRecord:
+    """Look up a job owned by the user, raising 404 otherwise."""
+    job = get_job_runner(manager).get(job_id)
+    if job is None or job.username != username:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job with ID {job_id} not found",
+        )
+    return job
+
+
+@router.post("", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(
+    request: JobSubmitRequest,
+    username: CurrentUsername,
+    manager: ManagerDep,
+) -> JobResponse:
+    """
+    Submit a background job.
+
+    "advance" accepts the same params as POST /api/system/advance but is not
+    capped by ADVANCE_DATE_MAX_DAYS.
+    """
+    params = request.params
+    if request.kind == JOB_ADVANCE:
+        try:
+            advance = AdvanceRequest.model_validate(params)
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid advance params: {e}",
+            ) from e
+        params = advance.model_dump(mode="json", exclude_none=True)
+
+    job = get_job_runner(manager).submit(username, request.kind, params)
+    return job_to_response(job)
+
+
+@router.post(
+    "/import", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED
+)
+async def submit_import_job(
+    username: CurrentUsername,
+    manager: ManagerDep,
+    file: UploadFile = File(...),
+) -> JobResponse:
+    """
+    Import a JSON backup in the background.
+
+    Only the file name is checked here; parsing and validating the upload
+    run in the job, so malformed files show up as a failed job. Same format
+    as POST /api/user/import.
+    """
+    if not file.filename or not file.filename.endswith(".json"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File must be a JSON file (.json)",
+        )
+
+    job = get_job_runner(manager).submit(
+        username,
+        JOB_IMPORT,
+        {"filename": file.filename},
+        payload=await file.read(),
+    )
+    return job_to_response(job)
+
+
+@router.get("", response_model=list[JobResponse])
+async def list_jobs(
+    username: CurrentUsername,
+    manager: ManagerDep,
+    limit: int = 50,
+) -> list[JobResponse]:
+    """List the current user's most recent jobs, newest first."""
+    jobs = get_job_runner(manager).list_for_user(username, limit)
+    return [job_to_response(job) for job in jobs]
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    username: CurrentUsername,
+    manager: ManagerDep,
+) -> JobResponse:
+    """Get a job's status and progress."""
+    return job_to_response(_get_user_job(job_id, username, manager))
+
+
+@router.get("/{job_id}/result", response_model=JobResultResponse)
+async def get_job_result(
+    job_id: str,
+    username: CurrentUsername,
+    manager: ManagerDep,
+) -> JobResultResponse:
+    """
+    Get a finished job's result.
+
+    Returns 409 while the job is still queued or running.
+    """
+    job = _get_user_job(job_id, username, manager)
+    if not job.is_finished:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job {job_id} is still {job.status}",
+        )
+    return JobResultResponse(
+        id=job.id, status=job.status, result=job.result, error=job.error
+    )
+
+
+@router.get("/{job_id}/download")
+async def download_export(
+    job_id: str,
+    username: CurrentUsername,
+    manager: ManagerDep,
+) -> FileResponse:
+    """
+    Download the backup file written by a succeeded export job.
+
+    Returns 409 until the job has succeeded and 404 if the file is gone.
+    """
+    job = _get_user_job(job_id, username, manager)
+    if job.kind != JOB_EXPORT or job.status != JOB_SUCCEEDED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job {job_id} has no export to download",
+        )
+    path = export_path(job.id)
+    if not os.path.exists(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Export of job {job_id} is no longer available",
+        )
+    timestamp = job.created_at.strftime("%Y%m%d-%H%M%S")
+    return FileResponse(
+        path,
+        media_type="application/json",
+        filename=f"motido-backup-{timestamp}.json",
+    )
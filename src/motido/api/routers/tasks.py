@@ -10,10 +10,24 @@ from typing import Any
 
 from fastapi import APIRouter, HTTPException, status
 
-from motido.api.deps import CurrentUser, ManagerDep
+from motido.api.deps import ActiveUser, CurrentUser, ManagerDep
+from motido.api.events import (
+    BADGE_EARNED,
+    TASK_COMPLETED,
+    TASK_CREATED,
+    TASK_DELETED,
+    TASK_UNCOMPLETED,
+    TASK_UPDATED,
+    XP_CHANGED,
+    publish_event,
+)
 from motido.api.schemas import (
     BulkJumpToCurrentInstanceRequest,
     BulkJumpToCurrentInstanceResponse,
+    BulkTaskOperation,
+    BulkTaskOperationResult,
+    BulkTaskRequest,
+    BulkTaskResponse,
     HistoryEntrySchema,
     JumpToCurrentInstancePreview,
     SubtaskCreate,
@@ -26,6 +40,7 @@ from motido.api.schemas import (
     TaskUpdate,
 )
 from motido.core.models import (
+    Badge,
     Difficulty,
     Duration,
     Priority,
@@ -40,6 +55,7 @@ from motido.core.scoring import (
     calculate_task_scores,
     load_scoring_config,
 )
+from motido.data.abstraction import DataManager
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
@@ -145,10 +161,19 @@ def _is_visible_task(task: Task) -> bool:
 
 
 def _get_recurring_series(task: Task, user: User) -> list[Task]:
-    """Collect all tasks in the same recurring lineage as the given task."""
-    tasks_by_id = {user_task.id: user_task for user_task in user.tasks}
+    """
+    Collect all main-tier tasks in the same recurring lineage as the task.
+
+    Archived habit instances still link the series together, so they are
+    walked too (fetching the archive) when any habit was archived, but
+    never returned: archived tasks are read-only.
+    """
+    lineage = list(user.tasks)
+    if user.archive_summary.completed_habits:
+        lineage.extend(user.archived_tasks)
+    tasks_by_id = {user_task.id: user_task for user_task in lineage}
     children_by_parent: dict[str, list[Task]] = {}
-    for user_task in user.tasks:
+    for user_task in lineage:
         if user_task.parent_habit_id:
             children_by_parent.setdefault(user_task.parent_habit_id, []).append(
                 user_task
@@ -173,28 +198,30 @@ def _get_recurring_series(task: Task, user: User) -> list[Task]:
         for child in children_by_parent.get(current_id, []):
             pending_ids.append(child.id)
 
-    related_tasks: list[Task] = []
-    for task_id in related_ids:
-        related_task = tasks_by_id.get(task_id)
-        if related_task is not None:
-            related_tasks.append(related_task)
-    return related_tasks
+    return [user_task for user_task in user.tasks if user_task.id in related_ids]
 
 
 @router.get("", response_model=list[TaskResponse])
 async def list_tasks(
-    user: CurrentUser,
+    user: ActiveUser,
+    manager: ManagerDep,
     status_filter: str | None = None,
     priority: str | None = None,
     tag: str | None = None,
     project: str | None = None,
     is_habit: bool | None = None,
-    include_completed: bool = True,
+    include_completed: bool = False,
 ) -> list[TaskResponse]:
     """
-    List all tasks with optional filters.
+    List tasks with optional filters.
+
+    By default only open tasks are listed, served from the active set.
+    Completed history is opt-in (include_completed=true, or
+    status_filter=completed), since it has to be fetched from storage.
     """
-    tasks = [task for task in user.tasks if _is_visible_task(task)]
+    history = include_completed or status_filter == "completed"
+    candidates = user.all_tasks() if history else user.tasks
+    tasks = [task for task in candidates if _is_visible_task(task)]
 
     # Apply filters
     if status_filter == "pending":
@@ -208,7 +235,8 @@ async def list_tasks(
         ]  # pragma: no cover
 
     if tag:
-        tasks = [t for t in tasks if tag in t.tags]
+        tagged = manager.tagged_task_ids(user, tag)
+        tasks = [t for t in tasks if t.id in tagged]
 
     if project:
         tasks = [t for t in tasks if t.project == project]
@@ -216,8 +244,8 @@ async def list_tasks(
     if is_habit is not None:
         tasks = [t for t in tasks if t.is_habit == is_habit]
 
-    if not include_completed:  # pragma: no cover
-        tasks = [t for t in tasks if not t.is_complete]  # pragma: no cover
+    if not history:
+        tasks = [t for t in tasks if not t.is_complete]
 
     # Load scoring context for score calculation
     config = load_scoring_config()
@@ -238,7 +266,21 @@ async def create_task(
     """
     Create a new task.
     """
-    # Create the task
+    task = build_task(task_data, user)
+    manager.save_user(user)
+    publish_event(user.username, TASK_CREATED, task_id=task.id, title=task.title)
+
+    # Load scoring context for score calculation
+    config = load_scoring_config()
+    config = build_scoring_config_with_user_multipliers(config, user)
+    all_tasks = {t.id: t for t in user.tasks}
+    effective_date = date_type.today()
+
+    return task_to_response(task, all_tasks, config, effective_date)
+
+
+def build_task(task_data: TaskCreate, user: User) -> Task:
+    """Create a task from request data and add it to the user (no save)."""
     task = Task(
         title=task_data.title,
         creation_date=datetime.now(),
@@ -276,26 +318,20 @@ async def create_task(
         user.get_or_create_project(task.project)
 
     user.add_task(task)
-    manager.save_user(user)
-
-    # Load scoring context for score calculation
-    config = load_scoring_config()
-    config = build_scoring_config_with_user_multipliers(config, user)
-    all_tasks = {t.id: t for t in user.tasks}
-    effective_date = date_type.today()
-
-    return task_to_response(task, all_tasks, config, effective_date)
+    return task
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: str,
-    user: CurrentUser,
+    user: ActiveUser,
 ) -> TaskResponse:
     """
     Get a specific task by ID.
+
+    Archived tasks are served too (read-only), so their history stays visible.
     """
-    task = user.find_task_by_id(task_id)
+    task = user.find_task_by_id(task_id) or user.find_archived_task(task_id)
     if not task:  # pragma: no cover
         raise HTTPException(  # pragma: no cover
             status_code=status.HTTP_404_NOT_FOUND,
@@ -538,6 +574,7 @@ async def update_task(
 
     apply_task_updates(task, task_data, user)
     manager.save_user(user)
+    publish_event(user.username, TASK_UPDATED, task_id=task.id)
 
     # Load scoring context for score calculation
     config = load_scoring_config()
@@ -566,6 +603,7 @@ async def delete_task(
 
     user.remove_task(task.id)
     manager.save_user(user)
+    publish_event(user.username, TASK_DELETED, task_id=task.id)
 
 
 @router.post("/{task_id}/end-recurrence", status_code=status.HTTP_204_NO_CONTENT)
@@ -599,10 +637,11 @@ async def end_task_recurrence(
         related_task.recurrence_ended_at = ended_at
 
     manager.save_user(user)
+    publish_event(user.username, TASK_UPDATED, task_id=task.id)
 
 
 @router.post("/{task_id}/undo", response_model=TaskResponse)
-async def undo_task_change(
+async def undo_task_change(  # pylint: disable=too-many-statements
     task_id: str,
     user: CurrentUser,
     manager: ManagerDep,
@@ -614,6 +653,11 @@ async def undo_task_change(
     """
     task = user.find_task_by_id(task_id)
     if not task:
+        if user.find_archived_task(task_id):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Task is archived and read-only",
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Task with ID {task_id} not found",
@@ -671,6 +715,7 @@ async def undo_task_change(
         )
 
     manager.save_user(user)
+    publish_event(user.username, TASK_UPDATED, task_id=task.id)
 
     # Load scoring context for score calculation
     config = load_scoring_config()
@@ -694,8 +739,6 @@ async def defer_task(
     Either provide an explicit `defer_until` date, or set
     `defer_to_next_recurrence=True` for recurring tasks.
     """
-    from motido.core.recurrence import calculate_next_occurrence
-
     task = user.find_task_by_id(task_id)
     if not task:
         raise HTTPException(
@@ -703,6 +746,26 @@ async def defer_task(
             detail=f"Task with ID {task_id} not found",
         )
 
+    defer_date = apply_task_defer(task, request)
+
+    manager.save_user(user)
+    publish_event(user.username, TASK_UPDATED, task_id=task.id)
+
+    config = load_scoring_config()
+    config = build_scoring_config_with_user_multipliers(config, user)
+    all_tasks = {t.id: t for t in user.tasks}
+    effective_date = date_type.today()
+
+    return TaskDeferResponse(
+        task=task_to_response(task, all_tasks, config, effective_date),
+        deferred_until=defer_date,
+    )
+
+
+def apply_task_defer(task: Task, request: TaskDeferRequest) -> datetime:
+    """Resolve the defer date for a request and apply it to the task (no save)."""
+    from motido.core.recurrence import calculate_next_occurrence
+
     defer_date: datetime | None = None
 
     if request.defer_to_next_recurrence:
@@ -727,18 +790,7 @@ async def defer_task(
 
     record_history(task, "defer_until", task.defer_until, defer_date)
     task.defer_until = defer_date
-
-    manager.save_user(user)
-
-    config = load_scoring_config()
-    config = build_scoring_config_with_user_multipliers(config, user)
-    all_tasks = {t.id: t for t in user.tasks}
-    effective_date = date_type.today()
-
-    return TaskDeferResponse(
-        task=task_to_response(task, all_tasks, config, effective_date),
-        deferred_until=defer_date,
-    )
+    return defer_date
 
 
 @router.post(
@@ -789,6 +841,8 @@ async def jump_tasks_to_current_instance(
 
     if updated_tasks:
         manager.save_user(user)
+        for task in updated_tasks:
+            publish_event(user.username, TASK_UPDATED, task_id=task.id)
 
     config = load_scoring_config()
     config = build_scoring_config_with_user_multipliers(config, user)
@@ -805,6 +859,180 @@ async def jump_tasks_to_current_instance(
     )
 
 
+@router.post("/bulk", response_model=BulkTaskResponse)
+async def bulk_task_operations(  # pylint: disable=too-many-locals
+    request: BulkTaskRequest,
+    user: CurrentUser,
+    manager: ManagerDep,
+) -> BulkTaskResponse:
+    """
+    Apply an ordered list of task operations and persist them with one save.
+
+    Operations run in order against the same loaded user, so later operations
+    see the effects of earlier ones. A failing operation is
+    reported in its result and does not stop the rest of the batch. Change
+    events are published only after the single save succeeds.
+    """
+    config = load_scoring_config()
+    config = build_scoring_config_with_user_multipliers(config, user)
+    all_tasks = {t.id: t for t in user.tasks}
+    initial_xp = user.total_xp
+
+    results: list[BulkTaskOperationResult] = []
+    touched: list[tuple[Task | None, Task | None]] = []
+    pending_events: list[tuple[str, dict[str, Any]]] = []
+
+    for index, operation in enumerate(request.operations):
+        result = BulkTaskOperationResult(
+            index=index, op=operation.op, task_id=operation.task_id, success=False
+        )
+        task: Task | None = None
+        next_instance: Task | None = None
+        try:
+            task, next_instance = _apply_bulk_operation(
+                operation, result, user, manager, config, all_tasks, pending_events
+            )
+            result.success = True
+        except HTTPException as e:
+            result.error = str(e.detail)
+        except ValueError as e:
+            result.error = str(e)
+        results.append(result)
+        touched.append((task, next_instance))
+
+    succeeded = sum(1 for result in results if result.success)
+    if succeeded:
+        manager.save_user(user)
+        for event_type, data in pending_events:
+            publish_event(user.username, event_type, **data)
+        if user.total_xp != initial_xp:
+            publish_event(
+                user.username,
+                XP_CHANGED,
+                delta=user.total_xp - initial_xp,
+                total_xp=user.total_xp,
+            )
+
+    # Build responses from the final state of each task
+    all_tasks = {t.id: t for t in user.tasks}
+    effective_date = date_type.today()
+    for result, (task, next_instance) in zip(results, touched):
+        if task is not None and task.id in all_tasks:
+            result.task = task_to_response(task, all_tasks, config, effective_date)
+        if next_instance is not None and next_instance.id in all_tasks:
+            result.next_instance = task_to_response(
+                next_instance, all_tasks, config, effective_date
+            )
+
+    return BulkTaskResponse(
+        results=results,
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        xp_change=user.total_xp - initial_xp,
+        total_xp=user.total_xp,
+    )
+
+
+def _apply_bulk_operation(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    operation: BulkTaskOperation,
+    result: BulkTaskOperationResult,
+    user: User,
+    manager: DataManager,
+    config: dict[str, Any],
+    all_tasks: dict[str, Task],
+    pending_events: list[tuple[str, dict[str, Any]]],
+) -> tuple[Task | None, Task | None]:
+    """
+    Apply one bulk operation without saving.
+
+    Raises HTTPException (or ValueError for ambiguous IDs) on failure.
+
+    Returns:
+        Tuple of (affected_task, next_habit_instance)
+    """
+    if operation.op == "create":
+        if operation.create is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="create payload is required",
+            )
+        created = build_task(operation.create, user)
+        all_tasks[created.id] = created
+        result.task_id = created.id
+        pending_events.append(
+            (TASK_CREATED, {"task_id": created.id, "title": created.title})
+        )
+        return created, None
+
+    if not operation.task_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="task_id is required",
+        )
+    task = user.find_task_by_id(operation.task_id)
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task with ID {operation.task_id} not found",
+        )
+    result.task_id = task.id
+
+    if operation.op == "update":
+        if operation.update is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="update payload is required",
+            )
+        apply_task_updates(task, operation.update, user)
+        pending_events.append((TASK_UPDATED, {"task_id": task.id}))
+        return task, None
+
+    if operation.op == "complete":
+        xp_earned, next_instance, newly_earned = mark_task_complete(
+            task, user, manager, config, all_tasks
+        )
+        result.xp_earned = xp_earned
+        pending_events.append(
+            (
+                TASK_COMPLETED,
+                {
+                    "task_id": task.id,
+                    "xp_earned": xp_earned,
+                    "next_instance_id": next_instance.id if next_instance else None,
+                },
+            )
+        )
+        for badge in newly_earned:
+            pending_events.append(
+                (
+                    BADGE_EARNED,
+                    {"badge_id": badge.id, "name": badge.name, "glyph": badge.glyph},
+                )
+            )
+        return task, next_instance
+
+    if operation.op == "uncomplete":
+        mark_task_incomplete(task)
+        pending_events.append((TASK_UNCOMPLETED, {"task_id": task.id}))
+        return task, None
+
+    if operation.op == "delete":
+        user.remove_task(task.id)
+        all_tasks.pop(task.id, None)
+        pending_events.append((TASK_DELETED, {"task_id": task.id}))
+        return None, None
+
+    # op == "defer"
+    if operation.defer is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="defer payload is required",
+        )
+    apply_task_defer(task, operation.defer)
+    pending_events.append((TASK_UPDATED, {"task_id": task.id}))
+    return task, None
+
+
 @router.post("/{task_id}/complete", response_model=TaskCompletionResponse)
 async def complete_task(
     task_id: str,
@@ -824,6 +1052,45 @@ async def complete_task(
             detail=f"Task with ID {task_id} not found",
         )
 
+    config = load_scoring_config()
+    config = build_scoring_config_with_user_multipliers(config, user)
+    all_tasks = {t.id: t for t in user.tasks}
+    effective_date = date_type.today()
+
+    xp_earned, next_instance, newly_earned = mark_task_complete(
+        task, user, manager, config, all_tasks
+    )
+    next_instance_response = None
+    if next_instance:
+        next_instance_response = task_to_response(
+            next_instance, all_tasks, config, effective_date
+        )
+
+    manager.save_user(user)
+    _publish_completion(user, task, xp_earned, next_instance, newly_earned)
+
+    return TaskCompletionResponse(
+        task=task_to_response(task, all_tasks, config, effective_date),
+        xp_earned=xp_earned,
+        next_instance=next_instance_response,
+    )
+
+
+def mark_task_complete(
+    task: Task,
+    user: User,
+    manager: DataManager,
+    config: dict[str, Any],
+    all_tasks: dict[str, Task],
+) -> tuple[int, Task | None, list[Badge]]:
+    """
+    Complete a task, award XP, check badges and create the next habit instance.
+
+    The user is not saved; all_tasks is updated with any new instance.
+
+    Returns:
+        Tuple of (xp_earned, next_instance, newly_earned_badges)
+    """
     if task.is_complete:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -848,9 +1115,6 @@ async def complete_task(
     # Award XP (simplified - uses base XP from scoring)
     from motido.core.scoring import check_badges
 
-    config = load_scoring_config()
-    config = build_scoring_config_with_user_multipliers(config, user)
-    all_tasks = {t.id: t for t in user.tasks}
     effective_date = date_type.today()
     xp_earned = int(calculate_score(task, all_tasks, config, effective_date))
     user.total_xp += xp_earned
@@ -869,11 +1133,10 @@ async def complete_task(
     user.xp_transactions.append(transaction)
 
     # Check for badges (persist=False: single atomic save at the end)
-    check_badges(user, manager, config, persist=False)
+    newly_earned = check_badges(user, manager, config, persist=False)
 
     # Create next instance for recurring habits
     next_instance = None
-    next_instance_response = None
     if task.is_habit and task.recurrence_rule:
         from motido.core.recurrence import create_next_habit_instance
 
@@ -882,17 +1145,37 @@ async def complete_task(
             user.add_task(next_instance)
             # Update all_tasks to include the new instance for scoring
             all_tasks[next_instance.id] = next_instance
-            next_instance_response = task_to_response(
-                next_instance, all_tasks, config, effective_date
-            )
 
-    manager.save_user(user)
+    return xp_earned, next_instance, newly_earned
 
-    return TaskCompletionResponse(
-        task=task_to_response(task, all_tasks, config, effective_date),
+
+def _publish_completion(
+    user: User,
+    task: Task,
+    xp_earned: int,
+    next_instance: Task | None,
+    newly_earned: list[Badge],
+) -> None:
+    """Publish the change events for a saved task completion."""
+    publish_event(
+        user.username,
+        TASK_COMPLETED,
+        task_id=task.id,
         xp_earned=xp_earned,
-        next_instance=next_instance_response,
+        next_instance_id=next_instance.id if next_instance else None,
     )
+    if xp_earned:
+        publish_event(
+            user.username, XP_CHANGED, delta=xp_earned, total_xp=user.total_xp
+        )
+    for badge in newly_earned:
+        publish_event(
+            user.username,
+            BADGE_EARNED,
+            badge_id=badge.id,
+            name=badge.name,
+            glyph=badge.glyph,
+        )
 
 
 @router.post("/{task_id}/uncomplete", response_model=TaskResponse)
@@ -911,6 +1194,21 @@ async def uncomplete_task(
             detail=f"Task with ID {task_id} not found",
         )
 
+    mark_task_incomplete(task)
+    manager.save_user(user)
+    publish_event(user.username, TASK_UNCOMPLETED, task_id=task.id)
+
+    # Load scoring context for score calculation
+    config = load_scoring_config()
+    config = build_scoring_config_with_user_multipliers(config, user)
+    all_tasks = {t.id: t for t in user.tasks}
+    effective_date = date_type.today()
+
+    return task_to_response(task, all_tasks, config, effective_date)
+
+
+def mark_task_incomplete(task: Task) -> None:
+    """Mark a completed task as incomplete (no save)."""
     if not task.is_complete:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -923,16 +1221,6 @@ async def uncomplete_task(
     if task.is_habit and task.streak_current > 0:  # pragma: no cover
         task.streak_current -= 1  # pragma: no cover
 
-    manager.save_user(user)
-
-    # Load scoring context for score calculation
-    config = load_scoring_config()
-    config = build_scoring_config_with_user_multipliers(config, user)
-    all_tasks = {t.id: t for t in user.tasks}
-    effective_date = date_type.today()
-
-    return task_to_response(task, all_tasks, config, effective_date)
-
 
 # === Subtask endpoints ===
 
@@ -956,6 +1244,7 @@ async def add_subtask(
 
     task.subtasks.append({"text": subtask_data.text, "complete": False})
     manager.save_user(user)
+    publish_event(user.username, TASK_UPDATED, task_id=task.id)
 
     # Load scoring context for score calculation
     config = load_scoring_config()
@@ -995,6 +1284,7 @@ async def update_subtask(
         "complete": subtask_data.complete,
     }
     manager.save_user(user)
+    publish_event(user.username, TASK_UPDATED, task_id=task.id)
 
     # Load scoring context for score calculation
     config = load_scoring_config()
@@ -1030,6 +1320,7 @@ async def delete_subtask(
 
     task.subtasks.pop(subtask_index)
     manager.save_user(user)
+    publish_event(user.username, TASK_UPDATED, task_id=task.id)
 
     # Load scoring context for score calculation
     config = load_scoring_config()
@@ -1043,6 +1334,37 @@ async def delete_subtask(
 # === Dependency endpoints ===
 
 
+@router.get("/{task_id}/dependents", response_model=list[TaskResponse])
+async def list_dependents(
+    task_id: str,
+    user: CurrentUser,
+    manager: ManagerDep,
+) -> list[TaskResponse]:
+    """
+    List the tasks that depend on a task.
+    """
+    task = user.find_task_by_id(task_id)
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task with ID {task_id} not found",
+        )
+
+    dependent_ids = manager.dependent_task_ids(user, task.id)
+
+    # Load scoring context for score calculation
+    config = load_scoring_config()
+    config = build_scoring_config_with_user_multipliers(config, user)
+    all_tasks = {t.id: t for t in user.tasks}
+    effective_date = date_type.today()
+
+    return [
+        task_to_response(t, all_tasks, config, effective_date)
+        for t in user.all_tasks()
+        if t.id in dependent_ids
+    ]
+
+
 @router.post("/{task_id}/dependencies/{dep_id}", response_model=TaskResponse)
 async def add_dependency(
     task_id: str,
@@ -1070,6 +1392,7 @@ async def add_dependency(
     if dep_task.id not in task.dependencies:
         task.dependencies.append(dep_task.id)
         manager.save_user(user)
+        publish_event(user.username, TASK_UPDATED, task_id=task.id)
 
     # Load scoring context for score calculation
     config = load_scoring_config()
@@ -1101,6 +1424,7 @@ async def remove_dependency(
     if dep_task and dep_task.id in task.dependencies:
         task.dependencies.remove(dep_task.id)
         manager.save_user(user)
+        publish_event(user.username, TASK_UPDATED, task_id=task.id)
 
     # Load scoring context for score calculation
     config = load_scoring_config()
@@ -1149,6 +1473,7 @@ async def update_counter(
         )
 
     manager.save_user(user)
+    publish_event(user.username, TASK_UPDATED, task_id=task.id)
 
     # Load scoring context for score calculation
     config = load_scoring_config()
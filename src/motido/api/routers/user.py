@@ -5,13 +5,18 @@ User profile, XP, and badges API endpoints.
 """
 
 import json
+from collections.abc import AsyncIterator
 from datetime import datetime
+from typing import Any
 from zoneinfo import ZoneInfo
 
 from fastapi import APIRouter, File, HTTPException, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 
-from motido.api.deps import CurrentUser, ManagerDep
+from motido.api.deps import ActiveUser, CurrentUser, CurrentUsername, ManagerDep
+from motido.api.events import XP_CHANGED, publish_event
 from motido.api.schemas import (
+    ArchiveResponse,
     BadgeSchema,
     NotificationSummary,
     ProjectCreate,
@@ -23,13 +28,29 @@ from motido.api.schemas import (
     TimezoneUpdate,
     UserProfile,
     UserStats,
+    XPRollupResponse,
     XPTransactionSchema,
     XPWithdrawRequest,
 )
+from motido.core.archive import DEFAULT_ARCHIVE_HORIZON_DAYS, archive_completed_tasks
 from motido.core.models import User, XPTransaction
+from motido.core.xp_rollup import (
+    DEFAULT_DAILY_ROLLUP_DAYS,
+    DEFAULT_MONTHLY_ROLLUP_DAYS,
+    rollup_xp_transactions,
+)
+from motido.data.backup import (
+    NdjsonBackupReader,
+    build_backup,
+    iter_backup_ndjson,
+    save_imported_user,
+)
 
 router = APIRouter(prefix="/user", tags=["user"])
 
+# Bytes read per chunk when streaming an uploaded backup
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
 
 def calculate_level(xp: int) -> int:
     """Calculate level from XP using a simple formula."""
@@ -60,27 +81,24 @@ async def get_profile(user: CurrentUser) -> UserProfile:
 
 
 @router.get("/stats", response_model=UserStats)
-async def get_stats(user: CurrentUser) -> UserStats:
+async def get_stats(user: ActiveUser, manager: ManagerDep) -> UserStats:
     """Get user statistics."""
-    total_tasks = len(user.tasks)
-    completed_tasks = len([t for t in user.tasks if t.is_complete])
-    pending_tasks = total_tasks - completed_tasks
-    habits = [t for t in user.tasks if t.is_habit and not t.parent_habit_id]
-
-    # Calculate current and best streak across all habits
-    current_streak = max((h.streak_current for h in habits), default=0)
-    best_streak = max((h.streak_best for h in habits), default=0)
+    counts = manager.task_counts(user)
+    # Archived tasks are all complete and count through their summary
+    archive = user.archive_summary
+    total_tasks = counts.total + archive.completed_tasks
+    completed_tasks = counts.completed + archive.completed_tasks
 
     return UserStats(
         total_tasks=total_tasks,
         completed_tasks=completed_tasks,
-        pending_tasks=pending_tasks,
-        habits_count=len(habits),
+        pending_tasks=total_tasks - completed_tasks,
+        habits_count=counts.habits,
         total_xp=user.total_xp,
         level=calculate_level(user.total_xp),
         badges_earned=len([b for b in user.badges if b.earned_date is not None]),
-        current_streak=current_streak,
-        best_streak=best_streak,
+        current_streak=counts.current_streak,
+        best_streak=max(archive.best_streak, counts.best_streak),
     )
 
 
@@ -192,15 +210,22 @@ async def get_notification_summary(user: CurrentUser) -> NotificationSummary:
 
 @router.get("/xp", response_model=list[XPTransactionSchema])
 async def get_xp_log(
-    user: CurrentUser,
+    username: CurrentUsername,
+    manager: ManagerDep,
     limit: int = 50,
+    offset: int = 0,
 ) -> list[XPTransactionSchema]:
-    """Get XP transaction history."""
-    transactions = sorted(
-        user.xp_transactions,
-        key=lambda t: t.timestamp,
-        reverse=True,
-    )[:limit]
+    """
+    Get one page of XP transaction history, newest first.
+
+    Only the token is checked, so the user's tasks are never loaded.
+    """
+    if limit < 1 or offset < 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="limit must be positive and offset must not be negative",
+        )
+    transactions = manager.load_xp_log(username, limit=limit, offset=offset)
 
     return [
         XPTransactionSchema(
@@ -239,6 +264,9 @@ async def withdraw_xp(
     )
     user.xp_transactions.append(transaction)
     manager.save_user(user)
+    publish_event(
+        user.username, XP_CHANGED, delta=-request.amount, total_xp=user.total_xp
+    )
 
     return XPTransactionSchema(
         id=transaction.id,
@@ -250,6 +278,72 @@ async def withdraw_xp(
     )
 
 
+@router.post("/xp/rollup", response_model=XPRollupResponse)
+async def rollup_xp_log(
+    user: CurrentUser,
+    manager: ManagerDep,
+    daily_after: int = DEFAULT_DAILY_ROLLUP_DAYS,
+    monthly_after: int = DEFAULT_MONTHLY_ROLLUP_DAYS,
+) -> XPRollupResponse:
+    """
+    Compact old XP transactions into daily and monthly aggregates.
+
+    Transactions older than `daily_after` days become one entry per day and
+    sign; whole months older than `monthly_after` days one entry per month.
+    Total XP is unchanged.
+    """
+    try:
+        result = rollup_xp_transactions(
+            user, daily_after_days=daily_after, monthly_after_days=monthly_after
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
+    if result.compacted:
+        manager.save_user(user)
+
+    return XPRollupResponse(
+        compacted=result.compacted,
+        aggregates=result.aggregates,
+        remaining=len(user.xp_transactions),
+    )
+
+
+# === Archive Endpoints ===
+
+
+@router.post("/archive", response_model=ArchiveResponse)
+async def archive_tasks(
+    user: CurrentUser,
+    manager: ManagerDep,
+    days: int = DEFAULT_ARCHIVE_HORIZON_DAYS,
+) -> ArchiveResponse:
+    """
+    Move completed tasks older than `days` days to the archive tier.
+
+    Archived tasks still count towards stats, badges and the heatmap, and
+    stay readable (GET /tasks/{id}) but can no longer be changed.
+    """
+    if days < 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="days must not be negative",
+        )
+    try:
+        archived = archive_completed_tasks(user, manager, horizon_days=days)
+    except NotImplementedError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(exc)
+        ) from exc
+
+    return ArchiveResponse(
+        horizon_days=days,
+        archived_count=len(archived),
+        archived_total=user.archive_summary.completed_tasks,
+    )
+
+
 # === Badge Endpoints ===
 
 
@@ -449,106 +543,11 @@ async def export_user_data(user: CurrentUser) -> Response:
     """
     Export complete user data as JSON for backup.
 
-    Returns all user data including tasks, XP transactions, badges, tags, and projects
-    in the same format as JsonDataManager for full data portability.
+    Returns all user data including tasks, archived tasks and the archive
+    summary, XP transactions, badges, tags, and projects in the same format
+    as JsonDataManager for full data portability.
     """
-    # Serialize tasks (match JsonDataManager format exactly)
-    tasks_data = [
-        {
-            "id": task.id,
-            "title": task.title,
-            "text_description": task.text_description,
-            "priority": task.priority.value,
-            "difficulty": task.difficulty.value,
-            "duration": task.duration.value,
-            "is_complete": task.is_complete,
-            "creation_date": (
-                task.creation_date.strftime("%Y-%m-%d %H:%M:%S")
-                if task.creation_date
-                else None
-            ),
-            "due_date": (
-                task.due_date.strftime("%Y-%m-%d %H:%M:%S") if task.due_date else None
-            ),
-            "start_date": (
-                task.start_date.strftime("%Y-%m-%d %H:%M:%S")
-                if task.start_date
-                else None
-            ),
-            "icon": task.icon,
-            "tags": task.tags,
-            "project": task.project,
-            "subtasks": task.subtasks,
-            "dependencies": task.dependencies,
-            "history": task.history,
-            "is_habit": task.is_habit,
-            "recurrence_rule": task.recurrence_rule,
-            "recurrence_type": (
-                task.recurrence_type.value if task.recurrence_type else None
-            ),
-            "streak_current": task.streak_current,
-            "streak_best": task.streak_best,
-            "parent_habit_id": task.parent_habit_id,
-            "recurrence_ended_at": (
-                task.recurrence_ended_at.strftime("%Y-%m-%d %H:%M:%S")
-                if task.recurrence_ended_at
-                else None
-            ),
-        }
-        for task in user.tasks
-    ]
-
-    # Prepare complete user data (username/password_hash excluded - import uses current user)
-    user_data = {
-        "total_xp": user.total_xp,
-        "tasks": tasks_data,
-        "last_processed_date": user.last_processed_date.isoformat(),
-        "vacation_mode": user.vacation_mode,
-        "timezone": user.timezone,
-        "xp_transactions": [
-            {
-                "id": trans.id,
-                "amount": trans.amount,
-                "source": trans.source,
-                "timestamp": trans.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-                "task_id": trans.task_id,
-                "description": trans.description,
-            }
-            for trans in getattr(user, "xp_transactions", [])
-        ],
-        "badges": [
-            {
-                "id": badge.id,
-                "name": badge.name,
-                "description": badge.description,
-                "glyph": badge.glyph,
-                "earned_date": (
-                    badge.earned_date.strftime("%Y-%m-%d %H:%M:%S")
-                    if badge.earned_date
-                    else None
-                ),
-            }
-            for badge in getattr(user, "badges", [])
-        ],
-        "defined_tags": [
-            {
-                "id": tag.id,
-                "name": tag.name,
-                "color": tag.color,
-                "multiplier": tag.multiplier,
-            }
-            for tag in getattr(user, "defined_tags", [])
-        ],
-        "defined_projects": [
-            {
-                "id": proj.id,
-                "name": proj.name,
-                "color": proj.color,
-                "multiplier": proj.multiplier,
-            }
-            for proj in getattr(user, "defined_projects", [])
-        ],
-    }
+    user_data = build_backup(user)
 
     # Generate filename with timestamp
     timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
@@ -593,7 +592,8 @@ async def import_user_data(
     """
     Import user data from JSON backup file.
 
-    Replaces all current user data with data from the backup file.
+    Replaces all current user data, archive tier included, with data from
+    the backup file.
     Data is imported into the current user's account (username/password preserved).
     Supports both new format (direct user data) and legacy format (username-wrapped).
 
@@ -606,16 +606,38 @@ async def import_user_data(
             detail="File must be a JSON file (.json)",
         )
 
+    # Read and parse JSON file
+    import_data = read_import_upload(await file.read())
+
+    imported_user = build_imported_user(import_data, user)
+
+    # Save the imported user data (replaces all current data)
+    save_imported_user(manager, imported_user)
+
+    # Return summary of imported data
+    return {
+        "message": "Data imported successfully",
+        "summary": import_summary(imported_user),
+    }
+
+
+def read_import_upload(contents: bytes) -> Any:
+    """Parse an uploaded backup file, raising 400 on invalid JSON."""
     try:
-        # Read and parse JSON file
-        contents = await file.read()
-        import_data = json.loads(contents.decode("utf-8"))
+        return json.loads(contents.decode("utf-8"))
     except (json.JSONDecodeError, UnicodeDecodeError) as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid JSON file: {e}",
         ) from e
 
+
+def build_imported_user(import_data: Any, user: User) -> User:
+    """
+    Deserialize backup data into a replacement for the given user (no save).
+
+    Raises HTTPException (400) if the data cannot be imported.
+    """
     # Validate structure - expect dict
     if not isinstance(import_data, dict):
         raise HTTPException(
@@ -656,6 +678,12 @@ async def import_user_data(
             detail=f"Invalid user data format: {e}",
         ) from e
 
+    _finalize_imported_user(imported_user, user)
+    return imported_user
+
+
+def _finalize_imported_user(imported_user: User, user: User) -> None:
+    """Carry over credentials and tag imported tasks before saving."""
     # Preserve current password_hash if not in import (security)
     if not imported_user.password_hash:
         imported_user.password_hash = user.password_hash
@@ -663,21 +691,91 @@ async def import_user_data(
     # Process imported tasks (add "imported" tag, register tags/projects)
     _process_imported_tasks(imported_user)
 
-    # Save the imported user data (replaces all current data)
-    manager.save_user(imported_user)
 
-    # Return summary of imported data
+def import_summary(imported_user: User) -> dict[str, Any]:
+    """Summarize the counts of an imported user's data."""
     return {
-        "message": "Data imported successfully",
-        "summary": {
-            "username": imported_user.username,
-            "total_xp": imported_user.total_xp,
-            "tasks_count": len(imported_user.tasks),
-            "xp_transactions_count": len(getattr(imported_user, "xp_transactions", [])),
-            "badges_count": len(getattr(imported_user, "badges", [])),
-            "tags_count": len(getattr(imported_user, "defined_tags", [])),
-            "projects_count": len(getattr(imported_user, "defined_projects", [])),
+        "username": imported_user.username,
+        "total_xp": imported_user.total_xp,
+        "tasks_count": len(imported_user.tasks),
+        "archived_tasks_count": len(imported_user.archived_tasks),
+        "xp_transactions_count": len(getattr(imported_user, "xp_transactions", [])),
+        "badges_count": len(getattr(imported_user, "badges", [])),
+        "tags_count": len(getattr(imported_user, "defined_tags", [])),
+        "projects_count": len(getattr(imported_user, "defined_projects", [])),
+    }
+
+
+@router.get("/export/stream")
+async def export_user_data_stream(user: CurrentUser) -> StreamingResponse:
+    """
+    Export user data as NDJSON, one record per line.
+
+    Each task, XP transaction, badge, tag and project is serialized as it is
+    sent instead of building the whole backup document in memory. Records use
+    the same shapes as the JSON backup (see motido.data.backup).
+    """
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    filename = f"motido-backup-{timestamp}.ndjson"
+    return StreamingResponse(
+        iter_backup_ndjson(user),
+        media_type="application/x-ndjson",
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
         },
+    )
+
+
+async def _iter_upload_lines(
+    file: UploadFile, chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """Yield an upload's lines while reading it in fixed-size chunks."""
+    buffer = b""
+    while chunk := await file.read(chunk_size):
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+@router.post("/import/stream")
+async def import_user_data_stream(
+    user: CurrentUser,
+    manager: ManagerDep,
+    file: UploadFile = File(...),
+) -> dict:
+    """
+    Import an NDJSON backup produced by GET /api/user/export/stream.
+
+    The upload is read line by line and records are validated in chunks, so
+    memory stays bounded by the imported data rather than the raw file.
+    Replaces all current user data, like POST /api/user/import.
+    """
+    if not file.filename or not file.filename.endswith(".ndjson"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File must be an NDJSON file (.ndjson)",
+        )
+
+    reader = NdjsonBackupReader(user.username)
+    try:
+        async for line in _iter_upload_lines(file):
+            reader.feed(line)
+        imported_user = reader.finish()
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid backup: {e}",
+        ) from e
+
+    _finalize_imported_user(imported_user, user)
+    save_imported_user(manager, imported_user)
+
+    return {
+        "message": "Data imported successfully",
+        "summary": import_summary(imported_user),
     }
 
 
@@ -9,7 +9,7 @@ from datetime import date, datetime, timedelta
 
 from fastapi import APIRouter
 
-from motido.api.deps import CurrentUser
+from motido.api.deps import CurrentUser, CurrentUsername, ManagerDep
 from motido.api.routers.tasks import task_to_response
 from motido.api.schemas import CalendarEvent, HeatmapDay, KanbanColumn, TaskResponse
 
@@ -81,13 +81,17 @@ async def get_calendar_events(
 
 @router.get("/heatmap", response_model=list[HeatmapDay])
 async def get_heatmap_data(
-    user: CurrentUser,
+    username: CurrentUsername,
+    manager: ManagerDep,
     weeks: int = 12,
     habit_id: str | None = None,
 ) -> list[HeatmapDay]:
     """
     Get heatmap data showing task completion over time.
     If habit_id is provided, shows data for that specific habit.
+
+    Both the day counts and the archive summary come from summary queries,
+    so the user's tasks are never loaded.
     """
     today = date.today()
     start_date = today - timedelta(weeks=weeks, days=today.weekday())
@@ -103,26 +107,20 @@ async def get_heatmap_data(
         _ = day_data[current]  # Initialize the day (triggers defaultdict)
         current += timedelta(days=1)
 
-    # Count completions
-    for task in user.tasks:
-        # Filter by habit if specified
-        if habit_id:
-            if habit_id not in (task.id, task.parent_habit_id):
-                continue
-
-        if task.due_date is None:
-            continue
-
-        task_date = (
-            task.due_date.date()
-            if isinstance(task.due_date, datetime)
-            else task.due_date
-        )
-
-        if start_date <= task_date <= today:
-            day_data[task_date]["total"] += 1
-            if task.is_complete:
-                day_data[task_date]["completed"] += 1
+    # Archived tasks only count through their summary, unless one habit's
+    # own instances are asked for (the backend counts those)
+    if not habit_id:
+        archive_summary = manager.load_archive_summary(username)
+        for day, count in archive_summary.completions_between(
+            start_date, today
+        ).items():
+            day_data[day]["total"] += count
+            day_data[day]["completed"] += count
+
+    counts = manager.completion_counts_by_day(username, start_date, today, habit_id)
+    for day, (completed, total) in counts.items():
+        day_data[day]["total"] += total
+        day_data[day]["completed"] += completed
 
     return [
         HeatmapDay(
@@ -142,6 +140,10 @@ async def get_kanban_data(
 ) -> list[KanbanColumn]:
     """
     Get kanban board data organized by status.
+
+    The done column needs completed history, so the board works on the
+    fully loaded user and filters in memory rather than querying the
+    backend's tag and dependency tables as well.
     """
     # Define columns with explicit types
     columns: dict[str, dict[str, str | list[TaskResponse]]] = {
@@ -151,6 +153,7 @@ async def get_kanban_data(
         "blocked": {"title": "Blocked", "tasks": []},
         "done": {"title": "Done", "tasks": []},
     }
+    incomplete = {task.id for task in user.tasks if not task.is_complete}
 
     for task in user.tasks:
         if task.recurrence_ended_at is not None:
@@ -168,27 +171,17 @@ async def get_kanban_data(
         # Determine column
         if task.is_complete:
             column = "done"
+        elif any(dep_id in incomplete for dep_id in task.dependencies):
+            # Blocked by an incomplete dependency
+            column = "blocked"
+        elif task.start_date and task.start_date > datetime.now():  # pragma: no cover
+            column = "backlog"  # pragma: no cover
+        elif task.due_date and task.due_date <= datetime.now() + timedelta(
+            days=1
+        ):  # pragma: no cover
+            column = "in_progress"  # pragma: no cover
         else:
-            # Check if blocked by incomplete dependencies
-            has_incomplete_deps = False
-            for dep_id in task.dependencies:
-                dep_task = user.find_task_by_id(dep_id)
-                if dep_task and not dep_task.is_complete:
-                    has_incomplete_deps = True
-                    break
-
-            if has_incomplete_deps:
-                column = "blocked"
-            elif (
-                task.start_date and task.start_date > datetime.now()
-            ):  # pragma: no cover
-                column = "backlog"  # pragma: no cover
-            elif task.due_date and task.due_date <= datetime.now() + timedelta(
-                days=1
-            ):  # pragma: no cover
-                column = "in_progress"  # pragma: no cover
-            else:
-                column = "todo"
+            column = "todo"
 
         task_list = columns[column]["tasks"]
         if isinstance(task_list, list):
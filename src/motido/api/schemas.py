@@ -6,7 +6,7 @@ These mirror the core models but are optimized for JSON serialization.
 """
 
 from datetime import date, datetime
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -179,6 +179,45 @@ class BulkJumpToCurrentInstanceResponse(BaseModel):
     updated_count: int = 0
 
 
+class BulkTaskOperation(BaseModel):
+    """A single operation in a bulk task mutation request."""
+
+    op: Literal["create", "update", "complete", "uncomplete", "delete", "defer"]
+    task_id: str | None = None  # Required for every op except create
+    create: TaskCreate | None = None  # Payload for op="create"
+    update: TaskUpdate | None = None  # Payload for op="update"
+    defer: TaskDeferRequest | None = None  # Payload for op="defer"
+
+
+class BulkTaskRequest(BaseModel):
+    """Schema for applying an ordered list of task operations in one save."""
+
+    operations: list[BulkTaskOperation] = Field(..., min_length=1)
+
+
+class BulkTaskOperationResult(BaseModel):
+    """Outcome of a single bulk operation."""
+
+    index: int
+    op: str
+    task_id: str | None = None
+    success: bool
+    error: str | None = None
+    xp_earned: int = 0
+    task: TaskResponse | None = None
+    next_instance: TaskResponse | None = None
+
+
+class BulkTaskResponse(BaseModel):
+    """Schema for a bulk task mutation response."""
+
+    results: list[BulkTaskOperationResult] = Field(default_factory=list)
+    succeeded: int = 0
+    failed: int = 0
+    xp_change: int = 0
+    total_xp: int = 0
+
+
 # === Tag Schemas ===
 class TagBase(BaseModel):
     """Base schema for tag data."""
@@ -243,6 +282,14 @@ class XPWithdrawRequest(BaseModel):
     description: str = ""
 
 
+class XPRollupResponse(BaseModel):
+    """Schema for the result of rolling up old XP transactions."""
+
+    compacted: int  # Transactions folded into aggregates
+    aggregates: int  # Aggregate entries written
+    remaining: int  # Transactions in the XP log after the rollup
+
+
 # === Badge Schemas ===
 class BadgeSchema(BaseModel):
     """Schema for badge data."""
@@ -282,6 +329,14 @@ class UserStats(BaseModel):
     best_streak: int
 
 
+class ArchiveResponse(BaseModel):
+    """Schema for the result of archiving completed tasks."""
+
+    horizon_days: int
+    archived_count: int  # Tasks archived by this request
+    archived_total: int  # Tasks in the archive after it
+
+
 # === Auth Schemas ===
 class TokenResponse(BaseModel):
     """Schema for JWT token response."""
@@ -290,6 +345,13 @@ class TokenResponse(BaseModel):
     token_type: str = "bearer"
 
 
+class StreamTicketResponse(BaseModel):
+    """Schema for an event stream ticket response."""
+
+    ticket: str
+    expires_in: int  # Seconds
+
+
 class LoginRequest(BaseModel):
     """Schema for login request."""
 
@@ -367,6 +429,37 @@ class SystemStatus(BaseModel):
     timezone: str | None = None
 
 
+# === Job Schemas ===
+class JobSubmitRequest(BaseModel):
+    """Schema for submitting a background job (imports use /jobs/import)."""
+
+    kind: Literal["advance", "export", "rescore"]
+    params: dict[str, Any] = Field(default_factory=dict)
+
+
+class JobResponse(BaseModel):
+    """Schema for a background job's status."""
+
+    id: str
+    kind: str
+    status: str
+    progress: int = 0
+    total: int | None = None
+    message: str | None = None
+    error: str | None = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class JobResultResponse(BaseModel):
+    """Schema for a finished job's result."""
+
+    id: str
+    status: str
+    result: dict[str, Any] | None = None
+    error: str | None = None
+
+
 # === Scoring Configuration Schemas ===
 class AgeFactorConfig(BaseModel):
     """Schema for age factor settings."""
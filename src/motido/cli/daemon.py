@@ -0,0 +1,489 @@
+# cli/daemon.py
+"""
+Optional background daemon that keeps CLI state warm between invocations.
+
+``motido daemon start`` launches a process listening on a Unix domain socket.
+While it runs, ``motido <command>`` sends its argv to the daemon, which
+executes it against an already-loaded manager and User and returns the
+captured output and exit code. When no daemon is reachable (or
+MOTIDO_NO_DAEMON is set) the CLI runs the command in-process as usual.
+
+The daemon serves one request at a time, so commands never interleave their
+saves. It reloads the user when the backend reports a data_version() change
+made by another process, and drops its manager when the config changes.
+
+Each command carries the client's backend environment (MANAGER_ENV), which
+the daemon adopts, rebuilding its manager when it differs from the last
+request's, and the client's config path. A daemon reading another config
+file (another install) refuses the command, and the client runs it itself.
+
+Protocol: the client sends one JSON object terminated by a newline and reads
+one JSON object back before the daemon closes the connection.
+
+    {"argv": ["list"], "tty": true, "columns": 120,
+     "env": {"DATABASE_URL": null, ...}, "config_path": "/.../config.json"}
+        -> {"exit_code": 0, "stdout": "...", "stderr": ""}
+        -> {"refused": "..."}
+    {"control": "ping" | "stop"}
+        -> {"pid": 123, "uptime": 4.2, "requests": 17}
+"""
+
+import io
+import json
+import os
+import socket
+import sys
+from contextlib import redirect_stderr, redirect_stdout
+from time import monotonic, sleep
+from typing import Any
+
+from motido.cli.main import (
+    USER_COMMANDS,
+    _requested_command,
+    load_command_user,
+    run_parsed_command,
+    setup_parser,
+)
+from motido.core.metrics import record_cache
+from motido.core.models import User
+from motido.data.abstraction import DataManager
+from motido.data.backend_factory import get_data_manager, reset_data_manager
+from motido.data.config import get_config_path
+
+SOCKET_ENV = "MOTIDO_DAEMON_SOCKET"
+DISABLE_ENV = "MOTIDO_NO_DAEMON"
+
+# Commands that always run in the invoking process ('batch' reads local
+# files/stdin; 'generate' and 'migrate' write users the daemon must then
+# reload)
+LOCAL_COMMANDS = {"init", "daemon", "batch", "generate", "migrate"}
+# Commands that prompt on stdin unless confirmed up front with -y/--yes
+PROMPTING_COMMANDS = {"batch-edit", "batch-complete"}
+
+# Seconds to wait for a freshly started daemon to accept connections
+START_TIMEOUT = 5.0
+# Seconds a client waits for a command to finish
+REQUEST_TIMEOUT = 300.0
+
+MAX_REQUEST_BYTES = 1024 * 1024
+
+# Environment that selects and configures the backend, sent with each command
+MANAGER_ENV = ("DATABASE_URL", "MOTIDO_SQLITE_PRAGMAS")
+
+# Only the owner may connect; applied before bind so the socket never exists
+# with looser permissions
+SOCKET_UMASK = 0o177
+
+
+def daemon_supported() -> bool:
+    """Whether this platform supports the daemon (Unix domain sockets)."""
+    return hasattr(socket, "AF_UNIX") and hasattr(os, "getuid")
+
+
+def get_socket_path() -> str:
+    """Socket path from MOTIDO_DAEMON_SOCKET, else a per-user runtime path."""
+    configured = os.getenv(SOCKET_ENV)
+    if configured:
+        return configured
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR") or "/tmp"
+    return os.path.join(runtime_dir, f"motido-{os.getuid()}.sock")
+
+
+def _should_forward(argv: list[str]) -> bool:
+    if os.getenv(DISABLE_ENV) or not daemon_supported():
+        return False
+    command = _requested_command(argv)
+    if command is None or command in LOCAL_COMMANDS:
+        return False
+    if command in PROMPTING_COMMANDS and not {"-y", "--yes"} & set(argv):
+        return False
+    if "--profile" in argv:  # Profile the in-process run, not the daemon
+        return False
+    return os.path.exists(get_socket_path())
+
+
+def _connect(path: str, timeout: float) -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _read_message(sock: socket.socket) -> dict[str, Any]:
+    buffer = b""
+    while not buffer.endswith(b"\n"):
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        buffer += chunk
+        if len(buffer) > MAX_REQUEST_BYTES:
+            raise ValueError("Daemon message too large")
+    message = json.loads(buffer.decode("utf-8"))
+    if not isinstance(message, dict):
+        raise ValueError("Daemon message must be a JSON object")
+    return message
+
+
+def _manager_env() -> dict[str, str | None]:
+    return {name: os.environ.get(name) for name in MANAGER_ENV}
+
+
+def _adopt_manager_env(env: dict[str, Any]) -> None:
+    for name in MANAGER_ENV:
+        value = env.get(name)
+        if isinstance(value, str):
+            os.environ[name] = value
+        else:
+            os.environ.pop(name, None)
+
+
+def _send_message(sock: socket.socket, message: dict[str, Any]) -> None:
+    sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+def send_request(
+    request: dict[str, Any],
+    path: str | None = None,
+    timeout: float = REQUEST_TIMEOUT,
+) -> dict[str, Any]:
+    """
+    Send one request to the daemon and return its response.
+
+    Raises:
+        ConnectionError: If no daemon accepts the connection.
+        OSError, ValueError: If the exchange fails after connecting.
+    """
+    try:
+        sock = _connect(path or get_socket_path(), timeout)
+    except OSError as e:
+        raise ConnectionError(f"No daemon listening: {e}") from e
+    with sock:
+        _send_message(sock, request)
+        return _read_message(sock)
+
+
+def forward_command(argv: list[str]) -> int | None:
+    """
+    Run argv on the daemon, echoing its output.
+
+    Returns the command's exit code, or None when the command should run
+    in-process (no daemon, a local-only command, the daemon is gone or it
+    refused the command).
+    """
+    if not _should_forward(argv):
+        return None
+    request = {
+        "argv": argv,
+        "tty": sys.stdout.isatty(),
+        "columns": _terminal_columns(),
+        "env": _manager_env(),
+        "config_path": get_config_path(),
+    }
+    try:
+        response = send_request(request)
+    except ConnectionError:
+        # Stale socket file: the daemon is gone, run locally
+        return None
+    except (OSError, ValueError) as e:
+        # The daemon may have run the command, so don't retry it locally
+        print(f"Error: lost connection to motido daemon: {e}", file=sys.stderr)
+        return 1
+    if "refused" in response:
+        return None
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stderr.write(response.get("stderr", ""))
+    return int(response.get("exit_code", 1))
+
+
+def _terminal_columns() -> int:
+    try:
+        return os.get_terminal_size(sys.stdout.fileno()).columns
+    except (OSError, ValueError):
+        return 80
+
+
+class _TerminalEnv:
+    """Temporarily expose the client's terminal settings to rich."""
+
+    def __init__(self, tty: bool, columns: int) -> None:
+        self._values = {"COLUMNS": str(columns)}
+        if tty:
+            self._values["FORCE_COLOR"] = "1"
+        self._saved: dict[str, str | None] = {}
+
+    def __enter__(self) -> None:
+        for key, value in self._values.items():
+            self._saved[key] = os.environ.get(key)
+            os.environ[key] = value
+
+    def __exit__(self, *exc: Any) -> None:
+        for key, value in self._saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+class CliDaemon:  # pylint: disable=too-many-instance-attributes
+    """Serves CLI commands over a Unix socket with a warm manager and user."""
+
+    def __init__(self, socket_path: str | None = None) -> None:
+        self.socket_path = socket_path or get_socket_path()
+        self.requests_served = 0
+        self._started = monotonic()
+        self._running = False
+        self._manager: DataManager | None = None
+        self._user: User | None = None
+        self._data_version: Any = None
+        self._config_version: int | None = None
+        self._manager_env: dict[str, str | None] = {}
+
+    # --- Warm state ---
+
+    def _current_config_version(self) -> int | None:
+        try:
+            return os.stat(get_config_path()).st_mtime_ns
+        except OSError:
+            return None
+
+    def _backend_version(self, manager: DataManager) -> Any:
+        data_version = getattr(manager, "data_version", None)
+        return data_version() if callable(data_version) else None
+
+    def get_manager(self) -> DataManager:
+        """
+        Return the warm manager, rebuilding it if the config or the backend
+        environment changed.
+        """
+        config_version = self._current_config_version()
+        manager_env = _manager_env()
+        if (
+            self._manager is None
+            or config_version != self._config_version
+            or manager_env != self._manager_env
+        ):
+            reset_data_manager()
+            self._manager = get_data_manager()
+            self._manager.initialize()
+            self._config_version = config_version
+            self._manager_env = manager_env
+            self._user = None
+        return self._manager
+
+    def get_user(self, args: Any, manager: DataManager) -> User | None:
+        """
+        Return the warm user for args.command, reloading it if the store
+        changed (or the backend can't report a version).
+        """
+        version = self._backend_version(manager)
+        hit = not (
+            self._user is None or version is None or version != self._data_version
+        )
+        record_cache("daemon_user", hit)
+        if not hit:
+            self._user = load_command_user(args, manager)
+            self._data_version = version
+        return self._user
+
+    def invalidate(self) -> None:
+        """Drop the cached user so the next command reloads it."""
+        self._user = None
+        self._data_version = None
+
+    # --- Requests ---
+
+    def run_argv(
+        self,
+        argv: list[str],
+        tty: bool = False,
+        columns: int = 80,
+        env: dict[str, Any] | None = None,
+    ) -> dict:
+        """
+        Execute one CLI command and return its exit code and output.
+
+        env holds the client's MANAGER_ENV values, adopted before the run
+        (None keeps the daemon's own).
+        """
+        stdout, stderr = io.StringIO(), io.StringIO()
+        exit_code = 0
+        if env is not None:
+            _adopt_manager_env(env)
+        with redirect_stdout(stdout), redirect_stderr(stderr), _TerminalEnv(
+            tty, columns
+        ):
+            try:
+                args = setup_parser(_requested_command(argv)).parse_args(argv)
+                manager = self.get_manager()
+                user = None
+                if args.command in USER_COMMANDS:
+                    user = self.get_user(args, manager)
+                run_parsed_command(args, manager, user)
+                # Our own save is not an external change
+                self._data_version = self._backend_version(manager)
+            except SystemExit as e:
+                exit_code = e.code if isinstance(e.code, int) else int(bool(e.code))
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                # Keep serving: report the failure to this client only
+                print(f"Error: {e}", file=sys.stderr)
+                exit_code = 1
+            if exit_code:
+                self.invalidate()
+        self.requests_served += 1
+        return {
+            "exit_code": exit_code,
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue(),
+        }
+
+    def status(self) -> dict[str, Any]:
+        """Return the daemon's pid, uptime and request count."""
+        return {
+            "pid": os.getpid(),
+            "uptime": round(monotonic() - self._started, 3),
+            "requests": self.requests_served,
+        }
+
+    def handle_request(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Dispatch a decoded request to a command run or control action."""
+        control = request.get("control")
+        if control == "stop":
+            self._running = False
+            return self.status()
+        if control == "ping":
+            return self.status()
+        argv = request.get("argv")
+        env = request.get("env")
+        if (
+            not isinstance(argv, list)
+            or not all(isinstance(a, str) for a in argv)
+            or not isinstance(env, (dict, type(None)))
+        ):
+            return {"exit_code": 2, "stdout": "", "stderr": "Invalid request\n"}
+        config_path = request.get("config_path")
+        if config_path is not None and config_path != get_config_path():
+            return {"refused": f"daemon reads config {get_config_path()}"}
+        return self.run_argv(
+            argv, bool(request.get("tty")), int(request.get("columns") or 80), env
+        )
+
+    def _handle_connection(self, conn: socket.socket) -> None:
+        with conn:
+            try:
+                request = _read_message(conn)
+            except (OSError, ValueError) as e:
+                response: dict[str, Any] = {
+                    "exit_code": 2,
+                    "stdout": "",
+                    "stderr": f"Invalid request: {e}\n",
+                }
+            else:
+                response = self.handle_request(request)
+            try:
+                _send_message(conn, response)
+            except OSError:  # pragma: no cover - client went away
+                pass
+
+    def serve_forever(self) -> None:
+        """Listen on the socket until a stop request arrives."""
+        if os.path.exists(self.socket_path):
+            try:
+                send_request({"control": "ping"}, self.socket_path, timeout=1)
+            except ConnectionError:
+                os.unlink(self.socket_path)  # left behind by a dead daemon
+            else:
+                raise RuntimeError(f"A daemon is already running on {self.socket_path}")
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            saved_umask = os.umask(SOCKET_UMASK)
+            try:
+                server.bind(self.socket_path)
+            finally:
+                os.umask(saved_umask)
+            server.listen()
+            self._running = True
+            while self._running:
+                conn, _ = server.accept()
+                self._handle_connection(conn)
+        finally:
+            server.close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+
+def start_background_daemon(path: str) -> dict[str, Any]:
+    """
+    Launch the daemon as a detached process and wait until it answers.
+
+    Raises:
+        RuntimeError: If it does not come up within START_TIMEOUT.
+    """
+    import subprocess  # pylint: disable=import-outside-toplevel
+
+    env = dict(os.environ, **{SOCKET_ENV: path})
+    subprocess.Popen(  # pylint: disable=consider-using-with
+        [sys.executable, "-m", "motido.cli.daemon"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        env=env,
+    )
+    deadline = monotonic() + START_TIMEOUT
+    while monotonic() < deadline:
+        try:
+            return send_request({"control": "ping"}, path, timeout=1)
+        except ConnectionError:
+            sleep(0.05)
+    raise RuntimeError(f"Daemon did not start on {path}")
+
+
+def handle_daemon(args: Any) -> None:
+    """Handles the 'daemon' command (start, stop, status, run)."""
+    if not daemon_supported():
+        print("The daemon requires Unix domain sockets, unavailable on this platform.")
+        sys.exit(1)
+    path = args.socket or get_socket_path()
+
+    if args.daemon_action == "run":
+        print(f"motido daemon listening on {path}")
+        CliDaemon(path).serve_forever()
+        return
+
+    try:
+        info = send_request({"control": "ping"}, path, timeout=1)
+    except ConnectionError:
+        info = None
+
+    if args.daemon_action == "start":
+        if info is None:
+            try:
+                info = start_background_daemon(path)
+            except RuntimeError as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+            print(f"Daemon started (pid {info['pid']}) on {path}.")
+        else:
+            print(f"Daemon already running (pid {info['pid']}) on {path}.")
+    elif args.daemon_action == "stop":
+        if info is None:
+            print("Daemon is not running.")
+            return
+        send_request({"control": "stop"}, path, timeout=5)
+        print(f"Daemon stopped (pid {info['pid']}).")
+    elif info is None:
+        print("Daemon is not running.")
+    else:
+        print(
+            f"Daemon running (pid {info['pid']}) on {path}: "
+            f"{info['requests']} request(s) served, up {info['uptime']:.0f}s."
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    CliDaemon().serve_forever()
@@ -0,0 +1,35 @@
+# cli/lazy.py
+"""
+Deferred imports for the CLI.
+
+Every ``motido`` invocation imports ``motido.cli.main``, so module-level
+imports there are paid by every command. LazyImport stands in for a class or
+function from a heavy dependency and imports it on first use.
+"""
+
+import importlib
+from typing import Any
+
+
+class LazyImport:
+    """Placeholder for ``module.name`` that imports it when first used."""
+
+    def __init__(self, module: str, name: str) -> None:
+        self._module = module
+        self._name = name
+        self._target: Any = None
+
+    def resolve(self) -> Any:
+        """Import (once) and return the real object."""
+        if self._target is None:
+            self._target = getattr(importlib.import_module(self._module), self._name)
+        return self._target
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.resolve(), attr)
+
+    def __repr__(self) -> str:
+        return f"<LazyImport {self._module}.{self._name}>"
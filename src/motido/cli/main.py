@@ -6,18 +6,18 @@ Provides commands to initialize, create, view, list, and edit tasks.
 """
 
 import argparse
+import copy
+import dataclasses
 import re
+import shlex
 import sys
 from argparse import Namespace  # Import Namespace
 from datetime import date, datetime, timedelta
-from typing import Any, Callable, TypeVar
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
 
-# Import rich for table formatting
-from rich.console import Console
-from rich.table import Table
-from rich.text import Text
-
-# Updated imports
+from motido.cli.lazy import LazyImport
+from motido.core.archive import DEFAULT_ARCHIVE_HORIZON_DAYS, archive_completed_tasks
+from motido.core.logs import configure_logging
 from motido.core.models import (  # Added Duration
     Difficulty,
     Duration,
@@ -27,6 +27,7 @@ from motido.core.models import (  # Added Duration
     Tag,
     Task,
     User,
+    XPTransaction,
 )
 from motido.core.recurrence import create_next_habit_instance
 from motido.core.scoring import (
@@ -38,10 +39,43 @@ from motido.core.scoring import (
     withdraw_xp,
 )
 from motido.core.utils import auto_generate_icon, parse_date, process_day
+from motido.core.xp_rollup import (
+    DEFAULT_DAILY_ROLLUP_DAYS,
+    DEFAULT_MONTHLY_ROLLUP_DAYS,
+    rollup_xp_transactions,
+)
 from motido.data.abstraction import DataManager  # For type hinting
-from motido.data.abstraction import DEFAULT_USERNAME
-from motido.data.backend_factory import get_data_manager
+from motido.data.abstraction import DEFAULT_USERNAME, newest_xp_transactions
+from motido.data.backend_factory import (
+    BACKEND_TYPES,
+    create_data_manager,
+    get_data_manager,
+)
 from motido.data.config import load_config, save_config
+from motido.data.synthetic import SyntheticSpec, populate
+
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.table import Table
+    from rich.text import Text
+else:
+    # rich is used for table formatting; it takes ~30ms to import, so
+    # commands that only print plain text never load it.
+    # pylint: disable=invalid-name
+    Console = LazyImport("rich.console", "Console")
+    Table = LazyImport("rich.table", "Table")
+    Text = LazyImport("rich.text", "Text")
+    # pylint: enable=invalid-name
+
+# The daemon client/server live in motido.cli.daemon, which imports this module
+forward_command = LazyImport("motido.cli.daemon", "forward_command")
+handle_daemon = LazyImport("motido.cli.daemon", "handle_daemon")
+# The migration tool pulls in every backend's serialization code
+migrate_backend = LazyImport("motido.data.migration", "migrate_backend")
+# cProfile/tracemalloc are only loaded for --profile runs
+ProfileSession = LazyImport(  # pylint: disable=invalid-name
+    "motido.core.profiling", "ProfileSession"
+)
 
 T = TypeVar("T")
 
@@ -524,7 +558,7 @@ def _is_task_blocked(task: Task, all_tasks: list[Task]) -> bool:
     return False
 
 
-def handle_view(args: Namespace, _manager: DataManager, user: User | None) -> None:
+def handle_view(args: Namespace, manager: DataManager, user: User | None) -> None:
     """Handles the 'view' command."""
     if not user:
         print(f"User '{DEFAULT_USERNAME}' not found or no data available.")
@@ -579,7 +613,18 @@ def handle_view(args: Namespace, _manager: DataManager, user: User | None) -> No
         habit_id = getattr(args, "habit_id", None)
         weeks = getattr(args, "weeks", 12)
         console = Console()
-        render_heatmap(user.tasks, habit_id, console, weeks)
+        today = date.today()
+        start_date = today - timedelta(days=today.weekday(), weeks=weeks - 1)
+
+        def completion_dates(series_id: str) -> set[date]:
+            # Day counts come from the backend's daily summary, so the
+            # cost grows with the weeks shown rather than with the tasks
+            counts = manager.completion_counts_by_day(
+                user.username, start_date, today, series_id
+            )
+            return {day for day, (completed, _) in counts.items() if completed}
+
+        render_heatmap(user.all_tasks(), habit_id, console, weeks, completion_dates)
         return
 
     if not args.id:
@@ -1637,6 +1682,8 @@ def handle_xp(args: Namespace, manager: DataManager, user: User | None) -> None:
         withdraw_xp(user, manager, args.amount)
     elif args.xp_command == "log":
         _handle_xp_log(user)
+    elif args.xp_command == "rollup":
+        _handle_xp_rollup(args, manager, user)
     else:
         print(f"Error: Unknown xp command '{args.xp_command}'")
         sys.exit(1)
@@ -1679,6 +1726,32 @@ def _handle_xp_log(user: User) -> None:
     console.print(table)
 
 
+def _handle_xp_rollup(args: Namespace, manager: DataManager, user: User) -> None:
+    """Compact old XP transactions into daily and monthly aggregates."""
+    try:
+        result = rollup_xp_transactions(
+            user,
+            daily_after_days=args.daily_after,
+            monthly_after_days=args.monthly_after,
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if not result.compacted:
+        print("Nothing to roll up.")
+        return
+    try:
+        manager.save_user(user)
+    except IOError as e:
+        print(f"Error saving changes: {e}")
+        sys.exit(1)
+    print(
+        f"Rolled up {result.compacted} XP transaction(s) into "
+        f"{result.aggregates} aggregate(s); {len(user.xp_transactions)} remain."
+    )
+
+
 def handle_habits(_args: Namespace, _manager: DataManager, user: User | None) -> None:
     """Handles the 'habits' command to list habit statistics."""
     if user is None:
@@ -2118,7 +2191,8 @@ def handle_history(args: Namespace, _manager: DataManager, user: User | None) ->
         sys.exit(1)
 
     try:
-        task = user.find_task_by_id(args.id)
+        # Archived tasks keep their history, read-only
+        task = user.find_task_by_id(args.id) or user.find_archived_task(args.id)
         if not task:
             print(f"Error: Task with ID prefix '{args.id}' not found.")
             sys.exit(1)
@@ -2168,7 +2242,11 @@ def handle_undo(args: Namespace, manager: DataManager, user: User | None) -> Non
     try:
         task = user.find_task_by_id(args.id)
         if not task:
-            print(f"Error: Task with ID prefix '{args.id}' not found.")
+            archived = user.find_archived_task(args.id)
+            if archived:
+                print(f"Error: Task '{archived.title}' is archived and read-only.")
+            else:
+                print(f"Error: Task with ID prefix '{args.id}' not found.")
             sys.exit(1)
 
         if not task.history:
@@ -2213,6 +2291,31 @@ def handle_undo(args: Namespace, manager: DataManager, user: User | None) -> Non
         sys.exit(1)
 
 
+def handle_archive(args: Namespace, manager: DataManager, user: User | None) -> None:
+    """Handles the 'archive' command: move old completed tasks to the archive."""
+    if user is None:
+        print("Error: User not found.")
+        sys.exit(1)
+
+    if args.days < 0:
+        print("Error: --days must not be negative.")
+        sys.exit(1)
+
+    try:
+        archived = archive_completed_tasks(user, manager, horizon_days=args.days)
+    except NotImplementedError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if not archived:
+        print(f"Nothing to archive: no completed tasks older than {args.days} days.")
+        return
+    print(
+        f"Archived {len(archived)} completed task(s) older than {args.days} days "
+        f"({user.archive_summary.completed_tasks} archived in total)."
+    )
+
+
 def _would_create_cycle(task_id: str, new_dep_id: str, all_tasks: list[Task]) -> bool:
     """Check if adding new_dep_id as a dependency of task_id would create a cycle.
 
@@ -2390,6 +2493,288 @@ def handle_batch_complete(
         sys.exit(1)
 
 
+class _DeferredSaveManager(DataManager):
+    """
+    Wraps a manager so save_user() only records the user to save.
+
+    Used by 'batch' to save once per N commands instead of once per command.
+    Other attributes (optional backend capabilities) pass through.
+    """
+
+    def __init__(self, manager: DataManager) -> None:
+        self._manager = manager
+        self.pending: User | None = None
+        self.saves = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._manager, name)
+
+    def initialize(self) -> None:
+        self._manager.initialize()
+
+    def load_user(self, username: str = DEFAULT_USERNAME) -> User | None:
+        return self._manager.load_user(username)
+
+    def list_usernames(self) -> list[str]:
+        return self._manager.list_usernames()
+
+    def save_user(self, user: User) -> None:
+        self.pending = user
+
+    def backend_type(self) -> str:
+        return self._manager.backend_type()
+
+    def archive_tasks(
+        self, user: User, tasks: list[Task], *, replace: bool = False
+    ) -> None:
+        # The archive write saves the user itself, so it can't be deferred
+        self._manager.archive_tasks(user, tasks, replace=replace)
+
+    def load_archived_tasks(self, username: str = DEFAULT_USERNAME) -> list[Task]:
+        return self._manager.load_archived_tasks(username)
+
+    def rebuild_daily_summary(self, username: str = DEFAULT_USERNAME) -> int:
+        return self._manager.rebuild_daily_summary(username)
+
+    def load_xp_log(
+        self, username: str, *, limit: int, offset: int = 0
+    ) -> list[XPTransaction]:
+        if self.pending is not None and self.pending.username == username:
+            # Storage is behind the pending user; page its in-memory log
+            return newest_xp_transactions(
+                self.pending.xp_transactions, limit=limit, offset=offset
+            )
+        return self._manager.load_xp_log(username, limit=limit, offset=offset)
+
+    def flush(self) -> None:
+        """Save the pending user, if any."""
+        if self.pending is not None:
+            self._manager.save_user(self.pending)
+            self.pending = None
+            self.saves += 1
+
+
+# Commands that can't run inside a batch
+BATCH_EXCLUDED_COMMANDS = {"batch", "init", "daemon", "migrate"}
+# User commands that only read the user, so a failing one leaves nothing to undo
+BATCH_READ_ONLY_COMMANDS = {"list", "view", "habits", "stats", "history"}
+
+
+def _read_batch_lines(path: str) -> list[str]:
+    """Read batch commands from a file, or stdin when path is '-'."""
+    if path == "-":
+        return sys.stdin.read().splitlines()
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+def _parse_batch_line(line: str) -> Namespace:
+    """
+    Parse one batch line as CLI arguments.
+
+    Raises:
+        ValueError: If the line can't be parsed or runs a disallowed command.
+    """
+    try:
+        argv = shlex.split(line)
+    except ValueError as e:
+        raise ValueError(f"cannot parse line: {e}") from e
+    command = _requested_command(argv)
+    if command in BATCH_EXCLUDED_COMMANDS:
+        raise ValueError(f"'{command}' cannot be used inside a batch")
+    if command in ("batch-edit", "batch-complete") and not {"-y", "--yes"} & set(argv):
+        raise ValueError(f"'{command}' needs --yes inside a batch")
+    try:
+        return setup_parser(command).parse_args(argv)
+    except SystemExit as e:
+        # argparse has already printed the usage error
+        raise ValueError("invalid arguments") from e
+
+
+def _restore_user(user: User, snapshot: User) -> None:
+    """Put a copy's state back into the user object, keeping its identity."""
+    for field in dataclasses.fields(User):
+        setattr(user, field.name, getattr(snapshot, field.name))
+
+
+# pylint: disable-next=too-many-branches
+def handle_batch(args: Namespace, manager: DataManager, user: User | None) -> None:
+    """
+    Handles the 'batch' command: run CLI commands from a file or stdin.
+
+    Each non-blank line (lines starting with # are comments) is parsed with
+    the regular argument parser and dispatched against a single loaded user.
+    Saves are deferred to every --save-every commands and the end of the
+    batch. Stops at the first failing line unless --keep-going is given.
+    A failing command's changes are rolled back (the user is copied before
+    each command that may change it), so saves only persist whole commands.
+    """
+    try:
+        lines = _read_batch_lines(args.file)
+    except OSError as e:
+        print(f"Error reading batch file: {e}")
+        sys.exit(1)
+
+    deferred = _DeferredSaveManager(manager)
+    succeeded = 0
+    failures: list[int] = []
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        try:
+            command_args = _parse_batch_line(line)
+        except ValueError as e:
+            print(f"Line {line_number}: {e}")
+            failures.append(line_number)
+        else:
+            command_args.verbose = command_args.verbose or args.verbose
+            command_user = user if command_args.command in USER_COMMANDS else None
+            rollback = None
+            if (
+                command_args.command in USER_COMMANDS
+                and command_args.command not in BATCH_READ_ONLY_COMMANDS
+            ):
+                rollback = (copy.deepcopy(user), deferred.pending is not None)
+            try:
+                run_parsed_command(command_args, deferred, command_user)
+                failed = False
+            except SystemExit as e:
+                failed = bool(e.code)
+            if failed:
+                print(f"Line {line_number}: command failed: {line.strip()}")
+                failures.append(line_number)
+                if rollback is not None:
+                    snapshot, was_pending = rollback
+                    if user is not None and snapshot is not None:
+                        _restore_user(user, snapshot)
+                    deferred.pending = user if was_pending else None
+            else:
+                succeeded += 1
+            # 'create' on a fresh install builds the user it saves
+            if user is None and deferred.pending is not None:
+                user = deferred.pending
+
+        if failures and not args.keep_going:
+            break
+        if args.save_every and succeeded and succeeded % args.save_every == 0:
+            deferred.flush()
+
+    try:
+        deferred.flush()
+    except (IOError, OSError) as e:
+        print(f"Error saving changes: {e}")
+        sys.exit(1)
+
+    print(
+        f"Batch finished: {succeeded} command(s) succeeded, "
+        f"{len(failures)} failed, {deferred.saves} save(s)."
+    )
+    if failures:
+        if not args.keep_going:
+            print(f"Stopped at line {failures[0]}; use --keep-going to continue.")
+        sys.exit(1)
+
+
+def handle_generate(args: Namespace, manager: DataManager, _user: User | None) -> None:
+    """
+    Handles the 'generate' command: write a seeded synthetic account.
+
+    Refuses to replace an existing user unless --force is given.
+    """
+    if not args.force and manager.load_user(args.username) is not None:
+        print(
+            f"Error: User '{args.username}' already exists. "
+            "Use --force to replace it or --username to pick another name."
+        )
+        sys.exit(1)
+
+    spec = SyntheticSpec(
+        tasks=args.tasks,
+        completed_ratio=args.completed_ratio,
+        dependency_ratio=args.dependency_ratio,
+        dependency_depth=args.dependency_depth,
+        habits=args.habits,
+        habit_instances=args.habit_instances,
+        xp_days=args.xp_days,
+        xp_per_day=args.xp_per_day,
+        history_per_task=args.history,
+        subtasks_per_task=args.subtasks,
+        tags=args.tags,
+        projects=args.projects,
+        seed=args.seed,
+        end_date=parse_date(args.end_date).date() if args.end_date else None,
+    )
+    user = populate(manager, spec, args.username)
+    print(
+        f"Generated user '{user.username}': {len(user.tasks)} tasks, "
+        f"{len(user.xp_transactions)} XP transactions, {user.total_xp} XP "
+        f"(seed {spec.seed})."
+    )
+
+
+def handle_db(args: Namespace, manager: DataManager, _user: User | None) -> None:
+    """Handles the 'db' command: storage diagnostics and maintenance."""
+    if args.db_command == "explain":
+        plans = manager.explain_queries(args.username)
+        if not plans:
+            print(f"The {manager.backend_type()} backend has no query plans to show.")
+            return
+        for name, lines in plans.items():
+            print(f"{name}:")
+            for line in lines:
+                print(f"  {line}")
+    elif args.db_command == "rebuild-summary":
+        count = manager.rebuild_daily_summary(args.username)
+        print(
+            f"Rebuilt the daily summary of user '{args.username}': "
+            f"{count} day counts."
+        )
+    else:
+        print(f"Error: Unknown db command '{args.db_command}'")
+        sys.exit(1)
+
+
+def handle_migrate(args: Namespace) -> None:
+    """Handles the 'migrate' command: copy every user to another backend."""
+    if args.source == args.target:
+        print("Error: The source and target backends must differ.")
+        sys.exit(1)
+    checkpoint = args.checkpoint or f"motido-migrate-{args.source}-{args.target}.json"
+
+    def report(username: str, digest: Any) -> None:
+        print(
+            f"Copied user '{username}': {digest.tasks} tasks, "
+            f"{digest.archived_tasks} archived, "
+            f"{digest.xp_transactions} XP transactions."
+        )
+
+    try:
+        source = create_data_manager(args.source)
+        target = create_data_manager(args.target)
+        source.initialize()
+        target.initialize()
+        result = migrate_backend(source, target, checkpoint, on_user=report)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        # Backends raise their own driver errors; the checkpoint keeps the
+        # progress made so far, so report and let the user rerun
+        print(f"Error: Migration stopped: {e}")
+        print(f"Rerun the same command to resume from '{checkpoint}'.")
+        sys.exit(1)
+
+    print(
+        f"Migrated {len(result.migrated)} users from {args.source} to "
+        f"{args.target} ({len(result.skipped)} already copied)."
+    )
+    if result.mismatches:
+        for username, problem in result.mismatches.items():
+            print(f"Verification failed for user '{username}': {problem}")
+        sys.exit(1)
+    print(
+        f"Verified {len(result.migrated) + len(result.skipped)} users: "
+        "row counts and checksums match."
+    )
+
+
 def _wrap_handler(
     handler_func: Callable[[argparse.Namespace, DataManager, User | None], T],
 ) -> Callable[[argparse.Namespace, DataManager, User | None], T]:
@@ -2401,27 +2786,8 @@ def _wrap_handler(
     return wrapped
 
 
-def setup_parser() -> argparse.ArgumentParser:
-    """Set up and configure the argument parser for the CLI.
-
-    Returns:
-        argparse.ArgumentParser: Configured argument parser with
-        all commands and options.
-    """
-    parser = argparse.ArgumentParser(description="Moti-Do: Task Management CLI")
-    subparsers = parser.add_subparsers(
-        dest="command", help="Available commands", required=True
-    )
-
-    # --- Global Arguments ---
-    parser.add_argument(
-        "-v",
-        "--verbose",
-        action="store_true",
-        help="Enable verbose output for commands.",
-    )
-
-    # --- Init Command ---
+def _add_init_parser(subparsers: Any) -> None:
+    """Add the parser for the Init command."""
     parser_init = subparsers.add_parser(
         "init", help="Initialize the application and select backend."
     )
@@ -2433,7 +2799,9 @@ def setup_parser() -> argparse.ArgumentParser:
     )
     parser_init.set_defaults(func=handle_init)
 
-    # --- Create Command ---
+
+def _add_create_parser(subparsers: Any) -> None:
+    """Add the parser for the Create command."""
     parser_create = subparsers.add_parser("create", help="Create a new task.")
     parser_create.add_argument(
         "-d",
@@ -2488,7 +2856,9 @@ def setup_parser() -> argparse.ArgumentParser:
     )
     parser_create.set_defaults(func=_wrap_handler(handle_create))
 
-    # --- List Command ---
+
+def _add_list_parser(subparsers: Any) -> None:
+    """Add the parser for the List command."""
     parser_list = subparsers.add_parser("list", help="List all tasks.")
     parser_list.add_argument(
         "--sort-by",
@@ -2516,7 +2886,9 @@ def setup_parser() -> argparse.ArgumentParser:
     )
     parser_list.set_defaults(func=_wrap_handler(handle_list))
 
-    # --- View Command ---
+
+def _add_view_parser(subparsers: Any) -> None:
+    """Add the parser for the View command."""
     parser_view = subparsers.add_parser(
         "view", help="View tasks (details, calendar, graph)."
     )
@@ -2576,7 +2948,9 @@ def setup_parser() -> argparse.ArgumentParser:
 
     parser_view.set_defaults(func=_wrap_handler(handle_view))
 
-    # --- Edit Command ---
+
+def _add_edit_parser(subparsers: Any) -> None:
+    """Add the parser for the Edit command."""
     parser_edit = subparsers.add_parser(
         "edit",
         help="Edit the description, priority, difficulty, or duration of an existing task.",
@@ -2617,7 +2991,9 @@ def setup_parser() -> argparse.ArgumentParser:
     )
     parser_edit.set_defaults(func=_wrap_handler(handle_edit))
 
-    # --- Delete Command ---
+
+def _add_delete_parser(subparsers: Any) -> None:
+    """Add the parser for the Delete command."""
     parser_delete = subparsers.add_parser("delete", help="Delete a task by ID.")
     parser_delete.add_argument(
         "--id",
@@ -2626,7 +3002,9 @@ def setup_parser() -> argparse.ArgumentParser:
     )
     parser_delete.set_defaults(func=_wrap_handler(handle_delete))
 
-    # --- Complete Command ---
+
+def _add_complete_parser(subparsers: Any) -> None:
+    """Add the parser for the Complete command."""
     parser_complete = subparsers.add_parser("complete", help="Mark a task as complete.")
     parser_complete.add_argument(
         "--id",
@@ -2635,7 +3013,9 @@ def setup_parser() -> argparse.ArgumentParser:
     )
     parser_complete.set_defaults(func=_wrap_handler(handle_complete))
 
-    # --- Describe Command ---
+
+def _add_describe_parser(subparsers: Any) -> None:
+    """Add the parser for the Describe command."""
     parser_describe = subparsers.add_parser(
         "describe", help="Set or update the text description of a task."
     )
@@ -2650,7 +3030,9 @@ def setup_parser() -> argparse.ArgumentParser:
     )
     parser_describe.set_defaults(func=_wrap_handler(handle_describe))
 
-    # --- Set Due Date Command ---
+
+def _add_set_due_parser(subparsers: Any) -> None:
+    """Add the parser for the Set Due Date command."""
     parser_set_due = subparsers.add_parser(
         "set-due", help="Set or clear the due date of a task."
     )
@@ -2667,7 +3049,9 @@ def setup_parser() -> argparse.ArgumentParser:
     )
     parser_set_due.set_defaults(func=_wrap_handler(handle_set_due))
 
-    # --- Set Start Date Command ---
+
+def _add_set_start_parser(subparsers: Any) -> None:
+    """Add the parser for the Set Start Date command."""
     parser_set_start = subparsers.add_parser(
         "set-start", help="Set or clear the start date of a task."
     )
@@ -2684,7 +3068,9 @@ def setup_parser() -> argparse.ArgumentParser:
     )
     parser_set_start.set_defaults(func=_wrap_handler(handle_set_start))
 
-    # --- Tag Command ---
+
+def _add_tag_parser(subparsers: Any) -> None:
+    """Add the parser for the Tag command."""
     parser_tag = subparsers.add_parser(
         "tag", help="Add, remove, or list tags on a task."
     )
@@ -2701,7 +3087,9 @@ def setup_parser() -> argparse.ArgumentParser:
     )
     parser_tag.set_defaults(func=_wrap_handler(handle_tag))
 
-    # --- Project Command ---
+
+def _add_project_parser(subparsers: Any) -> None:
+    """Add the parser for the Project command."""
     parser_project = subparsers.add_parser(
         "project", help="Set or clear the project for a task."
     )
@@ -2714,7 +3102,9 @@ def setup_parser() -> argparse.ArgumentParser:
     )
     parser_project.set_defaults(func=_wrap_handler(handle_project))
 
-    # --- Run Penalties Command ---
+
+def _add_run_penalties_parser(subparsers: Any) -> None:
+    """Add the parser for the Run Penalties command."""
     parser_penalties = subparsers.add_parser(
         "run-penalties", help="Apply daily penalties for incomplete tasks."
     )
@@ -2725,7 +3115,9 @@ def setup_parser() -> argparse.ArgumentParser:
     )
     parser_penalties.set_defaults(func=_wrap_handler(handle_run_penalties))
 
-    # --- Advance Command ---
+
+def _add_advance_parser(subparsers: Any) -> None:
+    """Add the parser for the Advance command."""
     parser_advance = subparsers.add_parser(
         "advance", help="Advance virtual date by one day (or multiple days with --to)."
     )
@@ -2738,7 +3130,9 @@ def setup_parser() -> argparse.ArgumentParser:
     )
     parser_advance.set_defaults(func=_wrap_handler(handle_advance))
 
-    # --- XP Command ---
+
+def _add_xp_parser(subparsers: Any) -> None:
+    """Add the parser for the XP command."""
     parser_xp = subparsers.add_parser("xp", help="Manage XP.")
     xp_subparsers = parser_xp.add_subparsers(dest="xp_command", required=True)
 
@@ -2751,23 +3145,53 @@ def setup_parser() -> argparse.ArgumentParser:
     # XP Log
     xp_subparsers.add_parser("log", help="View XP transaction history.")
 
+    # XP Rollup
+    parser_xp_rollup = xp_subparsers.add_parser(
+        "rollup",
+        help="Compact old XP transactions into daily and monthly aggregates.",
+    )
+    parser_xp_rollup.add_argument(
+        "--daily-after",
+        type=int,
+        default=DEFAULT_DAILY_ROLLUP_DAYS,
+        metavar="DAYS",
+        help="Roll transactions older than DAYS into daily aggregates "
+        f"(default: {DEFAULT_DAILY_ROLLUP_DAYS}).",
+    )
+    parser_xp_rollup.add_argument(
+        "--monthly-after",
+        type=int,
+        default=DEFAULT_MONTHLY_ROLLUP_DAYS,
+        metavar="DAYS",
+        help="Roll whole months older than DAYS into monthly aggregates "
+        f"(default: {DEFAULT_MONTHLY_ROLLUP_DAYS}).",
+    )
+
     parser_xp.set_defaults(func=_wrap_handler(handle_xp))
 
-    # --- Habits Command ---
+
+def _add_habits_parser(subparsers: Any) -> None:
+    """Add the parser for the Habits command."""
     parser_habits = subparsers.add_parser("habits", help="List habits with statistics.")
     parser_habits.set_defaults(func=_wrap_handler(handle_habits))
 
-    # --- Stats Command ---
+
+def _add_stats_parser(subparsers: Any) -> None:
+    """Add the parser for the Stats command."""
     parser_stats = subparsers.add_parser("stats", help="Show productivity statistics.")
     parser_stats.set_defaults(func=_wrap_handler(handle_stats))
 
-    # --- Badges Command ---
+
+def _add_badges_parser(subparsers: Any) -> None:
+    """Add the parser for the Badges command."""
     parser_badges = subparsers.add_parser(
         "badges", help="Display earned and available badges."
     )
     parser_badges.set_defaults(func=_wrap_handler(handle_badges))
 
-    # --- Tags Registry Command ---
+
+def _add_tags_parser(subparsers: Any) -> None:
+    """Add the parser for the Tags Registry command."""
     parser_tags = subparsers.add_parser(
         "tags", help="Manage the global tag registry with colors."
     )
@@ -2801,7 +3225,9 @@ def setup_parser() -> argparse.ArgumentParser:
 
     parser_tags.set_defaults(func=_wrap_handler(handle_tags))
 
-    # --- Projects Registry Command ---
+
+def _add_projects_parser(subparsers: Any) -> None:
+    """Add the parser for the Projects Registry command."""
     parser_projects = subparsers.add_parser(
         "projects", help="Manage the global project registry with colors."
     )
@@ -2845,7 +3271,9 @@ def setup_parser() -> argparse.ArgumentParser:
 
     parser_projects.set_defaults(func=_wrap_handler(handle_projects))
 
-    # --- Vacation Command ---
+
+def _add_vacation_parser(subparsers: Any) -> None:
+    """Add the parser for the Vacation command."""
     parser_vacation = subparsers.add_parser("vacation", help="Manage vacation mode.")
     parser_vacation.add_argument(
         "status",
@@ -2854,7 +3282,9 @@ def setup_parser() -> argparse.ArgumentParser:
     )
     parser_vacation.set_defaults(func=_wrap_handler(handle_vacation))
 
-    # --- Depends Command ---
+
+def _add_depends_parser(subparsers: Any) -> None:
+    """Add the parser for the Depends command."""
     parser_depends = subparsers.add_parser("depends", help="Manage task dependencies.")
     parser_depends.add_argument(
         "depends_command",
@@ -2871,7 +3301,9 @@ def setup_parser() -> argparse.ArgumentParser:
     )
     parser_depends.set_defaults(func=_wrap_handler(handle_depends))
 
-    # --- Subtask Command ---
+
+def _add_subtask_parser(subparsers: Any) -> None:
+    """Add the parser for the Subtask command."""
     parser_subtask = subparsers.add_parser("subtask", help="Manage task subtasks.")
     parser_subtask.add_argument(
         "subtask_command",
@@ -2891,21 +3323,43 @@ def setup_parser() -> argparse.ArgumentParser:
     )
     parser_subtask.set_defaults(func=_wrap_handler(handle_subtask))
 
-    # --- History Command ---
+
+def _add_history_parser(subparsers: Any) -> None:
+    """Add the parser for the History command."""
     parser_history = subparsers.add_parser("history", help="Show task change history.")
     parser_history.add_argument(
         "--id", required=True, help="The task ID to show history for."
     )
     parser_history.set_defaults(func=_wrap_handler(handle_history))
 
-    # --- Undo Command ---
+
+def _add_undo_parser(subparsers: Any) -> None:
+    """Add the parser for the Undo command."""
     parser_undo = subparsers.add_parser("undo", help="Undo the last change to a task.")
     parser_undo.add_argument(
         "--id", required=True, help="The task ID to undo the last change for."
     )
     parser_undo.set_defaults(func=_wrap_handler(handle_undo))
 
-    # --- Batch Edit Command ---
+
+def _add_archive_parser(subparsers: Any) -> None:
+    """Add the parser for the Archive command."""
+    parser_archive = subparsers.add_parser(
+        "archive",
+        help="Move old completed tasks and ended habit series to the archive.",
+    )
+    parser_archive.add_argument(
+        "--days",
+        type=int,
+        default=DEFAULT_ARCHIVE_HORIZON_DAYS,
+        help="Archive tasks completed more than this many days ago "
+        f"(default: {DEFAULT_ARCHIVE_HORIZON_DAYS}).",
+    )
+    parser_archive.set_defaults(func=_wrap_handler(handle_archive))
+
+
+def _add_batch_edit_parser(subparsers: Any) -> None:
+    """Add the parser for the Batch Edit command."""
     parser_batch_edit = subparsers.add_parser(
         "batch-edit", help="Edit multiple tasks at once based on filter criteria."
     )
@@ -2940,7 +3394,9 @@ def setup_parser() -> argparse.ArgumentParser:
     )
     parser_batch_edit.set_defaults(func=_wrap_handler(handle_batch_edit))
 
-    # --- Batch Complete Command ---
+
+def _add_batch_complete_parser(subparsers: Any) -> None:
+    """Add the parser for the Batch Complete command."""
     parser_batch_complete = subparsers.add_parser(
         "batch-complete",
         help="Complete multiple tasks at once based on filter criteria.",
@@ -2962,69 +3418,301 @@ def setup_parser() -> argparse.ArgumentParser:
     )
     parser_batch_complete.set_defaults(func=_wrap_handler(handle_batch_complete))
 
-    return parser
 
+def _add_batch_parser(subparsers: Any) -> None:
+    """Add the parser for the Batch command."""
+    parser_batch = subparsers.add_parser(
+        "batch",
+        help="Run CLI commands (one per line) from a file or stdin in one session.",
+    )
+    parser_batch.add_argument(
+        "-f",
+        "--file",
+        default="-",
+        help="File with one command per line, e.g. 'create --title X' "
+        "(default: '-' for stdin).",
+    )
+    parser_batch.add_argument(
+        "--keep-going",
+        action="store_true",
+        help="Continue after a failing command instead of stopping.",
+    )
+    parser_batch.add_argument(
+        "--save-every",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Save after every N successful commands (default: only at the end).",
+    )
+    parser_batch.set_defaults(func=_wrap_handler(handle_batch))
+
+
+def _add_generate_parser(subparsers: Any) -> None:
+    """Add the parser for the Generate command."""
+    parser_generate = subparsers.add_parser(
+        "generate",
+        help="Write a seeded synthetic account for testing and benchmarks.",
+    )
+    defaults = SyntheticSpec()
+    parser_generate.add_argument(
+        "--username",
+        default=DEFAULT_USERNAME,
+        help=f"User to write (default: {DEFAULT_USERNAME}).",
+    )
+    parser_generate.add_argument(
+        "--force", action="store_true", help="Replace the user if it already exists."
+    )
+    parser_generate.add_argument(
+        "--seed", type=int, default=defaults.seed, help="Random seed (default: 0)."
+    )
+    parser_generate.add_argument(
+        "--end-date",
+        help="The account's 'today', e.g. 2025-06-30 (default: today).",
+    )
+    knobs: list[tuple[str, type, str]] = [
+        ("tasks", int, "One-off tasks"),
+        ("completed_ratio", float, "Share of one-off tasks completed"),
+        ("dependency_ratio", float, "Share of open tasks in dependency chains"),
+        ("dependency_depth", int, "Maximum dependency chain length"),
+        ("habits", int, "Habit series"),
+        ("habit_instances", int, "Instances per habit series"),
+        ("xp_days", int, "Days of XP transactions"),
+        ("xp_per_day", int, "XP transactions per day"),
+        ("history_per_task", int, "Average history entries per task"),
+        ("subtasks_per_task", int, "Average subtasks per one-off task"),
+        ("tags", int, "Defined tags"),
+        ("projects", int, "Defined projects"),
+    ]
+    for field, field_type, help_text in knobs:
+        # --history and --subtasks read better than the spec field names
+        option = field.removesuffix("_per_task").replace("_", "-")
+        parser_generate.add_argument(
+            f"--{option}",
+            dest=field.removesuffix("_per_task"),
+            type=field_type,
+            default=getattr(defaults, field),
+            help=f"{help_text} (default: {getattr(defaults, field)}).",
+        )
+    parser_generate.set_defaults(func=_wrap_handler(handle_generate))
 
-def main() -> None:
-    """Main function to parse arguments and dispatch commands."""
-    # Parse arguments
-    args = setup_parser().parse_args()
 
-    # --- Execute Command ---
-    # The 'init' command doesn't need a pre-fetched manager or user
-    if args.command == "init":
-        args.func(args)
-        return
+def _add_db_parser(subparsers: Any) -> None:
+    """Add the parser for the Db command."""
+    parser_db = subparsers.add_parser(
+        "db", help="Inspect and maintain the storage backend."
+    )
+    db_subparsers = parser_db.add_subparsers(dest="db_command", required=True)
 
-    # Get the manager *once* for other commands
-    manager = get_data_manager()
-    user = None  # Initialize user to None
+    parser_db_explain = db_subparsers.add_parser(
+        "explain",
+        help="Show the query plans of the main access patterns.",
+    )
+    parser_db_explain.add_argument(
+        "--username",
+        default=DEFAULT_USERNAME,
+        help=f"User whose queries to plan (default: {DEFAULT_USERNAME}).",
+    )
 
-    # Load user for commands that require it
-    if args.command in [
-        "create",
-        "list",
-        "view",
-        "edit",
-        "delete",
-        "complete",
-        "run-penalties",
-        "xp",
-        "vacation",
-        "depends",
-        "subtask",
-        "history",
-        "undo",
-        "habits",
-        "stats",
-        "advance",
-        "describe",
-        "set-due",
-        "set-start",
-        "tag",
-        "project",
-        "tags",
-        "projects",
-        "batch-edit",
-        "batch-complete",
-    ]:
-        try:
-            user = manager.load_user(DEFAULT_USERNAME)
-            if user is None and args.command not in ["create"]:
-                print_verbose(
-                    args, f"User '{DEFAULT_USERNAME}' not found."
-                )  # pragma: no cover
-        except (IOError, OSError, ValueError) as e:
-            print(f"Error loading user data: {e}")
-            print("Hint: If you haven't initialized, run 'motido init'.")
-            sys.exit(1)
-        except Exception as e:  # pylint: disable=broad-exception-caught
-            # Broad exception is needed here to prevent unexpected crashes
-            # during user data loading and to provide helpful error messages
-            print(f"An unexpected error occurred loading user data: {e}")
-            sys.exit(1)
+    parser_db_rebuild = db_subparsers.add_parser(
+        "rebuild-summary",
+        help="Recount a user's daily completion summary from their tasks.",
+    )
+    parser_db_rebuild.add_argument(
+        "--username",
+        default=DEFAULT_USERNAME,
+        help=f"User whose summary to rebuild (default: {DEFAULT_USERNAME}).",
+    )
+
+    parser_db.set_defaults(func=_wrap_handler(handle_db))
+
+
+def _add_migrate_parser(subparsers: Any) -> None:
+    """Add the parser for the Migrate command."""
+    parser_migrate = subparsers.add_parser(
+        "migrate", help="Copy every user from one storage backend to another."
+    )
+    parser_migrate.add_argument(
+        "--from",
+        dest="source",
+        required=True,
+        choices=BACKEND_TYPES,
+        help="Backend to copy users from.",
+    )
+    parser_migrate.add_argument(
+        "--to",
+        dest="target",
+        required=True,
+        choices=BACKEND_TYPES,
+        help="Backend to copy users to.",
+    )
+    parser_migrate.add_argument(
+        "--checkpoint",
+        help="Progress file to resume from "
+        "(default: motido-migrate-<from>-<to>.json).",
+    )
+    parser_migrate.set_defaults(func=handle_migrate)
+
+
+def _add_daemon_parser(subparsers: Any) -> None:
+    """Add the parser for the Daemon command."""
+    parser_daemon = subparsers.add_parser(
+        "daemon",
+        help="Manage the background daemon that keeps data loaded between commands.",
+    )
+    parser_daemon.add_argument(
+        "daemon_action",
+        choices=["start", "stop", "status", "run"],
+        help="start/stop the background daemon, show its status, or run it "
+        "in the foreground.",
+    )
+    parser_daemon.add_argument(
+        "--socket",
+        help="Unix socket path (default: $MOTIDO_DAEMON_SOCKET or a per-user path).",
+    )
+    parser_daemon.set_defaults(func=handle_daemon)
+
+
+# Parser builders for each subcommand, keyed by command name. main() builds
+# only the invoked command's parser so startup doesn't pay for the full tree.
+_COMMAND_PARSERS: dict[str, Callable[[Any], None]] = {
+    "init": _add_init_parser,
+    "create": _add_create_parser,
+    "list": _add_list_parser,
+    "view": _add_view_parser,
+    "edit": _add_edit_parser,
+    "delete": _add_delete_parser,
+    "complete": _add_complete_parser,
+    "describe": _add_describe_parser,
+    "set-due": _add_set_due_parser,
+    "set-start": _add_set_start_parser,
+    "tag": _add_tag_parser,
+    "project": _add_project_parser,
+    "run-penalties": _add_run_penalties_parser,
+    "advance": _add_advance_parser,
+    "xp": _add_xp_parser,
+    "habits": _add_habits_parser,
+    "stats": _add_stats_parser,
+    "badges": _add_badges_parser,
+    "tags": _add_tags_parser,
+    "projects": _add_projects_parser,
+    "vacation": _add_vacation_parser,
+    "depends": _add_depends_parser,
+    "subtask": _add_subtask_parser,
+    "history": _add_history_parser,
+    "undo": _add_undo_parser,
+    "archive": _add_archive_parser,
+    "batch-edit": _add_batch_edit_parser,
+    "batch-complete": _add_batch_complete_parser,
+    "batch": _add_batch_parser,
+    "generate": _add_generate_parser,
+    "db": _add_db_parser,
+    "migrate": _add_migrate_parser,
+    "daemon": _add_daemon_parser,
+}
+
+
+def setup_parser(command: str | None = None) -> argparse.ArgumentParser:
+    """Set up and configure the argument parser for the CLI.
+
+    Args:
+        command: If this names a known subcommand, only that subcommand's
+            parser is built. Otherwise the full tree is built (e.g. for help).
+
+    Returns:
+        argparse.ArgumentParser: Configured argument parser with
+        all commands and options.
+    """
+    parser = argparse.ArgumentParser(description="Moti-Do: Task Management CLI")
+    subparsers = parser.add_subparsers(
+        dest="command", help="Available commands", required=True
+    )
 
-    # Execute the command, passing manager and user
+    # --- Global Arguments ---
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Enable verbose output for commands.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile this run (cProfile + tracemalloc); the report is written "
+        "to MOTIDO_PROFILE_DIR.",
+    )
+
+    if command in _COMMAND_PARSERS:
+        _COMMAND_PARSERS[command](subparsers)
+    else:
+        for build_parser in _COMMAND_PARSERS.values():
+            build_parser(subparsers)
+
+    return parser
+
+
+def _requested_command(argv: list[str]) -> str | None:
+    """Return the subcommand named in argv (the first non-option token)."""
+    return next((arg for arg in argv if not arg.startswith("-")), None)
+
+
+# Commands that operate on the loaded user
+USER_COMMANDS = {
+    "create",
+    "list",
+    "view",
+    "edit",
+    "delete",
+    "complete",
+    "run-penalties",
+    "xp",
+    "vacation",
+    "depends",
+    "subtask",
+    "history",
+    "undo",
+    "archive",
+    "habits",
+    "stats",
+    "advance",
+    "describe",
+    "set-due",
+    "set-start",
+    "tag",
+    "project",
+    "tags",
+    "projects",
+    "batch-edit",
+    "batch-complete",
+    "batch",
+}
+
+
+def load_command_user(args: Namespace, manager: DataManager) -> User | None:
+    """Load the user for commands that need one (exits on load errors)."""
+    if args.command not in USER_COMMANDS:
+        return None
+    try:
+        user = manager.load_user(DEFAULT_USERNAME)
+        if user is None and args.command not in ["create"]:
+            print_verbose(
+                args, f"User '{DEFAULT_USERNAME}' not found."
+            )  # pragma: no cover
+        return user
+    except (IOError, OSError, ValueError) as e:
+        print(f"Error loading user data: {e}")
+        print("Hint: If you haven't initialized, run 'motido init'.")
+        sys.exit(1)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        # Broad exception is needed here to prevent unexpected crashes
+        # during user data loading and to provide helpful error messages
+        print(f"An unexpected error occurred loading user data: {e}")
+        sys.exit(1)
+
+
+def run_parsed_command(
+    args: Namespace, manager: DataManager, user: User | None
+) -> None:
+    """Execute a parsed command, passing manager and user (exits on errors)."""
     try:
         args.func(args, manager=manager, user=user)
     except (IOError, OSError, ValueError, AttributeError, TypeError) as e:
@@ -3039,5 +3727,49 @@ def main() -> None:
         sys.exit(1)
 
 
+def main() -> None:
+    """Main function to parse arguments and dispatch commands."""
+    argv = sys.argv[1:]
+
+    # Hand the command to the background daemon when one is running
+    exit_code = forward_command(argv)
+    if exit_code is not None:
+        if exit_code:
+            sys.exit(exit_code)
+        return
+
+    # Parse arguments, building only the parser for the invoked command
+    args = setup_parser(_requested_command(argv)).parse_args(argv)
+    # Backend chatter is logged at DEBUG; warnings and errors reach stderr
+    configure_logging(level="DEBUG" if args.verbose else None)
+
+    if not args.profile:
+        dispatch_command(args)
+        return
+
+    session = ProfileSession(f"cli-{args.command}")
+    try:
+        with session:
+            dispatch_command(args)
+    finally:
+        _, report_path = session.write()
+        print(
+            f"Profile ({session.summary()}) written to {report_path}", file=sys.stderr
+        )
+
+
+def dispatch_command(args: Namespace) -> None:
+    """Run a parsed command, loading the manager and user it needs."""
+    # 'init', 'migrate' and 'daemon' don't need a pre-fetched manager or user
+    if args.command in ("init", "migrate", "daemon"):
+        args.func(args)
+        return
+
+    # Get the manager *once* for other commands
+    manager = get_data_manager()
+    user = load_command_user(args, manager)
+    run_parsed_command(args, manager, user)
+
+
 if __name__ == "__main__":
     main()  # pragma: no cover
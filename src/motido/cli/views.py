@@ -1,7 +1,8 @@
 """View components for CLI display (calendar, dependency graph, kanban, heatmap)."""
 
 from datetime import date, timedelta
-from typing import Dict, List, Set
+from functools import partial
+from typing import Callable, Dict, List, Set
 
 from rich.console import Console
 from rich.table import Table
@@ -464,14 +465,13 @@ def _find_habits_to_show(
 
 def _render_habit_heatmap(
     habit: Task,
-    tasks: List[Task],
+    completion_dates: Set[date],
     start_date: date,
     weeks: int,
     today: date,
     console: Console,
 ) -> None:
     """Render heatmap for a single habit."""
-    completion_dates = _get_completion_dates_for_habit(tasks, habit.id)
     console.print(f"[bold]{habit.title}[/bold]")
 
     # Build and print week labels
@@ -491,7 +491,11 @@ def _render_habit_heatmap(
 
 
 def render_heatmap(
-    tasks: List[Task], habit_id: str | None, console: Console, weeks: int = 12
+    tasks: List[Task],
+    habit_id: str | None,
+    console: Console,
+    weeks: int = 12,
+    completion_dates: Callable[[str], Set[date]] | None = None,
 ) -> None:
     """
     Renders a calendar heatmap showing habit completion over time.
@@ -505,6 +509,8 @@ def render_heatmap(
         habit_id: Specific habit ID to show, or None for all habits
         console: Rich Console for output
         weeks: Number of weeks to display (default 12)
+        completion_dates: Returns the days a habit (by ID) was completed in
+            the displayed weeks; defaults to scanning tasks
     """
     today = date.today()
     # Calculate start_date as the Monday of (weeks-1) weeks ago
@@ -519,8 +525,12 @@ def render_heatmap(
     console.print(f"[bold cyan]Habit Heatmap (last {weeks} weeks)[/bold cyan]")
     console.print()
 
+    if completion_dates is None:
+        completion_dates = partial(_get_completion_dates_for_habit, tasks)
     for habit in habits_to_show:
-        _render_habit_heatmap(habit, tasks, start_date, weeks, today, console)
+        _render_habit_heatmap(
+            habit, completion_dates(habit.id), start_date, weeks, today, console
+        )
 
     # Legend
     legend = Text("Legend: ", style="dim")
@@ -0,0 +1,112 @@
+"""
+Archive tier for old completed tasks and ended recurrence series.
+
+Archiving moves completed tasks whose last activity is older than a horizon
+out of the user's task list into the backend's archive storage, folding
+them into User.archive_summary so badges, stats and the heatmap still count
+them. Archived tasks stay readable through User.archived_tasks (fetched on
+first use) for history views, but are never modified again. Kept habit
+instances keep naming their archived parents; readers walking a series
+resolve those through the archive, and recurrence processing counts
+archived instances as existing.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Iterable
+
+from motido.core.models import LazyTasks, Task
+
+DEFAULT_ARCHIVE_HORIZON_DAYS = 90
+
+
+def last_activity(task: Task) -> date:
+    """The latest of a task's creation date, due date and history entries."""
+    days = [task.creation_date.date()]
+    if task.due_date is not None:
+        days.append(task.due_date.date())
+    for entry in task.history:
+        try:
+            days.append(datetime.fromisoformat(entry["timestamp"]).date())
+        except (KeyError, TypeError, ValueError):
+            continue
+    return max(days)
+
+
+def select_archivable(
+    tasks: Iterable[Task], today: date, horizon_days: int
+) -> list[Task]:
+    """
+    Pick the tasks to move to the archive.
+
+    A task qualifies when it is complete and its last activity is more than
+    horizon_days before today, unless it keeps a running habit series going
+    (the root, which identifies the series, and the latest instance, which
+    recurrence processing chains from, of a series whose recurrence has not
+    ended) or a task staying in the main tier depends on it.
+
+    Args:
+        tasks: Every task of the user.
+        today: The date the horizon is measured from.
+        horizon_days: How many days completed tasks stay in the main tier.
+
+    Returns:
+        The tasks to archive.
+    """
+    tasks = list(tasks)
+    cutoff = today - timedelta(days=horizon_days)
+    parent_ids = {task.parent_habit_id for task in tasks if task.parent_habit_id}
+
+    def keeps_series_running(task: Task) -> bool:
+        return (
+            task.is_habit
+            and task.recurrence_ended_at is None
+            and (task.parent_habit_id is None or task.id not in parent_ids)
+        )
+
+    candidates = {
+        task.id: task
+        for task in tasks
+        if task.is_complete
+        and not keeps_series_running(task)
+        and last_activity(task) < cutoff
+    }
+    # Tasks staying in the main tier keep their dependencies there too
+    staying = [task for task in tasks if task.id not in candidates]
+    while staying:
+        for dep_id in staying.pop().dependencies:
+            dependency = candidates.pop(dep_id, None)
+            if dependency is not None:
+                staying.append(dependency)
+    return list(candidates.values())
+
+
+def archive_completed_tasks(
+    user: Any,
+    manager: Any,
+    *,
+    horizon_days: int = DEFAULT_ARCHIVE_HORIZON_DAYS,
+    today: date | None = None,
+) -> list[Task]:
+    """
+    Move a user's archivable tasks to the manager's archive tier.
+
+    Args:
+        user: The User to archive tasks of (every task is fetched).
+        manager: The DataManager holding the user; it stores the archived
+            tasks and saves the user.
+        horizon_days: How many days completed tasks stay in the main tier.
+        today: The date the horizon is measured from (defaults to today).
+
+    Returns:
+        The tasks that were archived.
+    """
+    archived = select_archivable(user.all_tasks(), today or date.today(), horizon_days)
+    if not archived:
+        return []
+
+    user.remove_tasks({task.id for task in archived})
+    for task in archived:
+        user.archive_summary.add(task)
+    manager.archive_tasks(user, archived)
+    user.archived_tasks = LazyTasks(lambda: manager.load_archived_tasks(user.username))
+    return archived
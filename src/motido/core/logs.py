@@ -0,0 +1,157 @@
+# core/logs.py
+"""
+Logging setup for Moti-Do.
+
+Modules log through per-module loggers (``logging.getLogger(__name__)``), all
+children of the ``motido`` logger. configure_logging attaches one handler to
+that logger: plain text for the CLI, one JSON object per line for the API.
+Low-level messages from a busy call site can be rate limited so they cannot
+flood log ingestion under load.
+
+Environment variables (override the defaults passed by each entry point):
+    MOTIDO_LOG_LEVEL: Level name, e.g. DEBUG, INFO, WARNING.
+    MOTIDO_LOG_FORMAT: "text" or "json".
+    MOTIDO_LOG_RATE_LIMIT: Max records per call site per minute (0 = off).
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, TextIO
+
+LOGGER_NAME = "motido"
+LEVEL_ENV = "MOTIDO_LOG_LEVEL"
+FORMAT_ENV = "MOTIDO_LOG_FORMAT"
+RATE_LIMIT_ENV = "MOTIDO_LOG_RATE_LIMIT"
+RATE_LIMIT_WINDOW_SECONDS = 60.0
+
+TEXT_FORMAT = "%(levelname)s %(name)s: %(message)s"
+
+# Attributes every LogRecord has; anything else was passed via ``extra``
+_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None))
+) | {"message", "asctime"}
+
+# Handler installed by configure_logging - mutable module-level state
+# pylint: disable=invalid-name
+_handler: logging.Handler | None = None
+# pylint: enable=invalid-name
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects, including ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class RateLimitFilter(logging.Filter):  # pylint: disable=too-few-public-methods
+    """
+    Passes at most ``limit`` records per call site every ``window`` seconds.
+
+    Warnings and errors always pass. The first record from a call site after a
+    window in which records were dropped carries a ``suppressed`` count.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        window: float = RATE_LIMIT_WINDOW_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (pathname, lineno) -> [window start, records passed, records dropped]
+        self._sites: dict[tuple[str, int], list[Any]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.pathname, record.lineno)
+        now = self._clock()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None or now - site[0] >= self.window:
+                if site is not None and site[2]:
+                    record.suppressed = site[2]
+                self._sites[key] = [now, 1, 0]
+                return True
+            if site[1] < self.limit:
+                site[1] += 1
+                return True
+            site[2] += 1
+            return False
+
+
+class _CurrentStderrHandler(logging.StreamHandler):  # type: ignore[type-arg]
+    """Writes to whatever ``sys.stderr`` is at emit time (daemon redirects it)."""
+
+    @property
+    def stream(self) -> TextIO:  # type: ignore[override]
+        """The live sys.stderr."""
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value: TextIO) -> None:
+        """The stream always follows sys.stderr."""
+
+
+def configure_logging(
+    level: str | int | None = None,
+    fmt: str | None = None,
+    stream: TextIO | None = None,
+) -> logging.Handler:
+    """
+    Install (or replace) the handler on the ``motido`` logger.
+
+    Args:
+        level: Level for motido loggers; defaults to MOTIDO_LOG_LEVEL or WARNING.
+        fmt: "text" or "json"; defaults to MOTIDO_LOG_FORMAT or "text".
+        stream: Stream to write to; defaults to the current sys.stderr.
+
+    Returns:
+        The installed handler.
+    """
+    # pylint: disable=global-statement
+    global _handler
+
+    level = level or os.getenv(LEVEL_ENV) or "WARNING"
+    fmt = (fmt or os.getenv(FORMAT_ENV) or "text").lower()
+    rate_limit = int(os.getenv(RATE_LIMIT_ENV, "0"))
+
+    handler: logging.Handler = (
+        logging.StreamHandler(stream) if stream else _CurrentStderrHandler()
+    )
+    handler.setFormatter(
+        JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT)
+    )
+    if rate_limit > 0:
+        handler.addFilter(RateLimitFilter(rate_limit))
+
+    logger = logging.getLogger(LOGGER_NAME)
+    if _handler is not None:
+        logger.removeHandler(_handler)
+    logger.addHandler(handler)
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    _handler = handler
+    return handler
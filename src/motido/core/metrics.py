@@ -0,0 +1,279 @@
+# core/metrics.py
+"""
+In-process metrics for Moti-Do.
+
+A small, dependency-free registry of counters and latency histograms that
+renders in the Prometheus text exposition format. Hot code paths record
+phases with ``timed("phase")``; when a request is being timed (see
+``collect_request_timings``) the same durations are also gathered per request
+so the API can return them in a ``Server-Timing`` header.
+"""
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Iterator, Optional, Protocol, TypeVar
+
+# Metric names
+HTTP_LATENCY = "motido_http_request_duration_seconds"
+PHASE_LATENCY = "motido_phase_duration_seconds"
+TASKS_SCORED = "motido_tasks_scored_total"
+ROWS_UPSERTED = "motido_rows_upserted_total"
+CACHE_HITS = "motido_cache_hits_total"
+CACHE_MISSES = "motido_cache_misses_total"
+
+METRIC_HELP = {
+    HTTP_LATENCY: "API request latency by route.",
+    PHASE_LATENCY: "Latency of internal phases (load_user, save_user, scoring, ...).",
+    TASKS_SCORED: "Tasks whose score was calculated.",
+    ROWS_UPSERTED: "Rows written to a database backend.",
+    CACHE_HITS: "Lookups answered from an in-process cache.",
+    CACHE_MISSES: "Lookups that missed an in-process cache.",
+}
+
+# Upper bounds in seconds, Prometheus client defaults
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelKey = tuple[tuple[str, str], ...]
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class PhaseObserver(Protocol):
+    """Receives phase boundaries while installed with ``observe_phases``."""
+
+    def phase_started(self, phase: str) -> None:
+        """Called when a timed phase begins."""
+
+    def phase_finished(self, phase: str, seconds: float) -> None:
+        """Called when a timed phase ends."""
+
+
+# Phase durations (name, seconds) for the request being served, if any
+_request_timings: ContextVar[Optional[list[tuple[str, float]]]] = ContextVar(
+    "motido_request_timings", default=None
+)
+# Extra per-phase listener (e.g. a profiling session), if any
+_phase_observer: ContextVar[Optional[PhaseObserver]] = ContextVar(
+    "motido_phase_observer", default=None
+)
+
+
+class _Histogram:  # pylint: disable=too-few-public-methods
+    """Cumulative bucket counts plus sum and count for one label set."""
+
+    __slots__ = ("bucket_counts", "total", "count")
+
+    def __init__(self, size: int) -> None:
+        self.bucket_counts = [0] * size
+        self.total = 0.0
+        self.count = 0
+
+
+def _label_key(labels: dict[str, Any]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: tuple[str, str] | None = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms keyed by metric name and labels."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[LabelKey, float]] = {}
+        self._histograms: dict[str, dict[LabelKey, _Histogram]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Add value to a counter."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        """Record one observation in a histogram."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(len(self.buckets))
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram.bucket_counts[index] += 1
+            histogram.total += seconds
+            histogram.count += 1
+
+    def counter_value(self, name: str, **labels: Any) -> float:
+        """Current value of a counter (0 if never incremented)."""
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0)
+
+    def histogram_count(self, name: str, **labels: Any) -> int:
+        """Number of observations recorded in a histogram."""
+        with self._lock:
+            histogram = self._histograms.get(name, {}).get(_label_key(labels))
+            return histogram.count if histogram else 0
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: list[str] = []
+        with self._lock:
+            for name in sorted(self._counters):
+                lines += _header(name, "counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+            for name in sorted(self._histograms):
+                lines += _header(name, "histogram")
+                for key, histogram in sorted(self._histograms[name].items()):
+                    for bound, count in zip(self.buckets, histogram.bucket_counts):
+                        le = ("le", _format_value(bound))
+                        lines.append(f"{name}_bucket{_format_labels(key, le)} {count}")
+                    inf = ("le", "+Inf")
+                    lines.append(
+                        f"{name}_bucket{_format_labels(key, inf)} {histogram.count}"
+                    )
+                    lines.append(
+                        f"{name}_sum{_format_labels(key)} "
+                        f"{_format_value(histogram.total)}"
+                    )
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _header(name: str, kind: str) -> list[str]:
+    help_text = METRIC_HELP.get(name)
+    return ([f"# HELP {name} {help_text}"] if help_text else []) + [
+        f"# TYPE {name} {kind}"
+    ]
+
+
+# Process-wide registry - mutable module-level state
+# pylint: disable=invalid-name
+_metrics: Optional[MetricsRegistry] = None
+# pylint: enable=invalid-name
+
+
+def get_metrics() -> MetricsRegistry:
+    """Return the process-wide metrics registry, creating it on first use."""
+    global _metrics  # pylint: disable=global-statement
+    if _metrics is None:
+        _metrics = MetricsRegistry()
+    return _metrics
+
+
+def set_metrics(registry: MetricsRegistry | None) -> None:
+    """Replace the process-wide registry (None resets it; used by tests)."""
+    global _metrics  # pylint: disable=global-statement
+    _metrics = registry
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a hit or miss for the named cache."""
+    get_metrics().inc(CACHE_HITS if hit else CACHE_MISSES, cache=cache)
+
+
+@contextmanager
+def collect_request_timings() -> Iterator[list[tuple[str, float]]]:
+    """Gather every ``timed`` phase in this context into the yielded list."""
+    timings: list[tuple[str, float]] = []
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+@contextmanager
+def observe_phases(observer: PhaseObserver) -> Iterator[None]:
+    """Report every ``timed`` phase in this context to observer."""
+    token = _phase_observer.set(observer)
+    try:
+        yield
+    finally:
+        _phase_observer.reset(token)
+
+
+def _start_phase(phase: str) -> float:
+    observer = _phase_observer.get()
+    if observer is not None:
+        observer.phase_started(phase)
+    return perf_counter()
+
+
+def record_phase(phase: str, seconds: float) -> None:
+    """Record a phase duration in the histogram and the current request."""
+    get_metrics().observe(PHASE_LATENCY, seconds, phase=phase)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((phase, seconds))
+    observer = _phase_observer.get()
+    if observer is not None:
+        observer.phase_finished(phase, seconds)
+
+
+class timed:  # pylint: disable=invalid-name,too-few-public-methods
+    """
+    Time a phase, as a context manager or a decorator.
+
+        with timed("scoring"):
+            ...
+
+        @timed("load_user")
+        def load_user(...): ...
+    """
+
+    def __init__(self, phase: str) -> None:
+        self.phase = phase
+        self._start = 0.0
+
+    def __enter__(self) -> "timed":
+        self._start = _start_phase(self.phase)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        record_phase(self.phase, perf_counter() - self._start)
+
+    def __call__(self, func: F) -> F:
+        phase = self.phase
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = _start_phase(phase)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record_phase(phase, perf_counter() - start)
+
+        return wrapper  # type: ignore[return-value]
+
+
+def format_server_timing(timings: list[tuple[str, float]], total: float) -> str:
+    """
+    Build a Server-Timing header value, summing repeated phases.
+
+    Durations are in milliseconds, e.g. ``load_user;dur=1.2, total;dur=8.5``.
+    """
+    summed: dict[str, float] = {}
+    for phase, seconds in timings:
+        summed[phase] = summed.get(phase, 0.0) + seconds
+    summed["total"] = total
+    return ", ".join(
+        f"{phase};dur={seconds * 1000:.1f}" for phase, seconds in summed.items()
+    )
@@ -3,11 +3,13 @@
 Defines the core data models for the Moti-Do application.
 """
 
+import copy
+import sys
 import uuid
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from enum import Enum
-from typing import Any, Dict, List, Literal
+from typing import Any, Callable, Dict, Iterator, List, Literal
 
 # Type for XP transaction sources
 XPSource = Literal[
@@ -19,6 +21,8 @@ XPSource = Literal[
     "manual_adjustment",
     "daily_earned",  # Aggregated daily earned XP
     "daily_lost",  # Aggregated daily lost XP (penalties)
+    "monthly_earned",  # Rolled-up monthly earned XP (see motido.core.xp_rollup)
+    "monthly_lost",  # Rolled-up monthly lost XP
 ]
 
 # Default colors for tags and projects
@@ -181,7 +185,12 @@ class SubtaskRecurrenceMode(str, Enum):
     ALWAYS = "always"  # Full new task regardless of subtask state
 
 
-@dataclass
+def _intern(value: Any) -> Any:
+    """Intern a string value; anything else (including None) is returned as is."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(slots=True)
 class XPTransaction:
     """Represents a single XP transaction (gain or loss)."""
 
@@ -193,8 +202,12 @@ class XPTransaction:
     description: str = ""
     game_date: date | None = None  # The game day this transaction belongs to
 
+    def __post_init__(self) -> None:
+        """Share one string object per source across the XP log."""
+        self.source = _intern(self.source)
 
-@dataclass
+
+@dataclass(slots=True)
 class Badge:
     """Represents an achievement badge."""
 
@@ -209,7 +222,7 @@ class Badge:
         return self.earned_date is not None
 
 
-@dataclass
+@dataclass(slots=True)
 class Tag:
     """Represents a tag with color for categorizing tasks."""
 
@@ -219,7 +232,7 @@ class Tag:
     multiplier: float = 1.0  # Score multiplier for tasks with this tag
 
 
-@dataclass
+@dataclass(slots=True)
 class Project:
     """Represents a project with color for organizing tasks."""
 
@@ -229,7 +242,7 @@ class Project:
     multiplier: float = 1.0  # Score multiplier for tasks in this project
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:  # pylint: disable=too-many-instance-attributes
     """Represents a single task."""
 
@@ -284,6 +297,20 @@ class Task:  # pylint: disable=too-many-instance-attributes
     penalty_score: float = field(default=0.0)  # Penalty if not completed today
     net_score: float = field(default=0.0)  # XP + penalty avoided
 
+    def __post_init__(self) -> None:
+        """
+        Intern the strings that repeat across tasks.
+
+        Tags, projects, recurrence rules and habit lineage ids are shared by
+        many tasks (every instance of a habit series carries the same ones),
+        so interning them on construction keeps a single copy per value.
+        """
+        self.tags = [_intern(tag) for tag in self.tags]
+        self.project = _intern(self.project)
+        self.recurrence_rule = _intern(self.recurrence_rule)
+        self.parent_habit_id = _intern(self.parent_habit_id)
+        self.icon = _intern(self.icon)
+
     def __str__(self) -> str:
         """String representation for simple display."""
         # Format creation_date as YYYY-MM-DD HH:MM:SS
@@ -296,6 +323,155 @@ class Task:  # pylint: disable=too-many-instance-attributes
         )
 
 
+class LazyTasks:
+    """
+    Tasks a user's active-set load left in storage, fetched on first use.
+
+    Backends can load only incomplete tasks, open habit roots and the latest
+    instance of each habit series into User.tasks; the rest (years of
+    completed habit instances, mostly) sit behind this collection and are
+    queried the first time it is iterated. User.archived_tasks uses the same
+    collection for the archive tier. A LazyTasks built without a loader is
+    already loaded and empty, which is what eagerly loaded users carry.
+    """
+
+    __slots__ = ("_loader", "_tasks", "active_ids")
+
+    def __init__(
+        self,
+        loader: Callable[[], List[Task]] | None = None,
+        active_ids: frozenset[str] = frozenset(),
+    ) -> None:
+        """
+        Args:
+            loader: Fetches the tasks from storage; None means nothing to fetch.
+            active_ids: IDs the active-set load put into User.tasks, so saves
+                can tell deleted active tasks from ones that were never loaded.
+        """
+        self._loader = loader
+        self._tasks: List[Task] | None = None if loader else []
+        self.active_ids = active_ids
+
+    @classmethod
+    def of(cls, tasks: List[Task], active_ids: frozenset[str]) -> "LazyTasks":
+        """An already loaded collection holding tasks."""
+        lazy = cls(active_ids=active_ids)
+        lazy._tasks = tasks
+        return lazy
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the tasks are in memory (saves must then write them back)."""
+        return self._tasks is not None
+
+    def _load(self) -> List[Task]:
+        if self._tasks is None:
+            assert self._loader is not None
+            self._tasks = self._loader()
+            self._loader = None
+        return self._tasks
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self._load())
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def remove(self, task_id: str) -> bool:
+        """Remove a task by its full ID, fetching the tasks first if needed."""
+        tasks = self._load()
+        initial_length = len(tasks)
+        tasks[:] = [task for task in tasks if task.id != task_id]
+        return len(tasks) < initial_length
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> "LazyTasks":
+        if self._tasks is None:
+            # The loader only reads storage, so copies can share it
+            return LazyTasks(self._loader, self.active_ids)
+        return LazyTasks.of(copy.deepcopy(self._tasks, memo), self.active_ids)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Loaders close over a live manager; pickles carry the tasks instead
+        return (LazyTasks.of, (self._load(), self.active_ids))
+
+
+@dataclass(slots=True)
+class ArchiveSummary:
+    """
+    What the stats, badges and heatmap still need from archived tasks.
+
+    Archived tasks are all complete, so per-day completion counts (by due
+    date) stand in for them on the heatmap, and the totals keep badge and
+    stats counts unchanged after tasks move to the archive.
+    """
+
+    completed_tasks: int = 0
+    completed_habits: int = 0
+    best_streak: int = 0
+    completions_by_day: Dict[str, int] = field(default_factory=dict)  # ISO date
+
+    def add(self, task: Task) -> None:
+        """Fold an archived task into the summary."""
+        self.completed_tasks += 1
+        if task.is_habit:
+            self.completed_habits += 1
+            self.best_streak = max(
+                self.best_streak, task.streak_best, task.streak_current
+            )
+        if task.due_date is not None:
+            day = task.due_date.date().isoformat()
+            self.completions_by_day[day] = self.completions_by_day.get(day, 0) + 1
+
+    def completions_between(self, start: date, end: date) -> Dict[date, int]:
+        """Archived completions per due date from start to end inclusive."""
+        counts = {}
+        for day_str, count in self.completions_by_day.items():
+            day = date.fromisoformat(day_str)
+            if start <= day <= end:
+                counts[day] = count
+        return counts
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for storage next to the user."""
+        return {
+            "completed_tasks": self.completed_tasks,
+            "completed_habits": self.completed_habits,
+            "best_streak": self.best_streak,
+            "completions_by_day": self.completions_by_day,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any] | None) -> "ArchiveSummary":
+        """Deserialize a stored summary (None or {} for users never archived)."""
+        data = data or {}
+        return cls(
+            completed_tasks=data.get("completed_tasks", 0),
+            completed_habits=data.get("completed_habits", 0),
+            best_streak=data.get("best_streak", 0),
+            completions_by_day=dict(data.get("completions_by_day", {})),
+        )
+
+
+@dataclass(slots=True)
+class TaskCounts:
+    """Totals over a user's main-tier tasks (archived tasks excluded)."""
+
+    total: int = 0
+    completed: int = 0
+    habits: int = 0  # Habit series (roots), not their instances
+    current_streak: int = 0  # Highest current streak of a habit series
+    best_streak: int = 0  # Highest best streak of a habit series
+
+    def add(self, task: Task) -> None:
+        """Count a task in the totals."""
+        self.total += 1
+        self.completed += task.is_complete
+        if task.is_habit and not task.parent_habit_id:
+            self.habits += 1
+            self.current_streak = max(self.current_streak, task.streak_current)
+            self.best_streak = max(self.best_streak, task.streak_best)
+
+
 @dataclass
 class User:  # pylint: disable=too-many-instance-attributes
     """Represents a user and their associated tasks."""
@@ -313,11 +489,40 @@ class User:  # pylint: disable=too-many-instance-attributes
     defined_projects: List[Project] = field(
         default_factory=list
     )  # Global project registry
+    # Tasks an active-set load left in storage (empty for eager loads)
+    inactive_tasks: LazyTasks = field(
+        default_factory=LazyTasks, compare=False, repr=False
+    )
+    # Tasks moved to the archive tier; read-only, fetched on first use
+    archived_tasks: LazyTasks = field(
+        default_factory=LazyTasks, compare=False, repr=False
+    )
+    archive_summary: ArchiveSummary = field(default_factory=ArchiveSummary)
+
+    def all_tasks(self) -> List[Task]:
+        """Every task, fetching the inactive ones if they were not loaded."""
+        return [*self.tasks, *self.inactive_tasks]
+
+    def tasks_with_archive_since(self, start: date) -> List[Task]:
+        """
+        Tasks for views reaching back to start (heatmaps).
+
+        Archived tasks are included, fetching them, only when the archive
+        summary has completions due on or after start.
+        """
+        if self.archive_summary.completions_between(start, date.max):
+            return [*self.tasks, *self.archived_tasks]
+        return self.tasks
 
     def find_task_by_id(self, task_id_prefix: str) -> Task | None:
         """
         Finds a task by its full or partial ID prefix.
 
+        Active and inactive tasks are searched alike, so a prefix resolves
+        the same way whether the user was loaded eagerly or by active set.
+        The inactive tasks are only fetched when the prefix is not the full
+        ID of an active task, since full IDs are unique.
+
         Args:
             task_id_prefix: The full or partial ID to search for.
 
@@ -328,6 +533,12 @@ class User:  # pylint: disable=too-many-instance-attributes
         matching_tasks = [
             task for task in self.tasks if task.id.startswith(task_id_prefix)
         ]
+        if not any(task.id == task_id_prefix for task in matching_tasks):
+            matching_tasks += [
+                task
+                for task in self.inactive_tasks
+                if task.id.startswith(task_id_prefix)
+            ]
         if len(matching_tasks) == 1:
             return matching_tasks[0]
         if len(matching_tasks) > 1:
@@ -338,6 +549,26 @@ class User:  # pylint: disable=too-many-instance-attributes
 
         return None
 
+    def find_archived_task(self, task_id_prefix: str) -> Task | None:
+        """
+        Finds an archived task by its full or partial ID prefix.
+
+        Archived tasks are read-only: history views may show them, but
+        changes to them are never saved.
+
+        Returns:
+            The matching Task object if found and unique, otherwise None.
+            Raises ValueError if the prefix matches multiple tasks.
+        """
+        matching_tasks = [
+            task for task in self.archived_tasks if task.id.startswith(task_id_prefix)
+        ]
+        if len(matching_tasks) > 1:
+            raise ValueError(
+                f"Ambiguous ID prefix '{task_id_prefix}'. Multiple tasks found."
+            )
+        return matching_tasks[0] if matching_tasks else None
+
     def add_task(self, task: Task) -> None:
         """Adds a task to the user's list."""
         self.tasks.append(task)
@@ -354,7 +585,17 @@ class User:  # pylint: disable=too-many-instance-attributes
         """
         initial_length = len(self.tasks)
         self.tasks = [task for task in self.tasks if task.id != task_id]
-        return len(self.tasks) < initial_length
+        if len(self.tasks) < initial_length:
+            return True
+        return self.inactive_tasks.remove(task_id)
+
+    def remove_tasks(self, task_ids: set[str]) -> None:
+        """Removes every task whose full ID is in task_ids (fetching inactive ones)."""
+        self.tasks = [task for task in self.tasks if task.id not in task_ids]
+        self.inactive_tasks = LazyTasks.of(
+            [task for task in self.inactive_tasks if task.id not in task_ids],
+            self.inactive_tasks.active_ids,
+        )
 
     def find_tag_by_name(self, tag_name: str) -> Tag | None:
         """
@@ -0,0 +1,166 @@
+# core/profiling.py
+"""
+Opt-in profiling of a single CLI run or API request.
+
+A ProfileSession runs cProfile and tracemalloc around one invocation and
+observes the ``timed`` phases from motido.core.metrics, so load_user,
+scoring and save_user are reported separately (calls, time and net memory
+allocated) next to the overall hot functions and top allocation sites.
+
+Reports are written to MOTIDO_PROFILE_DIR (default: <tmp>/motido-profiles)
+as a ``.prof`` file for pstats/snakeviz and a ``.txt`` summary.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import re
+import tempfile
+import tracemalloc
+from contextlib import ExitStack
+from dataclasses import dataclass
+from datetime import datetime
+from time import perf_counter
+from typing import Any, Optional
+
+from motido.core.metrics import observe_phases
+
+PROFILE_DIR_ENV = "MOTIDO_PROFILE_DIR"
+
+# Stack frames kept per allocation; 1 keeps tracemalloc overhead low
+TRACE_FRAMES = 1
+
+
+@dataclass
+class PhaseProfile:
+    """Accumulated cost of one phase within a profiling session."""
+
+    calls: int = 0
+    seconds: float = 0.0
+    allocated_bytes: int = 0
+
+
+def get_profile_dir() -> str:
+    """Directory profiling reports are written to."""
+    return os.getenv(PROFILE_DIR_ENV) or os.path.join(
+        tempfile.gettempdir(), "motido-profiles"
+    )
+
+
+class ProfileSession:  # pylint: disable=too-many-instance-attributes
+    """
+    Profile one invocation; use as a context manager.
+
+        with ProfileSession("cli-list") as session:
+            run()
+        paths = session.write()
+    """
+
+    def __init__(self, label: str) -> None:
+        self.label = re.sub(r"[^A-Za-z0-9_.-]+", "-", label).strip("-") or "profile"
+        self.started_at = datetime.now()
+        self.phases: dict[str, PhaseProfile] = {}
+        self.wall_seconds = 0.0
+        self.peak_bytes = 0
+        self._profiler = cProfile.Profile()
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._owns_tracemalloc = False
+        self._phase_stack: list[int] = []
+        self._start = 0.0
+        self._context = ExitStack()
+
+    # --- PhaseObserver ---
+
+    def phase_started(self, phase: str) -> None:  # pylint: disable=unused-argument
+        """Remember traced memory at the start of a phase."""
+        self._phase_stack.append(tracemalloc.get_traced_memory()[0])
+
+    def phase_finished(self, phase: str, seconds: float) -> None:
+        """Accumulate the phase's time and net allocation."""
+        start_bytes = self._phase_stack.pop() if self._phase_stack else 0
+        stats = self.phases.setdefault(phase, PhaseProfile())
+        stats.calls += 1
+        stats.seconds += seconds
+        stats.allocated_bytes += tracemalloc.get_traced_memory()[0] - start_bytes
+
+    # --- Context manager ---
+
+    def __enter__(self) -> "ProfileSession":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            self._owns_tracemalloc = True
+        tracemalloc.reset_peak()
+        self._context.enter_context(observe_phases(self))
+        self._start = perf_counter()
+        self._profiler.enable()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._profiler.disable()
+        self.wall_seconds = perf_counter() - self._start
+        self._context.close()
+        self.peak_bytes = tracemalloc.get_traced_memory()[1]
+        self._snapshot = tracemalloc.take_snapshot()
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+
+    # --- Reporting ---
+
+    def report(self, limit: int = 20) -> str:
+        """Text summary: phases, hottest functions and top allocation sites."""
+        lines = [
+            f"Profile {self.label} at {self.started_at.isoformat(timespec='seconds')}",
+            f"Wall time: {self.wall_seconds * 1000:.1f} ms, "
+            f"peak traced memory: {self.peak_bytes / 1024:.1f} KiB",
+            "",
+            "Phases:",
+        ]
+        if not self.phases:
+            lines.append("  (no timed phases ran)")
+        for phase, stats in sorted(self.phases.items()):
+            lines.append(
+                f"  {phase:<20} calls={stats.calls:<6} "
+                f"time={stats.seconds * 1000:9.1f} ms  "
+                f"net alloc={stats.allocated_bytes / 1024:+10.1f} KiB"
+            )
+
+        stream = io.StringIO()
+        stats_view = pstats.Stats(self._profiler, stream=stream)
+        stats_view.strip_dirs().sort_stats("cumulative").print_stats(limit)
+        lines += ["", "Top functions (cumulative):", stream.getvalue().strip()]
+
+        lines += ["", "Top allocations:"]
+        if self._snapshot is not None:
+            for stat in self._snapshot.statistics("lineno")[:limit]:
+                lines.append(f"  {stat}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory: str | None = None) -> tuple[str, str]:
+        """
+        Write the pstats dump and the text report.
+
+        Returns:
+            Paths of the ``.prof`` and ``.txt`` files.
+        """
+        directory = directory or get_profile_dir()
+        os.makedirs(directory, exist_ok=True)
+        stem = os.path.join(
+            directory,
+            f"{self.started_at.strftime('%Y%m%d-%H%M%S-%f')}-{self.label}",
+        )
+        self._profiler.dump_stats(f"{stem}.prof")
+        with open(f"{stem}.txt", "w", encoding="utf-8") as f:
+            f.write(self.report())
+        return f"{stem}.prof", f"{stem}.txt"
+
+    def summary(self) -> str:
+        """One-line summary suitable for a header or log message."""
+        phases = ", ".join(
+            f"{phase}={stats.seconds * 1000:.1f}ms"
+            for phase, stats in sorted(self.phases.items())
+        )
+        return (
+            f"wall={self.wall_seconds * 1000:.1f}ms "
+            f"peak={self.peak_bytes / 1024:.0f}KiB" + (f" {phases}" if phases else "")
+        )
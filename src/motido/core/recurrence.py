@@ -1,17 +1,25 @@
 """
 Logic for calculating task recurrences.
+
+dateutil is imported inside the functions that parse rules so importing this
+module (pulled in by the API at cold start) stays cheap.
 """
 
 import uuid
 from datetime import date as date_type
 from datetime import datetime, timedelta
-from typing import Optional, cast
-
-from dateutil.rrule import rrulestr
+from typing import Any, Optional, cast
 
 from motido.core.models import RecurrenceType, SubtaskRecurrenceMode, Task
 
 
+def _parse_rule(rule_str: str, dtstart: datetime) -> Any:
+    """Parse an RRULE string into a dateutil rule starting at dtstart."""
+    from dateutil.rrule import rrulestr  # pylint: disable=import-outside-toplevel
+
+    return rrulestr(rule_str, dtstart=dtstart)
+
+
 def calculate_next_occurrence(
     task: Task, completion_date: Optional[datetime] = None
 ) -> Optional[datetime]:
@@ -42,7 +50,7 @@ def calculate_next_occurrence(
 
         # Create rrule object
         # We pass dtstart as the reference date so the series starts from there
-        rule = rrulestr(rule_str, dtstart=reference_date)
+        rule = _parse_rule(rule_str, reference_date)
 
         # Get the next occurrence after the reference date
         next_date = rule.after(reference_date)
@@ -151,7 +159,7 @@ def calculate_current_instance_dates(
 
     try:
         rule_str = _normalize_rule(task.recurrence_rule)
-        rule = rrulestr(rule_str, dtstart=reference_due_date)
+        rule = _parse_rule(rule_str, reference_due_date)
         next_due = cast(Optional[datetime], rule.after(target_due_date, inc=True))
     except (ValueError, TypeError) as error:
         print(f"Error calculating current instance for task {task.id[:8]}: {error}")
@@ -267,7 +275,7 @@ def _advance_to_future_start(
     # Need to advance - parse the recurrence rule
     try:
         rule_str = _normalize_rule(task.recurrence_rule or "")
-        rule = rrulestr(rule_str, dtstart=next_due)
+        rule = _parse_rule(rule_str, next_due)
 
         # Keep advancing until due_date is after both completion_date and original
         while next_due_date <= completion_date_only or (
@@ -14,6 +14,7 @@ from dataclasses import dataclass, field
 from datetime import date
 from typing import Any, Callable, Dict, Optional
 
+from motido.core.metrics import TASKS_SCORED, get_metrics, timed
 from motido.core.models import Difficulty, Duration, Task, User
 
 
@@ -118,9 +119,13 @@ def load_scoring_config() -> Dict[str, Any]:
     default_config = get_default_scoring_config()
 
     if not os.path.exists(config_path):
-        # Create default config if file doesn't exist
-        with open(config_path, "w", encoding="utf-8") as f:
-            json.dump(default_config, f, indent=2)
+        # Create default config if file doesn't exist. Serverless deployments
+        # have a read-only package dir, so fall back to the in-memory default.
+        try:
+            with open(config_path, "w", encoding="utf-8") as f:
+                json.dump(default_config, f, indent=2)
+        except OSError:
+            pass
         return default_config
 
     try:
@@ -864,6 +869,8 @@ def calculate_score(
     Returns:
         The calculated score as an integer
     """
+    if visited is None:  # Top-level call, not a dependency-chain recursion
+        get_metrics().inc(TASKS_SCORED)
     config = merge_config_with_defaults(config)
 
     base_score = float(config.get("base_score", 0.0))
@@ -1209,11 +1216,12 @@ def calculate_task_scores(
     Returns:
         Tuple of (xp_score, penalty_score, net_score)
     """
-    # Calculate XP score
-    xp_score = calculate_score(task, all_tasks, config, effective_date)
+    with timed("scoring"):
+        # Calculate XP score
+        xp_score = calculate_score(task, all_tasks, config, effective_date)
 
-    # Calculate penalty score (only for due/overdue tasks)
-    penalty_score = calculate_penalty_score(task, config, effective_date)
+        # Calculate penalty score (only for due/overdue tasks)
+        penalty_score = calculate_penalty_score(task, config, effective_date)
 
     # Net score = XP + penalty avoided
     net_score = xp_score + penalty_score
@@ -1309,14 +1317,17 @@ def check_badges(
     if not badge_defs:
         return []
 
-    # Calculate current stats
+    # Calculate current stats (archived tasks count through their summary)
+    archive = user.archive_summary
     completed_tasks = [t for t in user.tasks if t.is_complete]
-    tasks_completed_count = len(completed_tasks)
+    tasks_completed_count = len(completed_tasks) + archive.completed_tasks
 
-    habits_completed_count = len([t for t in completed_tasks if t.is_habit])
+    habits_completed_count = (
+        len([t for t in completed_tasks if t.is_habit]) + archive.completed_habits
+    )
 
     # Find best streak across all habits
-    best_streak = 0
+    best_streak = archive.best_streak
     for task in user.tasks:
         if task.is_habit:
             best_streak = max(best_streak, task.streak_best, task.streak_current)
@@ -9,6 +9,7 @@ from datetime import date, datetime, timedelta
 from typing import Any
 from zoneinfo import ZoneInfo
 
+from motido.core.metrics import timed
 from motido.core.models import Difficulty, Duration, Priority, RecurrenceType, Task
 from motido.core.recurrence import create_next_habit_instance
 
@@ -227,22 +228,64 @@ def process_day(
             task.defer_until = None
 
     initial_xp: int = user.total_xp
-    apply_penalties(
-        user,
-        manager,
-        effective_date,
-        scoring_config,
-        user.tasks,
-        persist=persist,
-    )
+    with timed("penalties"):
+        apply_penalties(
+            user,
+            manager,
+            effective_date,
+            scoring_config,
+            user.tasks,
+            persist=persist,
+        )
     xp_change: int = user.total_xp - initial_xp
 
     # Process recurrences
-    _process_recurrences(user, effective_date)
+    with timed("recurrence"):
+        _process_recurrences(user, effective_date)
 
     return xp_change
 
 
+def advance_user_to(
+    user: Any,
+    manager: Any,
+    target_date: date,
+    scoring_config: Any,
+    on_day: Any = None,
+) -> int:
+    """
+    Process every day after user.last_processed_date up to target_date.
+
+    Changes are not persisted; the caller saves the user afterwards.
+
+    Args:
+        user: User object to advance
+        manager: DataManager passed through to penalty processing
+        target_date: Last date to process (inclusive)
+        scoring_config: Scoring configuration dict
+        on_day: Optional callback(days_processed, total_days) after each day
+
+    Returns:
+        int: Number of days processed
+    """
+    total_days = max(0, (target_date - user.last_processed_date).days)
+    days_processed = 0
+    while user.last_processed_date < target_date:
+        processing_date = user.last_processed_date + timedelta(days=1)
+        # Update date BEFORE penalties so all saves during apply_penalties have correct date
+        user.last_processed_date = processing_date
+        days_processed += 1
+
+        if not user.vacation_mode:
+            # Apply penalties and generate recurrences for the current day
+            process_day(user, manager, processing_date, scoring_config, persist=False)
+
+        if on_day is not None:
+            on_day(days_processed, total_days)
+
+    return days_processed
+
+
 def _process_recurrences(
     user: Any, effective_date: Any
 ) -> None:  # pylint: disable=too-many-locals
@@ -268,6 +311,10 @@ def _process_recurrences(
     pending_instances: set[tuple[str, Any]] = set()
     effective_datetime = datetime.combine(effective_date, datetime.min.time())
 
+    # Archived habit instances still exist; their keys are fetched only when
+    # a chain reaches a gap in the main tier
+    archived_instances: set[tuple[str, Any]] | None = None
+
     # --- Phase 1: FROM_DUE_DATE and STRICT tasks (chain from due_date) ---
     for task in user.tasks:
         if (
@@ -296,6 +343,14 @@ def _process_recurrences(
                 already_created = instance_key in existing_instances or (
                     instance_key in pending_instances
                 )
+                if not already_created and user.archive_summary.completed_habits:
+                    if archived_instances is None:
+                        archived_instances = {
+                            (t.title, t.due_date.date())
+                            for t in user.archived_tasks
+                            if t.is_habit and t.due_date
+                        }
+                    already_created = instance_key in archived_instances
 
                 if not already_created:
                     new_tasks.append(next_instance)
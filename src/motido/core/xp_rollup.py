@@ -0,0 +1,146 @@
+"""
+Rollups that keep long-lived accounts' XP logs small.
+
+Every completion, penalty and daily aggregate stays in User.xp_transactions
+forever, so the log grows with the account's age. A rollup compacts
+transactions older than a horizon into one daily_earned/daily_lost entry
+per game day, and those older than a longer horizon into one
+monthly_earned/monthly_lost entry per month. Amounts are summed, so
+User.total_xp and any XP totals over whole days (or months) are unchanged.
+Withdrawals are the user's own spending record and are always kept as is.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any
+
+from motido.core.models import XPTransaction
+
+DEFAULT_DAILY_ROLLUP_DAYS = 30
+DEFAULT_MONTHLY_ROLLUP_DAYS = 365
+
+# Sources that are never rolled up
+KEPT_SOURCES = frozenset({"withdrawal"})
+
+
+@dataclass(slots=True)
+class XPRollupResult:
+    """What a rollup did to the XP log."""
+
+    compacted: int = 0  # Transactions folded into aggregates
+    aggregates: int = 0  # Aggregate entries written (new or updated)
+
+
+def _game_day(transaction: XPTransaction) -> date:
+    return transaction.game_date or transaction.timestamp.date()
+
+
+def _group_aged(
+    transactions: list[XPTransaction], daily_cutoff: date, monthly_cutoff: date
+) -> tuple[list[XPTransaction], dict[tuple[str, date], list[XPTransaction]]]:
+    """
+    Split transactions into those kept as is and groups to aggregate.
+
+    Groups are keyed by (aggregate source, day), the day being the first of
+    the month for monthly aggregates.
+    """
+    kept: list[XPTransaction] = []
+    groups: dict[tuple[str, date], list[XPTransaction]] = {}
+    for transaction in transactions:
+        day = _game_day(transaction)
+        if transaction.source in KEPT_SOURCES or day >= daily_cutoff:
+            kept.append(transaction)
+            continue
+        sign = "earned" if transaction.amount >= 0 else "lost"
+        if day < monthly_cutoff:
+            key = (f"monthly_{sign}", day.replace(day=1))
+        else:
+            key = (f"daily_{sign}", day)
+        groups.setdefault(key, []).append(transaction)
+    return kept, groups
+
+
+def _aggregate(
+    source: Any, day: date, transactions: list[XPTransaction]
+) -> XPTransaction:
+    """Fold transactions into one entry, reusing an existing aggregate's ID."""
+    amount = sum(t.amount for t in transactions)
+    aggregate = next((t for t in transactions if t.source == source), None)
+    if aggregate is None:
+        aggregate = XPTransaction(
+            amount=amount, source=source, timestamp=transactions[0].timestamp
+        )
+    verb = "Earned" if amount >= 0 else "Lost"
+    when = f"in {day:%Y-%m}" if source.startswith("monthly") else f"on {day}"
+    aggregate.amount = amount
+    aggregate.timestamp = max(t.timestamp for t in transactions)
+    aggregate.task_id = None
+    aggregate.description = f"{verb} {abs(amount)} XP {when}"
+    aggregate.game_date = day
+    return aggregate
+
+
+def rollup_xp_transactions(
+    user: Any,
+    *,
+    daily_after_days: int = DEFAULT_DAILY_ROLLUP_DAYS,
+    monthly_after_days: int = DEFAULT_MONTHLY_ROLLUP_DAYS,
+    today: date | None = None,
+) -> XPRollupResult:
+    """
+    Compact a user's old XP transactions into daily and monthly aggregates.
+
+    Transactions whose game day is more than daily_after_days before today
+    become daily aggregates; those in whole months ending more than
+    monthly_after_days before today become monthly aggregates (dated the
+    first of the month). Earned and lost XP get separate entries. Running
+    the rollup again only touches newly aged transactions.
+
+    The caller saves the user; new and updated aggregates are marked dirty
+    for backends that upsert only changed transactions.
+
+    Args:
+        user: The User whose xp_transactions to compact.
+        daily_after_days: Age in days after which transactions become daily.
+        monthly_after_days: Age in days after which months become monthly.
+        today: The date the horizons are measured from (defaults to today).
+
+    Returns:
+        How many transactions were compacted into how many aggregates.
+
+    Raises:
+        ValueError: If daily_after_days is below 1 or monthly_after_days is
+            below daily_after_days.
+    """
+    if daily_after_days < 1:
+        raise ValueError("The daily rollup horizon must be at least 1 day.")
+    if monthly_after_days < daily_after_days:
+        raise ValueError(
+            "The monthly rollup horizon must not be shorter than the daily one."
+        )
+
+    today = today or date.today()
+    daily_cutoff = today - timedelta(days=daily_after_days)
+    # Only whole months are rolled up, so a month is never split in two
+    monthly_cutoff = (today - timedelta(days=monthly_after_days)).replace(day=1)
+
+    kept, groups = _group_aged(user.xp_transactions, daily_cutoff, monthly_cutoff)
+
+    result = XPRollupResult()
+    dirty_ids = getattr(user, "_dirty_xp_transaction_ids", None)
+    if dirty_ids is None:
+        dirty_ids = set()
+        setattr(user, "_dirty_xp_transaction_ids", dirty_ids)
+    for (source, day), transactions in groups.items():
+        if len(transactions) == 1 and transactions[0].source == source:
+            kept.append(transactions[0])
+            continue
+
+        aggregate = _aggregate(source, day, transactions)
+        kept.append(aggregate)
+        dirty_ids.add(aggregate.id)
+        result.compacted += len(transactions)
+        result.aggregates += 1
+
+    user.xp_transactions = sorted(kept, key=lambda t: t.timestamp)
+    return result
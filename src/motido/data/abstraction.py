@@ -4,14 +4,34 @@ Defines the abstract base class for data managers.
 Ensures all data backends adhere to a common interface.
 """
 
+import heapq
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from datetime import date
 
-from motido.core.models import User
+from motido.core.models import ArchiveSummary, Task, TaskCounts, User, XPTransaction
 
 # Define a default username for the single-user scenario for now
 DEFAULT_USERNAME = "default_user"
 
 
+def newest_xp_transactions(
+    transactions: Iterable[XPTransaction], *, limit: int, offset: int = 0
+) -> list[XPTransaction]:
+    """One page of an in-memory XP log, newest first, without sorting all of it."""
+    return heapq.nlargest(offset + limit, transactions, key=lambda t: t.timestamp)[
+        offset:
+    ]
+
+
+def _series_ids(task: Task) -> list[str]:
+    """The habits whose per-habit day counts include task (see daily_summary)."""
+    ids = [task.id] if task.is_habit else []
+    if task.parent_habit_id:
+        ids.append(task.parent_habit_id)
+    return ids
+
+
 class DataManager(ABC):
     """
     Abstract Base Class for data persistence operations.
@@ -38,6 +58,36 @@ class DataManager(ABC):
         """
         # Placeholder for future sync: Check for remote changes before loading
 
+    def load_active_user(self, username: str = DEFAULT_USERNAME) -> User | None:
+        """
+        Loads a user with only their active tasks in User.tasks.
+
+        The active set is every incomplete task, habit roots whose recurrence
+        has not ended and the latest instance of each habit series. Everything
+        else stays in storage behind User.inactive_tasks until iterated, and
+        save_user leaves it untouched unless it was fetched.
+
+        Backends without an active-set query load everything eagerly.
+
+        Args:
+            username: The username of the user to load. Defaults to DEFAULT_USERNAME.
+
+        Returns:
+            A User object if found, otherwise None.
+        """
+        return self.load_user(username)
+
+    def list_usernames(self) -> list[str]:
+        """
+        Lists the usernames of every stored user, sorted.
+
+        Returns:
+            The usernames.
+        """
+        raise NotImplementedError(
+            f"The {self.backend_type()} backend cannot list its users"
+        )
+
     @abstractmethod
     def save_user(self, user: User) -> None:
         """
@@ -48,6 +98,242 @@ class DataManager(ABC):
         """
         # Placeholder for future sync: Push changes to remote after saving
 
+    def archive_tasks(
+        self, user: User, tasks: list[Task], *, replace: bool = False
+    ) -> None:
+        """
+        Moves tasks to the archive tier and saves the user.
+
+        The caller has already removed tasks from the user and folded them
+        into user.archive_summary (see motido.core.archive). The archived
+        copies are written before the user is saved, so a failure in between
+        leaves a task in both tiers rather than in neither.
+
+        Args:
+            user: The user the tasks were removed from.
+            tasks: The tasks to archive.
+            replace: Whether tasks replace the user's whole archive, as when
+                restoring a backup, instead of joining it.
+        """
+        raise NotImplementedError(
+            f"The {self.backend_type()} backend has no archive tier"
+        )
+
+    def load_archived_tasks(self, username: str = DEFAULT_USERNAME) -> list[Task]:
+        """
+        Reads a user's archived tasks (backends without an archive have none).
+
+        Args:
+            username: The username whose archive to read.
+
+        Returns:
+            The archived Task objects.
+        """
+        del username
+        return []
+
+    def load_xp_log(
+        self, username: str, *, limit: int, offset: int = 0
+    ) -> list[XPTransaction]:
+        """
+        Reads one page of a user's XP log, newest first.
+
+        Takes a username rather than a User so callers need not load the
+        user's tasks first. Backends storing XP transactions in a database
+        page there; the default loads the user and picks the page from
+        user.xp_transactions (see newest_xp_transactions).
+
+        Args:
+            username: The user whose XP log to read.
+            limit: The maximum number of transactions to return.
+            offset: How many of the newest transactions to skip.
+
+        Returns:
+            The XPTransaction objects of the page (none for unknown users).
+        """
+        user = self.load_user(username)
+        if user is None:
+            return []
+        return newest_xp_transactions(user.xp_transactions, limit=limit, offset=offset)
+
+    def tagged_task_ids(self, user: User, tag: str) -> set[str]:
+        """
+        Finds the IDs of a user's tasks carrying a tag.
+
+        Database backends answer from their indexed tag table, i.e. for the
+        user as last saved; the default scans the user's tasks.
+
+        Args:
+            user: The user whose tasks to search.
+            tag: The tag to look for.
+
+        Returns:
+            The IDs of the tagged tasks, archived tasks excluded.
+        """
+        return {task.id for task in user.all_tasks() if tag in task.tags}
+
+    def dependent_task_ids(self, user: User, task_id: str) -> set[str]:
+        """
+        Finds the IDs of a user's tasks that depend on a task.
+
+        Database backends answer from their indexed dependency table, i.e.
+        for the user as last saved; the default scans the user's tasks.
+
+        Args:
+            user: The user whose tasks to search.
+            task_id: The full ID of the task depended on.
+
+        Returns:
+            The IDs of the tasks listing task_id as a dependency.
+        """
+        return {task.id for task in user.all_tasks() if task_id in task.dependencies}
+
+    def blocked_task_ids(self, user: User) -> set[str]:
+        """
+        Finds the IDs of a user's incomplete tasks waiting on another one.
+
+        A task is blocked while one of its dependencies is an incomplete
+        task; dependencies that no longer exist do not block. Database
+        backends answer with an indexed join, i.e. for the user as last
+        saved; the default only looks at the active tasks in User.tasks,
+        which is where incomplete tasks always are.
+
+        Args:
+            user: The user whose tasks to check.
+
+        Returns:
+            The IDs of the blocked tasks.
+        """
+        incomplete = {task.id for task in user.tasks if not task.is_complete}
+        return {
+            task.id
+            for task in user.tasks
+            if task.id in incomplete
+            and any(dep_id in incomplete for dep_id in task.dependencies)
+        }
+
+    def task_counts(self, user: User) -> TaskCounts:
+        """
+        Totals a user's main-tier tasks for the stats view.
+
+        Database backends answer with one aggregate query and the JSON
+        backend from a summary it keeps up to date on save, i.e. for the
+        user as last saved; the default scans the user's tasks.
+
+        Args:
+            user: The user whose tasks to count.
+
+        Returns:
+            The totals, archived tasks excluded (see User.archive_summary).
+        """
+        counts = TaskCounts()
+        for task in user.all_tasks():
+            counts.add(task)
+        return counts
+
+    def completion_counts_by_day(
+        self, username: str, start: date, end: date, habit_id: str | None = None
+    ) -> dict[date, tuple[int, int]]:
+        """
+        Counts a user's tasks due on each day from start to end inclusive.
+
+        Without habit_id, every main-tier task counts and archived tasks
+        are left to the archive summary (see load_archive_summary). With
+        habit_id, only that habit and the instances naming it as parent
+        count, archived ones included, since the summary has no per-habit
+        breakdown.
+
+        Takes a username rather than a User so callers need not load the
+        user's tasks first. Database backends read a daily_summary table
+        kept up to date as task rows are written, and the JSON backend a
+        summary it rewrites on save, so the cost grows with the days asked
+        for, not the tasks; all answer for the user as last saved. The
+        default loads the user and scans their tasks.
+
+        Args:
+            username: The user whose tasks to count.
+            start: The first day to count.
+            end: The last day to count.
+            habit_id: The habit whose instances to count, if any.
+
+        Returns:
+            (completed, total) task counts by due date, for days with tasks
+            (none for unknown users).
+        """
+        user = self.load_user(username)
+        if user is None:
+            return {}
+        tasks = user.all_tasks()
+        if habit_id:
+            tasks = [*user.inactive_tasks, *user.tasks_with_archive_since(start)]
+
+        counts: dict[date, tuple[int, int]] = {}
+        for task in tasks:
+            if task.due_date is None:
+                continue
+            if habit_id and habit_id not in _series_ids(task):
+                continue
+            day = task.due_date.date()
+            if start <= day <= end:
+                completed, total = counts.get(day, (0, 0))
+                counts[day] = (completed + task.is_complete, total + 1)
+        return counts
+
+    def load_archive_summary(self, username: str) -> ArchiveSummary:
+        """
+        Reads a user's archive summary (User.archive_summary) as last saved.
+
+        Backends storing it next to the user row read just that; the
+        default loads the user.
+
+        Args:
+            username: The user whose summary to read.
+
+        Returns:
+            The summary (empty for unknown users).
+        """
+        user = self.load_user(username)
+        return user.archive_summary if user is not None else ArchiveSummary()
+
+    def rebuild_daily_summary(self, username: str = DEFAULT_USERNAME) -> int:
+        """
+        Recomputes a user's stored daily completion summary from their tasks.
+
+        The summary is kept up to date on write; rebuilding repairs one
+        that drifted, e.g. after tasks were edited outside motido. Backends
+        without a stored summary have nothing to rebuild.
+
+        Args:
+            username: The user whose summary to rebuild.
+
+        Returns:
+            The number of (day, series) counts stored.
+        """
+        del username
+        return 0
+
+    def explain_queries(self, username: str = DEFAULT_USERNAME) -> dict[str, list[str]]:
+        """
+        Shows the database's query plan for each main access pattern.
+
+        Backends without a query planner have no plans to show.
+
+        Args:
+            username: The user whose queries to plan.
+
+        Returns:
+            The plan's lines, by access pattern name.
+        """
+        del username
+        return {}
+
+    def close(self) -> None:
+        """
+        Releases the backend's open connections, e.g. on shutdown.
+
+        The default holds none.
+        """
+
     @abstractmethod
     def backend_type(self) -> str:
         """Returns the type of the backend (e.g., 'json', 'db')."""
@@ -5,13 +5,14 @@ Factory function to create the appropriate DataManager instance
 based on the application's configuration.
 """
 
+import logging
 import os
 from typing import Optional
 
 from .abstraction import DataManager
 from .config import load_config
-from .database_manager import DatabaseDataManager
-from .json_manager import JsonDataManager
+
+logger = logging.getLogger(__name__)
 
 # Singleton instance cache - mutable module-level state (not constants)
 # pylint: disable=invalid-name
@@ -20,6 +21,10 @@ _backend_message_shown = False  # Track if backend type message was shown
 # pylint: enable=invalid-name
 
 
+# Backend types of config.json's "backend" setting
+BACKEND_TYPES = ("json", "db", "postgres")
+
+
 def reset_data_manager() -> None:
     """
     Reset the singleton data manager instance.
@@ -33,6 +38,12 @@ def reset_data_manager() -> None:
     _backend_message_shown = False
 
 
+def close_data_manager() -> None:
+    """Closes the cached data manager's connections, if one was created."""
+    if _data_manager_instance is not None:
+        _data_manager_instance.close()
+
+
 def get_data_manager() -> DataManager:
     """
     Reads the configuration and returns an instance of the
@@ -63,7 +74,7 @@ def get_data_manager() -> DataManager:
     database_url = os.getenv("DATABASE_URL")
     if database_url:
         if not _backend_message_shown:
-            print("Using PostgreSQL backend (DATABASE_URL detected).")
+            logger.info("Using PostgreSQL backend (DATABASE_URL detected).")
             _backend_message_shown = True
         # Import here to avoid requiring psycopg2 when not needed
         from .postgres_manager import PostgresDataManager
@@ -77,20 +88,25 @@ def get_data_manager() -> DataManager:
 
     if backend_type == "json":
         if not _backend_message_shown:
-            print("Using JSON backend.")
+            logger.info("Using JSON backend.")
             _backend_message_shown = True
+        # Backends are imported on demand so each CLI run only loads its own
+        from .json_manager import JsonDataManager
+
         _data_manager_instance = JsonDataManager()
         return _data_manager_instance
     if backend_type == "db":
         if not _backend_message_shown:
-            print("Using Database (SQLite) backend.")
+            logger.info("Using Database (SQLite) backend.")
             _backend_message_shown = True
+        from .database_manager import DatabaseDataManager
+
         _data_manager_instance = DatabaseDataManager()
         return _data_manager_instance
     if backend_type == "postgres":
         # Allow explicit postgres config even without DATABASE_URL
         if not _backend_message_shown:
-            print("Using PostgreSQL backend (config).")
+            logger.info("Using PostgreSQL backend (config).")
             _backend_message_shown = True
         from .postgres_manager import PostgresDataManager
 
@@ -99,3 +115,35 @@ def get_data_manager() -> DataManager:
 
     # Should ideally not happen due to config loading validation, but good practice
     raise ValueError(f"Unknown backend type configured: '{backend_type}'")
+
+
+def create_data_manager(backend_type: str) -> DataManager:
+    """
+    Creates a new DataManager of the given type, ignoring the configuration.
+
+    Unlike get_data_manager the instance is not cached, so tools such as
+    `motido migrate` can hold two backends at once. The postgres backend
+    still reads DATABASE_URL.
+
+    Args:
+        backend_type: One of BACKEND_TYPES.
+
+    Returns:
+        An uninitialized instance of that backend.
+
+    Raises:
+        ValueError: If the backend type is unknown.
+    """
+    if backend_type == "json":
+        from .json_manager import JsonDataManager
+
+        return JsonDataManager()
+    if backend_type == "db":
+        from .database_manager import DatabaseDataManager
+
+        return DatabaseDataManager()
+    if backend_type == "postgres":
+        from .postgres_manager import PostgresDataManager
+
+        return PostgresDataManager()
+    raise ValueError(f"Unknown backend type: '{backend_type}'")
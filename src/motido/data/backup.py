@@ -0,0 +1,344 @@
+# data/backup.py
+"""
+Backup serialization shared by the JSON export and the streaming NDJSON
+export/import.
+
+The JSON backup is a single object described by docs/motido-backup-schema.json.
+The NDJSON backup carries the same data as one record per line:
+
+    {"type": "header", "format": "motido-backup-ndjson", "version": 1}
+    {"type": "user", "data": {"total_xp": ..., "archive_summary": ...}}
+    {"type": "task", "data": {...}}            # one per task
+    {"type": "archived_task", "data": {...}}   # one per archived task
+    {"type": "xp_transaction", "data": {...}}  # one per transaction
+    {"type": "badge" | "tag" | "project", "data": {...}}
+
+Each record's data is exactly one item of the matching array in the JSON
+backup, so either format can be converted to the other without loss.
+
+Backups carry the archive tier (archived tasks and the archive summary the
+stats and badges count), and restoring one replaces the stored archive
+with it; see save_imported_user.
+"""
+
+import json
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from motido.core.models import (
+    Badge,
+    LazyTasks,
+    Project,
+    Tag,
+    Task,
+    User,
+    XPTransaction,
+)
+
+from .abstraction import DEFAULT_USERNAME, DataManager
+from .json_manager import JsonDataManager
+
+NDJSON_FORMAT = "motido-backup-ndjson"
+NDJSON_VERSION = 1
+
+# NDJSON record type -> JSON backup array it belongs to
+RECORD_SECTIONS = {
+    "task": "tasks",
+    "archived_task": "archived_tasks",
+    "xp_transaction": "xp_transactions",
+    "badge": "badges",
+    "tag": "defined_tags",
+    "project": "defined_projects",
+}
+
+# User-level fields carried by the "user" record
+USER_FIELDS = (
+    "total_xp",
+    "last_processed_date",
+    "vacation_mode",
+    "timezone",
+    "archive_summary",
+)
+
+# Records deserialized per batch while streaming an import
+IMPORT_CHUNK_SIZE = 500
+
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _format_datetime(value: Any) -> str | None:
+    return value.strftime(DATETIME_FORMAT) if value else None
+
+
+def serialize_task(task: Task) -> dict[str, Any]:
+    """Serialize a task in the backup format (matches JsonDataManager)."""
+    return {
+        "id": task.id,
+        "title": task.title,
+        "text_description": task.text_description,
+        "priority": task.priority.value,
+        "difficulty": task.difficulty.value,
+        "duration": task.duration.value,
+        "is_complete": task.is_complete,
+        "creation_date": _format_datetime(task.creation_date),
+        "due_date": _format_datetime(task.due_date),
+        "start_date": _format_datetime(task.start_date),
+        "icon": task.icon,
+        "tags": task.tags,
+        "project": task.project,
+        "subtasks": task.subtasks,
+        "dependencies": task.dependencies,
+        "history": task.history,
+        "is_habit": task.is_habit,
+        "recurrence_rule": task.recurrence_rule,
+        "recurrence_type": (
+            task.recurrence_type.value if task.recurrence_type else None
+        ),
+        "streak_current": task.streak_current,
+        "streak_best": task.streak_best,
+        "parent_habit_id": task.parent_habit_id,
+        "recurrence_ended_at": _format_datetime(task.recurrence_ended_at),
+    }
+
+
+def serialize_xp_transaction(trans: XPTransaction) -> dict[str, Any]:
+    """Serialize an XP transaction in the backup format."""
+    return {
+        "id": trans.id,
+        "amount": trans.amount,
+        "source": trans.source,
+        "timestamp": trans.timestamp.strftime(DATETIME_FORMAT),
+        "task_id": trans.task_id,
+        "description": trans.description,
+    }
+
+
+def serialize_badge(badge: Badge) -> dict[str, Any]:
+    """Serialize a badge in the backup format."""
+    return {
+        "id": badge.id,
+        "name": badge.name,
+        "description": badge.description,
+        "glyph": badge.glyph,
+        "earned_date": _format_datetime(badge.earned_date),
+    }
+
+
+def serialize_tag(tag: Tag) -> dict[str, Any]:
+    """Serialize a tag definition in the backup format."""
+    return {
+        "id": tag.id,
+        "name": tag.name,
+        "color": tag.color,
+        "multiplier": tag.multiplier,
+    }
+
+
+def serialize_project(project: Project) -> dict[str, Any]:
+    """Serialize a project definition in the backup format."""
+    return {
+        "id": project.id,
+        "name": project.name,
+        "color": project.color,
+        "multiplier": project.multiplier,
+    }
+
+
+def serialize_user_fields(user: User) -> dict[str, Any]:
+    """Serialize the user-level (non-list) backup fields."""
+    return {
+        "total_xp": user.total_xp,
+        "last_processed_date": user.last_processed_date.isoformat(),
+        "vacation_mode": user.vacation_mode,
+        "timezone": user.timezone,
+    }
+
+
+def build_backup(user: User) -> dict[str, Any]:
+    """
+    Build the complete JSON backup for a user.
+
+    username/password_hash are excluded; import uses the current user.
+    """
+    backup = serialize_user_fields(user)
+    backup["archive_summary"] = user.archive_summary.to_dict()
+    backup["tasks"] = [serialize_task(task) for task in user.tasks]
+    backup["archived_tasks"] = [serialize_task(task) for task in user.archived_tasks]
+    backup["xp_transactions"] = [
+        serialize_xp_transaction(trans) for trans in user.xp_transactions
+    ]
+    backup["badges"] = [serialize_badge(badge) for badge in user.badges]
+    backup["defined_tags"] = [serialize_tag(tag) for tag in user.defined_tags]
+    backup["defined_projects"] = [
+        serialize_project(proj) for proj in user.defined_projects
+    ]
+    return backup
+
+
+def iter_backup_records(user: User) -> Iterator[dict[str, Any]]:
+    """Yield the NDJSON backup records for a user, one entity at a time."""
+    yield {"type": "header", "format": NDJSON_FORMAT, "version": NDJSON_VERSION}
+    yield {
+        "type": "user",
+        "data": {
+            **serialize_user_fields(user),
+            "archive_summary": user.archive_summary.to_dict(),
+        },
+    }
+    for task in user.tasks:
+        yield {"type": "task", "data": serialize_task(task)}
+    for task in user.archived_tasks:
+        yield {"type": "archived_task", "data": serialize_task(task)}
+    for trans in user.xp_transactions:
+        yield {"type": "xp_transaction", "data": serialize_xp_transaction(trans)}
+    for badge in user.badges:
+        yield {"type": "badge", "data": serialize_badge(badge)}
+    for tag in user.defined_tags:
+        yield {"type": "tag", "data": serialize_tag(tag)}
+    for proj in user.defined_projects:
+        yield {"type": "project", "data": serialize_project(proj)}
+
+
+def save_imported_user(manager: DataManager, user: User) -> None:
+    """
+    Replace the stored user with one rebuilt from a backup.
+
+    The stored archive tier is replaced by the backup's archived tasks
+    (none for backups made before they were exported), so it always agrees
+    with the restored archive_summary. Backends without an archive tier
+    can only restore backups without archived tasks.
+    """
+    archived = list(user.archived_tasks)
+    try:
+        manager.archive_tasks(user, archived, replace=True)
+    except NotImplementedError:
+        if archived:
+            raise
+        manager.save_user(user)
+
+
+def iter_backup_ndjson(user: User) -> Iterator[str]:
+    """Yield the NDJSON backup for a user as newline-terminated lines."""
+    for record in iter_backup_records(user):
+        yield json.dumps(record) + "\n"
+
+
+class NdjsonBackupReader:  # pylint: disable=too-many-instance-attributes
+    """
+    Incrementally rebuild a User from NDJSON backup lines.
+
+    Records are validated and deserialized in chunks of IMPORT_CHUNK_SIZE, so
+    only model objects (never the raw upload) are held for the whole import.
+    Errors raise ValueError naming the offending line.
+    """
+
+    def __init__(
+        self, username: str = DEFAULT_USERNAME, chunk_size: int = IMPORT_CHUNK_SIZE
+    ) -> None:
+        self._deserializer = JsonDataManager()
+        self._chunk_size = chunk_size
+        self._username = username
+        self._user_fields: dict[str, Any] = {}
+        self._pending: dict[str, list[dict[str, Any]]] = {
+            section: [] for section in RECORD_SECTIONS.values()
+        }
+        self._pending_count = 0
+        self._loaded: dict[str, list[Any]] = {
+            section: [] for section in RECORD_SECTIONS.values()
+        }
+        self._line_number = 0
+        self._seen_header = False
+
+    def feed(self, line: str | bytes) -> None:
+        """Consume one NDJSON line (blank lines are ignored)."""
+        self._line_number += 1
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line.strip():
+            return
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Line {self._line_number}: invalid JSON: {e}") from e
+        if not isinstance(record, dict):
+            raise ValueError(f"Line {self._line_number}: expected a JSON object")
+
+        record_type = record.get("type")
+        if not self._seen_header:
+            if record_type != "header" or record.get("format") != NDJSON_FORMAT:
+                raise ValueError(
+                    f"Line {self._line_number}: missing {NDJSON_FORMAT} header"
+                )
+            if record.get("version") != NDJSON_VERSION:
+                raise ValueError(
+                    f"Line {self._line_number}: unsupported backup version "
+                    f"{record.get('version')}"
+                )
+            self._seen_header = True
+            return
+
+        data = record.get("data")
+        if not isinstance(data, dict):
+            raise ValueError(f"Line {self._line_number}: record data must be an object")
+        if record_type == "user":
+            self._user_fields.update(
+                {key: data[key] for key in USER_FIELDS if key in data}
+            )
+            return
+        section = RECORD_SECTIONS.get(str(record_type))
+        if section is None:
+            raise ValueError(
+                f"Line {self._line_number}: unknown record type '{record_type}'"
+            )
+        self._pending[section].append(data)
+        self._pending_count += 1
+        if self._pending_count >= self._chunk_size:
+            self._flush()
+
+    def feed_lines(self, lines: Iterable[str | bytes]) -> None:
+        """Consume several NDJSON lines."""
+        for line in lines:
+            self.feed(line)
+
+    def _flush(self) -> None:
+        """Deserialize the pending chunk of records into model objects."""
+        if not self._pending_count:
+            return
+        try:
+            chunk_user = self._deserializer.deserialize_user_data(
+                self._pending, self._username
+            )
+        except ValueError as e:
+            raise ValueError(
+                f"Invalid record before line {self._line_number}: {e}"
+            ) from e
+        self._loaded["tasks"].extend(chunk_user.tasks)
+        self._loaded["archived_tasks"].extend(chunk_user.archived_tasks)
+        self._loaded["xp_transactions"].extend(chunk_user.xp_transactions)
+        self._loaded["badges"].extend(chunk_user.badges)
+        self._loaded["defined_tags"].extend(chunk_user.defined_tags)
+        self._loaded["defined_projects"].extend(chunk_user.defined_projects)
+        for records in self._pending.values():
+            records.clear()
+        self._pending_count = 0
+
+    @property
+    def record_count(self) -> int:
+        """Number of entity records deserialized so far (excluding pending)."""
+        return sum(len(items) for items in self._loaded.values())
+
+    def finish(self) -> User:
+        """Deserialize any remaining records and return the rebuilt User."""
+        if not self._seen_header:
+            raise ValueError("Empty backup: missing header record")
+        self._flush()
+        user = self._deserializer.deserialize_user_data(
+            self._user_fields, self._username
+        )
+        user.tasks = self._loaded["tasks"]
+        user.archived_tasks = LazyTasks.of(self._loaded["archived_tasks"], frozenset())
+        user.xp_transactions = self._loaded["xp_transactions"]
+        user.badges = self._loaded["badges"]
+        user.defined_tags = self._loaded["defined_tags"]
+        user.defined_projects = self._loaded["defined_projects"]
+        return user
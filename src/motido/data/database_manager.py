@@ -1,23 +1,34 @@
 # data/database_manager.py
+# pylint: disable=too-many-lines
 """
 Implementation of the DataManager interface using SQLite database storage.
 """
 
 import json
+import logging
 import os
+import re
 import sqlite3
-from datetime import date, datetime
+import threading
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
 from typing import Optional
 
+from motido.core.metrics import ROWS_UPSERTED, get_metrics, timed
 from motido.core.models import (
+    ArchiveSummary,
     Difficulty,
     Duration,
+    LazyTasks,
     Priority,
     Project,
     RecurrenceType,
     Tag,
     Task,
+    TaskCounts,
     User,
+    XPTransaction,
 )
 from motido.core.utils import (
     parse_difficulty_safely,
@@ -27,16 +38,258 @@ from motido.core.utils import (
 
 from .abstraction import DEFAULT_USERNAME, DataManager
 from .config import get_config_path  # Needed to place DB file near config
+from .job_store import SqliteJobStore
+
+logger = logging.getLogger(__name__)
 
 DB_NAME = "motido.db"
 
+# Pragmas applied to each new connection. Override them with
+# MOTIDO_SQLITE_PRAGMAS, e.g. "mmap_size=0,synchronous=full", or per manager.
+PRAGMAS_ENV = "MOTIDO_SQLITE_PRAGMAS"
+DEFAULT_PRAGMAS = {
+    # Readers don't block the writer, and commits append to the log
+    "journal_mode": "wal",
+    # Safe with WAL: a power loss may only drop the latest commits
+    "synchronous": "normal",
+    "cache_size": "-16000",  # KiB when negative: 16 MB of page cache
+    "mmap_size": str(256 * 1024 * 1024),  # Read pages through a memory map
+    "temp_store": "memory",
+    "busy_timeout": "5000",  # ms to wait for another process's write lock
+}
+_PRAGMA_NAME = re.compile(r"[a-z_]+")
+_PRAGMA_VALUE = re.compile(r"-?\w+")
+
+TASK_COLUMNS = (
+    "id, title, text_description, priority, difficulty, duration, "
+    "is_complete, creation_date, due_date, start_date, icon, tags, "
+    "project, subtasks, dependencies, history, is_habit, recurrence_rule, "
+    "recurrence_type, streak_current, streak_best, parent_habit_id, "
+    "recurrence_ended_at, defer_until"
+)
+
+# TASK_COLUMNS for the tasks table, whose tags, subtasks and dependencies
+# live in the task_tags, task_subtasks and task_dependencies tables. They are
+# read back as JSON arrays, falling back to the JSON columns a row written
+# before those tables existed still has.
+TASK_SELECT_COLUMNS = (
+    "id, title, text_description, priority, difficulty, duration, "
+    "is_complete, creation_date, due_date, start_date, icon, "
+    "COALESCE(NULLIF((SELECT json_group_array(tag) FROM ("
+    "SELECT tag FROM task_tags WHERE task_id = tasks.id ORDER BY position"
+    ")), '[]'), tags) AS tags, "
+    "project, "
+    "COALESCE(NULLIF((SELECT json_group_array(json_object("
+    "'text', text, 'complete', json(CASE WHEN complete THEN 'true' ELSE 'false' END)"
+    ")) FROM ("
+    "SELECT text, complete FROM task_subtasks WHERE task_id = tasks.id "
+    "ORDER BY position"
+    ")), '[]'), subtasks) AS subtasks, "
+    "COALESCE(NULLIF((SELECT json_group_array(depends_on_id) FROM ("
+    "SELECT depends_on_id FROM task_dependencies WHERE task_id = tasks.id "
+    "ORDER BY position"
+    ")), '[]'), dependencies) AS dependencies, "
+    "history, is_habit, recurrence_rule, "
+    "recurrence_type, streak_current, streak_best, parent_habit_id, "
+    "recurrence_ended_at, defer_until"
+)
+
+# Takes the values of _task_row; format with the table and the INSERT verb
+TASK_INSERT_SQL = (
+    "{insert} INTO {table} (id, title, text_description, priority, difficulty, "
+    "duration, is_complete, creation_date, due_date, start_date, "
+    "icon, tags, project, subtasks, dependencies, history, user_username, "
+    "is_habit, recurrence_rule, recurrence_type, streak_current, streak_best, "
+    "parent_habit_id, recurrence_ended_at, defer_until) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+# Rows an active-set load reads: incomplete tasks, plus the root and latest
+# instance (no child names it as parent) of every habit series not ended.
+# Takes the username parameter once more, after the main query's.
+ACTIVE_TASK_CONDITION = """(
+    is_complete = 0
+    OR (
+        is_habit = 1
+        AND recurrence_ended_at IS NULL
+        AND (
+            parent_habit_id IS NULL
+            OR id NOT IN (
+                SELECT parent_habit_id FROM tasks
+                WHERE user_username = ? AND parent_habit_id IS NOT NULL
+            )
+        )
+    )
+)"""
+
+
+def _parse_pragmas(spec: str) -> dict[str, str]:
+    """Parses "name=value,..." pragma overrides, skipping malformed entries."""
+    pragmas: dict[str, str] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, value = item.partition("=")
+        name, value = name.strip().lower(), value.strip()
+        if _PRAGMA_NAME.fullmatch(name) and _PRAGMA_VALUE.fullmatch(value):
+            pragmas[name] = value
+        else:
+            logger.warning(
+                "Ignoring invalid SQLite pragma '%s' in %s.", item, PRAGMAS_ENV
+            )
+    return pragmas
+
+
+# Secondary indexes serving the access patterns of explain_queries
+TASK_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_tasks_user_complete_due "
+    "ON tasks(user_username, is_complete, due_date)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_user_parent_habit "
+    "ON tasks(user_username, parent_habit_id)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_user_habit "
+    "ON tasks(user_username, is_habit)",
+)
+
+TAGGED_TASKS_SQL = "SELECT task_id FROM task_tags WHERE user_username = ? AND tag = ?"
+DEPENDENT_TASKS_SQL = (
+    "SELECT task_id FROM task_dependencies "
+    "WHERE user_username = ? AND depends_on_id = ?"
+)
+BLOCKED_TASKS_SQL = """
+    SELECT DISTINCT dep.task_id
+    FROM task_dependencies AS dep
+    JOIN tasks AS waiting ON waiting.id = dep.task_id
+    JOIN tasks AS needed ON needed.id = dep.depends_on_id
+    WHERE dep.user_username = ?
+        AND waiting.is_complete = 0
+        AND needed.is_complete = 0
+        AND needed.user_username = dep.user_username
+"""
+
+# Habit series roots, as counted by TaskCounts
+HABIT_ROOT_CONDITION = "is_habit AND NULLIF(parent_habit_id, '') IS NULL"
+TASK_COUNTS_SQL = f"""
+    SELECT
+        COUNT(*) AS total,
+        COUNT(*) FILTER (WHERE is_complete) AS completed,
+        COUNT(*) FILTER (WHERE {HABIT_ROOT_CONDITION}) AS habits,
+        MAX(streak_current) FILTER (WHERE {HABIT_ROOT_CONDITION}) AS current_streak,
+        MAX(streak_best) FILTER (WHERE {HABIT_ROOT_CONDITION}) AS best_streak
+    FROM tasks
+    WHERE user_username = ?
+"""
+# Per-day task counts: habit_id '' counts every task in the tasks table by
+# due day; a habit's ID counts the habit and the instances naming it as
+# parent, archived ones included. save_user and archive_tasks keep it up to
+# date by subtracting the counts of the rows they replace and adding those
+# of the rows they write.
+DAILY_SUMMARY_TABLE = """
+    CREATE TABLE IF NOT EXISTS daily_summary (
+        user_username TEXT NOT NULL,
+        habit_id TEXT NOT NULL,
+        day TEXT NOT NULL,
+        completed INTEGER NOT NULL DEFAULT 0,
+        total INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_username, habit_id, day)
+    ) WITHOUT ROWID
+"""
+
+
+def _materialized_hint(version: tuple[int, ...]) -> str:
+    """
+    Returns the CTE hint that computes a CTE once for all its references.
+
+    AS MATERIALIZED needs SQLite 3.35; older versions get a plain CTE.
+    """
+    return "MATERIALIZED " if version >= (3, 35) else ""
+
+
+MATERIALIZED = _materialized_hint(sqlite3.sqlite_version_info)
+
+
+def _summary_change_sql(table: str, by_id: bool) -> str:
+    """
+    Adds the counts of a user's rows of table to daily_summary.
+
+    Takes :username, :sign (1 to add, -1 to subtract) and, if by_id, :ids
+    (a JSON array of the task IDs to count, looked up by primary key).
+    """
+    source = f"{table} WHERE user_username = :username"
+    if by_id:
+        source = (
+            f"json_each(:ids) AS picked CROSS JOIN {table} "
+            f"ON {table}.id = picked.value WHERE user_username = :username"
+        )
+    series = [
+        "SELECT id AS habit_id, due_date, is_complete FROM counted WHERE is_habit",
+        "SELECT parent_habit_id, due_date, is_complete FROM counted "
+        "WHERE NULLIF(parent_habit_id, '') IS NOT NULL",
+    ]
+    if table == "tasks":
+        series.insert(0, "SELECT '' AS habit_id, due_date, is_complete FROM counted")
+    return f"""
+        WITH counted AS {MATERIALIZED}(
+            SELECT {table}.id, is_habit, parent_habit_id, due_date, is_complete
+            FROM {source} AND due_date IS NOT NULL
+        )
+        INSERT INTO daily_summary (user_username, habit_id, day, completed, total)
+        SELECT :username, habit_id, substr(due_date, 1, 10) AS day,
+            :sign * SUM(is_complete), :sign * COUNT(*)
+        FROM ({" UNION ALL ".join(series)})
+        WHERE TRUE
+        GROUP BY habit_id, day
+        ON CONFLICT (user_username, habit_id, day) DO UPDATE SET
+            completed = completed + excluded.completed,
+            total = total + excluded.total
+    """
+
+
+DAILY_SUMMARY_CHANGE_SQL = {
+    (table, by_id): _summary_change_sql(table, by_id)
+    for table in ("tasks", "archived_tasks")
+    for by_id in (False, True)
+}
+# What a tasks row counts towards in daily_summary (see _summary_key)
+_SUMMARY_KEY_COLUMNS = (
+    "tasks.id, substr(due_date, 1, 10), is_complete, is_habit, parent_habit_id"
+)
+DAILY_SUMMARY_KEYS_SQL = f"""
+    SELECT {_SUMMARY_KEY_COLUMNS} FROM tasks WHERE user_username = :username
+"""
+DAILY_SUMMARY_KEYS_BY_ID_SQL = f"""
+    SELECT {_SUMMARY_KEY_COLUMNS}
+    FROM json_each(:ids) AS picked CROSS JOIN tasks ON tasks.id = picked.value
+    WHERE user_username = :username
+"""
+DAILY_SUMMARY_PRUNE_SQL = (
+    "DELETE FROM daily_summary WHERE user_username = ? AND total = 0"
+)
+DAILY_SUMMARY_SQL = """
+    SELECT day, completed, total FROM daily_summary
+    WHERE user_username = ? AND habit_id = ? AND day >= ? AND day <= ?
+"""
+
 
 class DatabaseDataManager(DataManager):
     """Manages data persistence using an SQLite database."""
 
-    def __init__(self) -> None:
-        """Initializes the Database data manager."""
+    def __init__(self, pragmas: Mapping[str, str] | None = None) -> None:
+        """
+        Initializes the Database data manager.
+
+        Args:
+            pragmas: Pragmas overriding DEFAULT_PRAGMAS and those set with
+                the MOTIDO_SQLITE_PRAGMAS environment variable.
+        """
         self._db_path = self._get_db_path()
+        self._pragmas = {
+            **DEFAULT_PRAGMAS,
+            **_parse_pragmas(os.getenv(PRAGMAS_ENV, "")),
+            **(pragmas or {}),
+        }
+        # One long-lived connection per thread ID (a connection is only
+        # used by the thread that opened it), kept so close() reaches all
+        self._connections: dict[int, sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
+        self._initialized = False
         # Initialize connection and cursor attributes for _connect/_close methods
         self.conn: Optional[sqlite3.Connection] = None
         self.cursor: Optional[sqlite3.Cursor] = None
@@ -52,20 +305,71 @@ class DatabaseDataManager(DataManager):
         os.makedirs(os.path.dirname(self._db_path), exist_ok=True)
 
     def _get_connection(self) -> sqlite3.Connection:
-        """Establishes a connection to the SQLite database."""
+        """
+        Returns this thread's connection to the SQLite database.
+
+        The connection is opened, and the pragmas applied, on the thread's
+        first call and reused afterwards, so the page cache, memory map and
+        sqlite3's prepared statement cache outlive single operations.
+        Opening one also closes those of threads that have exited.
+        """
+        thread_id = threading.get_ident()
+        conn = self._connections.get(thread_id)
+        if conn is not None:
+            return conn
         self._ensure_data_dir_exists()
         try:
-            # isolation_level=None enables autocommit mode for simplicity here
-            # In a larger app, explicit transaction management is better
-            conn = sqlite3.connect(self._db_path, isolation_level=None)
+            # isolation_level=None: statements autocommit unless they run
+            # inside an explicit transaction (see _transaction).
+            # check_same_thread=False lets close() run on any thread.
+            conn = sqlite3.connect(
+                self._db_path, isolation_level=None, check_same_thread=False
+            )
             conn.row_factory = sqlite3.Row  # Return rows as dict-like objects
-            return conn
+            for name, value in self._pragmas.items():
+                conn.execute(f"PRAGMA {name} = {value}")
         except sqlite3.Error as e:
-            print(f"Error connecting to database '{self._db_path}': {e}")
+            logger.error("Error connecting to database '%s': %s", self._db_path, e)
             raise  # Re-raise the exception to signal connection failure
+        with self._connections_lock:
+            live = {thread.ident for thread in threading.enumerate()}
+            for dead_id in set(self._connections) - live:
+                self._connections.pop(dead_id).close()
+            self._connections[thread_id] = conn
+        return conn
 
-    def _create_tables(self, conn: sqlite3.Connection) -> None:
-        """Creates the necessary database tables if they don't exist."""
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Runs the block as one write transaction, rolled back on errors."""
+        conn = self._get_connection()
+        # IMMEDIATE takes the write lock up front instead of failing midway
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    def close(self) -> None:
+        """
+        Closes every thread's connection; the next operation reopens one.
+
+        Meant for shutdown, when no other thread is mid-operation.
+        """
+        with self._connections_lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+
+    def _create_tables(self, conn: sqlite3.Connection) -> bool:
+        """
+        Creates the necessary database tables if they don't exist.
+
+        Returns:
+            Whether the tables and migrations were applied without error.
+        """
         try:
             cursor = conn.cursor()
             # User table
@@ -108,6 +412,42 @@ class DatabaseDataManager(DataManager):
                         ON DELETE CASCADE ON UPDATE CASCADE
                 )
             """)
+            # Archive tier: completed tasks moved out of the tasks table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS archived_tasks (
+                    id TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    text_description TEXT,
+                    priority TEXT NOT NULL DEFAULT 'Low',
+                    difficulty TEXT NOT NULL DEFAULT 'Trivial',
+                    duration TEXT NOT NULL DEFAULT 'Minuscule',
+                    is_complete INTEGER NOT NULL DEFAULT 1,
+                    creation_date TEXT,
+                    due_date TEXT,
+                    start_date TEXT,
+                    icon TEXT,
+                    tags TEXT,
+                    project TEXT,
+                    subtasks TEXT,
+                    dependencies TEXT,
+                    history TEXT,
+                    user_username TEXT NOT NULL,
+                    is_habit INTEGER NOT NULL DEFAULT 0,
+                    recurrence_rule TEXT,
+                    recurrence_type TEXT,
+                    streak_current INTEGER NOT NULL DEFAULT 0,
+                    streak_best INTEGER NOT NULL DEFAULT 0,
+                    parent_habit_id TEXT,
+                    recurrence_ended_at TEXT,
+                    defer_until TEXT,
+                    FOREIGN KEY (user_username) REFERENCES users (username)
+                        ON DELETE CASCADE ON UPDATE CASCADE
+                )
+            """)
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_archived_tasks_user "
+                "ON archived_tasks(user_username)"
+            )
 
             # Migration: Add new columns if they don't exist
             # SQLite doesn't support IF NOT EXISTS for ADD COLUMN, so we try and ignore error
@@ -141,6 +481,7 @@ class DatabaseDataManager(DataManager):
             user_columns = [
                 ("defined_tags", "TEXT"),  # JSON array of tag objects
                 ("defined_projects", "TEXT"),  # JSON array of project objects
+                ("archive_summary", "TEXT"),  # JSON ArchiveSummary
             ]
             for col_name, col_def in user_columns:  # pragma: no cover
                 try:
@@ -148,28 +489,169 @@ class DatabaseDataManager(DataManager):
                 except sqlite3.OperationalError:
                     pass  # Column likely already exists
 
+            self._create_task_list_tables(cursor)
+
+            # Migration: secondary indexes (after the columns they cover)
+            for statement in TASK_INDEXES:
+                cursor.execute(statement)
+
+            # Migration: daily_summary, counted from the existing rows once
+            summary_missing = (
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master "
+                    "WHERE type = 'table' AND name = 'daily_summary'"
+                ).fetchone()
+                is None
+            )
+            cursor.execute(DAILY_SUMMARY_TABLE)
+            if summary_missing:
+                for (username,) in cursor.execute("SELECT username FROM users"):
+                    self._rebuild_daily_summary(conn.cursor(), username)
+
             conn.commit()  # Commit table creation
-            print("Database tables checked/created successfully.")
+            logger.info("Database tables checked/created successfully.")
+            return True
         except sqlite3.Error as e:
-            print(f"Error creating database tables: {e}")
+            logger.error("Error creating database tables: %s", e)
+            return False
+
+    @staticmethod
+    def _create_task_list_tables(cursor: sqlite3.Cursor) -> None:
+        """
+        Creates the task_tags, task_subtasks and task_dependencies tables.
+
+        Each holds one row per list item of a task in the tasks table, with
+        indexes for tag and dependency lookups. Tasks saved before these
+        tables existed are migrated out of their JSON columns, which are
+        then cleared (rows with invalid JSON keep it, so loading still warns).
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS task_tags (
+                task_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                tag TEXT NOT NULL,
+                user_username TEXT NOT NULL,
+                PRIMARY KEY (task_id, position),
+                FOREIGN KEY (task_id) REFERENCES tasks (id) ON DELETE CASCADE
+            )
+        """)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_task_tags_user_tag "
+            "ON task_tags(user_username, tag)"
+        )
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS task_subtasks (
+                task_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                complete INTEGER NOT NULL DEFAULT 0,
+                user_username TEXT NOT NULL,
+                PRIMARY KEY (task_id, position),
+                FOREIGN KEY (task_id) REFERENCES tasks (id) ON DELETE CASCADE
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS task_dependencies (
+                task_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                depends_on_id TEXT NOT NULL,
+                user_username TEXT NOT NULL,
+                PRIMARY KEY (task_id, position),
+                FOREIGN KEY (task_id) REFERENCES tasks (id) ON DELETE CASCADE
+            )
+        """)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_task_dependencies_user_depends_on "
+            "ON task_dependencies(user_username, depends_on_id)"
+        )
+        # Foreign keys are not enforced on our connections: delete by trigger
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_tasks_delete_lists
+            AFTER DELETE ON tasks
+            BEGIN
+                DELETE FROM task_tags WHERE task_id = OLD.id;
+                DELETE FROM task_subtasks WHERE task_id = OLD.id;
+                DELETE FROM task_dependencies WHERE task_id = OLD.id;
+            END
+        """)
+
+        # Migration: move list items out of the tasks table's JSON columns
+        cursor.execute("""
+            INSERT OR IGNORE INTO task_tags (task_id, position, tag, user_username)
+            SELECT tasks.id, item.key, item.value, tasks.user_username
+            FROM tasks, json_each(
+                CASE WHEN json_valid(tasks.tags) THEN tasks.tags ELSE '[]' END
+            ) AS item
+            WHERE item.type = 'text'
+        """)
+        cursor.execute("""
+            INSERT OR IGNORE INTO task_subtasks
+                (task_id, position, text, complete, user_username)
+            SELECT
+                tasks.id,
+                item.key,
+                CASE WHEN item.type = 'object'
+                    THEN COALESCE(json_extract(item.value, '$.text'), '')
+                    ELSE item.value END,
+                CASE WHEN item.type = 'object'
+                    THEN COALESCE(json_extract(item.value, '$.complete'), 0)
+                    ELSE 0 END,
+                tasks.user_username
+            FROM tasks, json_each(
+                CASE WHEN json_valid(tasks.subtasks) THEN tasks.subtasks ELSE '[]' END
+            ) AS item
+            WHERE item.type IN ('object', 'text')
+        """)
+        cursor.execute("""
+            INSERT OR IGNORE INTO task_dependencies
+                (task_id, position, depends_on_id, user_username)
+            SELECT tasks.id, item.key, item.value, tasks.user_username
+            FROM tasks, json_each(
+                CASE WHEN json_valid(tasks.dependencies)
+                    THEN tasks.dependencies ELSE '[]' END
+            ) AS item
+            WHERE item.type = 'text'
+        """)
+        for column in ("tags", "subtasks", "dependencies"):
+            cursor.execute(
+                f"UPDATE tasks SET {column} = NULL "
+                f"WHERE {column} IS NOT NULL AND json_valid({column})"
+            )
 
     def initialize(self) -> None:
-        """Initializes the database by creating tables if needed."""
-        print(f"Initializing database at: {self._db_path}")
+        """
+        Initializes the database by creating tables if needed.
+
+        Runs once per manager, like the PostgreSQL backend: the API
+        initializes the shared manager on every request, and the migrations
+        scan the tasks table. A failed initialization is retried.
+        """
+        if self._initialized:
+            return
+
+        logger.info("Initializing database at: %s", self._db_path)
         try:
             with self._get_connection() as conn:
-                self._create_tables(conn)
+                self._initialized = self._create_tables(conn)
         except sqlite3.Error as e:
-            print(f"Database initialization failed: {e}")
+            logger.error("Database initialization failed: %s", e)
 
-    def load_user(
-        self, username: str = DEFAULT_USERNAME
-    ) -> (
-        User | None
-    ):  # pylint: disable=too-many-locals,too-many-branches,too-many-statements
+    @timed("load_user")
+    def load_user(self, username: str = DEFAULT_USERNAME) -> User | None:
         """Loads user data and their tasks from the database."""
+        return self._load_user(username, active_only=False)
+
+    @timed("load_user")
+    def load_active_user(self, username: str = DEFAULT_USERNAME) -> User | None:
+        """Loads a user's active tasks, leaving the rest in the database until needed."""
+        return self._load_user(username, active_only=True)
+
+    def _load_user(  # pylint: disable=too-many-locals
+        self, username: str, active_only: bool
+    ) -> User | None:
+        """Loads a user with all their tasks, or only the active set."""
         # Placeholder for future sync: Check for remote changes before loading
-        print(f"Loading user '{username}' from motido.database...")
+        logger.debug("Loading user '%s' from motido.database...", username)
         try:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
@@ -177,13 +659,14 @@ class DatabaseDataManager(DataManager):
                 # Check if user exists and get user data
                 cursor.execute(
                     "SELECT username, total_xp, last_processed_date, vacation_mode, "
-                    "defined_tags, defined_projects FROM users WHERE username = ?",
+                    "defined_tags, defined_projects, archive_summary "
+                    "FROM users WHERE username = ?",
                     (username,),
                 )
                 user_row = cursor.fetchone()
 
                 if not user_row:
-                    print(f"User '{username}' not found in database.")
+                    logger.info("User '%s' not found in database.", username)
                     # Optionally create user here:
                     # self._ensure_user_exists(conn, username)
                     # return User(username=username)
@@ -205,204 +688,12 @@ class DatabaseDataManager(DataManager):
 
                 # Load tasks for the user
                 cursor.execute(
-                    "SELECT id, title, text_description, priority, difficulty, duration, "
-                    "is_complete, creation_date, due_date, start_date, icon, tags, "
-                    "project, subtasks, dependencies, history, is_habit, recurrence_rule, "
-                    "recurrence_type, streak_current, streak_best, parent_habit_id, "
-                    "recurrence_ended_at, defer_until FROM tasks "
-                    "WHERE user_username = ?",
-                    (username,),
+                    f"SELECT {TASK_SELECT_COLUMNS} FROM tasks WHERE user_username = ?"
+                    + (f" AND {ACTIVE_TASK_CONDITION}" if active_only else ""),
+                    (username, username) if active_only else (username,),
                 )
                 task_rows = cursor.fetchall()
-                tasks = []
-                for row in task_rows:
-                    # Convert priority string to enum
-                    priority_str = (
-                        row["priority"]
-                        if "priority" in row.keys()
-                        else Priority.LOW.value
-                    )
-                    priority = parse_priority_safely(priority_str, row["id"])
-
-                    # Convert difficulty string to enum
-                    difficulty_str = (
-                        row["difficulty"]
-                        if "difficulty" in row.keys()
-                        else Difficulty.TRIVIAL.value
-                    )
-                    difficulty = parse_difficulty_safely(difficulty_str, row["id"])
-
-                    # Convert duration string to enum
-                    duration_str = (
-                        row["duration"]
-                        if "duration" in row.keys()
-                        else Duration.MINUSCULE.value
-                    )
-                    duration = parse_duration_safely(duration_str, row["id"])
-
-                    # Get is_complete (stored as INTEGER: 0 or 1)
-                    is_complete = (
-                        bool(row["is_complete"])
-                        if "is_complete" in row.keys()
-                        else False
-                    )
-
-                    # Get creation_date from row or use current time if not present
-                    creation_date = datetime.now()
-                    if "creation_date" in row.keys() and row["creation_date"]:
-                        try:
-                            creation_date = datetime.strptime(
-                                row["creation_date"], "%Y-%m-%d %H:%M:%S"
-                            )
-                        except ValueError:
-                            print(
-                                f"Warning: Invalid creation_date format for task {row['id']}, using current time."
-                            )
-
-                    # Get due_date and start_date
-                    due_date = None
-                    if "due_date" in row.keys() and row["due_date"]:
-                        try:
-                            due_date = datetime.strptime(
-                                row["due_date"], "%Y-%m-%d %H:%M:%S"
-                            )
-                        except ValueError:
-                            print(
-                                f"Warning: Invalid due_date format for task {row['id']}, ignoring."
-                            )
-
-                    start_date = None
-                    if "start_date" in row.keys() and row["start_date"]:
-                        try:
-                            start_date = datetime.strptime(
-                                row["start_date"], "%Y-%m-%d %H:%M:%S"
-                            )
-                        except ValueError:
-                            print(
-                                f"Warning: Invalid start_date format for task {row['id']}, ignoring."
-                            )
-
-                    # Deserialize JSON fields (tags, subtasks, dependencies)
-                    tags = []
-                    if "tags" in row.keys() and row["tags"]:
-                        try:
-                            tags = json.loads(row["tags"])
-                        except json.JSONDecodeError:
-                            print(
-                                f"Warning: Invalid JSON in tags for task {row['id']}, using empty list."
-                            )
-
-                    subtasks = []
-                    if "subtasks" in row.keys() and row["subtasks"]:
-                        try:
-                            subtasks = json.loads(row["subtasks"])
-                            subtasks = self._normalize_subtasks(subtasks)
-                        except json.JSONDecodeError:
-                            print(
-                                f"Warning: Invalid JSON in subtasks for task {row['id']}, using empty list."
-                            )
-
-                    dependencies = []
-                    if "dependencies" in row.keys() and row["dependencies"]:
-                        try:
-                            dependencies = json.loads(row["dependencies"])
-                        except json.JSONDecodeError:
-                            print(
-                                f"Warning: Invalid JSON in dependencies for task {row['id']}, using empty list."
-                            )
-
-                    history = []
-                    if "history" in row.keys() and row["history"]:
-                        try:
-                            history = json.loads(row["history"])
-                        except json.JSONDecodeError:
-                            print(
-                                f"Warning: Invalid JSON in history for task {row['id']}, using empty list."
-                            )
-
-                    # Handle migration from old 'description' column to new 'title' column
-                    title = row["title"] if "title" in row.keys() else None
-                    if not title:
-                        # Migrate old data if description column exists
-                        title = (  # pragma: no cover
-                            row["description"]
-                            if "description" in row.keys()
-                            else "Untitled Task"
-                        )
-
-                    text_description = (
-                        row["text_description"]
-                        if "text_description" in row.keys()
-                        else None
-                    )
-
-                    # Parse recurrence type
-                    recurrence_type_str = (
-                        row["recurrence_type"]
-                        if "recurrence_type" in row.keys()
-                        else None
-                    )
-                    recurrence_type = None
-                    if recurrence_type_str:
-                        try:
-                            recurrence_type = RecurrenceType(recurrence_type_str)
-                        except ValueError:
-                            pass
-
-                    task = Task(
-                        id=row["id"],
-                        title=title,
-                        text_description=text_description,
-                        creation_date=creation_date,
-                        priority=priority,
-                        difficulty=difficulty,
-                        duration=duration,
-                        is_complete=is_complete,
-                        due_date=due_date,
-                        start_date=start_date,
-                        icon=row["icon"] if "icon" in row.keys() else None,
-                        tags=tags,
-                        project=row["project"] if "project" in row.keys() else None,
-                        subtasks=subtasks,
-                        dependencies=dependencies,
-                        history=history,
-                        is_habit=(
-                            bool(row["is_habit"]) if "is_habit" in row.keys() else False
-                        ),
-                        recurrence_rule=(
-                            row["recurrence_rule"]
-                            if "recurrence_rule" in row.keys()
-                            else None
-                        ),
-                        recurrence_type=recurrence_type,
-                        streak_current=(
-                            row["streak_current"]
-                            if "streak_current" in row.keys()
-                            else 0
-                        ),
-                        streak_best=(
-                            row["streak_best"] if "streak_best" in row.keys() else 0
-                        ),
-                        parent_habit_id=(
-                            row["parent_habit_id"]
-                            if "parent_habit_id" in row.keys()
-                            else None
-                        ),
-                        recurrence_ended_at=(
-                            datetime.strptime(
-                                row["recurrence_ended_at"], "%Y-%m-%d %H:%M:%S"
-                            )
-                            if "recurrence_ended_at" in row.keys()
-                            and row["recurrence_ended_at"]
-                            else None
-                        ),
-                        defer_until=(
-                            datetime.strptime(row["defer_until"], "%Y-%m-%d %H:%M:%S")
-                            if "defer_until" in row.keys() and row["defer_until"]
-                            else None
-                        ),
-                    )
-                    tasks.append(task)
+                tasks = [self._row_to_task(row) for row in task_rows]
 
                 # Deserialize defined tags
                 defined_tags: list[Tag] = []
@@ -439,6 +730,12 @@ class DatabaseDataManager(DataManager):
                     except json.JSONDecodeError:
                         pass  # Use empty list
 
+                archive_summary = ArchiveSummary()
+                if "archive_summary" in user_row.keys() and user_row["archive_summary"]:
+                    archive_summary = ArchiveSummary.from_dict(
+                        json.loads(user_row["archive_summary"])
+                    )
+
                 user = User(
                     username=username,
                     total_xp=total_xp,
@@ -451,14 +748,204 @@ class DatabaseDataManager(DataManager):
                     ),
                     defined_tags=defined_tags,
                     defined_projects=defined_projects,
+                    archive_summary=archive_summary,
+                )
+                if active_only:
+                    user.inactive_tasks = LazyTasks(
+                        lambda: self._load_inactive_tasks(user),
+                        frozenset(task.id for task in tasks),
+                    )
+                user.archived_tasks = LazyTasks(
+                    lambda: self.load_archived_tasks(username)
+                )
+                logger.debug(
+                    "User '%s' loaded successfully with %s tasks.", username, len(tasks)
                 )
-                print(f"User '{username}' loaded successfully with {len(tasks)} tasks.")
                 return user
 
         except sqlite3.Error as e:
-            print(f"Error loading user '{username}' from motido.database: {e}")
+            logger.error(
+                "Error loading user '%s' from motido.database: %s", username, e
+            )
             return None
 
+    def _load_inactive_tasks(self, user: User) -> list[Task]:
+        """Reads the stored tasks an active-set load of user skipped."""
+        logger.debug("Fetching inactive tasks of user '%s'...", user.username)
+        skip = user.inactive_tasks.active_ids | {task.id for task in user.tasks}
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                f"SELECT {TASK_SELECT_COLUMNS} FROM tasks WHERE user_username = ?",
+                (user.username,),
+            )
+            return [self._row_to_task(row) for row in rows if row["id"] not in skip]
+
+    def _row_to_task(self, row: sqlite3.Row) -> Task:
+        """Converts a tasks row to a Task object."""
+        # pylint: disable=too-many-locals,too-many-branches,too-many-statements
+        # Convert priority string to enum
+        priority_str = (
+            row["priority"] if "priority" in row.keys() else Priority.LOW.value
+        )
+        priority = parse_priority_safely(priority_str, row["id"])
+
+        # Convert difficulty string to enum
+        difficulty_str = (
+            row["difficulty"]
+            if "difficulty" in row.keys()
+            else Difficulty.TRIVIAL.value
+        )
+        difficulty = parse_difficulty_safely(difficulty_str, row["id"])
+
+        # Convert duration string to enum
+        duration_str = (
+            row["duration"] if "duration" in row.keys() else Duration.MINUSCULE.value
+        )
+        duration = parse_duration_safely(duration_str, row["id"])
+
+        # Get is_complete (stored as INTEGER: 0 or 1)
+        is_complete = bool(row["is_complete"]) if "is_complete" in row.keys() else False
+
+        # Get creation_date from row or use current time if not present
+        creation_date = datetime.now()
+        if "creation_date" in row.keys() and row["creation_date"]:
+            try:
+                creation_date = datetime.strptime(
+                    row["creation_date"], "%Y-%m-%d %H:%M:%S"
+                )
+            except ValueError:
+                logger.warning(
+                    "Invalid creation_date format for task %s, using current time.",
+                    row["id"],
+                )
+
+        # Get due_date and start_date
+        due_date = None
+        if "due_date" in row.keys() and row["due_date"]:
+            try:
+                due_date = datetime.strptime(row["due_date"], "%Y-%m-%d %H:%M:%S")
+            except ValueError:
+                logger.warning(
+                    "Invalid due_date format for task %s, ignoring.",
+                    row["id"],
+                )
+
+        start_date = None
+        if "start_date" in row.keys() and row["start_date"]:
+            try:
+                start_date = datetime.strptime(row["start_date"], "%Y-%m-%d %H:%M:%S")
+            except ValueError:
+                logger.warning(
+                    "Invalid start_date format for task %s, ignoring.",
+                    row["id"],
+                )
+
+        # Deserialize JSON fields (tags, subtasks, dependencies)
+        tags = []
+        if "tags" in row.keys() and row["tags"]:
+            try:
+                tags = json.loads(row["tags"])
+            except json.JSONDecodeError:
+                logger.warning(
+                    "Invalid JSON in tags for task %s, using empty list.",
+                    row["id"],
+                )
+
+        subtasks = []
+        if "subtasks" in row.keys() and row["subtasks"]:
+            try:
+                subtasks = json.loads(row["subtasks"])
+                subtasks = self._normalize_subtasks(subtasks)
+            except json.JSONDecodeError:
+                logger.warning(
+                    "Invalid JSON in subtasks for task %s, using empty list.",
+                    row["id"],
+                )
+
+        dependencies = []
+        if "dependencies" in row.keys() and row["dependencies"]:
+            try:
+                dependencies = json.loads(row["dependencies"])
+            except json.JSONDecodeError:
+                logger.warning(
+                    "Invalid JSON in dependencies for task %s, using empty list.",
+                    row["id"],
+                )
+
+        history = []
+        if "history" in row.keys() and row["history"]:
+            try:
+                history = json.loads(row["history"])
+            except json.JSONDecodeError:
+                logger.warning(
+                    "Invalid JSON in history for task %s, using empty list.",
+                    row["id"],
+                )
+
+        # Handle migration from old 'description' column to new 'title' column
+        title = row["title"] if "title" in row.keys() else None
+        if not title:
+            # Migrate old data if description column exists
+            title = (  # pragma: no cover
+                row["description"] if "description" in row.keys() else "Untitled Task"
+            )
+
+        text_description = (
+            row["text_description"] if "text_description" in row.keys() else None
+        )
+
+        # Parse recurrence type
+        recurrence_type_str = (
+            row["recurrence_type"] if "recurrence_type" in row.keys() else None
+        )
+        recurrence_type = None
+        if recurrence_type_str:
+            try:
+                recurrence_type = RecurrenceType(recurrence_type_str)
+            except ValueError:
+                pass
+
+        return Task(
+            id=row["id"],
+            title=title,
+            text_description=text_description,
+            creation_date=creation_date,
+            priority=priority,
+            difficulty=difficulty,
+            duration=duration,
+            is_complete=is_complete,
+            due_date=due_date,
+            start_date=start_date,
+            icon=row["icon"] if "icon" in row.keys() else None,
+            tags=tags,
+            project=row["project"] if "project" in row.keys() else None,
+            subtasks=subtasks,
+            dependencies=dependencies,
+            history=history,
+            is_habit=(bool(row["is_habit"]) if "is_habit" in row.keys() else False),
+            recurrence_rule=(
+                row["recurrence_rule"] if "recurrence_rule" in row.keys() else None
+            ),
+            recurrence_type=recurrence_type,
+            streak_current=(
+                row["streak_current"] if "streak_current" in row.keys() else 0
+            ),
+            streak_best=(row["streak_best"] if "streak_best" in row.keys() else 0),
+            parent_habit_id=(
+                row["parent_habit_id"] if "parent_habit_id" in row.keys() else None
+            ),
+            recurrence_ended_at=(
+                datetime.strptime(row["recurrence_ended_at"], "%Y-%m-%d %H:%M:%S")
+                if "recurrence_ended_at" in row.keys() and row["recurrence_ended_at"]
+                else None
+            ),
+            defer_until=(
+                datetime.strptime(row["defer_until"], "%Y-%m-%d %H:%M:%S")
+                if "defer_until" in row.keys() and row["defer_until"]
+                else None
+            ),
+        )
+
     @staticmethod
     def _normalize_subtasks(subtasks: list) -> list:
         """
@@ -520,153 +1007,511 @@ class DatabaseDataManager(DataManager):
                     defined_projects_json,
                 ),
             )
-            # No commit needed due to autocommit (isolation_level=None)
+            # Committed with the caller's transaction (or autocommitted)
         except sqlite3.Error as e:
-            print(f"Error ensuring user '{user.username}' exists: {e}")
+            logger.error("Error ensuring user '%s' exists: %s", user.username, e)
             # Decide how to handle this - maybe raise an exception?
 
+    @staticmethod
+    def _task_row(task: Task, username: str, *, json_lists: bool = True) -> tuple:
+        """
+        A task's column values, in TASK_INSERT_SQL order.
+
+        With json_lists False (rows of the tasks table), tags, subtasks and
+        dependencies are left NULL for the rows of _task_list_rows.
+        """
+        return (
+            task.id,
+            task.title,
+            task.text_description,
+            task.priority.value,
+            task.difficulty.value,
+            task.duration.value,
+            1 if task.is_complete else 0,
+            (
+                task.creation_date.strftime("%Y-%m-%d %H:%M:%S")
+                if task.creation_date
+                else None
+            ),
+            (task.due_date.strftime("%Y-%m-%d %H:%M:%S") if task.due_date else None),
+            (
+                task.start_date.strftime("%Y-%m-%d %H:%M:%S")
+                if task.start_date
+                else None
+            ),
+            task.icon,
+            json.dumps(task.tags) if json_lists and task.tags else None,
+            task.project,
+            json.dumps(task.subtasks) if json_lists and task.subtasks else None,
+            (
+                json.dumps(task.dependencies)
+                if json_lists and task.dependencies
+                else None
+            ),
+            json.dumps(task.history) if task.history else None,
+            username,
+            1 if task.is_habit else 0,
+            task.recurrence_rule,
+            task.recurrence_type.value if task.recurrence_type else None,
+            task.streak_current,
+            task.streak_best,
+            task.parent_habit_id,
+            (
+                task.recurrence_ended_at.strftime("%Y-%m-%d %H:%M:%S")
+                if task.recurrence_ended_at
+                else None
+            ),
+            (
+                task.defer_until.strftime("%Y-%m-%d %H:%M:%S")
+                if task.defer_until
+                else None
+            ),
+        )
+
+    @staticmethod
+    def _task_list_rows(
+        tasks: list[Task], username: str
+    ) -> tuple[list[tuple], list[tuple], list[tuple]]:
+        """The task_tags, task_subtasks and task_dependencies rows of tasks."""
+        tag_rows: list[tuple] = []
+        subtask_rows: list[tuple] = []
+        dependency_rows: list[tuple] = []
+        for task in tasks:
+            tag_rows.extend(
+                (task.id, position, tag, username)
+                for position, tag in enumerate(task.tags)
+            )
+            subtask_rows.extend(
+                (
+                    task.id,
+                    position,
+                    subtask.get("text") or "",
+                    1 if subtask.get("complete") else 0,
+                    username,
+                )
+                for position, subtask in enumerate(
+                    DatabaseDataManager._normalize_subtasks(task.subtasks)
+                )
+            )
+            dependency_rows.extend(
+                (task.id, position, dep_id, username)
+                for position, dep_id in enumerate(task.dependencies)
+            )
+        return tag_rows, subtask_rows, dependency_rows
+
+    @timed("save_user")
     def save_user(self, user: User) -> None:
         """Saves the user and their tasks to the database."""
-        print(f"Saving user '{user.username}' to database...")
+        logger.debug("Saving user '%s' to database...", user.username)
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
+            with self._transaction() as conn:
+                self._write_user(conn, user)
+                logger.debug("User '%s' saved successfully.", user.username)
+                # Placeholder for future sync: Push changes to remote after saving
 
-                # Ensure the user exists in the users table
-                self._ensure_user_exists(conn, user)
+        except sqlite3.Error as e:
+            logger.error("Error saving user '%s' to database: %s", user.username, e)
 
-                # Serialize defined_tags and defined_projects as JSON
-                defined_tags_json = (
-                    json.dumps(
-                        [
-                            {"id": t.id, "name": t.name, "color": t.color}
-                            for t in user.defined_tags
-                        ]
-                    )
-                    if user.defined_tags
-                    else None
-                )
-                defined_projects_json = (
-                    json.dumps(
-                        [
-                            {"id": p.id, "name": p.name, "color": p.color}
-                            for p in user.defined_projects
-                        ]
-                    )
-                    if user.defined_projects
-                    else None
-                )
+    def _write_user(self, conn: sqlite3.Connection, user: User) -> None:
+        """Writes the user and their tasks inside the caller's transaction."""
+        cursor = conn.cursor()
 
-                # Update user's total_xp, last_processed_date, vacation_mode, and registries
-                cursor.execute(
-                    "UPDATE users SET total_xp = ?, last_processed_date = ?, vacation_mode = ?, "
-                    "defined_tags = ?, defined_projects = ? WHERE username = ?",
-                    (
-                        user.total_xp,
-                        user.last_processed_date.isoformat(),
-                        1 if user.vacation_mode else 0,
-                        defined_tags_json,
-                        defined_projects_json,
-                        user.username,
-                    ),
-                )
+        # Ensure the user exists in the users table
+        self._ensure_user_exists(conn, user)
+
+        # Serialize defined_tags and defined_projects as JSON
+        defined_tags_json = (
+            json.dumps(
+                [
+                    {"id": t.id, "name": t.name, "color": t.color}
+                    for t in user.defined_tags
+                ]
+            )
+            if user.defined_tags
+            else None
+        )
+        defined_projects_json = (
+            json.dumps(
+                [
+                    {"id": p.id, "name": p.name, "color": p.color}
+                    for p in user.defined_projects
+                ]
+            )
+            if user.defined_projects
+            else None
+        )
+
+        # Update user's total_xp, last_processed_date, vacation_mode, and registries
+        cursor.execute(
+            "UPDATE users SET total_xp = ?, last_processed_date = ?, vacation_mode = ?, "
+            "defined_tags = ?, defined_projects = ?, archive_summary = ? "
+            "WHERE username = ?",
+            (
+                user.total_xp,
+                user.last_processed_date.isoformat(),
+                1 if user.vacation_mode else 0,
+                defined_tags_json,
+                defined_projects_json,
+                json.dumps(user.archive_summary.to_dict()),
+                user.username,
+            ),
+        )
+
+        # Strategy: Delete existing tasks for the user and insert current ones.
+        # This is simpler than diffing but less efficient for large datasets.
+        # For a production app, consider updating existing/deleting
+        # removed/inserting new.
+        inactive = user.inactive_tasks
+        replaced: list[str] | None = None  # None: every row of the user
+        if inactive.loaded:
+            tasks = user.all_tasks()
+            stored = cursor.execute(DAILY_SUMMARY_KEYS_SQL, {"username": user.username})
+        else:
+            # Only the active set was loaded: replace just those rows
+            tasks = user.tasks
+            replaced = list(inactive.active_ids.union(task.id for task in tasks))
+            stored = cursor.execute(
+                DAILY_SUMMARY_KEYS_BY_ID_SQL,
+                {"username": user.username, "ids": json.dumps(replaced)},
+            )
+        # Recount only the rows added, removed or moved to another day,
+        # completion state or series, so a save touches few summary rows
+        old_keys = {row[0]: self._summary_key(*row[1:]) for row in stored}
+        new_keys = {
+            task.id: self._summary_key(
+                task.due_date.strftime("%Y-%m-%d") if task.due_date else None,
+                task.is_complete,
+                task.is_habit,
+                task.parent_habit_id,
+            )
+            for task in tasks
+        }
+        changed = sorted(
+            task_id
+            for task_id in old_keys.keys() | new_keys.keys()
+            if old_keys.get(task_id) != new_keys.get(task_id)
+        )
+        if changed:
+            self._change_daily_summary(cursor, user.username, "tasks", -1, changed)
+        if replaced is None:
+            cursor.execute(
+                "DELETE FROM tasks WHERE user_username = ?", (user.username,)
+            )
+        else:
+            cursor.executemany(
+                "DELETE FROM tasks WHERE user_username = ? AND id = ?",
+                [(user.username, task_id) for task_id in replaced],
+            )
+        logger.debug("Deleted existing tasks for '%s'.", user.username)
+
+        tasks_to_insert = [
+            self._task_row(task, user.username, json_lists=False) for task in tasks
+        ]
 
-                # Strategy: Delete existing tasks for the user and insert current ones.
-                # This is simpler than diffing but less efficient for large datasets.
-                # For a production app, consider updating existing/deleting
-                # removed/inserting new.
+        # Insert new tasks if any exist
+        if tasks_to_insert:
+            cursor.executemany(
+                TASK_INSERT_SQL.format(insert="INSERT", table="tasks"),
+                tasks_to_insert,
+            )
+            get_metrics().inc(ROWS_UPSERTED, len(tasks_to_insert), backend="db")
+            self._insert_task_lists(cursor, tasks, user.username)
+            logger.debug(
+                "Inserted %s tasks for '%s'.",
+                len(tasks_to_insert),
+                user.username,
+            )
+        else:
+            logger.debug("No tasks to insert for '%s'.", user.username)
+        if changed:
+            self._change_daily_summary(cursor, user.username, "tasks", 1, changed)
+            cursor.execute(DAILY_SUMMARY_PRUNE_SQL, (user.username,))
+
+    @staticmethod
+    def _summary_key(
+        day: str | None, is_complete: object, is_habit: object, parent: str | None
+    ) -> tuple:
+        """What a task counts towards in daily_summary, stored or in memory."""
+        return day, bool(is_complete), bool(is_habit), parent or None
+
+    def _insert_task_lists(
+        self, cursor: sqlite3.Cursor, tasks: list[Task], username: str
+    ) -> None:
+        """Inserts the list items of freshly inserted tasks rows."""
+        tag_rows, subtask_rows, dependency_rows = self._task_list_rows(tasks, username)
+        if tag_rows:
+            cursor.executemany(
+                "INSERT INTO task_tags (task_id, position, tag, user_username) "
+                "VALUES (?, ?, ?, ?)",
+                tag_rows,
+            )
+        if subtask_rows:
+            cursor.executemany(
+                "INSERT INTO task_subtasks "
+                "(task_id, position, text, complete, user_username) "
+                "VALUES (?, ?, ?, ?, ?)",
+                subtask_rows,
+            )
+        if dependency_rows:
+            cursor.executemany(
+                "INSERT INTO task_dependencies "
+                "(task_id, position, depends_on_id, user_username) "
+                "VALUES (?, ?, ?, ?)",
+                dependency_rows,
+            )
+
+    def list_usernames(self) -> list[str]:
+        """Reads the usernames from the users table."""
+        with self._get_connection() as conn:
+            rows = conn.execute("SELECT username FROM users ORDER BY username")
+            return [row["username"] for row in rows]
+
+    def load_xp_log(
+        self, username: str, *, limit: int, offset: int = 0
+    ) -> list[XPTransaction]:
+        """The users table keeps no XP transactions, so every page is empty."""
+        del username, limit, offset
+        return []
+
+    def load_archived_tasks(self, username: str = DEFAULT_USERNAME) -> list[Task]:
+        """Reads a user's rows from the archived_tasks table."""
+        logger.debug("Fetching archived tasks of user '%s'...", username)
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                f"SELECT {TASK_COLUMNS} FROM archived_tasks WHERE user_username = ?",
+                (username,),
+            )
+            return [self._row_to_task(row) for row in rows]
+
+    def archive_tasks(
+        self, user: User, tasks: list[Task], *, replace: bool = False
+    ) -> None:
+        """
+        Copies tasks into archived_tasks and saves the user without them.
+
+        Both happen in one transaction, so a task is never left in both
+        tiers; unlike save_user, errors propagate to the caller.
+        """
+        task_ids = [task.id for task in tasks]
+        with self._transaction() as conn:
+            cursor = conn.cursor()
+            if replace:
+                self._change_daily_summary(cursor, user.username, "archived_tasks", -1)
                 cursor.execute(
-                    "DELETE FROM tasks WHERE user_username = ?", (user.username,)
+                    "DELETE FROM archived_tasks WHERE user_username = ?",
+                    (user.username,),
                 )
-                print(f"Deleted existing tasks for '{user.username}'.")
-
-                # Prepare task data for batch insertion
-                tasks_to_insert = [
-                    (
-                        task.id,
-                        task.title,
-                        task.text_description,
-                        task.priority.value,
-                        task.difficulty.value,
-                        task.duration.value,
-                        1 if task.is_complete else 0,
-                        (
-                            task.creation_date.strftime("%Y-%m-%d %H:%M:%S")
-                            if task.creation_date
-                            else None
-                        ),
-                        (
-                            task.due_date.strftime("%Y-%m-%d %H:%M:%S")
-                            if task.due_date
-                            else None
-                        ),
-                        (
-                            task.start_date.strftime("%Y-%m-%d %H:%M:%S")
-                            if task.start_date
-                            else None
-                        ),
-                        task.icon,
-                        json.dumps(task.tags) if task.tags else None,
-                        task.project,
-                        json.dumps(task.subtasks) if task.subtasks else None,
-                        json.dumps(task.dependencies) if task.dependencies else None,
-                        json.dumps(task.history) if task.history else None,
-                        user.username,
-                        1 if task.is_habit else 0,
-                        task.recurrence_rule,
-                        task.recurrence_type.value if task.recurrence_type else None,
-                        task.streak_current,
-                        task.streak_best,
-                        task.parent_habit_id,
-                        (
-                            task.recurrence_ended_at.strftime("%Y-%m-%d %H:%M:%S")
-                            if task.recurrence_ended_at
-                            else None
-                        ),
-                        (
-                            task.defer_until.strftime("%Y-%m-%d %H:%M:%S")
-                            if task.defer_until
-                            else None
-                        ),
-                    )
-                    for task in user.tasks
-                ]
+            else:
+                # Replace rows a previous, interrupted archive run copied
+                self._change_daily_summary(
+                    cursor, user.username, "archived_tasks", -1, task_ids
+                )
+            cursor.executemany(
+                TASK_INSERT_SQL.format(
+                    insert="INSERT OR REPLACE", table="archived_tasks"
+                ),
+                [self._task_row(task, user.username) for task in tasks],
+            )
+            self._change_daily_summary(
+                cursor, user.username, "archived_tasks", 1, task_ids
+            )
+            self._write_user(conn, user)
+        logger.info("Archived %s tasks of user '%s'.", len(tasks), user.username)
 
-                # Insert new tasks if any exist
-                if tasks_to_insert:
-                    cursor.executemany(
-                        "INSERT INTO tasks (id, title, text_description, priority, difficulty, "
-                        "duration, is_complete, creation_date, due_date, start_date, "
-                        "icon, tags, project, subtasks, dependencies, history, user_username, "
-                        "is_habit, recurrence_rule, recurrence_type, streak_current, streak_best, "
-                        "parent_habit_id, recurrence_ended_at, defer_until) "
-                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                        tasks_to_insert,
-                    )
-                    print(
-                        f"Inserted {len(tasks_to_insert)} tasks for '{user.username}'."
-                    )
-                else:
-                    print(f"No tasks to insert for '{user.username}'.")
+    def tagged_task_ids(self, user: User, tag: str) -> set[str]:
+        """Looks the tag up in task_tags."""
+        with self._get_connection() as conn:
+            rows = conn.execute(TAGGED_TASKS_SQL, (user.username, tag))
+            return {row["task_id"] for row in rows}
 
-                # No explicit commit needed due to autocommit (isolation_level=None)
-                print(f"User '{user.username}' saved successfully.")
-                # Placeholder for future sync: Push changes to remote after saving
+    def dependent_task_ids(self, user: User, task_id: str) -> set[str]:
+        """Looks the task up in task_dependencies."""
+        with self._get_connection() as conn:
+            rows = conn.execute(DEPENDENT_TASKS_SQL, (user.username, task_id))
+            return {row["task_id"] for row in rows}
 
-        except sqlite3.Error as e:
-            print(f"Error saving user '{user.username}' to database: {e}")
+    def blocked_task_ids(self, user: User) -> set[str]:
+        """Joins task_dependencies to the incomplete tasks on both ends."""
+        with self._get_connection() as conn:
+            rows = conn.execute(BLOCKED_TASKS_SQL, (user.username,))
+            return {row["task_id"] for row in rows}
+
+    def task_counts(self, user: User) -> TaskCounts:
+        """Totals the user's tasks rows in one aggregate query."""
+        with self._get_connection() as conn:
+            row = conn.execute(TASK_COUNTS_SQL, (user.username,)).fetchone()
+        return TaskCounts(
+            total=row["total"],
+            completed=row["completed"],
+            habits=row["habits"],
+            current_streak=row["current_streak"] or 0,
+            best_streak=row["best_streak"] or 0,
+        )
+
+    @staticmethod
+    def _completion_counts_query(
+        username: str, start: date, end: date, habit_id: str | None
+    ) -> tuple[str, tuple]:
+        """The completion counts query and its parameters."""
+        return DAILY_SUMMARY_SQL, (
+            username,
+            habit_id or "",
+            start.isoformat(),
+            end.isoformat(),
+        )
+
+    def completion_counts_by_day(
+        self, username: str, start: date, end: date, habit_id: str | None = None
+    ) -> dict[date, tuple[int, int]]:
+        """Reads the days from start to end of the user's daily_summary rows."""
+        sql, params = self._completion_counts_query(username, start, end, habit_id)
+        with self._get_connection() as conn:
+            return {
+                date.fromisoformat(row["day"]): (row["completed"], row["total"])
+                for row in conn.execute(sql, params)
+            }
+
+    def load_archive_summary(self, username: str) -> ArchiveSummary:
+        """Reads the archive_summary column of the user's row."""
+        with self._get_connection() as conn:
+            row = conn.execute(
+                "SELECT archive_summary FROM users WHERE username = ?", (username,)
+            ).fetchone()
+        return ArchiveSummary.from_dict(
+            json.loads(row["archive_summary"])
+            if row and row["archive_summary"]
+            else None
+        )
+
+    @staticmethod
+    def _change_daily_summary(
+        cursor: sqlite3.Cursor,
+        username: str,
+        table: str,
+        sign: int,
+        task_ids: list[str] | None = None,
+    ) -> None:
+        """
+        Adds (sign 1) or subtracts (sign -1) rows' counts in daily_summary.
+
+        Counts the user's rows of table with the given IDs, or all of them
+        if task_ids is None.
+        """
+        params = {"username": username, "sign": sign}
+        if task_ids is not None:
+            params["ids"] = json.dumps(task_ids)
+        cursor.execute(DAILY_SUMMARY_CHANGE_SQL[table, task_ids is not None], params)
+
+    @classmethod
+    def _rebuild_daily_summary(cls, cursor: sqlite3.Cursor, username: str) -> int:
+        """Replaces the user's daily_summary rows with a fresh count."""
+        cursor.execute("DELETE FROM daily_summary WHERE user_username = ?", (username,))
+        for table in ("tasks", "archived_tasks"):
+            cls._change_daily_summary(cursor, username, table, 1)
+        row = cursor.execute(
+            "SELECT COUNT(*) FROM daily_summary WHERE user_username = ?", (username,)
+        ).fetchone()
+        return int(row[0])
+
+    def rebuild_daily_summary(self, username: str = DEFAULT_USERNAME) -> int:
+        """Recounts the user's daily_summary rows from their task rows."""
+        with self._transaction() as conn:
+            count = self._rebuild_daily_summary(conn.cursor(), username)
+        logger.info("Rebuilt %s daily summary rows of user '%s'.", count, username)
+        return count
+
+    @classmethod
+    def _access_patterns(
+        cls, username: str
+    ) -> dict[str, tuple[str, tuple | Mapping[str, object]]]:
+        """The main queries by name, with sample parameters for username."""
+        today = date.today()
+        return {
+            "load user": (
+                f"SELECT {TASK_SELECT_COLUMNS} FROM tasks WHERE user_username = ?",
+                (username,),
+            ),
+            "load active set": (
+                f"SELECT {TASK_SELECT_COLUMNS} FROM tasks WHERE user_username = ? "
+                f"AND {ACTIVE_TASK_CONDITION}",
+                (username, username),
+            ),
+            "open tasks due": (
+                "SELECT id FROM tasks WHERE user_username = ? AND is_complete = 0 "
+                "AND due_date <= ? ORDER BY due_date",
+                (username, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+            ),
+            "habit series": (
+                "SELECT id FROM tasks WHERE user_username = ? AND parent_habit_id = ?",
+                (username, ""),
+            ),
+            "habits": (
+                "SELECT id FROM tasks WHERE user_username = ? AND is_habit = 1",
+                (username,),
+            ),
+            "tagged tasks": (TAGGED_TASKS_SQL, (username, "")),
+            "dependent tasks": (DEPENDENT_TASKS_SQL, (username, "")),
+            "blocked tasks": (BLOCKED_TASKS_SQL, (username,)),
+            "archived tasks": (
+                f"SELECT {TASK_COLUMNS} FROM archived_tasks WHERE user_username = ?",
+                (username,),
+            ),
+            "task counts": (TASK_COUNTS_SQL, (username,)),
+            "completion counts": cls._completion_counts_query(
+                username, today - timedelta(weeks=12), today, None
+            ),
+            "daily summary update": (
+                DAILY_SUMMARY_CHANGE_SQL["tasks", True],
+                {"username": username, "sign": 1, "ids": "[]"},
+            ),
+        }
+
+    def explain_queries(self, username: str = DEFAULT_USERNAME) -> dict[str, list[str]]:
+        """Runs EXPLAIN QUERY PLAN on each access pattern."""
+        plans: dict[str, list[str]] = {}
+        with self._get_connection() as conn:
+            for name, (sql, params) in self._access_patterns(username).items():
+                depths: dict[int, int] = {0: -1}
+                lines = []
+                for node_id, parent, _, detail in conn.execute(
+                    f"EXPLAIN QUERY PLAN {sql}", params
+                ):
+                    depths[node_id] = depths.get(parent, -1) + 1
+                    lines.append("  " * depths[node_id] + detail)
+                plans[name] = lines
+        return plans
 
     def backend_type(self) -> str:
         """Returns the backend type."""
         return "db"
 
+    def data_version(self) -> int | None:
+        """
+        Returns the database's last modification time in ns (None if missing).
+
+        In WAL mode commits land in the -wal file until a checkpoint copies
+        them into the database file, so the later of the two counts.
+        """
+        try:
+            mtime = os.stat(self._db_path).st_mtime_ns
+        except OSError:
+            return None
+        try:
+            return max(mtime, os.stat(self._db_path + "-wal").st_mtime_ns)
+        except OSError:
+            return mtime
+
+    def create_job_store(self) -> SqliteJobStore:
+        """Returns a job store sharing this manager's database file."""
+        return SqliteJobStore(self._get_connection)
+
     def _connect(self) -> None:
         """Connects to the SQLite database."""
         # Place DB in the same directory as the config file
         # (within the package data dir)
         db_dir = os.path.dirname(get_config_path())
         db_path = os.path.join(db_dir, DB_NAME)
-        print(f"DB Path: {db_path}")
+        logger.debug("DB Path: %s", db_path)
         self.conn = sqlite3.connect(db_path)
         self.cursor = self.conn.cursor()
 
@@ -0,0 +1,342 @@
+# data/job_store.py
+"""
+Persistence for background jobs (long date catch-ups, imports, exports).
+
+Each backend that stores users also stores its jobs so that job status
+survives a worker restart. The JSON backend has no database, so jobs are
+kept in memory.
+
+Jobs run on threads of the API process, so a job still queued or running
+when the process stops would never finish. Initializing a store marks
+such jobs failed (see INTERRUPTED_ERROR); a store is initialized once per
+process, before it runs any job.
+
+Finished jobs are kept until the runner prunes them (see JobStore.prune).
+"""
+
+import json
+import sqlite3
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable
+
+# Job states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+FINISHED_STATES = (JOB_SUCCEEDED, JOB_FAILED)
+
+# Error recorded on jobs left unfinished by a stopped process
+INTERRUPTED_ERROR = "Interrupted by a restart"
+
+
+@dataclass
+class JobRecord:  # pylint: disable=too-many-instance-attributes
+    """A background job and its progress."""
+
+    username: str
+    kind: str
+    params: dict[str, Any] = field(default_factory=dict)
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    status: str = JOB_QUEUED
+    progress: int = 0
+    total: int | None = None
+    message: str | None = None
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    created_at: datetime = field(default_factory=datetime.now)
+    updated_at: datetime = field(default_factory=datetime.now)
+
+    @property
+    def is_finished(self) -> bool:
+        """Whether the job has succeeded or failed."""
+        return self.status in FINISHED_STATES
+
+
+class JobStore(ABC):
+    """
+    Abstract Base Class for job persistence.
+    Implementations must be safe to call from worker threads.
+    """
+
+    @abstractmethod
+    def initialize(self) -> None:
+        """
+        Create storage if needed and fail the jobs a stopped process left
+        queued or running. Must be idempotent.
+        """
+
+    @abstractmethod
+    def save(self, job: JobRecord) -> None:
+        """Insert or update a job."""
+
+    @abstractmethod
+    def get(self, job_id: str) -> JobRecord | None:
+        """Return a job by ID, or None if it does not exist."""
+
+    @abstractmethod
+    def list_for_user(self, username: str, limit: int = 50) -> list[JobRecord]:
+        """Return a user's most recent jobs, newest first."""
+
+    @abstractmethod
+    def prune(self, finished_before: datetime) -> list[JobRecord]:
+        """Delete the jobs finished before a time and return them."""
+
+
+class InMemoryJobStore(JobStore):
+    """Job store for backends without a database (and for tests)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._jobs: dict[str, JobRecord] = {}
+
+    def initialize(self) -> None:
+        """Nothing to create or recover for in-memory storage."""
+
+    def save(self, job: JobRecord) -> None:
+        with self._lock:
+            self._jobs[job.id] = job
+
+    def get(self, job_id: str) -> JobRecord | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_for_user(self, username: str, limit: int = 50) -> list[JobRecord]:
+        with self._lock:
+            jobs = [job for job in self._jobs.values() if job.username == username]
+        jobs.sort(key=lambda job: job.created_at, reverse=True)
+        return jobs[:limit]
+
+    def prune(self, finished_before: datetime) -> list[JobRecord]:
+        with self._lock:
+            pruned = [
+                job
+                for job in self._jobs.values()
+                if job.is_finished and job.updated_at < finished_before
+            ]
+            for job in pruned:
+                del self._jobs[job.id]
+        return pruned
+
+
+# Column order shared by the SQL stores
+_JOB_COLUMNS = (
+    "id, username, kind, status, progress, total, message, params, result, "
+    "error, created_at, updated_at"
+)
+
+
+# The finished jobs last updated before a time (placeholder: the time)
+_FINISHED_BEFORE_SQL = (
+    f"FROM jobs WHERE status IN ('{JOB_SUCCEEDED}', '{JOB_FAILED}') "
+    "AND updated_at < {0}"
+)
+
+# Fails the unfinished jobs of a stopped process (placeholders: error, now)
+_FAIL_INTERRUPTED_SQL = (
+    f"UPDATE jobs SET status = '{JOB_FAILED}', error = {{0}}, updated_at = {{0}} "
+    f"WHERE status IN ('{JOB_QUEUED}', '{JOB_RUNNING}')"
+)
+
+
+def _job_to_row(job: JobRecord) -> tuple:
+    """Flatten a job into a row in _JOB_COLUMNS order."""
+    return (
+        job.id,
+        job.username,
+        job.kind,
+        job.status,
+        job.progress,
+        job.total,
+        job.message,
+        json.dumps(job.params, default=str),
+        json.dumps(job.result, default=str) if job.result is not None else None,
+        job.error,
+        job.created_at.isoformat(),
+        job.updated_at.isoformat(),
+    )
+
+
+def _row_to_job(row: Any) -> JobRecord:
+    """Build a job from a row (sqlite3.Row or dict)."""
+
+    def _load(value: Any) -> Any:
+        # Postgres JSONB columns arrive already decoded
+        return json.loads(value) if isinstance(value, str) else value
+
+    def _timestamp(value: Any) -> datetime:
+        return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+    return JobRecord(
+        id=row["id"],
+        username=row["username"],
+        kind=row["kind"],
+        status=row["status"],
+        progress=row["progress"],
+        total=row["total"],
+        message=row["message"],
+        params=_load(row["params"]) or {},
+        result=_load(row["result"]),
+        error=row["error"],
+        created_at=_timestamp(row["created_at"]),
+        updated_at=_timestamp(row["updated_at"]),
+    )
+
+
+class SqliteJobStore(JobStore):
+    """Stores jobs in the SQLite database used by DatabaseDataManager."""
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection]) -> None:
+        """
+        Args:
+            connect: Returns a new connection to the application database.
+        """
+        self._connect = connect
+
+    def initialize(self) -> None:
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    username TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress INTEGER NOT NULL DEFAULT 0,
+                    total INTEGER,
+                    message TEXT,
+                    params TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_username ON jobs (username)"
+            )
+            conn.execute(
+                _FAIL_INTERRUPTED_SQL.format("?"),
+                (INTERRUPTED_ERROR, datetime.now().isoformat()),
+            )
+
+    def save(self, job: JobRecord) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO jobs ({_JOB_COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                _job_to_row(job),
+            )
+
+    def get(self, job_id: str) -> JobRecord | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {_JOB_COLUMNS} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return _row_to_job(row) if row else None
+
+    def list_for_user(self, username: str, limit: int = 50) -> list[JobRecord]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {_JOB_COLUMNS} FROM jobs WHERE username = ? "
+                "ORDER BY created_at DESC LIMIT ?",
+                (username, limit),
+            ).fetchall()
+        return [_row_to_job(row) for row in rows]
+
+    def prune(self, finished_before: datetime) -> list[JobRecord]:
+        where = _FINISHED_BEFORE_SQL.format("?")
+        params = (finished_before.isoformat(),)
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT {_JOB_COLUMNS} {where}", params).fetchall()
+            conn.execute(f"DELETE {where}", params)
+        return [_row_to_job(row) for row in rows]
+
+
+class PostgresJobStore(JobStore):
+    """Stores jobs in the PostgreSQL database used by PostgresDataManager."""
+
+    def __init__(self, connect: Callable[[], Any]) -> None:
+        """
+        Args:
+            connect: Returns a new psycopg2 connection with a dict cursor factory.
+        """
+        self._connect = connect
+
+    def initialize(self) -> None:
+        with self._connect() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS jobs (
+                        id TEXT PRIMARY KEY,
+                        username TEXT NOT NULL,
+                        kind TEXT NOT NULL,
+                        status TEXT NOT NULL,
+                        progress INTEGER NOT NULL DEFAULT 0,
+                        total INTEGER,
+                        message TEXT,
+                        params JSONB,
+                        result JSONB,
+                        error TEXT,
+                        created_at TIMESTAMP NOT NULL,
+                        updated_at TIMESTAMP NOT NULL
+                    )
+                """)
+                cursor.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_jobs_username ON jobs (username)"
+                )
+                cursor.execute(
+                    _FAIL_INTERRUPTED_SQL.format("%s"),
+                    (INTERRUPTED_ERROR, datetime.now()),
+                )
+            conn.commit()
+
+    def save(self, job: JobRecord) -> None:
+        with self._connect() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO jobs ({_JOB_COLUMNS}) "
+                    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
+                    "ON CONFLICT (id) DO UPDATE SET status = EXCLUDED.status, "
+                    "progress = EXCLUDED.progress, total = EXCLUDED.total, "
+                    "message = EXCLUDED.message, result = EXCLUDED.result, "
+                    "error = EXCLUDED.error, updated_at = EXCLUDED.updated_at",
+                    _job_to_row(job),
+                )
+            conn.commit()
+
+    def get(self, job_id: str) -> JobRecord | None:
+        with self._connect() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT {_JOB_COLUMNS} FROM jobs WHERE id = %s", (job_id,)
+                )
+                row = cursor.fetchone()
+        return _row_to_job(row) if row else None
+
+    def list_for_user(self, username: str, limit: int = 50) -> list[JobRecord]:
+        with self._connect() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT {_JOB_COLUMNS} FROM jobs WHERE username = %s "
+                    "ORDER BY created_at DESC LIMIT %s",
+                    (username, limit),
+                )
+                rows = cursor.fetchall()
+        return [_row_to_job(row) for row in rows]
+
+    def prune(self, finished_before: datetime) -> list[JobRecord]:
+        with self._connect() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE {_FINISHED_BEFORE_SQL.format('%s')} "
+                    f"RETURNING {_JOB_COLUMNS}",
+                    (finished_before.isoformat(),),
+                )
+                rows = cursor.fetchall()
+            conn.commit()
+        return [_row_to_job(row) for row in rows]
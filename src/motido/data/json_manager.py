@@ -4,21 +4,27 @@ Implementation of the DataManager interface using JSON file storage.
 """
 
 import json
+import logging
 import os
 import uuid
+from dataclasses import fields
 from datetime import date, datetime
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, List
 
+from motido.core.metrics import timed
 from motido.core.models import (
+    ArchiveSummary,
     Badge,
     Difficulty,
     Duration,
+    LazyTasks,
     Priority,
     Project,
     RecurrenceType,
     SubtaskRecurrenceMode,
     Tag,
     Task,
+    TaskCounts,
     User,
     XPTransaction,
 )
@@ -28,11 +34,14 @@ from motido.core.utils import (
     parse_priority_safely,
 )
 
-from .abstraction import DEFAULT_USERNAME, DataManager
+from .abstraction import DEFAULT_USERNAME, DataManager, newest_xp_transactions
 from .config import get_config_path
 
+logger = logging.getLogger(__name__)
+
 DATA_DIR = "motido_data"
 USERS_FILE = "users.json"
+ARCHIVE_FILE = "archive.json"  # Archived tasks, by username
 
 
 class JsonDataManager(DataManager):
@@ -41,6 +50,12 @@ class JsonDataManager(DataManager):
     def __init__(self) -> None:
         """Initializes the JSON data manager."""
         self._data_path = self._get_data_path()
+        self._archive_path = os.path.join(
+            os.path.dirname(self._data_path), ARCHIVE_FILE
+        )
+        # Each user's stored task and archive summaries as last loaded or
+        # saved, with the data_version() they are current for
+        self._summaries: Dict[str, tuple[int | None, Dict[str, Any]]] = {}
 
     def _get_data_path(self) -> str:
         """Gets the path to the main data file (users.json)."""
@@ -62,9 +77,9 @@ class JsonDataManager(DataManager):
         if not os.path.exists(self._data_path):
             # Create an empty structure if the file is new
             self._write_data({})  # Start with an empty JSON object
-            print(f"Initialized empty data file at: {self._data_path}")
+            logger.info("Initialized empty data file at: %s", self._data_path)
         else:
-            print(f"Data file already exists at: {self._data_path}")
+            logger.info("Data file already exists at: %s", self._data_path)
 
     def _read_data(self) -> Dict[str, Any]:
         """
@@ -82,11 +97,11 @@ class JsonDataManager(DataManager):
                 # Return loaded data, defaulting to empty dict if file was empty
                 return data if data else {}
         except json.JSONDecodeError as e:
-            print(f"Error decoding JSON data: {e}")
+            logger.error("Error decoding JSON data: %s", e)
             # In case of corrupted file, return empty dict (could be handled better)
             return {}
         except IOError as e:
-            print(f"Error reading data file: {e}")  # pragma: no cover
+            logger.error("Error reading data file: %s", e)  # pragma: no cover
             # In case of file access error, return empty dict (could be handled better)
             return {}  # pragma: no cover
 
@@ -102,7 +117,7 @@ class JsonDataManager(DataManager):
             with open(self._data_path, "w", encoding="utf-8") as file:
                 json.dump(data, file, indent=2)  # Pretty-print with 2-space indent
         except IOError as e:
-            print(f"Error writing to data file: {e}")
+            logger.error("Error writing to data file: %s", e)
             raise  # Re-raise to signal failure to the caller
 
     def _parse_datetime_field(
@@ -114,7 +129,9 @@ class JsonDataManager(DataManager):
         try:
             return datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
         except ValueError:
-            print(f"Warning: Invalid {field_name} format for task {task_id}, ignoring.")
+            logger.warning(
+                "Invalid %s format for task %s, ignoring.", field_name, task_id
+            )
             return None
 
     def _deserialize_task(self, task_dict: Dict[str, Any]) -> Task:
@@ -330,6 +347,12 @@ class JsonDataManager(DataManager):
                 for proj_dict in user_data.get("defined_projects", [])
             ]
 
+            # Archived tasks only appear in backups (see motido.data.backup)
+            archived_tasks = [
+                self._deserialize_task(task_dict)
+                for task_dict in user_data.get("archived_tasks", [])
+            ]
+
             # Create User object
             total_xp = user_data.get("total_xp", 0)
 
@@ -352,89 +375,189 @@ class JsonDataManager(DataManager):
                 badges=badges,
                 defined_tags=defined_tags,
                 defined_projects=defined_projects,
+                archived_tasks=LazyTasks.of(archived_tasks, frozenset()),
+                archive_summary=ArchiveSummary.from_dict(
+                    user_data.get("archive_summary")
+                ),
             )
         except (TypeError, KeyError, ValueError) as e:
             raise ValueError(f"Invalid user data format: {e}") from e
 
+    @timed("load_user")
     def load_user(self, username: str = DEFAULT_USERNAME) -> User | None:
         """Loads a specific user's data from the JSON file."""
         # Placeholder for future sync: Check for remote changes before loading
-        print(f"Loading user '{username}' from JSON...")
+        logger.debug("Loading user '%s' from JSON...", username)
+        version = self.data_version()
         all_data = self._read_data()
         user_data = all_data.get(username)
 
         if user_data:
             try:
                 user = self.deserialize_user_data(user_data, username)
-                print(f"User '{username}' loaded successfully.")
+                user.archived_tasks = LazyTasks(
+                    lambda: self.load_archived_tasks(username)
+                )
+                self._remember_summaries(username, user_data, version)
+                logger.debug("User '%s' loaded successfully.", username)
                 return user
             except ValueError as e:  # pragma: no cover
-                print(f"Error deserializing user data for '{username}': {e}")
+                logger.error("Error deserializing user data for '%s': %s", username, e)
                 return None  # Or handle corrupted data more gracefully
         else:
-            print(f"User '{username}' not found in JSON data.")
+            logger.info("User '%s' not found in JSON data.", username)
             # Optionally create a new user here if desired
             # return User(username=username)
             return None
 
+    @staticmethod
+    def _active_task_ids(task_dicts: List[Dict[str, Any]]) -> set[str]:
+        """
+        IDs of the stored tasks an active-set load puts into User.tasks.
+
+        Incomplete tasks, plus the root and latest instance (the one no other
+        task names as parent) of every habit series that has not ended.
+        """
+        parent_ids = {task.get("parent_habit_id") for task in task_dicts}
+        return {
+            task["id"]
+            for task in task_dicts
+            if not task.get("is_complete", False)
+            or (
+                task.get("is_habit", False)
+                and not task.get("recurrence_ended_at")
+                and (not task.get("parent_habit_id") or task["id"] not in parent_ids)
+            )
+        }
+
+    @timed("load_user")
+    def load_active_user(self, username: str = DEFAULT_USERNAME) -> User | None:
+        """Loads a user's active tasks, leaving the rest in the file until needed."""
+        logger.debug("Loading active tasks of user '%s' from JSON...", username)
+        version = self.data_version()
+        user_data = self._read_data().get(username)
+        if not user_data:
+            logger.info("User '%s' not found in JSON data.", username)
+            return None
+
+        stored_tasks = user_data.get("tasks", [])
+        active_ids = self._active_task_ids(stored_tasks)
+        active_data = {
+            **user_data,
+            "tasks": [task for task in stored_tasks if task["id"] in active_ids],
+        }
+        try:
+            user = self.deserialize_user_data(active_data, username)
+        except ValueError as e:  # pragma: no cover
+            logger.error("Error deserializing user data for '%s': %s", username, e)
+            return None
+        user.inactive_tasks = LazyTasks(
+            lambda: self._load_inactive_tasks(user), frozenset(active_ids)
+        )
+        user.archived_tasks = LazyTasks(lambda: self.load_archived_tasks(username))
+        self._remember_summaries(username, user_data, version)
+        return user
+
+    def list_usernames(self) -> List[str]:
+        """Returns the keys of the data file, sorted."""
+        return sorted(self._read_data())
+
+    def _load_inactive_tasks(self, user: User) -> List[Task]:
+        """Reads the stored tasks an active-set load of user skipped."""
+        logger.debug("Fetching inactive tasks of user '%s'...", user.username)
+        skip = user.inactive_tasks.active_ids | {task.id for task in user.tasks}
+        stored_tasks = self._read_data().get(user.username, {}).get("tasks", [])
+        return [
+            self._deserialize_task(task)
+            for task in stored_tasks
+            if task["id"] not in skip
+        ]
+
+    @staticmethod
+    def _serialize_task(task: Task) -> Dict[str, Any]:
+        """Serialize a task into its stored dictionary form."""
+        return {
+            "id": task.id,
+            "title": task.title,
+            "text_description": task.text_description,
+            "priority": task.priority.value,  # Save the priority value as string
+            "difficulty": task.difficulty.value,  # Save the difficulty value
+            "duration": task.duration.value,  # Save the duration value
+            "is_complete": task.is_complete,  # Save the completion status
+            "creation_date": (
+                task.creation_date.strftime("%Y-%m-%d %H:%M:%S")
+                if task.creation_date
+                else None
+            ),
+            "due_date": (
+                task.due_date.strftime("%Y-%m-%d %H:%M:%S") if task.due_date else None
+            ),
+            "start_date": (
+                task.start_date.strftime("%Y-%m-%d %H:%M:%S")
+                if task.start_date
+                else None
+            ),
+            "icon": task.icon,
+            "tags": task.tags,
+            "project": task.project,
+            "subtasks": task.subtasks,
+            "dependencies": task.dependencies,
+            "history": task.history,
+            "is_habit": task.is_habit,
+            "recurrence_rule": task.recurrence_rule,
+            "recurrence_type": (
+                task.recurrence_type.value if task.recurrence_type else None
+            ),
+            "streak_current": task.streak_current,
+            "streak_best": task.streak_best,
+            "parent_habit_id": task.parent_habit_id,
+            "subtask_recurrence_mode": task.subtask_recurrence_mode.value,
+            "defer_until": (
+                task.defer_until.strftime("%Y-%m-%d %H:%M:%S")
+                if task.defer_until
+                else None
+            ),
+            "recurrence_ended_at": (
+                task.recurrence_ended_at.strftime("%Y-%m-%d %H:%M:%S")
+                if task.recurrence_ended_at
+                else None
+            ),
+        }
+
     def save_user(self, user: User) -> None:
         """Saves a specific user's data to the JSON file."""
-        print(f"Saving user '{user.username}' to JSON...")
-        all_data = self._read_data()
+        self._save_user(user)
 
-        # Serialize tasks
-        tasks_data = [
-            {
-                "id": task.id,
-                "title": task.title,
-                "text_description": task.text_description,
-                "priority": task.priority.value,  # Save the priority value as string
-                "difficulty": task.difficulty.value,  # Save the difficulty value
-                "duration": task.duration.value,  # Save the duration value
-                "is_complete": task.is_complete,  # Save the completion status
-                "creation_date": (
-                    task.creation_date.strftime("%Y-%m-%d %H:%M:%S")
-                    if task.creation_date
-                    else None
-                ),
-                "due_date": (
-                    task.due_date.strftime("%Y-%m-%d %H:%M:%S")
-                    if task.due_date
-                    else None
-                ),
-                "start_date": (
-                    task.start_date.strftime("%Y-%m-%d %H:%M:%S")
-                    if task.start_date
-                    else None
-                ),
-                "icon": task.icon,
-                "tags": task.tags,
-                "project": task.project,
-                "subtasks": task.subtasks,
-                "dependencies": task.dependencies,
-                "history": task.history,
-                "is_habit": task.is_habit,
-                "recurrence_rule": task.recurrence_rule,
-                "recurrence_type": (
-                    task.recurrence_type.value if task.recurrence_type else None
-                ),
-                "streak_current": task.streak_current,
-                "streak_best": task.streak_best,
-                "parent_habit_id": task.parent_habit_id,
-                "subtask_recurrence_mode": task.subtask_recurrence_mode.value,
-                "defer_until": (
-                    task.defer_until.strftime("%Y-%m-%d %H:%M:%S")
-                    if task.defer_until
-                    else None
-                ),
-                "recurrence_ended_at": (
-                    task.recurrence_ended_at.strftime("%Y-%m-%d %H:%M:%S")
-                    if task.recurrence_ended_at
-                    else None
-                ),
-            }
-            for task in user.tasks
-        ]
+    @timed("save_user")
+    def _save_user(
+        self, user: User, archived_counts: Dict[str, Any] | None = None
+    ) -> None:
+        """
+        Saves a user, keeping their task summary up to date.
+
+        Args:
+            user: The user to save.
+            archived_counts: The per-habit day counts of the user's archived
+                tasks, if they changed; kept from the stored summary if not.
+        """
+        logger.debug("Saving user '%s' to JSON...", user.username)
+        all_data = self._read_data()
+        if archived_counts is None:
+            archived_counts = self._archived_counts(
+                user.username, all_data.get(user.username, {})
+            )
+        inactive = user.inactive_tasks
+        tasks = user.all_tasks() if inactive.loaded else user.tasks
+
+        tasks_data = [self._serialize_task(task) for task in tasks]
+        if not inactive.loaded:
+            # Write back, untouched, the stored tasks the user never loaded
+            skip = inactive.active_ids | {task.id for task in user.tasks}
+            tasks_data.extend(
+                task
+                for task in all_data.get(user.username, {}).get("tasks", [])
+                if task["id"] not in skip
+            )
         # Prepare user data for JSON
         user_data = {
             "username": user.username,
@@ -493,13 +616,259 @@ class JsonDataManager(DataManager):
                 for proj in getattr(user, "defined_projects", [])
             ],
         }
+        if user.archive_summary.completed_tasks:
+            user_data["archive_summary"] = user.archive_summary.to_dict()
+        user_data["task_summary"] = self._summarize_tasks(tasks_data, archived_counts)
 
         # Update the specific user's data in the overall structure
         all_data[user.username] = user_data
         self._write_data(all_data)
-        print(f"User '{user.username}' saved successfully.")
+        self._remember_summaries(user.username, user_data, self.data_version())
+        logger.debug("User '%s' saved successfully.", user.username)
         # Placeholder for future sync: Push changes to remote after saving
 
+    @staticmethod
+    def _series_counts(
+        task_dicts: Iterable[Dict[str, Any]], *, main: bool
+    ) -> Dict[str, Dict[str, List[int]]]:
+        """
+        [completed, total] counts of stored tasks by series and due date.
+
+        Series "" (if main) counts every task; a habit's ID counts the habit
+        and the instances naming it as parent. Days are ISO dates.
+        """
+        by_series: Dict[str, Dict[str, List[int]]] = {}
+        for task in task_dicts:
+            if not task.get("due_date"):
+                continue
+            series = [""] if main else []
+            if task.get("is_habit"):
+                series.append(task["id"])
+            if task.get("parent_habit_id"):
+                series.append(task["parent_habit_id"])
+            for habit_id in series:
+                by_day = by_series.setdefault(habit_id, {})
+                counts = by_day.setdefault(task["due_date"][:10], [0, 0])
+                counts[0] += bool(task.get("is_complete"))
+                counts[1] += 1
+        return by_series
+
+    def _archived_counts(
+        self, username: str, user_data: Dict[str, Any]
+    ) -> Dict[str, Dict[str, List[int]]]:
+        """
+        The per-habit day counts of a user's archived tasks.
+
+        Kept in the stored task summary; users saved before it was are
+        counted from the archive file.
+        """
+        summary = user_data.get("task_summary") or {}
+        if "archived_daily_summary" in summary:
+            archived: Dict[str, Dict[str, List[int]]] = summary[
+                "archived_daily_summary"
+            ]
+            return archived
+        return self._series_counts(self._read_archive().get(username, []), main=False)
+
+    @classmethod
+    def _summarize_tasks(
+        cls,
+        task_dicts: List[Dict[str, Any]],
+        archived_counts: Dict[str, Dict[str, List[int]]],
+    ) -> Dict[str, Any]:
+        """
+        The summary save_user keeps next to a user's tasks.
+
+        It holds the TaskCounts fields and the day counts by series of the
+        user's tasks (daily_summary) and archived tasks, so aggregate
+        queries skip deserializing tasks.
+        """
+        roots = [
+            task
+            for task in task_dicts
+            if task.get("is_habit") and not task.get("parent_habit_id")
+        ]
+        return {
+            "total": len(task_dicts),
+            "completed": sum(bool(task.get("is_complete")) for task in task_dicts),
+            "habits": len(roots),
+            "current_streak": max(
+                (task.get("streak_current", 0) for task in roots), default=0
+            ),
+            "best_streak": max(
+                (task.get("streak_best", 0) for task in roots), default=0
+            ),
+            "daily_summary": cls._series_counts(task_dicts, main=True),
+            "archived_daily_summary": archived_counts,
+        }
+
+    def _remember_summaries(
+        self, username: str, user_data: Dict[str, Any], version: int | None
+    ) -> None:
+        """Caches the summaries stored in user_data as of data file version."""
+        self._summaries[username] = (
+            version,
+            {key: user_data.get(key) for key in ("task_summary", "archive_summary")},
+        )
+
+    def _stored_summaries(self, username: str) -> Dict[str, Any]:
+        """
+        The user's stored summaries, reread when the data file changed since
+        they were last loaded or saved.
+        """
+        version = self.data_version()
+        cached = self._summaries.get(username)
+        if cached is None or cached[0] != version:
+            self._remember_summaries(
+                username, self._read_data().get(username, {}), version
+            )
+            cached = self._summaries[username]
+        return cached[1]
+
+    def _task_summary(self, username: str) -> Dict[str, Any]:
+        """
+        The user's task summary as last saved.
+
+        Users from files saved before summaries were kept are summarized
+        from the stored task dicts.
+        """
+        summary: Dict[str, Any] | None = self._stored_summaries(username)[
+            "task_summary"
+        ]
+        if summary is None or "archived_daily_summary" not in summary:
+            user_data = self._read_data().get(username, {})
+            summary = self._summarize_tasks(
+                user_data.get("tasks", []),
+                self._archived_counts(username, user_data),
+            )
+        return summary
+
+    def task_counts(self, user: User) -> TaskCounts:
+        """Reads the totals from the user's task summary."""
+        summary = self._task_summary(user.username)
+        return TaskCounts(
+            **{field.name: summary[field.name] for field in fields(TaskCounts)}
+        )
+
+    def load_archive_summary(self, username: str) -> ArchiveSummary:
+        """Reads the archive summary stored next to the user's tasks."""
+        return ArchiveSummary.from_dict(
+            self._stored_summaries(username)["archive_summary"]
+        )
+
+    def completion_counts_by_day(
+        self, username: str, start: date, end: date, habit_id: str | None = None
+    ) -> Dict[date, tuple[int, int]]:
+        """Reads the day counts from the user's task summary."""
+        summary = self._task_summary(username)
+        series = [summary["daily_summary"].get(habit_id or "", {})]
+        if habit_id:
+            series.append(summary["archived_daily_summary"].get(habit_id, {}))
+
+        first, last = start.isoformat(), end.isoformat()
+        counts: Dict[date, tuple[int, int]] = {}
+        for by_day in series:
+            for day, (completed, total) in by_day.items():
+                if first <= day <= last:
+                    done = counts.get(date.fromisoformat(day), (0, 0))
+                    counts[date.fromisoformat(day)] = (
+                        done[0] + completed,
+                        done[1] + total,
+                    )
+        return counts
+
+    def rebuild_daily_summary(self, username: str = DEFAULT_USERNAME) -> int:
+        """Recounts the user's stored task summary from the data and archive files."""
+        all_data = self._read_data()
+        user_data = all_data.get(username)
+        if user_data is None:
+            return 0
+        summary = self._summarize_tasks(
+            user_data.get("tasks", []), self._archived_counts(username, {})
+        )
+        user_data["task_summary"] = summary
+        self._write_data(all_data)
+        count = sum(
+            len(by_day)
+            for key in ("daily_summary", "archived_daily_summary")
+            for by_day in summary[key].values()
+        )
+        logger.info("Rebuilt %s daily summary rows of user '%s'.", count, username)
+        return count
+
+    def _read_archive(self) -> Dict[str, Any]:
+        """Reads the archive file ({username: [task dicts]}), empty if missing."""
+        try:
+            if not os.path.exists(self._archive_path):
+                return {}
+            with open(self._archive_path, "r", encoding="utf-8") as file:
+                return json.load(file) or {}
+        except json.JSONDecodeError as e:
+            logger.error("Error decoding archive data: %s", e)
+            return {}
+        except IOError as e:  # pragma: no cover
+            logger.error("Error reading archive file: %s", e)
+            return {}
+
+    def load_xp_log(
+        self, username: str, *, limit: int, offset: int = 0
+    ) -> List[XPTransaction]:
+        """Pages the user's XP transactions without deserializing their tasks."""
+        transactions = self._read_data().get(username, {}).get("xp_transactions", [])
+        return newest_xp_transactions(
+            (self._deserialize_xp_transaction(t) for t in transactions),
+            limit=limit,
+            offset=offset,
+        )
+
+    def load_archived_tasks(self, username: str = DEFAULT_USERNAME) -> List[Task]:
+        """Reads a user's archived tasks from the archive file."""
+        logger.debug("Fetching archived tasks of user '%s'...", username)
+        return [
+            self._deserialize_task(task_dict)
+            for task_dict in self._read_archive().get(username, [])
+        ]
+
+    def archive_tasks(
+        self, user: User, tasks: List[Task], *, replace: bool = False
+    ) -> None:
+        """
+        Adds tasks to the archive file, then saves the user.
+
+        The archive lives in its own file so loading and saving users.json
+        no longer reads and rewrites years of completed tasks. Archived
+        tasks replace stored ones with the same ID, so if saving the user
+        fails after the archive was written, archiving again does not
+        duplicate them. The archive file is replaced in one rename, never
+        left half-written.
+        """
+        archive = self._read_archive()
+        by_id = {
+            task_dict["id"]: task_dict
+            for task_dict in ([] if replace else archive.get(user.username, []))
+        }
+        by_id.update((task.id, self._serialize_task(task)) for task in tasks)
+        archived = archive[user.username] = list(by_id.values())
+        self._ensure_data_dir_exists()
+        temp_path = f"{self._archive_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(archive, file, indent=2)
+        os.replace(temp_path, self._archive_path)
+        logger.info("Archived %s tasks of user '%s'.", len(tasks), user.username)
+        self._save_user(user, self._series_counts(archived, main=False))
+
+    def data_version(self) -> int | None:
+        """
+        Returns the data file's modification time in ns (None if missing).
+
+        Long-lived processes (the CLI daemon) compare versions to detect
+        writes made by other processes.
+        """
+        try:
+            return os.stat(self._data_path).st_mtime_ns
+        except OSError:
+            return None
+
     def backend_type(self) -> str:
         """Returns the backend type."""
         return "json"
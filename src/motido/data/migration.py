@@ -0,0 +1,213 @@
+# data/migration.py
+"""
+Copies every user from one storage backend to another (`motido migrate`).
+
+Users are copied one at a time, so only one user is held in memory. Each
+target backend writes a user's tasks and XP transactions with its own bulk
+path (executemany on SQLite, execute_values or COPY on Postgres). Archived
+tasks are copied through the target's archive tier.
+
+Progress is checkpointed to a JSON file after every user. Rerunning with
+the same checkpoint skips the users already copied, so an interrupted
+migration resumes where it stopped. Once every user is copied, each one is
+read back from the target and compared with the source by row counts and
+a checksum of its data.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from motido.core.models import Task, User
+
+from .abstraction import DataManager
+from .backup import (
+    serialize_project,
+    serialize_tag,
+    serialize_task,
+    serialize_user_fields,
+    serialize_xp_transaction,
+)
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+
+@dataclass(slots=True)
+class UserDigest:
+    """Row counts and checksum of one user's data."""
+
+    tasks: int
+    archived_tasks: int
+    xp_transactions: int
+    checksum: str
+
+
+@dataclass(slots=True)
+class MigrationResult:
+    """What a migration run did."""
+
+    migrated: list[str] = field(default_factory=list)  # Copied by this run
+    skipped: list[str] = field(default_factory=list)  # Copied by an earlier run
+    mismatches: dict[str, str] = field(default_factory=dict)  # Failed verification
+
+
+def _sorted_tasks(tasks: list[Task]) -> list[dict[str, Any]]:
+    return [serialize_task(task) for task in sorted(tasks, key=lambda t: t.id)]
+
+
+def digest_user(user: User, archived: list[Task]) -> UserDigest:
+    """
+    Summarize the data every backend stores for a user.
+
+    The checksum covers the user's fields, tag and project definitions,
+    tasks, archived tasks and XP transactions in the backup format (see
+    motido.data.backup), sorted by ID so storage order does not matter.
+
+    Args:
+        user: The user, with every task loaded.
+        archived: The user's archived tasks.
+
+    Returns:
+        The user's digest.
+    """
+    tasks = user.all_tasks()
+    transactions = sorted(user.xp_transactions, key=lambda t: t.id)
+    payload = {
+        "user": serialize_user_fields(user),
+        "password_hash": user.password_hash,
+        "archive_summary": user.archive_summary.to_dict(),
+        "defined_tags": [serialize_tag(tag) for tag in user.defined_tags],
+        "defined_projects": [serialize_project(p) for p in user.defined_projects],
+        "tasks": _sorted_tasks(tasks),
+        "archived_tasks": _sorted_tasks(archived),
+        "xp_transactions": [serialize_xp_transaction(t) for t in transactions],
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return UserDigest(
+        tasks=len(tasks),
+        archived_tasks=len(archived),
+        xp_transactions=len(transactions),
+        checksum=hashlib.sha256(encoded).hexdigest(),
+    )
+
+
+def _read_checkpoint(path: str, source: str, target: str) -> dict[str, Any]:
+    """Load the checkpoint at path, or start one for this source and target."""
+    if not os.path.exists(path):
+        return {
+            "version": CHECKPOINT_VERSION,
+            "source": source,
+            "target": target,
+            "users": {},
+        }
+    with open(path, "r", encoding="utf-8") as f:
+        checkpoint: dict[str, Any] = json.load(f)
+    if (checkpoint.get("source"), checkpoint.get("target")) != (source, target):
+        raise ValueError(
+            f"Checkpoint '{path}' belongs to a migration from "
+            f"{checkpoint.get('source')} to {checkpoint.get('target')}."
+        )
+    return checkpoint
+
+
+def _write_checkpoint(path: str, checkpoint: dict[str, Any]) -> None:
+    """Replace the checkpoint file, never leaving a half-written one."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def _copy_user(target: DataManager, user: User, archived: list[Task]) -> None:
+    """Save a user to the target, archiving what it does not have yet."""
+    # A rerun after an interruption must not archive the same task twice
+    copied = {task.id for task in target.load_archived_tasks(user.username)}
+    pending = [task for task in archived if task.id not in copied]
+    if pending:
+        target.archive_tasks(user, pending)
+    else:
+        target.save_user(user)
+
+
+def verify_user(target: DataManager, username: str, expected: UserDigest) -> str | None:
+    """
+    Compare a user read back from the target with the source's digest.
+
+    Returns:
+        A description of the first difference, or None if they match.
+    """
+    user = target.load_user(username)
+    if user is None:
+        return "missing from the target"
+    found = digest_user(user, target.load_archived_tasks(username))
+    for name in ("tasks", "archived_tasks", "xp_transactions"):
+        if getattr(found, name) != getattr(expected, name):
+            return (
+                f"{name.replace('_', ' ')}: expected {getattr(expected, name)}, "
+                f"found {getattr(found, name)}"
+            )
+    if found.checksum != expected.checksum:
+        return "checksum mismatch"
+    return None
+
+
+def migrate_backend(
+    source: DataManager,
+    target: DataManager,
+    checkpoint_path: str,
+    on_user: Callable[[str, UserDigest], None] | None = None,
+) -> MigrationResult:
+    """
+    Copy every user from source to target, then verify the copies.
+
+    Both backends must be initialized. Existing users in the target with
+    the same username are overwritten.
+
+    Args:
+        source: The backend to read users from.
+        target: The backend to write users to.
+        checkpoint_path: The checkpoint file; created if missing, resumed
+            from if it exists.
+        on_user: Called with each user's name and digest once it is copied.
+
+    Returns:
+        The users copied or skipped, and those failing verification.
+
+    Raises:
+        ValueError: If the checkpoint belongs to another source or target.
+    """
+    checkpoint = _read_checkpoint(
+        checkpoint_path, source.backend_type(), target.backend_type()
+    )
+    done: dict[str, Any] = checkpoint["users"]
+    result = MigrationResult()
+
+    for username in source.list_usernames():
+        if username in done:
+            result.skipped.append(username)
+            continue
+        user = source.load_user(username)
+        if user is None:  # Deleted since it was listed
+            continue
+        archived = source.load_archived_tasks(username)
+        _copy_user(target, user, archived)
+
+        digest = digest_user(user, archived)
+        done[username] = asdict(digest)
+        _write_checkpoint(checkpoint_path, checkpoint)
+        result.migrated.append(username)
+        logger.debug("Copied user '%s' (%s tasks).", username, digest.tasks)
+        if on_user is not None:
+            on_user(username, digest)
+
+    for username, expected in done.items():
+        problem = verify_user(target, username, UserDigest(**expected))
+        if problem is not None:
+            result.mismatches[username] = problem
+    return result
@@ -1,24 +1,32 @@
 # data/postgres_manager.py
-# pylint: disable=too-many-locals
+# pylint: disable=too-many-locals,too-many-lines
 """
 Implementation of the DataManager interface using PostgreSQL database storage.
 Designed for use with Vercel Postgres.
 """
 
+import io
 import json
+import logging
 import os
-from datetime import date, datetime
+import re
+from collections.abc import Mapping
+from datetime import date, datetime, timedelta
 from typing import Optional
 
+from motido.core.metrics import ROWS_UPSERTED, get_metrics, timed
 from motido.core.models import (
+    ArchiveSummary,
     Difficulty,
     Duration,
+    LazyTasks,
     Priority,
     Project,
     RecurrenceType,
     SubtaskRecurrenceMode,
     Tag,
     Task,
+    TaskCounts,
     User,
     XPTransaction,
 )
@@ -29,6 +37,7 @@ from motido.core.utils import (
 )
 
 from .abstraction import DEFAULT_USERNAME, DataManager
+from .job_store import PostgresJobStore
 
 # Try to import psycopg2, but allow graceful fallback
 try:
@@ -41,6 +50,232 @@ except ImportError:  # pragma: no cover
     psycopg2 = None  # pragma: no cover
     RealDictCursor = None  # pragma: no cover
 
+logger = logging.getLogger(__name__)
+
+# Rows an active-set load reads: incomplete tasks, plus the root and latest
+# instance (no child names it as parent) of every habit series not ended.
+# Takes the username parameter once more, after the main query's.
+ACTIVE_TASK_CONDITION = """(
+    NOT is_complete
+    OR (
+        is_habit
+        AND recurrence_ended_at IS NULL
+        AND (
+            parent_habit_id IS NULL
+            OR id NOT IN (
+                SELECT parent_habit_id FROM tasks
+                WHERE user_username = %s AND parent_habit_id IS NOT NULL
+            )
+        )
+    )
+)"""
+
+
+# Column order of the rows _task_row builds
+TASK_INSERT_COLUMNS = """
+    id, title, text_description, priority, difficulty, duration,
+    is_complete, creation_date, due_date, start_date,
+    icon, tags, project, subtasks, dependencies, history,
+    user_username, is_habit, recurrence_rule, recurrence_type,
+    streak_current, streak_best, parent_habit_id, habit_start_delta,
+    subtask_recurrence_mode, recurrence_ended_at, defer_until
+"""
+
+# Reads tasks rows with their tags, subtasks and dependencies assembled from
+# the task_* tables as tag_list, subtask_list and dependency_list. These are
+# NULL for a task without any, where _row_to_task falls back to the JSON
+# columns a row written before those tables existed still has.
+TASK_SELECT = """
+    SELECT tasks.*,
+        (SELECT jsonb_agg(tag ORDER BY position) FROM task_tags
+         WHERE task_id = tasks.id) AS tag_list,
+        (SELECT jsonb_agg(
+            jsonb_build_object('text', text, 'complete', complete)
+            ORDER BY position
+         ) FROM task_subtasks WHERE task_id = tasks.id) AS subtask_list,
+        (SELECT jsonb_agg(depends_on_id ORDER BY position) FROM task_dependencies
+         WHERE task_id = tasks.id) AS dependency_list
+    FROM tasks"""
+
+# The task_* tables and the columns of the rows _task_list_rows builds
+TASK_LIST_TABLES = (
+    ("task_tags", "task_id, position, tag, user_username"),
+    ("task_subtasks", "task_id, position, text, complete, user_username"),
+    ("task_dependencies", "task_id, position, depends_on_id, user_username"),
+)
+
+# Secondary indexes serving the access patterns of explain_queries
+SECONDARY_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_tasks_user_complete_due "
+    "ON tasks(user_username, is_complete, due_date)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_user_parent_habit "
+    "ON tasks(user_username, parent_habit_id)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_user_habit "
+    "ON tasks(user_username, is_habit)",
+    "CREATE INDEX IF NOT EXISTS idx_xp_transactions_user_game_date_source "
+    "ON xp_transactions(user_username, game_date, source)",
+)
+
+TAGGED_TASKS_SQL = "SELECT task_id FROM task_tags WHERE user_username = %s AND tag = %s"
+DEPENDENT_TASKS_SQL = (
+    "SELECT task_id FROM task_dependencies "
+    "WHERE user_username = %s AND depends_on_id = %s"
+)
+BLOCKED_TASKS_SQL = """
+    SELECT DISTINCT dep.task_id
+    FROM task_dependencies AS dep
+    JOIN tasks AS waiting ON waiting.id = dep.task_id
+    JOIN tasks AS needed ON needed.id = dep.depends_on_id
+    WHERE dep.user_username = %s
+        AND NOT waiting.is_complete
+        AND NOT needed.is_complete
+        AND needed.user_username = dep.user_username
+"""
+
+# Habit series roots, as counted by TaskCounts
+HABIT_ROOT_CONDITION = "is_habit AND NULLIF(parent_habit_id, '') IS NULL"
+TASK_COUNTS_SQL = f"""
+    SELECT
+        COUNT(*) AS total,
+        COUNT(*) FILTER (WHERE is_complete) AS completed,
+        COUNT(*) FILTER (WHERE {HABIT_ROOT_CONDITION}) AS habits,
+        MAX(streak_current) FILTER (WHERE {HABIT_ROOT_CONDITION}) AS current_streak,
+        MAX(streak_best) FILTER (WHERE {HABIT_ROOT_CONDITION}) AS best_streak
+    FROM tasks
+    WHERE user_username = %s
+"""
+# Per-day task counts: habit_id '' counts every task in the tasks table by
+# due day; a habit's ID counts the habit and the instances naming it as
+# parent, archived ones included. Statement triggers on tasks and
+# archived_tasks keep it up to date from their transition tables. _sync_tasks
+# upserts every loaded task, so on UPDATE the triggers first diff the old
+# and new rows and recount only those whose due day, completion state or
+# series changed: a save adjusts just the days of the rows it changed.
+DAILY_SUMMARY_TABLE = """
+    CREATE TABLE IF NOT EXISTS daily_summary (
+        user_username TEXT NOT NULL,
+        habit_id TEXT NOT NULL,
+        day DATE NOT NULL,
+        completed INTEGER NOT NULL DEFAULT 0,
+        total INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_username, habit_id, day)
+    )
+"""
+# The habit_id values a row counts towards (NULLs are skipped)
+_SUMMARY_SERIES = """ARRAY[
+    CASE WHEN {main} THEN '' END,
+    CASE WHEN is_habit THEN id END,
+    NULLIF(parent_habit_id, '')
+]"""
+
+
+# What a row counts towards in daily_summary
+_SUMMARY_KEY_COLUMNS = (
+    "id, user_username, due_date::date AS due_date, is_complete, is_habit, "
+    "parent_habit_id"
+)
+# Rows of the first transition table counted differently in the second
+_CHANGED_ROWS = (
+    f"(SELECT {_SUMMARY_KEY_COLUMNS} FROM {{0}} "
+    f"EXCEPT SELECT {_SUMMARY_KEY_COLUMNS} FROM {{1}}) AS changed"
+)
+
+
+def _summary_change(rows: str, sign: str) -> str:
+    """Adds (sign '') or subtracts (sign '-') the counts of a transition table."""
+    series = _SUMMARY_SERIES.format(main="TG_TABLE_NAME = 'tasks'")
+    return f"""
+        INSERT INTO daily_summary AS summary
+            (user_username, habit_id, day, completed, total)
+        SELECT user_username, habit_id, due_date::date AS day,
+            {sign}COUNT(*) FILTER (WHERE is_complete), {sign}COUNT(*)
+        FROM (
+            SELECT user_username, due_date, is_complete, unnest({series}) AS habit_id
+            FROM {rows}
+        ) AS counted
+        WHERE habit_id IS NOT NULL AND due_date IS NOT NULL
+        GROUP BY user_username, habit_id, day
+        ON CONFLICT (user_username, habit_id, day) DO UPDATE SET
+            completed = summary.completed + EXCLUDED.completed,
+            total = summary.total + EXCLUDED.total;
+    """
+
+
+DAILY_SUMMARY_FUNCTION = f"""
+    CREATE OR REPLACE FUNCTION count_in_daily_summary() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' THEN
+            {_summary_change(_CHANGED_ROWS.format("old_rows", "new_rows"), "-")}
+            {_summary_change(_CHANGED_ROWS.format("new_rows", "old_rows"), "")}
+        ELSIF TG_OP = 'INSERT' THEN
+            {_summary_change("new_rows", "")}
+        ELSE
+            {_summary_change("old_rows", "-")}
+        END IF;
+        IF TG_OP <> 'INSERT' THEN
+            DELETE FROM daily_summary
+            WHERE user_username IN (SELECT user_username FROM old_rows)
+                AND total = 0;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+_TRANSITION_TABLES = {
+    "INSERT": "NEW TABLE AS new_rows",
+    "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "DELETE": "OLD TABLE AS old_rows",
+}
+DAILY_SUMMARY_TRIGGERS = tuple(
+    statement
+    for table in ("tasks", "archived_tasks")
+    for event, transition in _TRANSITION_TABLES.items()
+    for statement in (
+        f"DROP TRIGGER IF EXISTS trg_{table}_daily_summary_{event.lower()} "
+        f"ON {table}",
+        f"CREATE TRIGGER trg_{table}_daily_summary_{event.lower()} "
+        f"AFTER {event} ON {table} REFERENCING {transition} "
+        "FOR EACH STATEMENT EXECUTE FUNCTION count_in_daily_summary()",
+    )
+)
+# Recounts one user's daily_summary rows (after deleting them)
+DAILY_SUMMARY_REBUILD_SQL = f"""
+    INSERT INTO daily_summary (user_username, habit_id, day, completed, total)
+    SELECT %(username)s, habit_id, due_date::date AS day,
+        COUNT(*) FILTER (WHERE is_complete), COUNT(*)
+    FROM (
+        SELECT due_date, is_complete,
+            unnest({_SUMMARY_SERIES.format(main="TRUE")}) AS habit_id
+        FROM tasks WHERE user_username = %(username)s
+        UNION ALL
+        SELECT due_date, is_complete,
+            unnest({_SUMMARY_SERIES.format(main="FALSE")})
+        FROM archived_tasks WHERE user_username = %(username)s
+    ) AS counted
+    WHERE habit_id IS NOT NULL AND due_date IS NOT NULL
+    GROUP BY habit_id, day
+"""
+DAILY_SUMMARY_SQL = """
+    SELECT day, completed, total FROM daily_summary
+    WHERE user_username = %s AND habit_id = %s AND day >= %s AND day <= %s
+"""
+
+# Bulk upserts of at least this many rows stream through COPY into a staging
+# table instead of going through execute_values
+COPY_THRESHOLD = 2000
+# The parts of a _bulk_upsert VALUES statement the COPY path rebuilds
+INSERT_VALUES_RE = re.compile(
+    r"^\s*INSERT INTO (\w+) \(([^)]*)\)\s*VALUES %s(.*)$", re.DOTALL
+)
+# COPY text format escapes (NULL is \N)
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+XP_LOG_PAGE_SQL = """
+    SELECT * FROM xp_transactions WHERE user_username = %s
+    ORDER BY timestamp DESC
+    LIMIT %s OFFSET %s
+"""
+
 
 class PostgresDataManager(DataManager):
     """Manages data persistence using a PostgreSQL database (Vercel Postgres)."""
@@ -77,7 +312,7 @@ class PostgresDataManager(DataManager):
             error_type = getattr(psycopg2, "Error", None)
             if isinstance(error_type, type) and issubclass(error_type, BaseException):
                 if isinstance(e, error_type):
-                    print(f"Error connecting to PostgreSQL database: {e}")
+                    logger.error("Error connecting to PostgreSQL database: %s", e)
             raise
 
     def _create_tables(self, conn: "psycopg2.connection") -> None:
@@ -144,6 +379,19 @@ class PostgresDataManager(DataManager):
                     END $$;
                     """)
 
+                # Migration: Add archive_summary column to users
+                cursor.execute("""
+                    DO $$
+                    BEGIN
+                        IF NOT EXISTS (
+                            SELECT 1 FROM information_schema.columns
+                            WHERE table_name = 'users' AND column_name = 'archive_summary'
+                        ) THEN
+                            ALTER TABLE users ADD COLUMN archive_summary JSONB;
+                        END IF;
+                    END $$;
+                    """)
+
                 # Task table
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS tasks (
@@ -246,6 +494,17 @@ class PostgresDataManager(DataManager):
                     ON tasks(user_username)
                 """)
 
+                # Archive tier: same columns (and indexes) as tasks
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS archived_tasks (
+                        LIKE tasks INCLUDING ALL,
+                        FOREIGN KEY (user_username) REFERENCES users(username)
+                            ON DELETE CASCADE ON UPDATE CASCADE
+                    )
+                """)
+
+                self._create_task_list_tables(cursor)
+
                 # XP Transactions table
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS xp_transactions (
@@ -266,34 +525,158 @@ class PostgresDataManager(DataManager):
                     CREATE INDEX IF NOT EXISTS idx_xp_transactions_user
                     ON xp_transactions(user_username)
                 """)
+                # Serves XP log pages (load_xp_log) without sorting the log
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_xp_transactions_user_timestamp
+                    ON xp_transactions(user_username, timestamp DESC)
+                """)
+
+                # Migration: secondary indexes (after the columns they cover)
+                for statement in SECONDARY_INDEXES:
+                    cursor.execute(statement)
+
+                # Migration: daily_summary, counted from the existing rows once
+                cursor.execute("SELECT to_regclass('daily_summary') IS NULL AS missing")
+                summary_missing = cursor.fetchone()["missing"]
+                cursor.execute(DAILY_SUMMARY_TABLE)
+                for statement in (DAILY_SUMMARY_FUNCTION, *DAILY_SUMMARY_TRIGGERS):
+                    cursor.execute(statement)
+                if summary_missing:
+                    cursor.execute("SELECT username FROM users")
+                    for row in cursor.fetchall():
+                        self._rebuild_daily_summary(cursor, row["username"])
 
                 conn.commit()
         except Exception as e:  # pylint: disable=broad-exception-caught
             conn.rollback()
-            print(f"Error creating PostgreSQL tables: {e}")
+            logger.error("Error creating PostgreSQL tables: %s", e)
             raise
 
+    @staticmethod
+    def _create_task_list_tables(cursor: "psycopg2.extensions.cursor") -> None:
+        """
+        Creates the task_tags, task_subtasks and task_dependencies tables.
+
+        Each holds one row per list item of a task in the tasks table, with
+        indexes for tag and dependency lookups. Tasks saved before these
+        tables existed are migrated out of their JSON columns, which are
+        then cleared.
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS task_tags (
+                task_id TEXT NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                tag TEXT NOT NULL,
+                user_username TEXT NOT NULL,
+                PRIMARY KEY (task_id, position)
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_task_tags_user_tag
+            ON task_tags(user_username, tag)
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS task_subtasks (
+                task_id TEXT NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                complete BOOLEAN NOT NULL DEFAULT FALSE,
+                user_username TEXT NOT NULL,
+                PRIMARY KEY (task_id, position)
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS task_dependencies (
+                task_id TEXT NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                depends_on_id TEXT NOT NULL,
+                user_username TEXT NOT NULL,
+                PRIMARY KEY (task_id, position)
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_task_dependencies_user_depends_on
+            ON task_dependencies(user_username, depends_on_id)
+        """)
+
+        # Migration: move list items out of the tasks table's JSON columns
+        cursor.execute("""
+            INSERT INTO task_tags (task_id, position, tag, user_username)
+            SELECT tasks.id, item.ordinality - 1, item.value, tasks.user_username
+            FROM tasks, jsonb_array_elements_text(
+                CASE WHEN jsonb_typeof(tasks.tags) = 'array'
+                    THEN tasks.tags ELSE '[]' END
+            ) WITH ORDINALITY AS item(value, ordinality)
+            WHERE item.value IS NOT NULL  -- JSON nulls; tag is NOT NULL
+            ON CONFLICT DO NOTHING
+        """)
+        cursor.execute("""
+            INSERT INTO task_subtasks
+                (task_id, position, text, complete, user_username)
+            SELECT
+                tasks.id,
+                item.ordinality - 1,
+                CASE WHEN jsonb_typeof(item.value) = 'object'
+                    THEN COALESCE(item.value->>'text', '')
+                    ELSE item.value #>> '{}' END,
+                COALESCE(item.value->>'complete' = 'true', FALSE),
+                tasks.user_username
+            FROM tasks, jsonb_array_elements(
+                CASE WHEN jsonb_typeof(tasks.subtasks) = 'array'
+                    THEN tasks.subtasks ELSE '[]' END
+            ) WITH ORDINALITY AS item(value, ordinality)
+            WHERE jsonb_typeof(item.value) IN ('object', 'string')
+            ON CONFLICT DO NOTHING
+        """)
+        cursor.execute("""
+            INSERT INTO task_dependencies
+                (task_id, position, depends_on_id, user_username)
+            SELECT tasks.id, item.ordinality - 1, item.value, tasks.user_username
+            FROM tasks, jsonb_array_elements_text(
+                CASE WHEN jsonb_typeof(tasks.dependencies) = 'array'
+                    THEN tasks.dependencies ELSE '[]' END
+            ) WITH ORDINALITY AS item(value, ordinality)
+            WHERE item.value IS NOT NULL
+            ON CONFLICT DO NOTHING
+        """)
+        cursor.execute("""
+            UPDATE tasks SET tags = NULL, subtasks = NULL, dependencies = NULL
+            WHERE tags IS NOT NULL
+                OR subtasks IS NOT NULL
+                OR dependencies IS NOT NULL
+        """)
+
     def initialize(self) -> None:
         """Initializes the database by creating tables if needed."""
         # Skip if already initialized to reduce duplicate logging
         if self._initialized:
             return
 
-        print("Initializing PostgreSQL database...")
+        logger.info("Initializing PostgreSQL database...")
         try:
             with self._get_connection() as conn:
                 self._create_tables(conn)
-                print("PostgreSQL tables created/verified successfully.")
+                logger.info("PostgreSQL tables created/verified successfully.")
             self._initialized = True
         except Exception as e:  # pylint: disable=broad-exception-caught
-            print(f"PostgreSQL initialization failed: {e}")
+            logger.error("PostgreSQL initialization failed: %s", e)
             raise  # Re-raise to fail fast if database can't be initialized
 
+    @timed("load_user")
     def load_user(self, username: str = DEFAULT_USERNAME) -> User | None:
         """Loads user data and their tasks from the PostgreSQL database."""
-        # Only print loading message on first load per user
+        return self._load_user(username, active_only=False)
+
+    @timed("load_user")
+    def load_active_user(self, username: str = DEFAULT_USERNAME) -> User | None:
+        """Loads a user's active tasks, leaving the rest in PostgreSQL until needed."""
+        return self._load_user(username, active_only=True)
+
+    def _load_user(self, username: str, active_only: bool) -> User | None:
+        """Loads a user with all their tasks, or only the active set."""
+        # Only log the loading message on first load per user
         if username not in self._loaded_users:
-            print(f"Loading user '{username}' from PostgreSQL...")
+            logger.debug("Loading user '%s' from PostgreSQL...", username)
             self._loaded_users.add(username)
         try:
             with self._get_connection() as conn:
@@ -302,7 +685,7 @@ class PostgresDataManager(DataManager):
                     cursor.execute(
                         """
                         SELECT username, total_xp, password_hash, last_processed_date, vacation_mode,
-                               defined_tags, defined_projects, timezone
+                               defined_tags, defined_projects, timezone, archive_summary
                         FROM users WHERE username = %s
                         """,
                         (username,),
@@ -310,7 +693,7 @@ class PostgresDataManager(DataManager):
                     user_row = cursor.fetchone()
 
                     if not user_row:
-                        print(f"User '{username}' not found in PostgreSQL.")
+                        logger.info("User '%s' not found in PostgreSQL.", username)
                         return None
 
                     # Parse user data
@@ -354,12 +737,15 @@ class PostgresDataManager(DataManager):
                             for p in projects_data
                         ]
 
+                    summary_data = user_row.get("archive_summary")
+                    if isinstance(summary_data, str):
+                        summary_data = json.loads(summary_data)
+
                     # Load tasks for the user
                     cursor.execute(
-                        """
-                        SELECT * FROM tasks WHERE user_username = %s
-                        """,
-                        (username,),
+                        f"{TASK_SELECT} WHERE user_username = %s"
+                        + (f" AND {ACTIVE_TASK_CONDITION}" if active_only else ""),
+                        (username, username) if active_only else (username,),
                     )
                     task_rows = cursor.fetchall()
                     tasks = [self._row_to_task(row) for row in task_rows]
@@ -388,18 +774,50 @@ class PostgresDataManager(DataManager):
                         defined_tags=defined_tags,
                         defined_projects=defined_projects,
                         xp_transactions=xp_transactions,
+                        archive_summary=ArchiveSummary.from_dict(summary_data),
+                    )
+                    if active_only:
+                        user.inactive_tasks = LazyTasks(
+                            lambda: self._load_inactive_tasks(user),
+                            frozenset(task.id for task in tasks),
+                        )
+                    user.archived_tasks = LazyTasks(
+                        lambda: self.load_archived_tasks(username)
+                    )
+                    logger.debug(
+                        "User '%s' loaded with %s tasks.", username, len(tasks)
                     )
-                    print(f"User '{username}' loaded with {len(tasks)} tasks.")
                     return user
 
         except Exception as e:  # pylint: disable=broad-exception-caught
             error_type = getattr(psycopg2, "Error", None)
             if isinstance(error_type, type) and issubclass(error_type, BaseException):
                 if isinstance(e, error_type):
-                    print(f"Error loading user '{username}' from PostgreSQL: {e}")
+                    logger.error(
+                        "Error loading user '%s' from PostgreSQL: %s", username, e
+                    )
                     return None
             raise
 
+    def _load_inactive_tasks(self, user: User) -> list[Task]:
+        """Reads the stored tasks an active-set load of user skipped."""
+        logger.debug("Fetching inactive tasks of user '%s'...", user.username)
+        skip = list(user.inactive_tasks.active_ids | {task.id for task in user.tasks})
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                if skip:
+                    cursor.execute(
+                        f"{TASK_SELECT} "
+                        "WHERE user_username = %s AND NOT (id = ANY(%s))",
+                        (user.username, skip),
+                    )
+                else:
+                    cursor.execute(
+                        f"{TASK_SELECT} WHERE user_username = %s",
+                        (user.username,),
+                    )
+                return [self._row_to_task(row) for row in cursor.fetchall()]
+
     @staticmethod
     def _is_mock_cursor(cursor: object) -> bool:
         """Return True when the cursor is a unittest.mock object (tests)."""
@@ -423,17 +841,73 @@ class PostgresDataManager(DataManager):
         sql_row: str,
         rows: list[tuple],
     ) -> None:
-        """Bulk upsert using execute_values when available, else per-row execute."""
+        """
+        Bulk upsert using execute_values when available, else per-row execute.
+
+        Batches of COPY_THRESHOLD rows or more go through COPY instead.
+        """
         if not rows:
             return
 
+        get_metrics().inc(ROWS_UPSERTED, len(rows), backend="postgres")
         if cls._can_use_execute_values(cursor):
-            execute_values(cursor, sql_values, rows)
+            match = INSERT_VALUES_RE.match(sql_values)
+            if match and len(rows) >= COPY_THRESHOLD:
+                table, columns, conflict_clause = match.groups()
+                cls._copy_upsert(cursor, table, columns, conflict_clause, rows)
+            else:
+                execute_values(cursor, sql_values, rows)
             return
 
         for row in rows:
             cursor.execute(sql_row, row)
 
+    @staticmethod
+    def _copy_value(value: object) -> str:
+        """Formats one value for COPY's text format."""
+        if value is None:
+            return "\\N"
+        if isinstance(value, bool):
+            return "t" if value else "f"
+        if isinstance(value, (date, datetime)):
+            return value.isoformat()
+        return str(value).translate(COPY_ESCAPES)
+
+    @classmethod
+    def _copy_upsert(
+        cls,
+        cursor: "psycopg2.extensions.cursor",
+        table: str,
+        columns: str,
+        conflict_clause: str,
+        rows: list[tuple],
+    ) -> None:
+        """
+        Streams rows into a temporary copy of table with COPY, then merges.
+
+        The merge is the caller's INSERT with its VALUES list replaced by a
+        SELECT from the staging table, so ON CONFLICT behaves the same as on
+        the execute_values path.
+        """
+        staging = f"staging_{table}"
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(cls._copy_value(value) for value in row))
+            buffer.write("\n")
+        buffer.seek(0)
+
+        cursor.execute(
+            f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) "
+            "ON COMMIT DROP"
+        )
+        cursor.copy_expert(f"COPY {staging} ({columns}) FROM STDIN", buffer)
+        cursor.execute(
+            f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {staging}"
+            f"{conflict_clause}"
+        )
+        cursor.execute(f"DROP TABLE {staging}")
+        logger.debug("Copied %s rows into %s.", len(rows), table)
+
     def _row_to_task(self, row: dict) -> Task:
         """Converts a database row to a Task object."""
         # Parse enums
@@ -460,17 +934,17 @@ class PostgresDataManager(DataManager):
         if isinstance(start_date, str):
             start_date = datetime.fromisoformat(start_date)
 
-        # Parse JSONB fields
-        tags = row.get("tags", [])
+        # Parse JSONB fields, preferring lists assembled from the task_* tables
+        tags = row.get("tag_list") or row.get("tags", [])
         if isinstance(tags, str):
             tags = json.loads(tags)
 
-        subtasks = row.get("subtasks", [])
+        subtasks = row.get("subtask_list") or row.get("subtasks", [])
         if isinstance(subtasks, str):
             subtasks = json.loads(subtasks)
         subtasks = self._normalize_subtasks(subtasks)
 
-        dependencies = row.get("dependencies", [])
+        dependencies = row.get("dependency_list") or row.get("dependencies", [])
         if isinstance(dependencies, str):
             dependencies = json.loads(dependencies)
 
@@ -614,8 +1088,9 @@ class PostgresDataManager(DataManager):
         cursor.execute(
             """
             INSERT INTO users (username, total_xp, password_hash, last_processed_date,
-                              vacation_mode, defined_tags, defined_projects, timezone)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                              vacation_mode, defined_tags, defined_projects, timezone,
+                              archive_summary)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
             ON CONFLICT (username) DO UPDATE SET
                 total_xp = EXCLUDED.total_xp,
                 password_hash = EXCLUDED.password_hash,
@@ -623,7 +1098,8 @@ class PostgresDataManager(DataManager):
                 vacation_mode = EXCLUDED.vacation_mode,
                 defined_tags = EXCLUDED.defined_tags,
                 defined_projects = EXCLUDED.defined_projects,
-                timezone = EXCLUDED.timezone
+                timezone = EXCLUDED.timezone,
+                archive_summary = EXCLUDED.archive_summary
             """,
             (
                 user.username,
@@ -634,52 +1110,135 @@ class PostgresDataManager(DataManager):
                 defined_tags_json,
                 defined_projects_json,
                 user.timezone,
+                json.dumps(user.archive_summary.to_dict()),
             ),
         )
 
-    def _sync_tasks(self, cursor: "psycopg2.extensions.cursor", user: User) -> None:
-        task_ids = [t.id for t in user.tasks]
+    @staticmethod
+    def _task_row(task: Task, username: str, *, json_lists: bool = True) -> tuple:
+        """
+        A task's column values, in TASK_INSERT_COLUMNS order.
 
-        if user.tasks:
-            rows = [
+        With json_lists False (rows of the tasks table), tags, subtasks and
+        dependencies are left NULL for the rows of _task_list_rows.
+        """
+        return (
+            task.id,
+            task.title,
+            task.text_description,
+            task.priority.value,
+            task.difficulty.value,
+            task.duration.value,
+            task.is_complete,
+            task.creation_date,
+            task.due_date,
+            task.start_date,
+            task.icon,
+            json.dumps(task.tags) if json_lists and task.tags else None,
+            task.project,
+            json.dumps(task.subtasks) if json_lists and task.subtasks else None,
+            (
+                json.dumps(task.dependencies)
+                if json_lists and task.dependencies
+                else None
+            ),
+            json.dumps(task.history) if task.history else None,
+            username,
+            task.is_habit,
+            task.recurrence_rule,
+            task.recurrence_type.value if task.recurrence_type else None,
+            task.streak_current,
+            task.streak_best,
+            task.parent_habit_id,
+            task.habit_start_delta,
+            task.subtask_recurrence_mode.value,
+            (
+                task.recurrence_ended_at.strftime("%Y-%m-%d %H:%M:%S")
+                if task.recurrence_ended_at
+                else None
+            ),
+            (
+                task.defer_until.strftime("%Y-%m-%d %H:%M:%S")
+                if task.defer_until
+                else None
+            ),
+        )
+
+    @classmethod
+    def _task_list_rows(
+        cls, tasks: list[Task], username: str
+    ) -> tuple[list[tuple], list[tuple], list[tuple]]:
+        """The task_tags, task_subtasks and task_dependencies rows of tasks."""
+        tag_rows: list[tuple] = []
+        subtask_rows: list[tuple] = []
+        dependency_rows: list[tuple] = []
+        for task in tasks:
+            tag_rows.extend(
+                (task.id, position, tag, username)
+                for position, tag in enumerate(task.tags)
+            )
+            subtask_rows.extend(
                 (
                     task.id,
-                    task.title,
-                    task.text_description,
-                    task.priority.value,
-                    task.difficulty.value,
-                    task.duration.value,
-                    task.is_complete,
-                    task.creation_date,
-                    task.due_date,
-                    task.start_date,
-                    task.icon,
-                    json.dumps(task.tags) if task.tags else None,
-                    task.project,
-                    json.dumps(task.subtasks) if task.subtasks else None,
-                    json.dumps(task.dependencies) if task.dependencies else None,
-                    json.dumps(task.history) if task.history else None,
-                    user.username,
-                    task.is_habit,
-                    task.recurrence_rule,
-                    task.recurrence_type.value if task.recurrence_type else None,
-                    task.streak_current,
-                    task.streak_best,
-                    task.parent_habit_id,
-                    task.habit_start_delta,
-                    task.subtask_recurrence_mode.value,
-                    (
-                        task.recurrence_ended_at.strftime("%Y-%m-%d %H:%M:%S")
-                        if task.recurrence_ended_at
-                        else None
-                    ),
-                    (
-                        task.defer_until.strftime("%Y-%m-%d %H:%M:%S")
-                        if task.defer_until
-                        else None
-                    ),
+                    position,
+                    subtask.get("text") or "",
+                    bool(subtask.get("complete")),
+                    username,
+                )
+                for position, subtask in enumerate(
+                    cls._normalize_subtasks(task.subtasks)
                 )
-                for task in user.tasks
+            )
+            dependency_rows.extend(
+                (task.id, position, dep_id, username)
+                for position, dep_id in enumerate(task.dependencies)
+            )
+        return tag_rows, subtask_rows, dependency_rows
+
+    def _sync_task_lists(
+        self, cursor: "psycopg2.extensions.cursor", tasks: list[Task], username: str
+    ) -> None:
+        """Replaces the task_* rows of freshly upserted tasks rows."""
+        cursor.execute(
+            """
+            WITH cleared_tags AS (
+                DELETE FROM task_tags WHERE task_id = ANY(%(ids)s)
+            ), cleared_subtasks AS (
+                DELETE FROM task_subtasks WHERE task_id = ANY(%(ids)s)
+            )
+            DELETE FROM task_dependencies WHERE task_id = ANY(%(ids)s)
+            """,
+            {"ids": [task.id for task in tasks]},
+        )
+        for (table, columns), rows in zip(
+            TASK_LIST_TABLES, self._task_list_rows(tasks, username)
+        ):
+            placeholders = ", ".join(["%s"] * len(columns.split(",")))
+            self._bulk_upsert(
+                cursor,
+                f"INSERT INTO {table} ({columns}) VALUES %s",
+                f"INSERT INTO {table} ({columns}) VALUES ({placeholders})",
+                rows,
+            )
+
+    def _sync_tasks(self, cursor: "psycopg2.extensions.cursor", user: User) -> None:
+        inactive = user.inactive_tasks
+        tasks = user.all_tasks() if inactive.loaded else user.tasks
+        task_ids = [t.id for t in tasks]
+
+        if not inactive.loaded:
+            # Only the active set was loaded: drop the active rows the user
+            # deleted and leave every other stored row alone
+            removed_ids = list(inactive.active_ids.difference(task_ids))
+            if removed_ids:
+                cursor.execute(
+                    "DELETE FROM tasks WHERE user_username = %s AND id = ANY(%s)",
+                    (user.username, removed_ids),
+                )
+
+        if tasks:
+            rows = [
+                self._task_row(task, user.username, json_lists=False) for task in tasks
             ]
 
             sql_values = """
@@ -766,7 +1325,10 @@ class PostgresDataManager(DataManager):
                 """
 
             self._bulk_upsert(cursor, sql_values, sql_row, rows)
+            self._sync_task_lists(cursor, tasks, user.username)
 
+        if not inactive.loaded:
+            return
         if task_ids:
             cursor.execute(
                 "DELETE FROM tasks WHERE user_username = %s AND NOT (id = ANY(%s))",
@@ -778,6 +1340,215 @@ class PostgresDataManager(DataManager):
                 (user.username,),
             )
 
+    def list_usernames(self) -> list[str]:
+        """Reads the usernames from the users table."""
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT username FROM users ORDER BY username")
+                return [row["username"] for row in cursor.fetchall()]
+
+    def load_archived_tasks(self, username: str = DEFAULT_USERNAME) -> list[Task]:
+        """Reads a user's rows from the archived_tasks table."""
+        logger.debug("Fetching archived tasks of user '%s'...", username)
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT * FROM archived_tasks WHERE user_username = %s",
+                    (username,),
+                )
+                return [self._row_to_task(row) for row in cursor.fetchall()]
+
+    def archive_tasks(
+        self, user: User, tasks: list[Task], *, replace: bool = False
+    ) -> None:
+        """
+        Copies tasks into archived_tasks and saves the user without them.
+
+        Both happen in one transaction, so a task is never in both tables.
+        """
+        rows = [self._task_row(task, user.username) for task in tasks]
+        placeholders = ", ".join(["%s"] * len(TASK_INSERT_COLUMNS.split(",")))
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                if replace:
+                    cursor.execute(
+                        "DELETE FROM archived_tasks WHERE user_username = %s",
+                        (user.username,),
+                    )
+                self._bulk_upsert(
+                    cursor,
+                    f"INSERT INTO archived_tasks ({TASK_INSERT_COLUMNS}) VALUES %s "
+                    "ON CONFLICT (id) DO NOTHING",
+                    f"INSERT INTO archived_tasks ({TASK_INSERT_COLUMNS}) "
+                    f"VALUES ({placeholders}) ON CONFLICT (id) DO NOTHING",
+                    rows,
+                )
+                self._upsert_user_row(cursor, user)
+                self._sync_tasks(cursor, user)
+                conn.commit()
+        logger.info("Archived %s tasks of user '%s'.", len(tasks), user.username)
+
+    def load_xp_log(
+        self, username: str, *, limit: int, offset: int = 0
+    ) -> list[XPTransaction]:
+        """Reads one page of the user's XP log from the database, newest first."""
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(XP_LOG_PAGE_SQL, (username, limit, offset))
+                return [self._row_to_xp_transaction(row) for row in cursor.fetchall()]
+
+    def tagged_task_ids(self, user: User, tag: str) -> set[str]:
+        """Looks the tag up in task_tags."""
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(TAGGED_TASKS_SQL, (user.username, tag))
+                return {row["task_id"] for row in cursor.fetchall()}
+
+    def dependent_task_ids(self, user: User, task_id: str) -> set[str]:
+        """Looks the task up in task_dependencies."""
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(DEPENDENT_TASKS_SQL, (user.username, task_id))
+                return {row["task_id"] for row in cursor.fetchall()}
+
+    def blocked_task_ids(self, user: User) -> set[str]:
+        """Joins task_dependencies to the incomplete tasks on both ends."""
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(BLOCKED_TASKS_SQL, (user.username,))
+                return {row["task_id"] for row in cursor.fetchall()}
+
+    def task_counts(self, user: User) -> TaskCounts:
+        """Totals the user's tasks rows in one aggregate query."""
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(TASK_COUNTS_SQL, (user.username,))
+                row = cursor.fetchone()
+        return TaskCounts(
+            total=row["total"],
+            completed=row["completed"],
+            habits=row["habits"],
+            current_streak=row["current_streak"] or 0,
+            best_streak=row["best_streak"] or 0,
+        )
+
+    @staticmethod
+    def _completion_counts_query(
+        username: str, start: date, end: date, habit_id: str | None
+    ) -> tuple[str, tuple]:
+        """The completion counts query and its parameters."""
+        return DAILY_SUMMARY_SQL, (username, habit_id or "", start, end)
+
+    def completion_counts_by_day(
+        self, username: str, start: date, end: date, habit_id: str | None = None
+    ) -> dict[date, tuple[int, int]]:
+        """Reads the days from start to end of the user's daily_summary rows."""
+        sql, params = self._completion_counts_query(username, start, end, habit_id)
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(sql, params)
+                return {
+                    row["day"]: (row["completed"], row["total"])
+                    for row in cursor.fetchall()
+                }
+
+    def load_archive_summary(self, username: str) -> ArchiveSummary:
+        """Reads the archive_summary column of the user's row."""
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT archive_summary FROM users WHERE username = %s",
+                    (username,),
+                )
+                row = cursor.fetchone()
+        summary_data = row["archive_summary"] if row else None
+        if isinstance(summary_data, str):
+            summary_data = json.loads(summary_data)
+        return ArchiveSummary.from_dict(summary_data)
+
+    @staticmethod
+    def _rebuild_daily_summary(
+        cursor: "psycopg2.extensions.cursor", username: str
+    ) -> int:
+        """Replaces the user's daily_summary rows with a fresh count."""
+        cursor.execute(
+            "DELETE FROM daily_summary WHERE user_username = %s", (username,)
+        )
+        cursor.execute(DAILY_SUMMARY_REBUILD_SQL, {"username": username})
+        return int(cursor.rowcount)
+
+    def rebuild_daily_summary(self, username: str = DEFAULT_USERNAME) -> int:
+        """Recounts the user's daily_summary rows from their task rows."""
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                count = self._rebuild_daily_summary(cursor, username)
+                conn.commit()
+        logger.info("Rebuilt %s daily summary rows of user '%s'.", count, username)
+        return count
+
+    @classmethod
+    def _access_patterns(
+        cls, username: str
+    ) -> dict[str, tuple[str, tuple | Mapping[str, object]]]:
+        """The main queries by name, with sample parameters for username."""
+        today = date.today()
+        return {
+            "load user": (
+                f"{TASK_SELECT} WHERE user_username = %s",
+                (username,),
+            ),
+            "load active set": (
+                f"{TASK_SELECT} WHERE user_username = %s AND {ACTIVE_TASK_CONDITION}",
+                (username, username),
+            ),
+            "open tasks due": (
+                "SELECT id FROM tasks WHERE user_username = %s "
+                "AND NOT is_complete AND due_date <= %s ORDER BY due_date",
+                (username, datetime.now()),
+            ),
+            "habit series": (
+                "SELECT id FROM tasks "
+                "WHERE user_username = %s AND parent_habit_id = %s",
+                (username, ""),
+            ),
+            "habits": (
+                "SELECT id FROM tasks WHERE user_username = %s AND is_habit",
+                (username,),
+            ),
+            "tagged tasks": (TAGGED_TASKS_SQL, (username, "")),
+            "dependent tasks": (DEPENDENT_TASKS_SQL, (username, "")),
+            "blocked tasks": (BLOCKED_TASKS_SQL, (username,)),
+            "archived tasks": (
+                "SELECT * FROM archived_tasks WHERE user_username = %s",
+                (username,),
+            ),
+            "XP log page": (XP_LOG_PAGE_SQL, (username, 50, 0)),
+            "XP by game day": (
+                "SELECT game_date, source, SUM(amount) FROM xp_transactions "
+                "WHERE user_username = %s AND game_date >= %s "
+                "GROUP BY game_date, source",
+                (username, today),
+            ),
+            "task counts": (TASK_COUNTS_SQL, (username,)),
+            "completion counts": cls._completion_counts_query(
+                username, today - timedelta(weeks=12), today, None
+            ),
+            "daily summary rebuild": (
+                DAILY_SUMMARY_REBUILD_SQL,
+                {"username": username},
+            ),
+        }
+
+    def explain_queries(self, username: str = DEFAULT_USERNAME) -> dict[str, list[str]]:
+        """Runs EXPLAIN on each access pattern."""
+        plans: dict[str, list[str]] = {}
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                for name, (sql, params) in self._access_patterns(username).items():
+                    cursor.execute(f"EXPLAIN {sql}", params)
+                    plans[name] = [row["QUERY PLAN"] for row in cursor.fetchall()]
+        return plans
+
     def _sync_xp_transactions(
         self,
         cursor: "psycopg2.extensions.cursor",
@@ -856,9 +1627,10 @@ class PostgresDataManager(DataManager):
                     (user.username,),
                 )
 
+    @timed("save_user")
     def save_user(self, user: User) -> None:
         """Saves the user and their tasks to the PostgreSQL database."""
-        print(f"Saving user '{user.username}' to PostgreSQL...")
+        logger.debug("Saving user '%s' to PostgreSQL...", user.username)
         try:
             with self._get_connection() as conn:
                 with conn.cursor() as cursor:
@@ -867,16 +1639,19 @@ class PostgresDataManager(DataManager):
                     self._sync_xp_transactions(cursor, user, delete_missing=True)
 
                     conn.commit()
-                    print(f"User '{user.username}' saved with {len(user.tasks)} tasks.")
+                    logger.debug(
+                        "User '%s' saved with %s tasks.", user.username, len(user.tasks)
+                    )
 
                     dirty_ids = getattr(user, "_dirty_xp_transaction_ids", None)
                     if dirty_ids is not None:
                         dirty_ids.clear()
 
         except Exception as e:  # pylint: disable=broad-exception-caught
-            print(f"Error saving user '{user.username}' to PostgreSQL: {e}")
+            logger.error("Error saving user '%s' to PostgreSQL: %s", user.username, e)
             raise
 
+    @timed("save_user_progress")
     def save_user_progress(self, user: User) -> None:
         """
         Save only user-level fields and XP transactions.
@@ -887,7 +1662,7 @@ class PostgresDataManager(DataManager):
         Intended for operations like date advancement / penalties where tasks are
         not modified.
         """
-        print(f"Saving user progress '{user.username}' to PostgreSQL...")
+        logger.debug("Saving user progress '%s' to PostgreSQL...", user.username)
         try:
             with self._get_connection() as conn:
                 with conn.cursor() as cursor:
@@ -901,9 +1676,15 @@ class PostgresDataManager(DataManager):
                         dirty_ids.clear()
 
         except Exception as e:  # pylint: disable=broad-exception-caught
-            print(f"Error saving user progress '{user.username}' to PostgreSQL: {e}")
+            logger.error(
+                "Error saving user progress '%s' to PostgreSQL: %s", user.username, e
+            )
             raise
 
     def backend_type(self) -> str:
         """Returns the backend type."""
         return "postgres"
+
+    def create_job_store(self) -> PostgresJobStore:
+        """Returns a job store sharing this manager's database."""
+        return PostgresJobStore(self._get_connection)
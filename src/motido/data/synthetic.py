@@ -0,0 +1,285 @@
+# data/synthetic.py
+"""
+Seeded generator for large, realistic synthetic accounts.
+
+Builds a User with many one-off tasks (some in dependency chains), habit
+series with long ``parent_habit_id`` lineages, years of XP transactions and
+per-task edit histories. The same spec and seed always produce the same
+user, so generated accounts can serve as fixtures and benchmark baselines.
+
+    user = generate_user(SyntheticSpec(tasks=20_000, habits=50, seed=7))
+    populate(manager, SyntheticSpec(tasks=20_000))  # generate and save
+"""
+
+import random
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Any
+
+from motido.core.models import (
+    DEFAULT_PROJECT_COLORS,
+    DEFAULT_TAG_COLORS,
+    Difficulty,
+    Duration,
+    Priority,
+    Project,
+    RecurrenceType,
+    Tag,
+    Task,
+    User,
+    XPTransaction,
+)
+
+from .abstraction import DEFAULT_USERNAME, DataManager
+
+# Habit rules and the number of days between their instances
+HABIT_RULES = {"daily": 1, "every 3 days": 3, "weekly": 7}
+
+HISTORY_FIELDS = ("title", "priority", "difficulty", "duration", "due_date", "tags")
+
+_WORDS = (
+    "review plan write call email fix clean update read draft refactor "
+    "deploy test book pay order sort archive sketch water stretch practise"
+).split()
+_NOUNS = (
+    "report invoice garden kitchen budget slides backlog inbox car notes "
+    "proposal roadmap bug release taxes lesson guitar plants recipe paper"
+).split()
+
+
+@dataclass
+class SyntheticSpec:  # pylint: disable=too-many-instance-attributes
+    """Size of each dimension of a generated account."""
+
+    tasks: int = 1_000  # One-off (non-habit) tasks
+    completed_ratio: float = 0.6  # Share of one-off tasks already completed
+    dependency_ratio: float = 0.2  # Share of open tasks placed in chains
+    dependency_depth: int = 5  # Maximum length of a dependency chain
+    habits: int = 20  # Habit series
+    habit_instances: int = 100  # Instances (lineage length) per habit series
+    xp_days: int = 365  # Days of XP transactions, ending at end_date
+    xp_per_day: int = 5  # XP transactions per day
+    history_per_task: int = 3  # Average history entries per task
+    subtasks_per_task: int = 2  # Average subtasks per one-off task
+    tags: int = 10
+    projects: int = 5
+    seed: int = 0
+    end_date: date | None = None  # The account's "today"; defaults to today
+
+
+class _Generator:  # pylint: disable=too-few-public-methods
+    """Holds the RNG and reference dates while one user is built."""
+
+    def __init__(self, spec: SyntheticSpec) -> None:
+        self.spec = spec
+        self.rng = random.Random(spec.seed)
+        self.today = spec.end_date or date.today()
+        self.now = datetime.combine(self.today, time(12))
+        self.tag_names = [f"tag-{i}" for i in range(spec.tags)]
+        self.project_names = [f"project-{i}" for i in range(spec.projects)]
+
+    def uuid(self) -> str:
+        """A UUID4 string drawn from the seeded RNG."""
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def title(self) -> str:
+        """A short, plausible task title."""
+        return f"{self.rng.choice(_WORDS).title()} {self.rng.choice(_NOUNS)}"
+
+    def moment(self, days_back: int) -> datetime:
+        """A random time of day, days_back days before the account's today."""
+        return self.now - timedelta(
+            days=days_back, minutes=self.rng.randrange(-600, 600)
+        )
+
+    def count(self, average: int) -> int:
+        """A small count that averages to average."""
+        return self.rng.randint(0, 2 * average) if average > 0 else 0
+
+    def task_fields(self) -> dict[str, Any]:
+        """Attributes shared by one-off tasks and habits."""
+        rng = self.rng
+        return {
+            "priority": rng.choice(list(Priority)),
+            "difficulty": rng.choice(list(Difficulty)),
+            "duration": rng.choice(list(Duration)),
+            "tags": rng.sample(self.tag_names, k=min(len(self.tag_names), 2)),
+            "project": (rng.choice(self.project_names) if self.project_names else None),
+        }
+
+    def history(self, created: datetime, completed: bool) -> list[dict[str, Any]]:
+        """Edit history between a task's creation and now."""
+        span = max(1, int((self.now - created).total_seconds()))
+        stamps = sorted(
+            created + timedelta(seconds=self.rng.randrange(span))
+            for _ in range(self.count(self.spec.history_per_task))
+        )
+        entries: list[dict[str, Any]] = [
+            {
+                "timestamp": stamp.isoformat(),
+                "field": (name := self.rng.choice(HISTORY_FIELDS)),
+                "old_value": f"old {name}",
+                "new_value": f"new {name}",
+            }
+            for stamp in stamps
+        ]
+        if completed:
+            entries.append(
+                {
+                    "timestamp": (stamps[-1] if stamps else created).isoformat(),
+                    "field": "is_complete",
+                    "old_value": False,
+                    "new_value": True,
+                }
+            )
+        return entries
+
+    def one_off_tasks(self) -> list[Task]:
+        """One-off tasks, with some open ones linked into dependency chains."""
+        spec, rng = self.spec, self.rng
+        tasks = []
+        for _ in range(spec.tasks):
+            created = self.moment(rng.randrange(1, max(2, spec.xp_days)))
+            completed = rng.random() < spec.completed_ratio
+            due = created + timedelta(days=rng.randrange(1, 60))
+            tasks.append(
+                Task(
+                    id=self.uuid(),
+                    title=self.title(),
+                    creation_date=created,
+                    due_date=due if rng.random() < 0.7 else None,
+                    is_complete=completed,
+                    subtasks=[
+                        {"text": f"Step {i + 1}", "complete": completed}
+                        for i in range(self.count(spec.subtasks_per_task))
+                    ],
+                    history=self.history(created, completed),
+                    **self.task_fields(),
+                )
+            )
+
+        # Chain a share of the open tasks: each waits on the one before it
+        open_tasks = [task for task in tasks if not task.is_complete]
+        chained = open_tasks[: int(len(open_tasks) * spec.dependency_ratio)]
+        depth = max(1, spec.dependency_depth)
+        for index, task in enumerate(chained):
+            if index % depth:
+                task.dependencies = [chained[index - 1].id]
+        return tasks
+
+    def habit_series(self) -> list[Task]:  # pylint: disable=too-many-locals
+        """Habit lineages: completed instances ending in one open instance."""
+        spec, rng = self.spec, self.rng
+        tasks = []
+        for _ in range(spec.habits):
+            rule = rng.choice(list(HABIT_RULES))
+            step = HABIT_RULES[rule]
+            fields = self.task_fields()
+            title = self.title()
+            recurrence_type = rng.choice(list(RecurrenceType))
+            count = max(1, spec.habit_instances)
+            parent_id: str | None = None
+            streak = best = 0
+            for index in range(count):
+                due = self.now - timedelta(days=step * (count - 1 - index))
+                is_last = index == count - 1
+                completed = not is_last and rng.random() < 0.85
+                streak = streak + 1 if completed else 0
+                best = max(best, streak)
+                task = Task(
+                    id=self.uuid(),
+                    title=title,
+                    creation_date=due - timedelta(days=step),
+                    due_date=due,
+                    is_complete=completed,
+                    is_habit=True,
+                    recurrence_rule=rule,
+                    recurrence_type=recurrence_type,
+                    streak_current=streak,
+                    streak_best=best,
+                    parent_habit_id=parent_id,
+                    history=self.history(due - timedelta(days=step), completed),
+                    **fields,
+                )
+                tasks.append(task)
+                parent_id = task.id
+        return tasks
+
+    def xp_transactions(self, tasks: list[Task]) -> list[XPTransaction]:
+        """Completions and penalties for each of the last xp_days days."""
+        spec, rng = self.spec, self.rng
+        completed_ids: list[str] = [t.id for t in tasks if t.is_complete]
+        transactions = []
+        for days_back in range(spec.xp_days - 1, -1, -1):
+            game_date = self.today - timedelta(days=days_back)
+            for _ in range(spec.xp_per_day):
+                penalty = rng.random() < 0.15
+                transactions.append(
+                    XPTransaction(
+                        id=self.uuid(),
+                        amount=-rng.randint(1, 10) if penalty else rng.randint(5, 60),
+                        source="penalty" if penalty else "task_completion",
+                        timestamp=self.moment(days_back),
+                        task_id=(
+                            None
+                            if penalty or not completed_ids
+                            else rng.choice(completed_ids)
+                        ),
+                        description="Missed task" if penalty else "Completed task",
+                        game_date=game_date,
+                    )
+                )
+        return transactions
+
+
+def generate_user(
+    spec: SyntheticSpec | None = None, username: str = DEFAULT_USERNAME
+) -> User:
+    """
+    Build a synthetic user; the same spec always yields the same user.
+
+    Args:
+        spec: Size of each dimension; defaults to SyntheticSpec().
+        username: Username of the generated user.
+
+    Returns:
+        The generated User, already processed up to spec.end_date.
+    """
+    gen = _Generator(spec or SyntheticSpec())
+    tasks = gen.one_off_tasks() + gen.habit_series()
+    transactions = gen.xp_transactions(tasks)
+    return User(
+        username=username,
+        total_xp=max(0, sum(t.amount for t in transactions)),
+        tasks=tasks,
+        last_processed_date=gen.today,
+        xp_transactions=transactions,
+        defined_tags=[
+            Tag(
+                name=name,
+                color=DEFAULT_TAG_COLORS[i % len(DEFAULT_TAG_COLORS)],
+                id=gen.uuid(),
+            )
+            for i, name in enumerate(gen.tag_names)
+        ],
+        defined_projects=[
+            Project(
+                name=name,
+                color=DEFAULT_PROJECT_COLORS[i % len(DEFAULT_PROJECT_COLORS)],
+                id=gen.uuid(),
+            )
+            for i, name in enumerate(gen.project_names)
+        ],
+    )
+
+
+def populate(
+    manager: DataManager,
+    spec: SyntheticSpec | None = None,
+    username: str = DEFAULT_USERNAME,
+) -> User:
+    """Generate a synthetic user and save it through manager."""
+    user = generate_user(spec, username)
+    manager.save_user(user)
+    return user
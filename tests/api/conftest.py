@@ -10,7 +10,12 @@ from datetime import datetime
 import pytest
 from fastapi.testclient import TestClient
 
-from motido.api.deps import get_current_user, get_manager
+from motido.api.deps import (
+    get_current_active_user,
+    get_current_user,
+    get_current_username,
+    get_manager,
+)
 from motido.api.main import app
 from motido.core.models import Difficulty, Duration, Priority, Project, Tag, Task, User
 from motido.data.abstraction import DataManager
@@ -106,6 +111,8 @@ def client(
 
     app.dependency_overrides[get_manager] = override_get_manager
     app.dependency_overrides[get_current_user] = override_get_current_user
+    app.dependency_overrides[get_current_active_user] = override_get_current_user
+    app.dependency_overrides[get_current_username] = lambda: test_user.username
 
     yield TestClient(app)
 
@@ -127,6 +134,8 @@ def empty_client(mock_manager: MockDataManager) -> Generator[TestClient, None, N
 
     app.dependency_overrides[get_manager] = override_get_manager
     app.dependency_overrides[get_current_user] = override_get_current_user
+    app.dependency_overrides[get_current_active_user] = override_get_current_user
+    app.dependency_overrides[get_current_username] = lambda: empty_user.username
 
     yield TestClient(app)
 
@@ -0,0 +1,153 @@
+# tests/api/test_archive.py
+# pylint: disable=redefined-outer-name
+"""
+Tests for the archive tier endpoints and archive-aware reads.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from motido.core.models import LazyTasks, Task, User
+
+from .conftest import MockDataManager
+
+OLD = datetime.now() - timedelta(days=200)
+
+
+@pytest.fixture
+def archived_task() -> Task:
+    """A completed task with history, old enough to archive."""
+    return Task(
+        title="Old chore",
+        creation_date=OLD,
+        due_date=OLD,
+        is_complete=True,
+        history=[
+            {
+                "timestamp": OLD.isoformat(),
+                "field": "title",
+                "old_value": "Chore",
+                "new_value": "Old chore",
+            }
+        ],
+    )
+
+
+@pytest.fixture
+def archiving_manager(mock_manager: MockDataManager, mocker: Any) -> MockDataManager:
+    """The mock manager with an archive tier recording what it was given."""
+    stored: list[Task] = []
+
+    def archive_tasks(user: User, tasks: list[Task]) -> None:
+        stored.extend(tasks)
+        mock_manager.save_user(user)
+
+    mocker.patch.object(mock_manager, "archive_tasks", side_effect=archive_tasks)
+    mocker.patch.object(mock_manager, "load_archived_tasks", return_value=stored)
+    return mock_manager
+
+
+class TestArchiveEndpoint:
+    """Tests for POST /api/user/archive."""
+
+    def test_archive_moves_old_completed_tasks(
+        self,
+        client: TestClient,
+        test_user: User,
+        archiving_manager: MockDataManager,
+        archived_task: Task,
+    ) -> None:
+        """Test old completed tasks are archived and stats still count them."""
+        test_user.tasks.append(archived_task)
+        stats_before = client.get("/api/user/stats").json()
+
+        response = client.post("/api/user/archive", params={"days": 30})
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "horizon_days": 30,
+            "archived_count": 1,
+            "archived_total": 1,
+        }
+        assert test_user.find_task_by_id(archived_task.id) is None
+        assert archiving_manager.load_archived_tasks() == [archived_task]
+        stats_after = client.get("/api/user/stats").json()
+        assert stats_after["completed_tasks"] == stats_before["completed_tasks"]
+        assert stats_after["total_tasks"] == stats_before["total_tasks"]
+
+    def test_archive_nothing_old_enough(self, client: TestClient) -> None:
+        """Test the default horizon leaves freshly completed tasks alone."""
+        response = client.post("/api/user/archive")
+
+        assert response.status_code == 200
+        assert response.json()["archived_count"] == 0
+        assert response.json()["horizon_days"] == 90
+
+    def test_archive_rejects_negative_days(self, client: TestClient) -> None:
+        """Test a negative horizon is a bad request."""
+        response = client.post("/api/user/archive", params={"days": -1})
+        assert response.status_code == 400
+
+    def test_archive_unsupported_backend(
+        self, client: TestClient, test_user: User, archived_task: Task
+    ) -> None:
+        """Test backends without an archive tier answer 501."""
+        test_user.tasks.append(archived_task)
+
+        response = client.post("/api/user/archive")
+
+        assert response.status_code == 501
+        assert "mock backend" in response.json()["detail"]
+
+
+class TestArchivedReads:
+    """Tests for reading archived tasks through the regular endpoints."""
+
+    @pytest.fixture(autouse=True)
+    def archive(self, test_user: User, archived_task: Task) -> None:
+        """Put archived_task in test_user's archive tier."""
+        test_user.archived_tasks = LazyTasks.of([archived_task], frozenset())
+        test_user.archive_summary.add(archived_task)
+
+    def test_get_archived_task_shows_history(
+        self, client: TestClient, archived_task: Task
+    ) -> None:
+        """Test an archived task is still served with its history."""
+        response = client.get(f"/api/tasks/{archived_task.id}")
+
+        assert response.status_code == 200
+        assert response.json()["history"][0]["new_value"] == "Old chore"
+
+    def test_undo_archived_task_conflicts(
+        self, client: TestClient, archived_task: Task
+    ) -> None:
+        """Test archived tasks are read-only."""
+        response = client.post(f"/api/tasks/{archived_task.id}/undo")
+
+        assert response.status_code == 409
+        assert archived_task.history
+
+    def test_heatmap_counts_archived_completions(
+        self, client: TestClient, test_user: User, archived_task: Task
+    ) -> None:
+        """Test the heatmap uses the summary, or archived tasks for one habit."""
+        due = archived_task.due_date
+        assert due is not None
+        weeks = (date.today() - due.date()).days // 7 + 1
+
+        days = client.get("/api/views/heatmap", params={"weeks": weeks}).json()
+        day = next(d for d in days if d["date"] == due.date().isoformat())
+        assert day["completed_count"] == day["total_count"] == 1
+
+        # Only habits have per-habit day counts
+        archived_task.is_habit = True
+        test_user.archived_tasks = LazyTasks.of([archived_task], frozenset())
+        days = client.get(
+            "/api/views/heatmap",
+            params={"weeks": weeks, "habit_id": archived_task.id},
+        ).json()
+        day = next(d for d in days if d["date"] == due.date().isoformat())
+        assert day["completed_count"] == 1
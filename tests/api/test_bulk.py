@@ -0,0 +1,214 @@
+# tests/api/test_bulk.py
+# pylint: disable=redefined-outer-name
+"""
+Tests for the bulk task mutation endpoint.
+"""
+
+from collections.abc import Generator
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from motido.api.events import (
+    BADGE_EARNED,
+    TASK_COMPLETED,
+    TASK_CREATED,
+    TASK_DELETED,
+    TASK_UNCOMPLETED,
+    TASK_UPDATED,
+    XP_CHANGED,
+    RecordingEventBroker,
+    set_event_broker,
+)
+from motido.core.models import Badge, User
+
+from .conftest import MockDataManager
+
+
+@pytest.fixture
+def recorder() -> Generator[RecordingEventBroker, None, None]:
+    """Install a recording broker for the duration of a test."""
+    broker = RecordingEventBroker()
+    set_event_broker(broker)
+    yield broker
+    set_event_broker(None)
+
+
+@pytest.fixture
+def save_calls(mock_manager: MockDataManager, monkeypatch: Any) -> list[User]:
+    """Record every save_user call made by the route."""
+    calls: list[User] = []
+    original = mock_manager.save_user
+
+    def counting_save(user: User) -> None:
+        calls.append(user)
+        original(user)
+
+    monkeypatch.setattr(mock_manager, "save_user", counting_save)
+    return calls
+
+
+class TestBulkTaskOperations:
+    """Tests for POST /api/tasks/bulk."""
+
+    def test_mixed_operations_save_once(
+        self,
+        client: TestClient,
+        test_user: User,
+        save_calls: list[User],
+        recorder: RecordingEventBroker,
+    ) -> None:
+        """Test operations apply in order with a single save and events after."""
+        todo, done = test_user.tasks[0], test_user.tasks[1]
+        response = client.post(
+            "/api/tasks/bulk",
+            json={
+                "operations": [
+                    {"op": "create", "create": {"title": "Bulk created"}},
+                    {"op": "update", "task_id": todo.id, "update": {"title": "New"}},
+                    {"op": "complete", "task_id": todo.id},
+                    {"op": "uncomplete", "task_id": done.id},
+                    {"op": "delete", "task_id": done.id},
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["succeeded"] == 5
+        assert data["failed"] == 0
+        assert len(save_calls) == 1
+
+        created = data["results"][0]
+        assert created["task"]["title"] == "Bulk created"
+        assert created["task_id"] == created["task"]["id"]
+        assert data["results"][1]["task"]["title"] == "New"
+
+        completed = data["results"][2]
+        assert completed["xp_earned"] > 0
+        assert completed["task"]["is_complete"] is True
+        assert data["xp_change"] == completed["xp_earned"]
+        assert data["total_xp"] == 500 + completed["xp_earned"]
+
+        assert data["results"][4]["task"] is None
+        assert done.id not in {t.id for t in test_user.tasks}
+
+        assert [t for t in recorder.types() if t != BADGE_EARNED] == [
+            TASK_CREATED,
+            TASK_UPDATED,
+            TASK_COMPLETED,
+            TASK_UNCOMPLETED,
+            TASK_DELETED,
+            XP_CHANGED,
+        ]
+
+    def test_complete_habit_returns_next_instance_and_badges(
+        self,
+        client: TestClient,
+        test_user: User,
+        recorder: RecordingEventBroker,
+        monkeypatch: Any,
+    ) -> None:
+        """Test habit completion creates the next instance and reports badges."""
+        badge = Badge(id="first", name="First", description="", glyph="🏅")
+        monkeypatch.setattr(
+            "motido.core.scoring.check_badges", lambda *_a, **_k: [badge]
+        )
+        habit = test_user.tasks[2]
+
+        response = client.post(
+            "/api/tasks/bulk",
+            json={"operations": [{"op": "complete", "task_id": habit.id}]},
+        )
+
+        assert response.status_code == 200
+        result = response.json()["results"][0]
+        assert result["next_instance"] is not None
+        assert result["next_instance"]["id"] != habit.id
+        assert BADGE_EARNED in recorder.types()
+
+    def test_defer_operation(self, client: TestClient, test_user: User) -> None:
+        """Test a defer operation sets defer_until."""
+        task = test_user.tasks[0]
+        response = client.post(
+            "/api/tasks/bulk",
+            json={
+                "operations": [
+                    {
+                        "op": "defer",
+                        "task_id": task.id,
+                        "defer": {"defer_until": "2099-01-01T00:00:00"},
+                    }
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.json()["results"][0]["success"] is True
+        assert task.defer_until is not None and task.defer_until.year == 2099
+
+    def test_failures_are_reported_per_operation(
+        self, client: TestClient, test_user: User, save_calls: list[User]
+    ) -> None:
+        """Test failing operations are reported without stopping the batch."""
+        todo, done = test_user.tasks[0], test_user.tasks[1]
+        response = client.post(
+            "/api/tasks/bulk",
+            json={
+                "operations": [
+                    {"op": "create"},
+                    {"op": "update", "task_id": todo.id},
+                    {"op": "defer", "task_id": todo.id},
+                    {"op": "complete"},
+                    {"op": "complete", "task_id": "does-not-exist"},
+                    {"op": "complete", "task_id": done.id},
+                    {"op": "uncomplete", "task_id": todo.id},
+                    {"op": "complete", "task_id": todo.id},
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        errors = [result["error"] for result in data["results"]]
+        assert errors[:7] == [
+            "create payload is required",
+            "update payload is required",
+            "defer payload is required",
+            "task_id is required",
+            "Task with ID does-not-exist not found",
+            "Task is already complete",
+            "Task is not complete",
+        ]
+        assert data["succeeded"] == 1
+        assert data["failed"] == 7
+        assert len(save_calls) == 1
+
+    def test_all_failures_skip_save(
+        self,
+        client: TestClient,
+        test_user: User,
+        save_calls: list[User],
+        recorder: RecordingEventBroker,
+    ) -> None:
+        """Test nothing is saved or published when every operation fails."""
+        test_user.tasks[0].id = "abc-1"
+        test_user.tasks[2].id = "abc-2"
+
+        response = client.post(
+            "/api/tasks/bulk",
+            json={"operations": [{"op": "delete", "task_id": "abc"}]},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["failed"] == 1
+        assert "Ambiguous" in data["results"][0]["error"]
+        assert not save_calls
+        assert not recorder.published
+
+    def test_empty_operations_rejected(self, client: TestClient) -> None:
+        """Test an empty batch is a validation error."""
+        response = client.post("/api/tasks/bulk", json={"operations": []})
+        assert response.status_code == 422
@@ -0,0 +1,131 @@
+# tests/api/test_cold_start.py
+"""
+Tests for the serverless cold-start path: import budget and lazy routers.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import motido
+from motido.api.deps import get_current_username, get_manager
+from motido.api.main import LAZY_ROUTERS, app
+from motido.api.middleware.lazy_routers import LazyRouterMiddleware, LazyRouterRegistry
+
+from .conftest import MockDataManager
+
+# Cumulative import time budget for motido.api.main, in milliseconds.
+# Measured at ~600-730ms locally, of which FastAPI itself is ~400ms.
+# Wall-clock timing is noisy on shared runners, so the budget is only
+# checked when MOTIDO_IMPORT_BUDGET_MS is set (e.g. 1500).
+IMPORT_BUDGET_MS = os.getenv("MOTIDO_IMPORT_BUDGET_MS")
+
+# Modules a cold start must not import
+DEFERRED_MODULES = (
+    "dateutil",
+    "dotenv",
+    "passlib",
+    "psycopg2",
+    "motido.api.jobs",
+    "motido.api.routers.jobs",
+)
+
+_PROBE = """
+import sys
+import motido.api.main
+print(",".join(m for m in {modules!r} if m in sys.modules))
+"""
+
+
+def _run_cold_import() -> subprocess.CompletedProcess:
+    """Import the API in a fresh interpreter the way Vercel does."""
+    env = {k: v for k, v in os.environ.items() if not k.startswith("COV_CORE")}
+    env["VERCEL"] = "1"
+    env["PYTHONPATH"] = str(Path(motido.__file__).parent.parent)
+    return subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            _PROBE.format(modules=DEFERRED_MODULES),
+        ],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+        timeout=60,
+    )
+
+
+def test_cold_import_defers_modules() -> None:
+    """Test importing motido.api.main leaves heavy modules unimported."""
+    result = _run_cold_import()
+
+    assert result.stdout.strip() == "", f"Eagerly imported: {result.stdout}"
+
+
+@pytest.mark.skipif(
+    IMPORT_BUDGET_MS is None, reason="MOTIDO_IMPORT_BUDGET_MS is not set"
+)
+def test_cold_import_within_budget() -> None:
+    """Test importing motido.api.main stays within the cold-start budget."""
+    budget_ms = int(IMPORT_BUDGET_MS or 0)
+    result = _run_cold_import()
+
+    cumulative_us = next(
+        int(line.split("|")[1])
+        for line in result.stderr.splitlines()
+        if line.rstrip().endswith("| motido.api.main")
+    )
+    assert cumulative_us / 1000 < budget_ms, (
+        f"motido.api.main import took {cumulative_us / 1000:.0f}ms "
+        f"(budget {budget_ms}ms)"
+    )
+
+
+def _make_app() -> tuple[FastAPI, LazyRouterRegistry]:
+    lazy_app = FastAPI()
+    lazy_app.dependency_overrides[get_manager] = MockDataManager
+    lazy_app.dependency_overrides[get_current_username] = lambda: "u"
+    registry = LazyRouterRegistry(lazy_app, LAZY_ROUTERS, prefix="/api")
+    lazy_app.add_middleware(LazyRouterMiddleware, registry=registry)
+    return lazy_app, registry
+
+
+def test_lazy_router_loaded_on_first_request() -> None:
+    """Test a lazy router is included only when a request needs it."""
+    lazy_app, registry = _make_app()
+    client = TestClient(lazy_app)
+
+    assert client.get("/api/jobsx").status_code == 404
+    assert registry.pending == ["/api/jobs"]
+
+    # Routed to the jobs endpoint, which rejects the empty body
+    assert client.post("/api/jobs", json={}).status_code == 422
+    assert not registry.pending
+    # A request racing the first load finds the router already included
+    registry._include("/api/jobs")  # pylint: disable=protected-access
+
+
+def test_lazy_routers_load_all() -> None:
+    """Test load_all includes every pending router exactly once."""
+    lazy_app, registry = _make_app()
+    registry.load_all()
+    route_count = len(lazy_app.routes)
+    registry.load_all()
+
+    assert len(lazy_app.routes) == route_count
+    assert "/api/jobs/{job_id}" in lazy_app.openapi()["paths"]
+
+
+def test_openapi_includes_lazy_routers() -> None:
+    """Test the OpenAPI schema documents lazily loaded endpoints."""
+    app.openapi_schema = None
+    schema = app.openapi()
+    assert "/api/jobs/{job_id}" in schema["paths"]
@@ -16,9 +16,13 @@ from motido.api.deps import (
     ALGORITHM,
     SECRET_KEY,
     create_access_token,
+    create_stream_ticket,
+    get_current_active_user,
     get_current_user,
     get_current_user_optional,
+    get_current_username,
     get_manager,
+    get_stream_username,
     get_user,
     hash_password,
     save_user,
@@ -193,6 +197,22 @@ async def test_get_current_user_dev_mode_existing_user() -> None:
         mock_manager.load_user.assert_called_once_with(DEFAULT_USERNAME)
 
 
+@pytest.mark.asyncio
+async def test_get_current_active_user_loads_active_set() -> None:
+    """Test get_current_active_user loads through load_active_user."""
+    with patch.dict("os.environ", {"MOTIDO_DEV_MODE": "false"}):
+        mock_manager = MagicMock()
+        mock_user = User(username="testuser")
+        mock_manager.load_active_user.return_value = mock_user
+
+        token = create_access_token({"sub": "testuser"})
+        result = await get_current_active_user(token, mock_manager)
+
+        assert result == mock_user
+        mock_manager.load_active_user.assert_called_once_with("testuser")
+        mock_manager.load_user.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_get_current_user_dev_mode_new_user() -> None:
     """Test get_current_user in dev mode creating new user."""
@@ -266,6 +286,36 @@ async def test_get_current_user_prod_mode_success() -> None:
         mock_manager.load_user.assert_called_once_with("testuser")
 
 
+@pytest.mark.asyncio
+async def test_get_current_username_reads_token_only() -> None:
+    """Test the username dependency checks the token without a data manager."""
+    with patch.dict("os.environ", {"MOTIDO_DEV_MODE": "false"}):
+        token = create_access_token({"sub": "testuser"})
+        assert await get_current_username(token) == "testuser"
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_username(None)
+        assert exc_info.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_get_stream_username_dev_mode() -> None:
+    """Test the stream dependency needs no token in dev mode."""
+    with patch.dict("os.environ", {"MOTIDO_DEV_MODE": "true"}):
+        assert await get_stream_username(None, None) == DEFAULT_USERNAME
+
+
+@pytest.mark.asyncio
+async def test_stream_ticket_only_opens_the_stream() -> None:
+    """Test a stream ticket authenticates the stream and nothing else."""
+    ticket = create_stream_ticket("testuser")
+    with patch.dict("os.environ", {"MOTIDO_DEV_MODE": "false"}):
+        assert await get_stream_username(None, ticket) == "testuser"
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_username(ticket)
+        assert exc_info.value.status_code == 401
+        assert await get_current_user_optional(ticket, MagicMock()) is None
+
+
 @patch("motido.api.deps.pwd_context")
 def test_verify_password(mock_pwd_context: Any) -> None:
     """Test password verification."""
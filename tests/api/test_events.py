@@ -0,0 +1,300 @@
+# tests/api/test_events.py
+# pylint: disable=redefined-outer-name,too-few-public-methods
+"""
+Tests for the change-event brokers and the SSE stream endpoint.
+"""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator, Generator
+from datetime import date, timedelta
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from motido.api import events
+from motido.api.deps import (
+    STREAM_TICKET_EXPIRE_SECONDS,
+    create_access_token,
+)
+from motido.api.events import (
+    BADGE_EARNED,
+    DATE_ADVANCED,
+    TASK_COMPLETED,
+    TASK_CREATED,
+    TASK_DELETED,
+    TASK_UNCOMPLETED,
+    TASK_UPDATED,
+    XP_CHANGED,
+    ChangeEvent,
+    InProcessEventBroker,
+    RecordingEventBroker,
+    Subscription,
+    get_event_broker,
+    publish_event,
+    set_event_broker,
+    stream_events,
+)
+from motido.core.models import Badge, User
+
+
+@pytest.fixture
+def recorder() -> Generator[RecordingEventBroker, None, None]:
+    """Install a recording broker for the duration of a test."""
+    broker = RecordingEventBroker()
+    set_event_broker(broker)
+    yield broker
+    set_event_broker(None)
+
+
+class TestChangeEvent:
+    """Tests for ChangeEvent serialization."""
+
+    def test_to_sse_format(self) -> None:
+        """Test that events render as id/event/data SSE frames."""
+        event = ChangeEvent(type=TASK_CREATED, username="u", data={"task_id": "t1"})
+        frame = event.to_sse()
+        lines = frame.strip().split("\n")
+        assert lines[0] == f"id: {event.id}"
+        assert lines[1] == f"event: {TASK_CREATED}"
+        payload = json.loads(lines[2][len("data: ") :])
+        assert payload["type"] == TASK_CREATED
+        assert payload["data"] == {"task_id": "t1"}
+        assert frame.endswith("\n\n")
+
+
+class TestInProcessEventBroker:
+    """Tests for the in-process fan-out broker."""
+
+    async def test_publish_reaches_only_matching_user(self) -> None:
+        """Test events are delivered to the right user's subscribers."""
+        broker = InProcessEventBroker()
+        alice = broker.subscribe("alice")
+        bob = broker.subscribe("bob")
+
+        broker.publish(ChangeEvent(type=TASK_UPDATED, username="alice"))
+
+        received = await alice.get(timeout=1)
+        assert received is not None and received.type == TASK_UPDATED
+        assert await bob.get(timeout=0.01) is None
+
+    async def test_unsubscribe_is_idempotent(self) -> None:
+        """Test unsubscribing twice is safe and clears empty user entries."""
+        broker = InProcessEventBroker()
+        subscription = broker.subscribe("alice")
+        assert broker.subscriber_count("alice") == 1
+
+        broker.unsubscribe(subscription)
+        broker.unsubscribe(subscription)
+
+        assert broker.subscriber_count("alice") == 0
+
+    async def test_full_queue_drops_oldest(self) -> None:
+        """Test a slow subscriber keeps only the newest events."""
+        subscription = Subscription("alice", maxsize=2)
+        for index in range(3):
+            subscription.deliver(
+                ChangeEvent(type=XP_CHANGED, username="alice", data={"n": index})
+            )
+        await asyncio.sleep(0)
+
+        first = await subscription.get(timeout=1)
+        second = await subscription.get(timeout=1)
+        assert first is not None and first.data == {"n": 1}
+        assert second is not None and second.data == {"n": 2}
+
+
+class TestBrokerRegistry:
+    """Tests for the module-level broker singleton."""
+
+    def test_default_broker_is_in_process(self) -> None:
+        """Test the default broker is created lazily."""
+        set_event_broker(None)
+        try:
+            broker = get_event_broker()
+            assert isinstance(broker, InProcessEventBroker)
+            assert get_event_broker() is broker
+        finally:
+            set_event_broker(None)
+
+    def test_publish_event_uses_installed_broker(
+        self, recorder: RecordingEventBroker
+    ) -> None:
+        """Test publish_event builds and publishes through the singleton."""
+        event = publish_event("alice", DATE_ADVANCED, days_processed=2)
+        assert recorder.published == [event]
+        assert event.data == {"days_processed": 2}
+
+
+class TestStreamEvents:
+    """Tests for the SSE stream generator."""
+
+    async def test_stream_yields_events_and_heartbeats(self) -> None:
+        """Test the stream sends a greeting, events, and keep-alives."""
+        broker = InProcessEventBroker()
+        checks = iter([False, False, True])
+
+        async def is_disconnected() -> bool:
+            return next(checks)
+
+        stream = stream_events(broker, "alice", is_disconnected, heartbeat_seconds=0.01)
+        assert await stream.__anext__() == ": connected\n\n"
+
+        broker.publish(ChangeEvent(type=TASK_DELETED, username="alice"))
+        assert "event: task_deleted" in await stream.__anext__()
+        assert await stream.__anext__() == ": keep-alive\n\n"
+
+        with pytest.raises(StopAsyncIteration):
+            await stream.__anext__()
+        assert broker.subscriber_count("alice") == 0
+
+
+class TestStreamEndpoint:
+    """Tests for GET /api/events/stream."""
+
+    @pytest.fixture
+    def seen(self, monkeypatch: Any) -> dict[str, str]:
+        """Replace the stream with one recording the username it serves."""
+        seen: dict[str, str] = {}
+
+        async def fake_stream(
+            _broker: Any, username: str, _is_disconnected: Any
+        ) -> AsyncIterator[str]:
+            seen["username"] = username
+            yield ": connected\n\n"
+
+        monkeypatch.setattr("motido.api.main.stream_events", fake_stream)
+        monkeypatch.setenv("MOTIDO_DEV_MODE", "false")
+        return seen
+
+    def test_stream_endpoint_authenticates_without_loading_user(
+        self, client: TestClient, mock_manager: Any, seen: dict[str, str]
+    ) -> None:
+        """Test the token's user is streamed without loading their data."""
+        mock_manager.load_user = Mock(side_effect=AssertionError("loaded"))
+        token = create_access_token({"sub": "alice"})
+
+        response = client.get(
+            "/api/events/stream", headers={"Authorization": f"Bearer {token}"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.text == ": connected\n\n"
+        assert seen["username"] == "alice"
+
+    def test_stream_endpoint_accepts_ticket(
+        self, client: TestClient, seen: dict[str, str]
+    ) -> None:
+        """Test EventSource clients can open the stream with a ticket."""
+        issued = client.post("/api/events/ticket").json()
+        assert issued["expires_in"] == STREAM_TICKET_EXPIRE_SECONDS
+
+        response = client.get(f"/api/events/stream?ticket={issued['ticket']}")
+
+        assert response.status_code == 200
+        assert seen["username"] == "test_user"
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "",
+            "?ticket=bad",
+            f"?ticket={create_access_token({'sub': 'bob'})}",
+            f"?access_token={create_access_token({'sub': 'bob'})}",
+        ],
+    )
+    def test_stream_endpoint_rejects_missing_or_bad_ticket(
+        self, client: TestClient, seen: dict[str, str], query: str
+    ) -> None:
+        """Test the stream requires a ticket; access tokens stay out of URLs."""
+        response = client.get(f"/api/events/stream{query}")
+
+        assert response.status_code == 401
+        assert not seen
+
+
+class TestRoutesPublishEvents:
+    """Tests that mutating routes publish change events after saving."""
+
+    def test_create_publishes_task_created(
+        self, client: TestClient, recorder: RecordingEventBroker
+    ) -> None:
+        """Test creating a task publishes task_created."""
+        response = client.post("/api/tasks", json={"title": "Evented"})
+        assert response.status_code == 201
+        assert recorder.types() == [TASK_CREATED]
+        assert recorder.published[0].data["task_id"] == response.json()["id"]
+
+    def test_complete_publishes_completion_xp_and_badges(
+        self,
+        client: TestClient,
+        test_user: User,
+        recorder: RecordingEventBroker,
+        monkeypatch: Any,
+    ) -> None:
+        """Test completing a task publishes completion, XP and badge events."""
+        badge = Badge(id="first", name="First", description="", glyph="🏅")
+        monkeypatch.setattr(
+            "motido.core.scoring.check_badges", lambda *_a, **_k: [badge]
+        )
+        task = test_user.tasks[0]
+
+        response = client.post(f"/api/tasks/{task.id}/complete")
+
+        assert response.status_code == 200
+        assert recorder.types() == [TASK_COMPLETED, XP_CHANGED, BADGE_EARNED]
+        xp_event = recorder.published[1]
+        assert xp_event.data["total_xp"] == test_user.total_xp
+
+    def test_uncomplete_publishes_event(
+        self, client: TestClient, test_user: User, recorder: RecordingEventBroker
+    ) -> None:
+        """Test uncompleting a task publishes task_uncompleted."""
+        task = test_user.tasks[1]
+        response = client.post(f"/api/tasks/{task.id}/uncomplete")
+        assert response.status_code == 200
+        assert recorder.types() == [TASK_UNCOMPLETED]
+
+    def test_withdraw_publishes_xp_changed(
+        self, client: TestClient, recorder: RecordingEventBroker
+    ) -> None:
+        """Test withdrawing XP publishes a negative xp_changed delta."""
+        response = client.post("/api/user/xp/withdraw", json={"amount": 50})
+        assert response.status_code == 200
+        assert recorder.types() == [XP_CHANGED]
+        assert recorder.published[0].data["delta"] == -50
+
+    def test_advance_publishes_date_advanced(
+        self, client: TestClient, test_user: User, recorder: RecordingEventBroker
+    ) -> None:
+        """Test advancing the date publishes date_advanced and XP changes."""
+        test_user.last_processed_date = date.today() - timedelta(days=3)
+        test_user.tasks[0].due_date = test_user.tasks[0].creation_date - timedelta(
+            days=10
+        )
+        test_user.tasks[0].creation_date -= timedelta(days=20)
+
+        response = client.post("/api/system/advance", json={"days": 2})
+
+        assert response.status_code == 200
+        assert recorder.types() == [DATE_ADVANCED, XP_CHANGED]
+        assert recorder.published[0].data["days_processed"] == 2
+        assert recorder.published[1].data["delta"] < 0
+
+    def test_reset_score_tracking_publishes_xp_changed(
+        self, client: TestClient, recorder: RecordingEventBroker
+    ) -> None:
+        """Test resetting score tracking publishes the XP drop."""
+        response = client.post("/api/system/reset-score-tracking")
+        assert response.status_code == 200
+        assert recorder.types() == [XP_CHANGED]
+        assert recorder.published[0].data == {"delta": -500, "total_xp": 0}
+
+
+def test_events_module_exports_event_types() -> None:
+    """Test the public event type constants are stable strings."""
+    assert events.TASK_CREATED == "task_created"
+    assert events.DATE_ADVANCED == "date_advanced"
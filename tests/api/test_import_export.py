@@ -559,3 +559,100 @@ class TestImport:
         imported_user = auth_manager.load_user(DEFAULT_USERNAME)
         assert imported_user is not None
         assert imported_user.password_hash == original_password_hash
+
+
+class TestStreamingExportImport:
+    """Tests for /api/user/export/stream and /api/user/import/stream."""
+
+    def test_stream_export_matches_json_export(
+        self, authenticated_client: TestClient
+    ) -> None:
+        """Test the NDJSON records carry the same data as the JSON backup."""
+        response = authenticated_client.get("/api/user/export/stream")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert ".ndjson" in response.headers["content-disposition"]
+
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert records[0]["type"] == "header"
+        assert [r["type"] for r in records[1:]] == [
+            "user",
+            "task",
+            "badge",
+            "tag",
+            "project",
+        ]
+
+        backup = authenticated_client.get("/api/user/export").json()
+        assert records[1]["data"]["total_xp"] == backup["total_xp"]
+        assert records[2]["data"] == backup["tasks"][0]
+        assert records[3]["data"] == backup["badges"][0]
+
+    def test_stream_round_trip(
+        self,
+        authenticated_client: TestClient,
+        test_user_with_data: User,
+        auth_manager: MockDataManager,
+    ) -> None:
+        """Test an NDJSON export can be imported back."""
+        exported = authenticated_client.get("/api/user/export/stream").content
+        original_hash = test_user_with_data.password_hash
+
+        files = {"file": ("backup.ndjson", BytesIO(exported), "application/x-ndjson")}
+        response = authenticated_client.post("/api/user/import/stream", files=files)
+
+        assert response.status_code == 200
+        summary = response.json()["summary"]
+        assert summary["tasks_count"] == 1
+        assert summary["badges_count"] == 1
+        assert summary["total_xp"] == 500
+
+        imported = auth_manager.load_user(DEFAULT_USERNAME)
+        assert imported is not None
+        assert imported.password_hash == original_hash
+        assert "imported" in imported.tasks[0].tags
+
+    def test_stream_import_reads_in_chunks(
+        self,
+        authenticated_client: TestClient,
+        auth_manager: MockDataManager,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test lines split across read chunks are reassembled."""
+        from motido.api.routers import user as user_router
+
+        monkeypatch.setattr(user_router, "UPLOAD_CHUNK_SIZE", 7)
+        lines = [
+            {"type": "header", "format": "motido-backup-ndjson", "version": 1},
+            {"type": "task", "data": {"id": "t1", "title": "Chunked"}},
+        ]
+        body = "\n".join(json.dumps(line) for line in lines).encode()
+        files = {"file": ("backup.ndjson", BytesIO(body), "application/x-ndjson")}
+
+        response = authenticated_client.post("/api/user/import/stream", files=files)
+
+        assert response.status_code == 200
+        imported = auth_manager.load_user(DEFAULT_USERNAME)
+        assert imported is not None
+        assert [task.title for task in imported.tasks] == ["Chunked"]
+
+    def test_stream_import_rejects_wrong_extension(
+        self, authenticated_client: TestClient
+    ) -> None:
+        """Test non-NDJSON uploads are rejected."""
+        files = {"file": ("backup.json", BytesIO(b"{}"), "application/json")}
+        response = authenticated_client.post("/api/user/import/stream", files=files)
+        assert response.status_code == 400
+        assert "NDJSON" in response.json()["detail"]
+
+    def test_stream_import_rejects_invalid_records(
+        self, authenticated_client: TestClient
+    ) -> None:
+        """Test invalid records report the failing line."""
+        body = b'{"type": "header", "format": "motido-backup-ndjson", "version": 1}\n'
+        body += b"not json\n"
+        files = {"file": ("backup.ndjson", BytesIO(body), "application/x-ndjson")}
+        response = authenticated_client.post("/api/user/import/stream", files=files)
+        assert response.status_code == 400
+        assert "Line 2" in response.json()["detail"]
@@ -0,0 +1,396 @@
+# tests/api/test_jobs.py
+# pylint: disable=redefined-outer-name,protected-access
+"""
+Tests for the background job runner and the /api/jobs endpoints.
+"""
+
+import json
+import threading
+from collections.abc import Generator
+from datetime import date, datetime, timedelta
+from typing import Any
+from unittest.mock import MagicMock, Mock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from motido.api import jobs as jobs_module
+from motido.api.events import JOB_FINISHED, RecordingEventBroker, set_event_broker
+from motido.api.jobs import (
+    JOB_EXPORT,
+    JOB_EXPORT_DIR_ENV,
+    JOB_RETENTION,
+    JobContext,
+    JobRunner,
+    get_job_runner,
+    set_job_runner,
+)
+from motido.core.models import User
+from motido.data.job_store import (
+    JOB_FAILED,
+    JOB_SUCCEEDED,
+    InMemoryJobStore,
+    JobRecord,
+)
+
+from .conftest import MockDataManager
+
+
+@pytest.fixture(autouse=True)
+def export_dir(tmp_path: Any, monkeypatch: Any) -> Any:
+    """Write export job files to a temporary directory."""
+    directory = tmp_path / "exports"
+    monkeypatch.setenv(JOB_EXPORT_DIR_ENV, str(directory))
+    return directory
+
+
+@pytest.fixture
+def runner(mock_manager: MockDataManager) -> Generator[JobRunner, None, None]:
+    """Install an in-memory job runner for the duration of a test."""
+    job_runner = JobRunner(InMemoryJobStore(), mock_manager, max_workers=1)
+    set_job_runner(job_runner)
+    yield job_runner
+    job_runner.shutdown()
+    set_job_runner(None)
+
+
+def _finish(client: TestClient, runner: JobRunner, job_id: str) -> dict[str, Any]:
+    """Wait for a job and return its result payload."""
+    runner.wait(job_id, timeout=10)
+    response = client.get(f"/api/jobs/{job_id}/result")
+    assert response.status_code == 200
+    body: dict[str, Any] = response.json()
+    return body
+
+
+class TestSubmitJobs:
+    """Tests for submitting each job kind."""
+
+    def test_advance_job_ignores_request_cap(
+        self,
+        client: TestClient,
+        runner: JobRunner,
+        mock_manager: MockDataManager,
+        test_user: User,
+        monkeypatch: Any,
+    ) -> None:
+        """Test the advance job processes every pending day and reports progress."""
+        monkeypatch.setenv("ADVANCE_DATE_MAX_DAYS", "1")
+        test_user.last_processed_date = date.today() - timedelta(days=5)
+        overdue = test_user.tasks[0]
+        overdue.creation_date -= timedelta(days=20)
+        overdue.due_date = overdue.creation_date + timedelta(days=1)
+
+        response = client.post(
+            "/api/jobs", json={"kind": "advance", "params": {"days": 4}}
+        )
+        assert response.status_code == 202
+        job_id = response.json()["id"]
+
+        body = _finish(client, runner, job_id)
+        assert body["status"] == JOB_SUCCEEDED
+        assert body["result"]["days_processed"] == 4
+        assert body["result"]["pending_days"] == 0
+        assert body["result"]["xp_change"] < 0
+
+        status_body = client.get(f"/api/jobs/{job_id}").json()
+        assert status_body["progress"] == 4
+        assert status_body["total"] == 4
+        saved = mock_manager.load_user()
+        assert saved is not None
+        assert saved.last_processed_date == date.today() - timedelta(days=1)
+
+    def test_advance_job_to_date_and_default(
+        self, client: TestClient, runner: JobRunner, test_user: User
+    ) -> None:
+        """Test advance targets to_date, and today when no params are given."""
+        test_user.last_processed_date = date.today() - timedelta(days=3)
+        target = (date.today() - timedelta(days=2)).isoformat()
+
+        first = client.post(
+            "/api/jobs", json={"kind": "advance", "params": {"to_date": target}}
+        ).json()
+        assert _finish(client, runner, first["id"])["result"]["days_processed"] == 1
+
+        second = client.post("/api/jobs", json={"kind": "advance"}).json()
+        assert _finish(client, runner, second["id"])["result"]["days_processed"] == 2
+
+    def test_advance_job_rejects_invalid_params(
+        self, client: TestClient, runner: JobRunner
+    ) -> None:
+        """Test advance params are validated like POST /api/system/advance."""
+        response = client.post(
+            "/api/jobs", json={"kind": "advance", "params": {"days": 0}}
+        )
+        assert response.status_code == 400
+        assert not runner.list_for_user("test_user")
+
+    def test_export_job_writes_backup_file(
+        self, client: TestClient, runner: JobRunner, test_user: User, export_dir: Any
+    ) -> None:
+        """Test the export job writes the backup to a file it can serve."""
+        job = client.post("/api/jobs", json={"kind": "export"}).json()
+        result = _finish(client, runner, job["id"])["result"]
+
+        # The job row only references the file
+        assert result["file"] == f"{job['id']}.json"
+        assert result["tasks_count"] == len(test_user.tasks)
+        assert "tasks" not in result
+        assert (export_dir / result["file"]).stat().st_size == result["size_bytes"]
+
+        response = client.get(f"/api/jobs/{job['id']}/download")
+        assert response.status_code == 200
+        assert "attachment" in response.headers["content-disposition"]
+        backup = response.json()
+        assert backup["total_xp"] == test_user.total_xp
+        assert len(backup["tasks"]) == len(test_user.tasks)
+
+    def test_download_requires_available_export(
+        self, client: TestClient, runner: JobRunner, export_dir: Any
+    ) -> None:
+        """Test downloads fail for other job kinds and deleted export files."""
+        rescore = client.post("/api/jobs", json={"kind": "rescore"}).json()
+        runner.wait(rescore["id"], timeout=10)
+        assert client.get(f"/api/jobs/{rescore['id']}/download").status_code == 409
+
+        export = client.post("/api/jobs", json={"kind": "export"}).json()
+        runner.wait(export["id"], timeout=10)
+        (export_dir / f"{export['id']}.json").unlink()
+        assert client.get(f"/api/jobs/{export['id']}/download").status_code == 404
+
+    def test_rescore_job_scores_incomplete_tasks(
+        self, client: TestClient, runner: JobRunner, test_user: User
+    ) -> None:
+        """Test the rescore job scores every incomplete task."""
+        job = client.post("/api/jobs", json={"kind": "rescore"}).json()
+        result = _finish(client, runner, job["id"])["result"]
+        incomplete = {t.id for t in test_user.tasks if not t.is_complete}
+        assert set(result["scores"]) == incomplete
+        assert result["count"] == len(incomplete)
+
+    def test_import_job_replaces_user_data(
+        self,
+        client: TestClient,
+        runner: JobRunner,
+        mock_manager: MockDataManager,
+    ) -> None:
+        """Test an uploaded backup is imported by a job."""
+        backup = {"total_xp": 42, "tasks": [{"id": "t1", "title": "Imported"}]}
+        response = client.post(
+            "/api/jobs/import",
+            files={"file": ("backup.json", json.dumps(backup), "application/json")},
+        )
+        assert response.status_code == 202
+
+        body = _finish(client, runner, response.json()["id"])
+        assert body["result"]["total_xp"] == 42
+        assert body["result"]["tasks_count"] == 1
+        saved = mock_manager.load_user()
+        assert saved is not None and saved.total_xp == 42
+
+    def test_import_job_rejects_wrong_file_type(
+        self, client: TestClient, runner: JobRunner
+    ) -> None:
+        """Test a non-JSON file name fails before a job is queued."""
+        wrong_type = client.post(
+            "/api/jobs/import", files={"file": ("backup.txt", "{}", "text/plain")}
+        )
+        assert wrong_type.status_code == 400
+        assert not runner.list_for_user("test_user")
+
+    def test_import_job_parses_upload_in_job(
+        self, client: TestClient, runner: JobRunner
+    ) -> None:
+        """Test malformed JSON is accepted by the request and fails the job."""
+        response = client.post(
+            "/api/jobs/import",
+            files={"file": ("backup.json", "{not json", "application/json")},
+        )
+        assert response.status_code == 202
+
+        body = _finish(client, runner, response.json()["id"])
+        assert body["status"] == JOB_FAILED
+        assert body["error"].startswith("Invalid JSON file")
+
+    def test_import_job_reports_invalid_structure(
+        self, client: TestClient, runner: JobRunner
+    ) -> None:
+        """Test import validation errors surface as a failed job."""
+        response = client.post(
+            "/api/jobs/import",
+            files={"file": ("backup.json", "[]", "application/json")},
+        )
+        body = _finish(client, runner, response.json()["id"])
+        assert body["status"] == JOB_FAILED
+        assert body["error"] == "Invalid file structure: expected JSON object"
+
+
+class TestJobStatus:
+    """Tests for listing jobs and reading status/results."""
+
+    def test_list_and_unknown_job(self, client: TestClient, runner: JobRunner) -> None:
+        """Test listing jobs and 404s for jobs the user does not own."""
+        job = client.post("/api/jobs", json={"kind": "export"}).json()
+        runner.wait(job["id"], timeout=10)
+        other = runner.submit("someone_else", JOB_EXPORT)
+
+        listed = client.get("/api/jobs").json()
+        assert [item["id"] for item in listed] == [job["id"]]
+        assert client.get("/api/jobs/missing").status_code == 404
+        assert client.get(f"/api/jobs/{other.id}/result").status_code == 404
+
+    def test_polling_skips_user_load(
+        self,
+        client: TestClient,
+        runner: JobRunner,
+        mock_manager: MockDataManager,
+        monkeypatch: Any,
+    ) -> None:
+        """Test status, result, list and download only need the token."""
+        job = client.post("/api/jobs", json={"kind": "export"}).json()
+        runner.wait(job["id"], timeout=10)
+        monkeypatch.setattr(
+            mock_manager, "load_user", Mock(side_effect=AssertionError("loaded"))
+        )
+
+        for path in ("", f"/{job['id']}", f"/{job['id']}/result"):
+            assert client.get(f"/api/jobs{path}").status_code == 200
+        assert client.get(f"/api/jobs/{job['id']}/download").status_code == 200
+
+    def test_result_conflict_while_running(
+        self, client: TestClient, mock_manager: MockDataManager
+    ) -> None:
+        """Test the result endpoint returns 409 until the job finishes."""
+        release = threading.Event()
+
+        def blocking(_ctx: JobContext) -> dict[str, Any]:
+            release.wait(10)
+            return {"done": True}
+
+        blocking_runner = JobRunner(
+            InMemoryJobStore(), mock_manager, handlers={"slow": blocking}
+        )
+        set_job_runner(blocking_runner)
+        try:
+            job = blocking_runner.submit("test_user", "slow")
+            response = client.get(f"/api/jobs/{job.id}/result")
+            assert response.status_code == 409
+        finally:
+            release.set()
+            blocking_runner.shutdown()
+            set_job_runner(None)
+
+        assert _finish_status(blocking_runner, job.id) == JOB_SUCCEEDED
+
+
+def _finish_status(runner: JobRunner, job_id: str) -> str | None:
+    job = runner.wait(job_id, timeout=10)
+    return job.status if job else None
+
+
+class TestJobRunner:
+    """Tests for the runner itself."""
+
+    def test_unknown_kind_rejected(self, mock_manager: MockDataManager) -> None:
+        """Test submitting an unregistered kind raises ValueError."""
+        job_runner = JobRunner(InMemoryJobStore(), mock_manager, handlers={})
+        with pytest.raises(ValueError, match="Unknown job kind"):
+            job_runner.submit("u", "nope")
+        job_runner.shutdown()
+
+    def test_failure_is_recorded_and_published(
+        self, mock_manager: MockDataManager
+    ) -> None:
+        """Test handler errors mark the job failed and publish job_finished."""
+        recorder = RecordingEventBroker()
+        set_event_broker(recorder)
+        job_runner = JobRunner(InMemoryJobStore(), mock_manager)
+        try:
+            # MockDataManager has no user loaded, so load_user() fails
+            job = job_runner.submit("ghost", JOB_EXPORT)
+            finished = job_runner.wait(job.id, timeout=10)
+        finally:
+            job_runner.shutdown()
+            set_event_broker(None)
+
+        assert finished is not None
+        assert finished.status == JOB_FAILED
+        assert finished.error == "User 'ghost' not found"
+        assert recorder.types() == [JOB_FINISHED]
+        assert recorder.published[0].data["status"] == JOB_FAILED
+
+    def test_prune_deletes_expired_export_files(
+        self, mock_manager: MockDataManager, test_user: User, export_dir: Any
+    ) -> None:
+        """Test pruned export jobs take their files with them."""
+        mock_manager.save_user(test_user)
+        job_runner = JobRunner(InMemoryJobStore(), mock_manager, max_workers=1)
+        try:
+            export = job_runner.wait(
+                job_runner.submit(test_user.username, JOB_EXPORT).id, timeout=10
+            )
+            assert export is not None
+            rescore = job_runner.submit(test_user.username, "rescore")
+            job_runner.wait(rescore.id, timeout=10)
+            export_file = export_dir / f"{export.id}.json"
+            assert export_file.exists()
+
+            # Nothing has outlived the retention window yet
+            assert not job_runner.prune()
+            later = datetime.now() + JOB_RETENTION + timedelta(minutes=1)
+            pruned = job_runner.prune(now=later)
+        finally:
+            job_runner.shutdown()
+
+        assert len(pruned) == 2
+        assert not export_file.exists()
+        assert job_runner.get(export.id) is None
+
+    def test_wait_for_unknown_job(self, mock_manager: MockDataManager) -> None:
+        """Test waiting on a job this runner never saw returns the stored state."""
+        job_runner = JobRunner(InMemoryJobStore(), mock_manager)
+        assert job_runner.wait("missing") is None
+        job_runner.shutdown()
+
+    def test_progress_saves_are_throttled(self) -> None:
+        """Test progress is persisted at most once per interval until done."""
+        store = MagicMock()
+        ctx = JobContext(JobRecord(username="u", kind="k"), store, MagicMock())
+
+        ctx.report(1, 10, "working")
+        ctx.report(2)
+        assert store.save.call_count == 1
+        assert ctx.job.message == "working"
+
+        ctx.report(10)
+        assert store.save.call_count == 2
+        assert ctx.job.progress == 10
+
+
+class TestRunnerRegistry:
+    """Tests for the module-level runner singleton."""
+
+    def test_uses_manager_job_store(self) -> None:
+        """Test the runner takes its store from the backend when available."""
+        store = InMemoryJobStore()
+        manager = MagicMock()
+        manager.create_job_store.return_value = store
+        set_job_runner(None)
+        try:
+            job_runner = get_job_runner(manager)
+            assert job_runner.store is store
+            assert get_job_runner(manager) is job_runner
+        finally:
+            job_runner.shutdown()
+            set_job_runner(None)
+
+    def test_falls_back_to_memory_store(self, mock_manager: MockDataManager) -> None:
+        """Test backends without a job store get an in-memory one."""
+        set_job_runner(None)
+        try:
+            job_runner = get_job_runner(mock_manager)
+            assert isinstance(job_runner.store, InMemoryJobStore)
+        finally:
+            job_runner.shutdown()
+            set_job_runner(None)
+        assert jobs_module._job_runner is None
@@ -0,0 +1,106 @@
+# tests/api/test_metrics.py
+# pylint: disable=redefined-outer-name,unused-argument
+"""
+Tests for request metrics, Server-Timing headers and GET /api/metrics.
+"""
+
+import asyncio
+import re
+from collections.abc import Generator
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from motido.api.middleware.metrics import MetricsMiddleware
+from motido.core.metrics import (
+    HTTP_LATENCY,
+    TASKS_SCORED,
+    MetricsRegistry,
+    get_metrics,
+    set_metrics,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics() -> Generator[MetricsRegistry, None, None]:
+    """Give each test an empty metrics registry."""
+    registry = MetricsRegistry()
+    set_metrics(registry)
+    yield registry
+    set_metrics(None)
+
+
+class TestServerTiming:
+    """Tests for the metrics middleware."""
+
+    def test_list_tasks_reports_scoring_phase(
+        self, client: TestClient, fresh_metrics: MetricsRegistry
+    ) -> None:
+        """Test scoring time is returned and latency is recorded by route."""
+        response = client.get("/api/tasks", params={"include_completed": True})
+
+        assert response.status_code == 200
+        timing = response.headers["server-timing"]
+        assert "scoring;dur=" in timing
+        assert "total;dur=" in timing
+        assert fresh_metrics.counter_value(TASKS_SCORED) >= 3
+        # Labelled by route template; FastAPI may omit the include prefix
+        assert re.search(
+            r'_count\{method="GET",route="(/api)?/tasks",status="200"\} 1',
+            fresh_metrics.render(),
+        )
+
+    def test_unmatched_route_label(
+        self, client: TestClient, fresh_metrics: MetricsRegistry
+    ) -> None:
+        """Test unknown paths share one label instead of their raw path."""
+        response = client.get("/api/does-not-exist")
+
+        assert response.status_code == 404
+        assert (
+            fresh_metrics.histogram_count(
+                HTTP_LATENCY, method="GET", route="unmatched", status=404
+            )
+            == 1
+        )
+
+    def test_non_http_scopes_pass_through(self, fresh_metrics: MetricsRegistry) -> None:
+        """Test lifespan and websocket traffic is forwarded untimed."""
+        seen: list[str] = []
+
+        async def inner(scope: Any, receive: Any, send: Any) -> None:
+            seen.append(scope["type"])
+
+        asyncio.run(
+            MetricsMiddleware(inner)({"type": "lifespan"}, AsyncMock(), AsyncMock())
+        )
+
+        assert seen == ["lifespan"]
+        assert not fresh_metrics.render()
+
+
+class TestMetricsEndpoint:
+    """Tests for GET /api/metrics."""
+
+    def test_metrics_text_format(self, client: TestClient) -> None:
+        """Test metrics are served in the Prometheus text format."""
+        client.get("/api/health")
+        response = client.get("/api/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert f"# TYPE {HTTP_LATENCY} histogram" in response.text
+        assert 'route="/api/health",status="200"' in response.text
+
+    def test_metrics_token_required(self, client: TestClient, monkeypatch: Any) -> None:
+        """Test MOTIDO_METRICS_TOKEN protects the endpoint."""
+        monkeypatch.setenv("MOTIDO_METRICS_TOKEN", "s3cret")
+
+        assert client.get("/api/metrics").status_code == 401
+        response = client.get(
+            "/api/metrics", headers={"Authorization": "Bearer s3cret"}
+        )
+        assert response.status_code == 200
+        assert get_metrics() is not None
@@ -0,0 +1,110 @@
+# tests/api/test_profiling.py
+# pylint: disable=redefined-outer-name,unused-argument,protected-access
+"""
+Tests for per-request profiling via the X-Motido-Profile header.
+"""
+
+import asyncio
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from motido.api.middleware import profiling
+from motido.api.middleware.profiling import (
+    DEV_MODE_ENV,
+    PROFILE_HEADER,
+    REPORT_HEADER,
+    TOKEN_ENV,
+    ProfilingMiddleware,
+)
+from motido.core.profiling import PROFILE_DIR_ENV
+
+
+@pytest.fixture(autouse=True)
+def profile_env(tmp_path: Path, monkeypatch: Any) -> Path:
+    """Write reports to a temp dir and start with profiling switched off."""
+    monkeypatch.setenv(PROFILE_DIR_ENV, str(tmp_path))
+    monkeypatch.delenv(TOKEN_ENV, raising=False)
+    monkeypatch.delenv(DEV_MODE_ENV, raising=False)
+    monkeypatch.delenv("VERCEL_ENV", raising=False)
+    return tmp_path
+
+
+class TestProfilingMiddleware:
+    """Tests for the profiling middleware."""
+
+    def test_admin_token_profiles_request(
+        self, client: TestClient, profile_env: Path, monkeypatch: Any
+    ) -> None:
+        """Test a matching header profiles the request and writes a report."""
+        monkeypatch.setenv(TOKEN_ENV, "s3cret")
+
+        response = client.get(
+            "/api/tasks",
+            params={"include_completed": True},
+            headers={PROFILE_HEADER: "s3cret"},
+        )
+
+        assert response.status_code == 200
+        assert len(response.json()) >= 3
+        assert "scoring=" in response.headers[PROFILE_HEADER]
+        assert "server-timing" in response.headers
+        report = profile_env / response.headers[REPORT_HEADER]
+        assert "Phases:" in report.read_text(encoding="utf-8")
+        assert report.with_suffix(".prof").exists()
+
+    @pytest.mark.parametrize("header", [{}, {PROFILE_HEADER: "wrong"}])
+    def test_wrong_or_missing_token_not_profiled(
+        self, client: TestClient, monkeypatch: Any, header: dict[str, str]
+    ) -> None:
+        """Test requests without the admin token are served normally."""
+        monkeypatch.setenv(TOKEN_ENV, "s3cret")
+
+        response = client.get("/api/health", headers=header)
+
+        assert response.status_code == 200
+        assert PROFILE_HEADER not in response.headers
+
+    def test_header_ignored_without_configured_token(self, client: TestClient) -> None:
+        """Test profiling cannot be requested when no token is configured."""
+        response = client.get("/api/health", headers={PROFILE_HEADER: ""})
+        assert PROFILE_HEADER not in response.headers
+
+    def test_dev_mode_profiles_every_request(
+        self, client: TestClient, monkeypatch: Any
+    ) -> None:
+        """Test MOTIDO_PROFILE_REQUESTS=1 profiles requests outside production."""
+        monkeypatch.setenv(DEV_MODE_ENV, "1")
+        assert PROFILE_HEADER in client.get("/api/health").headers
+
+        monkeypatch.setenv("VERCEL_ENV", "production")
+        assert PROFILE_HEADER not in client.get("/api/health").headers
+
+    def test_concurrent_profile_reports_busy(
+        self, client: TestClient, monkeypatch: Any
+    ) -> None:
+        """Test a second profile request is served unprofiled while one runs."""
+        monkeypatch.setenv(DEV_MODE_ENV, "1")
+        with profiling._profile_lock:
+            response = client.get("/api/health")
+
+        assert response.status_code == 200
+        assert response.headers[PROFILE_HEADER] == "busy"
+        assert REPORT_HEADER not in response.headers
+
+    def test_non_http_scopes_pass_through(self, monkeypatch: Any) -> None:
+        """Test lifespan traffic is never profiled."""
+        monkeypatch.setenv(DEV_MODE_ENV, "1")
+        seen: list[str] = []
+
+        async def inner(scope: Any, receive: Any, send: Any) -> None:
+            seen.append(scope["type"])
+
+        asyncio.run(
+            ProfilingMiddleware(inner)({"type": "lifespan"}, AsyncMock(), AsyncMock())
+        )
+
+        assert seen == ["lifespan"]
@@ -10,7 +10,7 @@ from unittest.mock import MagicMock
 
 from fastapi.testclient import TestClient
 
-from motido.api.main import reset_score_tracking
+from motido.api.main import app, reset_score_tracking
 from motido.core.models import (
     Badge,
     RecurrenceType,
@@ -365,3 +365,11 @@ class TestOpenAPIEndpoint:
         """Test ReDoc endpoint."""
         response = client.get("/api/redoc")
         assert response.status_code == 200
+
+
+def test_shutdown_closes_data_manager(mocker: Any) -> None:
+    """Test the data manager's connections are closed on shutdown."""
+    close = mocker.patch("motido.api.main.close_data_manager")
+    with TestClient(app):
+        close.assert_not_called()
+    close.assert_called_once_with()
@@ -16,19 +16,28 @@ from motido.api.routers.tasks import (  # pylint: disable=protected-access
     parse_subtask_recurrence_mode,
 )
 from motido.api.schemas import BulkJumpToCurrentInstanceRequest
-from motido.core.models import RecurrenceType, SubtaskRecurrenceMode, Task, User
+from motido.core.models import (
+    LazyTasks,
+    RecurrenceType,
+    SubtaskRecurrenceMode,
+    Task,
+    User,
+)
 from motido.core.utils import _process_recurrences  # pylint: disable=protected-access
 
 
 class TestTaskList:
     """Tests for GET /api/tasks endpoint."""
 
-    def test_list_tasks_returns_all_tasks(self, client: TestClient) -> None:
-        """Test that listing tasks returns all tasks."""
+    def test_list_tasks_returns_open_tasks_by_default(self, client: TestClient) -> None:
+        """Test listing tasks returns the open ones unless history is asked for."""
         response = client.get("/api/tasks")
         assert response.status_code == 200
-        data = response.json()
-        assert len(data) == 3
+        assert len(response.json()) == 2
+        assert all(not task["is_complete"] for task in response.json())
+
+        response = client.get("/api/tasks", params={"include_completed": True})
+        assert len(response.json()) == 3
 
     def test_list_tasks_filter_by_status_pending(self, client: TestClient) -> None:
         """Test filtering tasks by pending status."""
@@ -65,6 +74,29 @@ class TestTaskList:
         data = response.json()
         assert all(task["is_habit"] for task in data)
 
+    def test_list_tasks_fetches_history_only_when_needed(
+        self, client: TestClient, test_user: User
+    ) -> None:
+        """Test pending listings leave an active-set user's history unfetched."""
+        archived = Task(
+            title="Old habit instance",
+            creation_date=datetime(2024, 1, 1),
+            is_complete=True,
+        )
+        test_user.inactive_tasks = LazyTasks(
+            lambda: [archived], frozenset(t.id for t in test_user.tasks)
+        )
+
+        for params in ({}, {"status_filter": "pending"}):
+            pending = client.get("/api/tasks", params=params)
+            assert archived.id not in {task["id"] for task in pending.json()}
+            assert not test_user.inactive_tasks.loaded
+
+        everything = client.get("/api/tasks", params={"include_completed": True})
+        assert archived.id in {task["id"] for task in everything.json()}
+        assert len(everything.json()) == 4
+        assert client.get(f"/api/tasks/{archived.id}").status_code == 200
+
     def test_list_tasks_empty_user(self, empty_client: TestClient) -> None:
         """Test listing tasks for user with no tasks."""
         response = empty_client.get("/api/tasks")
@@ -292,6 +324,37 @@ class TestTaskEndRecurrence:
 
         assert related == [task]
 
+    def test_get_recurring_series_walks_archived_instances(self) -> None:
+        """Lineage traversal should link kept instances through archived ones."""
+        series = [
+            Task(
+                title="Archived Chain",
+                creation_date=datetime.now(),
+                is_habit=True,
+                recurrence_rule="FREQ=DAILY",
+                is_complete=True,
+            )
+        ]
+        for _ in range(3):
+            series.append(
+                Task(
+                    title="Archived Chain",
+                    creation_date=datetime.now(),
+                    is_habit=True,
+                    recurrence_rule="FREQ=DAILY",
+                    is_complete=True,
+                    parent_habit_id=series[-1].id,
+                )
+            )
+        root, head = series[0], series[-1]
+        user = User(username="series-test", tasks=[root, head])
+        user.archived_tasks = LazyTasks.of(series[1:3], frozenset())
+        for archived in series[1:3]:
+            user.archive_summary.add(archived)
+
+        assert _get_recurring_series(head, user) == [root, head]
+        assert _get_recurring_series(root, user) == [root, head]
+
     def test_undo_recurrence_end_restores_timestamp(
         self, client: TestClient, test_user: User
     ) -> None:
@@ -971,6 +1034,22 @@ class TestDependencies:
         response = client.post(f"/api/tasks/{task_id}/dependencies/nonexistent")
         assert response.status_code == 404
 
+    def test_list_dependents(self, client: TestClient, test_user: User) -> None:
+        """Test listing the tasks that depend on a task."""
+        task_id = test_user.tasks[0].id
+        dep_id = test_user.tasks[1].id
+        client.post(f"/api/tasks/{task_id}/dependencies/{dep_id}")
+
+        response = client.get(f"/api/tasks/{dep_id}/dependents")
+        assert response.status_code == 200
+        assert [t["id"] for t in response.json()] == [task_id]
+        assert client.get(f"/api/tasks/{task_id}/dependents").json() == []
+
+    def test_list_dependents_task_not_found(self, client: TestClient) -> None:
+        """Test listing dependents of an unknown task."""
+        response = client.get("/api/tasks/nonexistent/dependents")
+        assert response.status_code == 404
+
 
 class TestParseSubtaskRecurrenceMode:
     """Tests for parse_subtask_recurrence_mode function."""
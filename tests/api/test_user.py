@@ -7,6 +7,8 @@ Tests for the user API endpoints.
 from datetime import date
 from datetime import datetime as dt
 from datetime import timedelta
+from typing import Any
+from unittest.mock import Mock
 
 from fastapi.testclient import TestClient
 
@@ -124,6 +126,79 @@ class TestXPEndpoints:
         response = client.get("/api/user/xp", params={"limit": 10})
         assert response.status_code == 200
 
+    def test_get_xp_log_pages_newest_first(
+        self, client: TestClient, test_user: User
+    ) -> None:
+        """Test limit and offset page through the log newest first."""
+        start = dt(2025, 1, 1, 9, 0)
+        test_user.xp_transactions = [
+            XPTx(
+                amount=i,
+                source="task_completion",
+                timestamp=start + timedelta(hours=i),
+            )
+            for i in range(5)
+        ]
+
+        response = client.get("/api/user/xp", params={"limit": 2, "offset": 1})
+
+        assert response.status_code == 200
+        assert [t["amount"] for t in response.json()] == [3, 2]
+
+    def test_get_xp_log_skips_user_load(
+        self, client: TestClient, mock_manager: Any, monkeypatch: Any
+    ) -> None:
+        """Test the page is read by username without loading the user."""
+        page = [XPTx(amount=7, source="task_completion", timestamp=dt.now())]
+        calls: list[tuple[str, int, int]] = []
+
+        def load_xp_log(username: str, *, limit: int, offset: int = 0) -> list[XPTx]:
+            calls.append((username, limit, offset))
+            return page
+
+        monkeypatch.setattr(
+            mock_manager, "load_user", Mock(side_effect=AssertionError("loaded"))
+        )
+        monkeypatch.setattr(mock_manager, "load_xp_log", load_xp_log)
+
+        response = client.get("/api/user/xp", params={"limit": 5})
+
+        assert response.status_code == 200
+        assert [t["amount"] for t in response.json()] == [7]
+        assert calls == [("test_user", 5, 0)]
+
+    def test_get_xp_log_rejects_bad_page(self, client: TestClient) -> None:
+        """Test a non-positive limit or negative offset is a bad request."""
+        assert client.get("/api/user/xp", params={"limit": 0}).status_code == 400
+        assert client.get("/api/user/xp", params={"offset": -1}).status_code == 400
+
+    def test_rollup_xp_log(self, client: TestClient, test_user: User) -> None:
+        """Test old transactions are compacted and total XP is unchanged."""
+        old = dt.now() - timedelta(days=60)
+        test_user.xp_transactions = [
+            XPTx(amount=10, source="task_completion", timestamp=old),
+            XPTx(amount=15, source="habit_completion", timestamp=old),
+            XPTx(amount=5, source="task_completion", timestamp=dt.now()),
+        ]
+
+        response = client.post("/api/user/xp/rollup")
+
+        assert response.status_code == 200
+        assert response.json() == {"compacted": 2, "aggregates": 1, "remaining": 2}
+        assert [t.amount for t in test_user.xp_transactions] == [25, 5]
+        assert test_user.total_xp == 500
+
+        response = client.post("/api/user/xp/rollup")
+        assert response.json() == {"compacted": 0, "aggregates": 0, "remaining": 2}
+
+    def test_rollup_xp_log_rejects_bad_horizons(self, client: TestClient) -> None:
+        """Test a monthly horizon shorter than the daily one is a bad request."""
+        response = client.post(
+            "/api/user/xp/rollup", params={"daily_after": 30, "monthly_after": 7}
+        )
+        assert response.status_code == 400
+        assert "monthly" in response.json()["detail"]
+
     def test_withdraw_xp_success(  # pylint: disable=unused-argument
         self, client: TestClient, test_user: User
     ) -> None:
@@ -3,11 +3,13 @@
 Tests for the view API endpoints (calendar, heatmap, kanban, habits).
 """
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from typing import Any
+from unittest.mock import Mock
 
 from fastapi.testclient import TestClient
 
-from motido.core.models import Priority, Task, User
+from motido.core.models import ArchiveSummary, Priority, Task, User
 
 
 class TestCalendarEndpoint:
@@ -192,6 +194,36 @@ class TestHeatmapEndpoint:
         response = client.get("/api/views/heatmap", params={"habit_id": habit.id})
         assert response.status_code == 200
 
+    def test_heatmap_skips_user_load(
+        self, client: TestClient, mock_manager: Any, monkeypatch: Any
+    ) -> None:
+        """Test the heatmap is answered by username without loading the user."""
+        calls: list[str] = []
+
+        def counts(
+            username: str, start: date, end: date, habit_id: str | None = None
+        ) -> dict[date, tuple[int, int]]:
+            calls.append(username)
+            assert start <= end and habit_id is None
+            return {end: (2, 3)}
+
+        monkeypatch.setattr(
+            mock_manager, "load_user", Mock(side_effect=AssertionError("loaded"))
+        )
+        monkeypatch.setattr(
+            mock_manager, "load_archive_summary", lambda username: ArchiveSummary()
+        )
+        monkeypatch.setattr(mock_manager, "completion_counts_by_day", counts)
+
+        response = client.get("/api/views/heatmap", params={"weeks": 1})
+
+        assert response.status_code == 200
+        today = next(
+            d for d in response.json() if d["date"] == date.today().isoformat()
+        )
+        assert (today["completed_count"], today["total_count"]) == (2, 3)
+        assert calls == ["test_user"]
+
 
 class TestKanbanEndpoint:
     """Tests for GET /api/views/kanban endpoint."""
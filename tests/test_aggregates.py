@@ -0,0 +1,256 @@
+"""Tests for the aggregate queries behind the stats and heatmap views."""
+
+# pylint: disable=redefined-outer-name
+
+from datetime import date, datetime
+from typing import Any
+
+import pytest
+
+from motido.core.models import LazyTasks, Task, TaskCounts, User
+from motido.data.abstraction import DataManager
+from motido.data.database_manager import DatabaseDataManager
+from motido.data.json_manager import JsonDataManager
+
+START, END = date(2025, 1, 1), date(2025, 1, 4)
+
+
+class MemoryManager(DataManager):  # pylint: disable=abstract-method
+    """A backend relying on the default, in-memory aggregates."""
+
+    def __init__(self) -> None:
+        self.user: User | None = None
+
+    def initialize(self) -> None:
+        pass
+
+    def load_user(self, username: str = "default_user") -> User | None:
+        return self.user if self.user and self.user.username == username else None
+
+    def save_user(self, user: User) -> None:
+        self.user = user
+
+    def archive_tasks(
+        self, user: User, tasks: list[Task], *, replace: bool = False
+    ) -> None:
+        user.archived_tasks = LazyTasks.of(tasks, frozenset())
+        self.save_user(user)
+
+    def backend_type(self) -> str:
+        return "memory"
+
+
+def _task(task_id: str, due_day: int | None, **fields: Any) -> Task:
+    return Task(
+        title=task_id,
+        id=task_id,
+        creation_date=datetime(2024, 12, 1),
+        due_date=datetime(2025, 1, due_day, 9) if due_day else None,
+        **fields,
+    )
+
+
+@pytest.fixture(autouse=True)
+def paths(tmp_path: Any, mocker: Any) -> None:
+    """Keep the JSON and SQLite backends' files in tmp_path."""
+    mocker.patch.object(
+        JsonDataManager,
+        "_get_data_path",
+        return_value=str(tmp_path / "data" / "users.json"),
+    )
+    mocker.patch.object(
+        DatabaseDataManager, "_get_db_path", return_value=str(tmp_path / "motido.db")
+    )
+
+
+def _populate(backend: DataManager) -> DataManager:
+    """Save a user with tasks, habit instances and an archive."""
+    backend.initialize()
+    habit: dict[str, Any] = {"is_habit": True, "recurrence_rule": "daily"}
+    user = User(
+        username="u",
+        tasks=[
+            _task("done", 2, is_complete=True),
+            _task("open", 2),
+            _task("later", 5, is_complete=True),
+            _task("undated", None),
+            _task("habit", 3, streak_current=3, streak_best=7, **habit),
+            _task(
+                "habit-2",
+                2,
+                is_complete=True,
+                parent_habit_id="habit",
+                streak_best=9,
+                **habit,
+            ),
+        ],
+    )
+    archived = _task("habit-1", 1, is_complete=True, parent_habit_id="habit", **habit)
+    user.archive_summary.add(archived)
+    backend.archive_tasks(user, [archived])
+    return backend
+
+
+@pytest.fixture(params=[JsonDataManager, DatabaseDataManager, MemoryManager])
+def manager(request: Any) -> DataManager:
+    """Each kind of backend, populated."""
+    return _populate(request.param())
+
+
+def _active_user(manager: DataManager) -> User:
+    user = manager.load_active_user("u")
+    assert user is not None
+    return user
+
+
+def test_task_counts(manager: DataManager) -> None:
+    """Test main-tier totals count habit series by their roots."""
+    counts = manager.task_counts(_active_user(manager))
+
+    assert counts == TaskCounts(
+        total=6, completed=3, habits=1, current_streak=3, best_streak=7
+    )
+
+
+def test_completion_counts_by_day(manager: DataManager) -> None:
+    """Test day counts cover the window and leave archived tasks out."""
+    counts = manager.completion_counts_by_day("u", START, END)
+
+    assert counts == {date(2025, 1, 2): (2, 3), date(2025, 1, 3): (0, 1)}
+
+
+def test_habit_completion_counts_include_archive(manager: DataManager) -> None:
+    """Test one habit's day counts include its archived instances."""
+    counts = manager.completion_counts_by_day("u", START, END, habit_id="habit")
+
+    assert counts == {
+        date(2025, 1, 1): (1, 1),
+        date(2025, 1, 2): (1, 1),
+        date(2025, 1, 3): (0, 1),
+    }
+
+
+def test_load_archive_summary(manager: DataManager) -> None:
+    """Test the archive summary reads back by username alone."""
+    summary = manager.load_archive_summary("u")
+
+    assert (summary.completed_tasks, summary.completed_habits) == (1, 1)
+    assert summary.completions_by_day == {"2025-01-01": 1}
+    assert manager.load_archive_summary("nobody").completed_tasks == 0
+    assert not manager.completion_counts_by_day("nobody", START, END)
+
+
+def test_json_summary_cache_follows_other_writers() -> None:
+    """Test cached JSON summaries are reread once another process writes."""
+    manager = _populate(JsonDataManager())
+    assert manager.completion_counts_by_day("u", START, END)
+    other = JsonDataManager()
+    user = other.load_user("u")
+    assert user is not None
+    user.tasks = []
+    other.save_user(user)
+
+    assert not manager.completion_counts_by_day("u", START, END)
+    assert manager.task_counts(user).total == 0
+
+
+def test_json_summary_computed_for_older_files() -> None:
+    """Test a data file saved without a task summary is summarized on read."""
+    manager = _populate(JsonDataManager())
+    data = getattr(manager, "_read_data")()
+    del data["u"]["task_summary"]
+    getattr(manager, "_write_data")(data)
+
+    counts = manager.task_counts(_active_user(manager))
+
+    assert (counts.total, counts.habits) == (6, 1)
+
+
+def _series_counts(manager: DataManager) -> list[dict[date, Any]]:
+    """Day counts of every task and of the habit series touched below."""
+    return [
+        manager.completion_counts_by_day("u", START, END, habit_id=habit_id)
+        for habit_id in (None, "habit", "habit-2")
+    ]
+
+
+def test_daily_summary_follows_saves(manager: DataManager) -> None:
+    """Test completing, uncompleting and new habit instances update day counts."""
+    user = manager.load_user("u")
+    assert user is not None
+    tasks = {task.id: task for task in user.all_tasks()}
+    tasks["done"].is_complete = False
+    tasks["habit"].is_complete = True
+    # The next day's instance
+    user.tasks.append(_task("habit-3", 4, is_habit=True, parent_habit_id="habit-2"))
+    manager.save_user(user)
+
+    assert _series_counts(manager) == [
+        {date(2025, 1, 2): (1, 3), date(2025, 1, 3): (1, 1), date(2025, 1, 4): (0, 1)},
+        {date(2025, 1, 1): (1, 1), date(2025, 1, 2): (1, 1), date(2025, 1, 3): (1, 1)},
+        {date(2025, 1, 2): (1, 1), date(2025, 1, 4): (0, 1)},
+    ]
+
+    # Saving only the active set updates the rows it replaces
+    active = _active_user(manager)
+    next(task for task in active.tasks if task.id == "habit-3").is_complete = True
+    manager.save_user(active)
+
+    counts = _series_counts(manager)
+    assert counts[0][date(2025, 1, 4)] == counts[2][date(2025, 1, 4)] == (1, 1)
+    manager.rebuild_daily_summary("u")
+    assert _series_counts(manager) == counts
+
+
+def test_sqlite_save_recounts_only_changed_rows(mocker: Any) -> None:
+    """Test a SQLite save only recounts rows added, removed or moved."""
+    manager = _populate(DatabaseDataManager())
+    change = mocker.spy(DatabaseDataManager, "_change_daily_summary")
+    user = manager.load_user("u")
+    assert user is not None
+    tasks = {task.id: task for task in user.tasks}
+    tasks["open"].title = "Renamed"  # Counted the same
+    tasks["done"].is_complete = False
+    user.tasks.remove(tasks["undated"])
+    manager.save_user(user)
+
+    assert [call.args[3:] for call in change.call_args_list] == [
+        (-1, ["done", "undated"]),
+        (1, ["done", "undated"]),
+    ]
+    counts = _series_counts(manager)
+    manager.rebuild_daily_summary("u")
+    assert _series_counts(manager) == counts
+
+    change.reset_mock()
+    manager.save_user(user)  # Nothing changed
+    change.assert_not_called()
+
+
+def test_sqlite_daily_summary_rebuilds() -> None:
+    """Test SQLite counts existing rows into a new daily_summary table, and rebuilds."""
+    manager = _populate(DatabaseDataManager())
+    counts = _series_counts(manager)
+    conn = getattr(manager, "_get_connection")()
+
+    conn.execute("DROP TABLE daily_summary")
+    DatabaseDataManager().initialize()  # Table creation runs once per manager
+    assert _series_counts(manager) == counts
+
+    conn.execute("DELETE FROM daily_summary")
+    assert manager.rebuild_daily_summary("u") == 8
+    assert _series_counts(manager) == counts
+
+
+def test_json_daily_summary_rebuilds() -> None:
+    """Test the JSON task summary is recounted from the data and archive files."""
+    manager = _populate(JsonDataManager())
+    counts = _series_counts(manager)
+    data = getattr(manager, "_read_data")()
+    data["u"]["task_summary"] = {"completions_by_day": {}}  # An older summary
+    getattr(manager, "_write_data")(data)
+
+    assert _series_counts(manager) == counts
+    assert manager.rebuild_daily_summary("u") == 8
+    assert _series_counts(manager) == counts
+    assert manager.rebuild_daily_summary("nobody") == 0
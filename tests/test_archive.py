@@ -0,0 +1,390 @@
+"""Tests for the archive tier (motido.core.archive and the file backends)."""
+
+# pylint: disable=redefined-outer-name,protected-access
+
+import os
+import sqlite3
+from datetime import date, datetime, timedelta
+from typing import Any
+
+import pytest
+
+from motido.core.archive import (
+    archive_completed_tasks,
+    last_activity,
+    select_archivable,
+)
+from motido.core.models import ArchiveSummary, LazyTasks, Task, User
+from motido.core.utils import _process_recurrences
+from motido.data.abstraction import DataManager
+from motido.data.backup import (
+    NdjsonBackupReader,
+    build_backup,
+    iter_backup_ndjson,
+    save_imported_user,
+)
+from motido.data.database_manager import DatabaseDataManager
+from motido.data.json_manager import JsonDataManager
+
+TODAY = date(2025, 6, 30)
+OLD = datetime(2025, 1, 10, 9, 0)  # Well past the 90-day horizon
+RECENT = datetime(2025, 6, 20, 9, 0)
+
+
+def _task(task_id: str, **fields: Any) -> Task:
+    fields.setdefault("creation_date", OLD)
+    fields.setdefault("title", task_id)
+    return Task(id=task_id, **fields)
+
+
+def _habit(task_id: str, parent: str | None = None, **fields: Any) -> Task:
+    return _task(
+        task_id,
+        is_habit=True,
+        recurrence_rule="daily",
+        parent_habit_id=parent,
+        **fields,
+    )
+
+
+def _user() -> User:
+    return User(
+        username="archivist",
+        tasks=[
+            _task("open"),
+            _task("old-done", is_complete=True, due_date=OLD),
+            _task("recent-done", is_complete=True, due_date=RECENT),
+            # Completed long ago, but an open task still depends on it
+            _task("needed", is_complete=True),
+            _task("blocked", dependencies=["needed"]),
+            # A running series: only the middle instance may go
+            _habit("root", title="stretch", is_complete=True, due_date=OLD),
+            _habit(
+                "inst-1",
+                "root",
+                title="stretch",
+                is_complete=True,
+                due_date=OLD + timedelta(days=1),
+                streak_best=7,
+            ),
+            _habit(
+                "inst-2",
+                "inst-1",
+                title="stretch",
+                is_complete=True,
+                due_date=OLD + timedelta(2),
+            ),
+            # An ended series goes entirely
+            _habit("ended", is_complete=True, recurrence_ended_at=OLD, due_date=OLD),
+            _habit("ended-1", "ended", is_complete=True, recurrence_ended_at=OLD),
+        ],
+    )
+
+
+ARCHIVED = {"old-done", "inst-1", "ended", "ended-1"}
+
+
+def _ids(tasks: Any) -> set[str]:
+    return {task.id for task in tasks}
+
+
+def test_last_activity_uses_latest_date() -> None:
+    """Test history entries count as activity and bad timestamps are skipped."""
+    task = _task(
+        "t",
+        due_date=OLD + timedelta(days=3),
+        history=[
+            {"timestamp": "2025-05-01T10:00:00", "field": "title"},
+            {"timestamp": "not a date"},
+            {"field": "no timestamp"},
+        ],
+    )
+    assert last_activity(task) == date(2025, 5, 1)
+    assert last_activity(_task("bare")) == OLD.date()
+
+
+def test_select_archivable() -> None:
+    """Test only old completed tasks no running series or open task needs go."""
+    assert _ids(select_archivable(_user().tasks, TODAY, 90)) == ARCHIVED
+    assert "recent-done" in _ids(select_archivable(_user().tasks, TODAY, 0))
+
+
+def test_dependencies_of_kept_tasks_stay_transitively() -> None:
+    """Test a chain of completed dependencies stays with the open task."""
+    tasks = [
+        _task("a", is_complete=True),
+        _task("b", is_complete=True, dependencies=["a"]),
+        _task("c", dependencies=["b"]),
+    ]
+    assert not select_archivable(tasks, TODAY, 90)
+
+
+def test_archive_summary_folds_tasks() -> None:
+    """Test the summary counts tasks, habits, streaks and completion days."""
+    summary = ArchiveSummary()
+    for task in _user().tasks:
+        if task.id in ARCHIVED:
+            summary.add(task)
+
+    assert summary.completed_tasks == 4
+    assert summary.completed_habits == 3
+    assert summary.best_streak == 7
+    assert summary.completions_by_day == {"2025-01-10": 2, "2025-01-11": 1}
+    assert summary.completions_between(date(2025, 1, 11), TODAY) == {
+        date(2025, 1, 11): 1
+    }
+    assert ArchiveSummary.from_dict(summary.to_dict()) == summary
+    assert ArchiveSummary.from_dict(None) == ArchiveSummary()
+
+
+def test_archiving_does_not_recreate_habit_instances(mocker: Any) -> None:
+    """Test archiving keeps lineage and recurrences skip archived instances."""
+    user = _user()
+    manager = mocker.MagicMock()
+
+    archived = archive_completed_tasks(user, manager, today=TODAY)
+    manager.load_archived_tasks.return_value = archived
+    inst_2 = user.find_task_by_id("inst-2")
+    assert inst_2 is not None and inst_2.parent_habit_id == "inst-1"
+    count = len(user.tasks)
+    # The root chains through the archived inst-1 (due the next day)
+    _process_recurrences(user, OLD.date() + timedelta(days=2))
+
+    assert len(user.tasks) == count
+    manager.load_archived_tasks.assert_called_once_with(user.username)
+
+
+def test_unarchived_series_chain_from_every_instance() -> None:
+    """Test older instances still fill the days before a later instance."""
+    root = _habit("root", title="stretch", is_complete=True, due_date=OLD)
+    later = _habit("later", "root", title="stretch", due_date=OLD + timedelta(4))
+    user = User(username="chains", tasks=[root, later])
+
+    _process_recurrences(user, OLD.date() + timedelta(days=4))
+
+    created = sorted(task.due_date.date() for task in user.tasks[2:] if task.due_date)
+    assert created == [OLD.date() + timedelta(days=n) for n in (1, 2, 3)]
+    assert {task.parent_habit_id for task in user.tasks[2:]} == {
+        "root",
+        *(task.id for task in user.tasks[2:4]),
+    }
+
+
+@pytest.fixture(params=["json", "db"])
+def manager(request: pytest.FixtureRequest, tmp_path: Any, mocker: Any) -> DataManager:
+    """An initialized file-backed manager holding _user()."""
+    backend: DataManager
+    if request.param == "json":
+        mocker.patch(
+            "motido.data.json_manager.get_config_path",
+            return_value=str(tmp_path / "config.json"),
+        )
+        backend = JsonDataManager()
+    else:
+        mocker.patch.object(
+            DatabaseDataManager,
+            "_get_db_path",
+            return_value=str(tmp_path / "motido.db"),
+        )
+        backend = DatabaseDataManager()
+    backend.initialize()
+    backend.save_user(_user())
+    return backend
+
+
+def test_archive_round_trip(manager: DataManager) -> None:
+    """Test archived tasks leave the main tier but stay readable with stats."""
+    assert not manager.load_archived_tasks("archivist")
+    user = manager.load_user("archivist")
+    assert user is not None
+
+    archived = archive_completed_tasks(user, manager, today=TODAY)
+
+    assert _ids(archived) == ARCHIVED
+    assert _ids(user.archived_tasks) == ARCHIVED
+    loaded = manager.load_user("archivist")
+    assert loaded is not None
+    assert _ids(loaded.tasks) == _ids(_user().tasks) - ARCHIVED
+    assert not loaded.archived_tasks.loaded
+    assert loaded.archive_summary.completed_tasks == 4
+    assert loaded.archive_summary.best_streak == 7
+    assert loaded.find_task_by_id("old-done") is None
+    archived_task = loaded.find_archived_task("old-done")
+    assert archived_task is not None
+    assert archived_task.due_date == OLD
+
+    # Nothing left to archive; archived tasks survive ordinary saves
+    assert not archive_completed_tasks(loaded, manager, today=TODAY)
+    manager.save_user(loaded)
+    assert _ids(manager.load_archived_tasks("archivist")) == ARCHIVED
+
+
+def test_archive_from_active_load(manager: DataManager) -> None:
+    """Test archiving an active-set load fetches and prunes the inactive tasks."""
+    user = manager.load_active_user("archivist")
+    assert user is not None
+
+    archive_completed_tasks(user, manager, today=TODAY)
+
+    loaded = manager.load_user("archivist")
+    assert loaded is not None
+    assert _ids(loaded.tasks) == _ids(_user().tasks) - ARCHIVED
+    active = manager.load_active_user("archivist")
+    assert active is not None
+    assert active.archive_summary.completed_tasks == 4
+
+
+@pytest.mark.parametrize("ndjson", [False, True])
+def test_backup_restores_archive_tier(manager: DataManager, ndjson: bool) -> None:
+    """Test a restored backup brings back its archive and drops later ones."""
+    user = manager.load_user("archivist")
+    assert user is not None
+    archive_completed_tasks(user, manager, today=TODAY)
+    if ndjson:
+        reader = NdjsonBackupReader("archivist")
+        reader.feed_lines(iter_backup_ndjson(user))
+        restored = reader.finish()
+    else:
+        restored = JsonDataManager().deserialize_user_data(
+            build_backup(user), "archivist"
+        )
+    # Archived after the backup was taken
+    later = manager.load_user("archivist")
+    assert later is not None
+    archive_completed_tasks(later, manager, horizon_days=0, today=TODAY)
+    assert "recent-done" in _ids(manager.load_archived_tasks("archivist"))
+
+    save_imported_user(manager, restored)
+
+    assert _ids(manager.load_archived_tasks("archivist")) == ARCHIVED
+    loaded = manager.load_user("archivist")
+    assert loaded is not None
+    assert "recent-done" in _ids(loaded.tasks)
+    assert loaded.archive_summary == user.archive_summary
+    counts = manager.completion_counts_by_day(
+        "archivist", OLD.date(), TODAY, habit_id="root"
+    )
+    manager.rebuild_daily_summary("archivist")
+    assert (
+        manager.completion_counts_by_day(
+            "archivist", OLD.date(), TODAY, habit_id="root"
+        )
+        == counts
+    )
+
+
+def test_sqlite_archive_is_one_transaction(tmp_path: Any, mocker: Any) -> None:
+    """Test a failing user save leaves nothing archived and raises."""
+    mocker.patch.object(
+        DatabaseDataManager, "_get_db_path", return_value=str(tmp_path / "m.db")
+    )
+    manager = DatabaseDataManager()
+    manager.initialize()
+    manager.save_user(_user())
+    mocker.patch.object(
+        manager, "_insert_task_lists", side_effect=sqlite3.OperationalError("full")
+    )
+    user = _user()
+
+    with pytest.raises(sqlite3.OperationalError, match="full"):
+        archive_completed_tasks(user, manager, today=TODAY)
+
+    assert not manager.load_archived_tasks("archivist")
+    stored = manager.load_user("archivist")
+    assert stored is not None
+    assert _ids(stored.tasks) == _ids(_user().tasks)
+    assert stored.archive_summary == ArchiveSummary()
+
+
+def test_json_archive_replaces_tasks_by_id(tmp_path: Any, mocker: Any) -> None:
+    """Test a rerun after a failed user save does not archive tasks twice."""
+    mocker.patch(
+        "motido.data.json_manager.get_config_path",
+        return_value=str(tmp_path / "config.json"),
+    )
+    manager = JsonDataManager()
+    manager.initialize()
+    manager.save_user(_user())
+    mocker.patch.object(manager, "_save_user", side_effect=OSError("disk full"))
+    user = manager.load_user("archivist")
+    assert user is not None
+
+    with pytest.raises(OSError, match="disk full"):
+        archive_completed_tasks(user, manager, today=TODAY)
+    mocker.stopall()
+    rerun = manager.load_user("archivist")
+    assert rerun is not None
+    assert rerun.archive_summary == ArchiveSummary()  # Never counted
+    archive_completed_tasks(rerun, manager, today=TODAY)
+
+    archived = manager.load_archived_tasks("archivist")
+    assert sorted(task.id for task in archived) == sorted(ARCHIVED)
+    assert rerun.archive_summary.completed_tasks == 4
+    assert not os.path.exists(f"{manager._archive_path}.tmp")
+
+
+def test_json_corrupt_archive_reads_empty(
+    tmp_path: Any, mocker: Any, caplog: Any
+) -> None:
+    """Test a corrupt archive file is logged and read as empty."""
+    mocker.patch(
+        "motido.data.json_manager.get_config_path",
+        return_value=str(tmp_path / "config.json"),
+    )
+    manager = JsonDataManager()
+    manager.initialize()
+    with open(manager._archive_path, "w", encoding="utf-8") as file:
+        file.write("{not json")
+
+    assert not manager.load_archived_tasks("archivist")
+    assert "Error decoding archive data" in caplog.text
+
+
+def test_find_archived_task_ambiguous() -> None:
+    """Test an archived ID prefix matching several tasks is rejected."""
+    user = User(username="u")
+    user.archived_tasks = LazyTasks.of([_task("abc-1"), _task("abc-2")], frozenset())
+    with pytest.raises(ValueError, match="Ambiguous"):
+        user.find_archived_task("abc")
+    assert user.find_archived_task("zzz") is None
+
+
+def test_tasks_with_archive_since() -> None:
+    """Test heatmap reads fetch the archive only when it covers the window."""
+    user = User(username="u", tasks=[_task("kept")])
+    fetched: list[bool] = []
+
+    def loader() -> list[Task]:
+        fetched.append(True)
+        return [_task("gone")]
+
+    user.archived_tasks = LazyTasks(loader)
+    user.archive_summary.add(_task("gone", due_date=OLD))
+
+    assert _ids(user.tasks_with_archive_since(TODAY)) == {"kept"}
+    assert not fetched
+    assert _ids(user.tasks_with_archive_since(OLD.date())) == {"kept", "gone"}
+
+
+def test_default_manager_has_no_archive() -> None:
+    """Test backends without an archive tier refuse to archive."""
+
+    class PlainManager(DataManager):  # pylint: disable=abstract-method
+        """A backend implementing only the abstract methods."""
+
+        def initialize(self) -> None:
+            pass
+
+        def load_user(self, username: str = "default_user") -> User | None:
+            return None
+
+        def save_user(self, user: User) -> None:
+            pass
+
+        def backend_type(self) -> str:
+            return "plain"
+
+    plain = PlainManager()
+    assert not plain.load_archived_tasks("u")
+    with pytest.raises(NotImplementedError, match="plain backend"):
+        archive_completed_tasks(_user(), plain, today=TODAY)
@@ -5,7 +5,7 @@ which creates the appropriate DataManager instance based on configuration.
 The tests verify that:
 - The correct manager type is returned for each backend configuration
 - The configuration is properly loaded
-- Appropriate messages are printed
+- Appropriate messages are logged
 - Invalid configurations raise appropriate errors
 """
 
@@ -15,7 +15,12 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 # Import the factory function and the classes it might return
-from motido.data.backend_factory import get_data_manager, reset_data_manager
+from motido.data.backend_factory import (
+    close_data_manager,
+    create_data_manager,
+    get_data_manager,
+    reset_data_manager,
+)
 from motido.data.database_manager import DatabaseDataManager
 from motido.data.json_manager import JsonDataManager
 
@@ -30,11 +35,11 @@ def reset_singleton() -> Generator[None, None, None]:
 
 @patch("motido.data.backend_factory.os.getenv")
 @patch("motido.data.backend_factory.load_config")
-@patch("motido.data.backend_factory.JsonDataManager")
-@patch("motido.data.backend_factory.DatabaseDataManager")  # Keep this mocked
-@patch("motido.data.backend_factory.print")  # Mock print
+@patch("motido.data.json_manager.JsonDataManager")
+@patch("motido.data.database_manager.DatabaseDataManager")  # Keep this mocked
+@patch("motido.data.backend_factory.logger")
 def test_get_data_manager_json_backend(
-    mock_print: Any,
+    mock_logger: Any,
     mock_db_manager: Any,
     mock_json_manager: Any,
     mock_load_config: Any,
@@ -57,16 +62,16 @@ def test_get_data_manager_json_backend(
     mock_db_manager.assert_not_called()
     assert isinstance(manager, JsonDataManager)
     assert manager == mock_json_instance
-    mock_print.assert_called_once_with("Using JSON backend.")
+    mock_logger.info.assert_called_once_with("Using JSON backend.")
 
 
 @patch("motido.data.backend_factory.os.getenv")
 @patch("motido.data.backend_factory.load_config")
-@patch("motido.data.backend_factory.JsonDataManager")  # Keep this mocked
-@patch("motido.data.backend_factory.DatabaseDataManager")
-@patch("motido.data.backend_factory.print")  # Mock print
+@patch("motido.data.json_manager.JsonDataManager")  # Keep this mocked
+@patch("motido.data.database_manager.DatabaseDataManager")
+@patch("motido.data.backend_factory.logger")
 def test_get_data_manager_db_backend(
-    mock_print: Any,
+    mock_logger: Any,
     mock_db_manager: Any,
     mock_json_manager: Any,
     mock_load_config: Any,
@@ -89,16 +94,16 @@ def test_get_data_manager_db_backend(
     mock_json_manager.assert_not_called()
     assert isinstance(manager, DatabaseDataManager)
     assert manager == mock_db_instance
-    mock_print.assert_called_once_with("Using Database (SQLite) backend.")
+    mock_logger.info.assert_called_once_with("Using Database (SQLite) backend.")
 
 
 @patch("motido.data.backend_factory.os.getenv")
 @patch("motido.data.backend_factory.load_config")
-@patch("motido.data.backend_factory.JsonDataManager")
-@patch("motido.data.backend_factory.DatabaseDataManager")  # Keep this mocked
-@patch("motido.data.backend_factory.print")  # Mock print
+@patch("motido.data.json_manager.JsonDataManager")
+@patch("motido.data.database_manager.DatabaseDataManager")  # Keep this mocked
+@patch("motido.data.backend_factory.logger")
 def test_get_data_manager_default_backend(
-    mock_print: Any,
+    mock_logger: Any,
     mock_db_manager: Any,
     mock_json_manager: Any,
     mock_load_config: Any,
@@ -121,16 +126,18 @@ def test_get_data_manager_default_backend(
     mock_db_manager.assert_not_called()
     assert isinstance(manager, JsonDataManager)
     assert manager == mock_json_instance
-    mock_print.assert_called_once_with("Using JSON backend.")  # Check default message
+    mock_logger.info.assert_called_once_with(
+        "Using JSON backend."
+    )  # Check default message
 
 
 @patch("motido.data.backend_factory.os.getenv")
 @patch("motido.data.backend_factory.load_config")
-@patch("motido.data.backend_factory.JsonDataManager")
-@patch("motido.data.backend_factory.DatabaseDataManager")
-@patch("motido.data.backend_factory.print")  # Mock print
+@patch("motido.data.json_manager.JsonDataManager")
+@patch("motido.data.database_manager.DatabaseDataManager")
+@patch("motido.data.backend_factory.logger")
 def test_get_data_manager_unknown_backend(
-    mock_print: Any,
+    mock_logger: Any,
     mock_db_manager: Any,
     mock_json_manager: Any,
     mock_load_config: Any,
@@ -156,14 +163,14 @@ def test_get_data_manager_unknown_backend(
     mock_load_config.assert_called_once()
     mock_json_manager.assert_not_called()
     mock_db_manager.assert_not_called()
-    mock_print.assert_not_called()  # No backend message should be printed
+    mock_logger.info.assert_not_called()  # No backend message should be logged
 
 
 @patch("motido.data.backend_factory.os.getenv")
 @patch("motido.data.postgres_manager.PostgresDataManager")
-@patch("motido.data.backend_factory.print")
+@patch("motido.data.backend_factory.logger")
 def test_get_data_manager_postgres_via_database_url(
-    mock_print: Any, mock_postgres_manager: Any, mock_getenv: Any
+    mock_logger: Any, mock_postgres_manager: Any, mock_getenv: Any
 ) -> None:
     """Test factory returns PostgresDataManager when DATABASE_URL is set."""
     # Configure mocks
@@ -179,7 +186,7 @@ def test_get_data_manager_postgres_via_database_url(
     mock_getenv.assert_called_once_with("DATABASE_URL")
     mock_postgres_manager.assert_called_once_with(database_url)
     assert manager == mock_postgres_instance
-    mock_print.assert_called_once_with(
+    mock_logger.info.assert_called_once_with(
         "Using PostgreSQL backend (DATABASE_URL detected)."
     )
 
@@ -187,9 +194,12 @@ def test_get_data_manager_postgres_via_database_url(
 @patch("motido.data.backend_factory.os.getenv")
 @patch("motido.data.backend_factory.load_config")
 @patch("motido.data.postgres_manager.PostgresDataManager")
-@patch("motido.data.backend_factory.print")
+@patch("motido.data.backend_factory.logger")
 def test_get_data_manager_postgres_via_config(
-    mock_print: Any, mock_postgres_manager: Any, mock_load_config: Any, mock_getenv: Any
+    mock_logger: Any,
+    mock_postgres_manager: Any,
+    mock_load_config: Any,
+    mock_getenv: Any,
 ) -> None:
     """Test factory returns PostgresDataManager when 'postgres' is in config."""
     # Configure mocks - no DATABASE_URL, but config has postgres
@@ -206,15 +216,15 @@ def test_get_data_manager_postgres_via_config(
     mock_load_config.assert_called_once()
     mock_postgres_manager.assert_called_once_with()
     assert manager == mock_postgres_instance
-    mock_print.assert_called_once_with("Using PostgreSQL backend (config).")
+    mock_logger.info.assert_called_once_with("Using PostgreSQL backend (config).")
 
 
 @patch("motido.data.backend_factory.os.getenv")
 @patch("motido.data.backend_factory.load_config")
-@patch("motido.data.backend_factory.JsonDataManager")
-@patch("motido.data.backend_factory.print")
+@patch("motido.data.json_manager.JsonDataManager")
+@patch("motido.data.backend_factory.logger")
 def test_get_data_manager_returns_cached_instance(
-    mock_print: Any,
+    mock_logger: Any,
     mock_json_manager: Any,
     mock_load_config: Any,
     mock_getenv: Any,
@@ -234,5 +244,44 @@ def test_get_data_manager_returns_cached_instance(
     assert manager1 is manager2
     # JsonDataManager constructor should only be called once (singleton pattern)
     mock_json_manager.assert_called_once()
-    # Backend message should only be printed once
-    mock_print.assert_called_once_with("Using JSON backend.")
+    # Backend message should only be logged once
+    mock_logger.info.assert_called_once_with("Using JSON backend.")
+
+
+@patch("motido.data.backend_factory.load_config")
+@patch("motido.data.json_manager.JsonDataManager")
+def test_close_data_manager_closes_cached_instance(
+    mock_json_manager: Any, mock_load_config: Any, monkeypatch: Any
+) -> None:
+    """Test close_data_manager closes the cached manager, if any."""
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    mock_load_config.return_value = {"backend": "json"}
+    close_data_manager()  # None created yet
+    mock_json_manager.assert_not_called()
+
+    get_data_manager()
+    close_data_manager()
+    mock_json_manager.return_value.close.assert_called_once_with()
+
+
+@patch("motido.data.postgres_manager.PostgresDataManager")
+@patch("motido.data.database_manager.DatabaseDataManager")
+@patch("motido.data.json_manager.JsonDataManager")
+def test_create_data_manager_returns_new_instances(
+    mock_json_manager: Any, mock_db_manager: Any, mock_postgres_manager: Any
+) -> None:
+    """Test create_data_manager builds each backend without caching."""
+    mock_json_manager.side_effect = lambda: MagicMock(spec=JsonDataManager)
+
+    first = create_data_manager("json")
+
+    assert first is not create_data_manager("json")
+    assert create_data_manager("db") is mock_db_manager.return_value
+    assert create_data_manager("postgres") is mock_postgres_manager.return_value
+    mock_postgres_manager.assert_called_once_with()
+
+
+def test_create_data_manager_unknown_backend() -> None:
+    """Test create_data_manager rejects unknown backend types."""
+    with pytest.raises(ValueError, match="Unknown backend type: 'xml'"):
+        create_data_manager("xml")
@@ -0,0 +1,120 @@
+"""Tests for backup serialization and the NDJSON backup reader."""
+
+import json
+from datetime import date, datetime
+from typing import Any
+
+import pytest
+
+from motido.core.models import (
+    Badge,
+    LazyTasks,
+    Project,
+    Tag,
+    Task,
+    User,
+    XPTransaction,
+)
+from motido.data.backup import (
+    NDJSON_FORMAT,
+    NdjsonBackupReader,
+    build_backup,
+    iter_backup_ndjson,
+    save_imported_user,
+)
+
+HEADER = json.dumps({"type": "header", "format": NDJSON_FORMAT, "version": 1})
+
+
+def _sample_user() -> User:
+    user = User(username="u", total_xp=10, last_processed_date=date(2024, 1, 5))
+    user.tasks = [
+        Task(id=f"t{i}", title=f"Task {i}", creation_date=datetime(2024, 1, 1))
+        for i in range(5)
+    ]
+    user.xp_transactions = [
+        XPTransaction(
+            id="x1", amount=5, source="task_completion", timestamp=datetime(2024, 1, 2)
+        )
+    ]
+    user.badges = [Badge(id="b1", name="B", description="", glyph="🏆")]
+    user.defined_tags = [Tag(id="g1", name="work")]
+    user.defined_projects = [Project(id="p1", name="home")]
+    archived = Task(
+        id="a1",
+        title="Archived",
+        creation_date=datetime(2023, 1, 1),
+        due_date=datetime(2023, 1, 2),
+        is_complete=True,
+    )
+    user.archived_tasks = LazyTasks.of([archived], frozenset())
+    user.archive_summary.add(archived)
+    return user
+
+
+def test_ndjson_round_trip_in_small_chunks() -> None:
+    """Test the reader rebuilds the same backup across several chunks."""
+    user = _sample_user()
+    reader = NdjsonBackupReader("u", chunk_size=2)
+
+    reader.feed_lines(iter_backup_ndjson(user))
+    assert reader.record_count >= 4  # earlier chunks already deserialized
+    rebuilt = reader.finish()
+
+    assert build_backup(rebuilt) == build_backup(user)
+    assert build_backup(rebuilt)["archived_tasks"][0]["id"] == "a1"
+    assert rebuilt.archive_summary.completed_tasks == 1
+
+
+def test_save_imported_user_without_archive_tier(mocker: Any) -> None:
+    """Test backends without an archive tier only restore backups without one."""
+    manager = mocker.MagicMock()
+    manager.archive_tasks.side_effect = NotImplementedError("no archive tier")
+    user = _sample_user()
+
+    with pytest.raises(NotImplementedError):
+        save_imported_user(manager, user)
+    manager.save_user.assert_not_called()
+
+    user.archived_tasks = LazyTasks.of([], frozenset())
+    save_imported_user(manager, user)
+    manager.save_user.assert_called_once_with(user)
+
+
+def test_reader_accepts_bytes_and_blank_lines() -> None:
+    """Test byte lines are decoded and blank lines skipped."""
+    reader = NdjsonBackupReader("u")
+    reader.feed_lines([HEADER.encode(), b"", b"   "])
+    rebuilt = reader.finish()
+    assert rebuilt.username == "u"
+    assert rebuilt.tasks == []
+
+
+@pytest.mark.parametrize(
+    ("lines", "message"),
+    [
+        ([], "missing header record"),
+        (['{"type": "task", "data": {}}'], "Line 1: missing"),
+        (
+            [json.dumps({"type": "header", "format": NDJSON_FORMAT, "version": 9})],
+            "unsupported backup version 9",
+        ),
+        ([HEADER, "[1, 2]"], "Line 2: expected a JSON object"),
+        ([HEADER, '{"type": "task", "data": []}'], "record data must be an object"),
+        ([HEADER, '{"type": "widget", "data": {}}'], "unknown record type 'widget'"),
+        (
+            [HEADER, '{"type": "user", "data": {"last_processed_date": "bad"}}'],
+            "Invalid user data format",
+        ),
+        (
+            [HEADER, '{"type": "task", "data": {"title": "no id"}}'],
+            "Invalid record before line 2",
+        ),
+    ],
+)
+def test_reader_errors(lines: list[str], message: str) -> None:
+    """Test malformed backups raise ValueError with a useful message."""
+    reader = NdjsonBackupReader("u", chunk_size=1)
+    with pytest.raises(ValueError, match=message):
+        reader.feed_lines(lines)
+        reader.finish()
@@ -0,0 +1,82 @@
+"""Tests for the `motido archive` command."""
+
+# pylint: disable=redefined-outer-name
+
+from datetime import datetime, timedelta
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from motido.cli import main as cli_main
+from motido.core.models import Task, User
+from motido.data.abstraction import DEFAULT_USERNAME, DataManager
+
+
+@pytest.fixture
+def user() -> User:
+    """A user with one old and one recent completed task."""
+    old = datetime.now() - timedelta(days=120)
+    return User(
+        username=DEFAULT_USERNAME,
+        tasks=[
+            Task(title="Old", id="old", creation_date=old, is_complete=True),
+            Task(title="New", id="new", creation_date=datetime.now()),
+        ],
+    )
+
+
+def _run_archive(manager: Any, user: User | None, *options: str) -> None:
+    args = cli_main.setup_parser("archive").parse_args(["archive", *options])
+    cli_main.handle_archive(args, manager, user)
+
+
+def test_archive_moves_old_tasks(user: User, capsys: Any) -> None:
+    """Test the default horizon archives the old task only."""
+    manager = MagicMock(spec=DataManager)
+
+    _run_archive(manager, user)
+
+    assert [task.id for task in user.tasks] == ["new"]
+    manager.archive_tasks.assert_called_once()
+    assert "Archived 1 completed task(s) older than 90 days (1 archived in total)" in (
+        capsys.readouterr().out
+    )
+
+
+def test_archive_nothing_to_do(user: User, capsys: Any) -> None:
+    """Test a long horizon leaves everything in place."""
+    manager = MagicMock(spec=DataManager)
+
+    _run_archive(manager, user, "--days", "365")
+
+    assert len(user.tasks) == 2
+    manager.archive_tasks.assert_not_called()
+    assert "Nothing to archive" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    "options, message",
+    [(("--days", "-1"), "must not be negative"), ((), "no archive tier")],
+)
+def test_archive_errors(
+    user: User, capsys: Any, options: tuple[str, ...], message: str
+) -> None:
+    """Test a bad horizon and a backend without an archive tier exit 1."""
+    manager = MagicMock(spec=DataManager)
+    manager.archive_tasks.side_effect = NotImplementedError("no archive tier")
+
+    with pytest.raises(SystemExit) as exc_info:
+        _run_archive(manager, user, *options)
+
+    assert exc_info.value.code == 1
+    assert message in capsys.readouterr().out
+
+
+def test_archive_user_not_found(capsys: Any) -> None:
+    """Test archive without a user exits 1."""
+    with pytest.raises(SystemExit) as exc_info:
+        _run_archive(MagicMock(spec=DataManager), None)
+
+    assert exc_info.value.code == 1
+    assert "User not found" in capsys.readouterr().out
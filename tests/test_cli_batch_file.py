@@ -0,0 +1,255 @@
+"""Tests for the `motido batch` command (commands from a file or stdin)."""
+
+# pylint: disable=redefined-outer-name,protected-access
+
+import io
+from datetime import datetime
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from motido.cli import main as cli_main
+from motido.core.models import User, XPTransaction
+from motido.data.abstraction import DataManager
+
+
+@pytest.fixture
+def manager() -> MagicMock:
+    """Provides a mocked DataManager."""
+    return MagicMock(spec=DataManager)
+
+
+def _run_batch(
+    manager: MagicMock, user: User | None, text: str, tmp_path: Any, *options: str
+) -> None:
+    batch_file = tmp_path / "commands.txt"
+    batch_file.write_text(text, encoding="utf-8")
+    args = cli_main.setup_parser("batch").parse_args(
+        ["batch", "-f", str(batch_file), *options]
+    )
+    cli_main.handle_batch(args, manager, user)
+
+
+def test_batch_runs_all_commands_with_one_save(
+    manager: MagicMock, tmp_path: Any, capsys: Any
+) -> None:
+    """Test every line runs against one user and saves once at the end."""
+    user = User(username="default_user")
+    _run_batch(
+        manager,
+        user,
+        '# tracker import\ncreate --title "First task"\n\ncreate --title Second\n',
+        tmp_path,
+    )
+
+    assert [task.title for task in user.tasks] == ["First task", "Second"]
+    manager.save_user.assert_called_once_with(user)
+    assert "2 command(s) succeeded, 0 failed, 1 save(s)" in capsys.readouterr().out
+
+
+def test_batch_save_every(manager: MagicMock, tmp_path: Any) -> None:
+    """Test --save-every N saves after every N successful commands."""
+    user = User(username="default_user")
+    _run_batch(
+        manager,
+        user,
+        "create --title A\ncreate --title B\ncreate --title C\n",
+        tmp_path,
+        "--save-every",
+        "2",
+    )
+    assert manager.save_user.call_count == 2
+
+
+def test_batch_stops_at_first_error(
+    manager: MagicMock, tmp_path: Any, capsys: Any
+) -> None:
+    """Test the batch stops on a failing line but keeps earlier work."""
+    user = User(username="default_user")
+    with pytest.raises(SystemExit) as excinfo:
+        _run_batch(
+            manager,
+            user,
+            "create --title A\ncomplete --id missing\ncreate --title B\n",
+            tmp_path,
+        )
+
+    assert excinfo.value.code == 1
+    assert [task.title for task in user.tasks] == ["A"]
+    manager.save_user.assert_called_once_with(user)
+    out = capsys.readouterr().out
+    assert "Line 2: command failed: complete --id missing" in out
+    assert "Stopped at line 2" in out
+
+
+def test_failed_line_changes_are_rolled_back(
+    manager: MagicMock, tmp_path: Any, mocker: Any
+) -> None:
+    """Test a command failing partway leaves nothing for later saves."""
+    run_command = cli_main.run_parsed_command
+
+    def fail_partway(args: Any, deferred: Any, user: User | None) -> None:
+        if args.command == "edit":
+            assert user is not None
+            user.total_xp = 999
+            user.tasks[0].title = "half edited"
+            raise SystemExit(1)
+        run_command(args, deferred, user)
+
+    mocker.patch("motido.cli.main.run_parsed_command", side_effect=fail_partway)
+    user = User(username="default_user")
+    with pytest.raises(SystemExit):
+        _run_batch(
+            manager,
+            user,
+            "create --title A\nedit --id x --title B\ncreate --title C\n",
+            tmp_path,
+            "--keep-going",
+        )
+
+    manager.save_user.assert_called_once_with(user)
+    assert user.total_xp == 0
+    assert [task.title for task in user.tasks] == ["A", "C"]
+
+
+def test_failed_first_line_saves_nothing(manager: MagicMock, tmp_path: Any) -> None:
+    """Test a rolled-back command that ran first leaves no pending save."""
+    with pytest.raises(SystemExit):
+        _run_batch(
+            manager, User(username="default_user"), "complete --id x\n", tmp_path
+        )
+    manager.save_user.assert_not_called()
+
+
+def test_batch_keep_going(manager: MagicMock, tmp_path: Any, capsys: Any) -> None:
+    """Test --keep-going runs the remaining lines and still fails overall."""
+    user = User(username="default_user")
+    with pytest.raises(SystemExit):
+        _run_batch(
+            manager,
+            user,
+            "create --title A\ncomplete --id missing\ncreate --title B\n",
+            tmp_path,
+            "--keep-going",
+        )
+
+    assert [task.title for task in user.tasks] == ["A", "B"]
+    assert "2 command(s) succeeded, 1 failed" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    "line, message",
+    [
+        ("list --bogus", "invalid arguments"),
+        ("init --backend json", "'init' cannot be used inside a batch"),
+        ("batch -f other.txt", "'batch' cannot be used inside a batch"),
+        ("batch-complete --tag x", "'batch-complete' needs --yes inside a batch"),
+        ('create --title "unterminated', "cannot parse line"),
+    ],
+)
+def test_batch_rejects_invalid_lines(
+    line: str, message: str, manager: MagicMock, tmp_path: Any, capsys: Any
+) -> None:
+    """Test unparseable or disallowed lines are reported with their number."""
+    with pytest.raises(SystemExit):
+        _run_batch(manager, User(username="u"), f"\n{line}\n", tmp_path)
+    assert f"Line 2: {message}" in capsys.readouterr().out
+    manager.save_user.assert_not_called()
+
+
+def test_batch_reads_stdin(manager: MagicMock, mocker: Any) -> None:
+    """Test '-f -' (the default) reads commands from stdin."""
+    user = User(username="default_user")
+    mocker.patch("sys.stdin", io.StringIO("create --title FromStdin\n"))
+    args = cli_main.setup_parser("batch").parse_args(["batch"])
+    cli_main.handle_batch(args, manager, user)
+    assert user.tasks[0].title == "FromStdin"
+
+
+def test_batch_missing_file(manager: MagicMock, tmp_path: Any, capsys: Any) -> None:
+    """Test an unreadable batch file exits with an error."""
+    args = cli_main.setup_parser("batch").parse_args(
+        ["batch", "-f", str(tmp_path / "missing.txt")]
+    )
+    with pytest.raises(SystemExit):
+        cli_main.handle_batch(args, manager, None)
+    assert "Error reading batch file" in capsys.readouterr().out
+
+
+def test_batch_without_user_creates_one(manager: MagicMock, tmp_path: Any) -> None:
+    """Test the user built by the first 'create' is reused by later lines."""
+    _run_batch(manager, None, "create --title A\ncreate --title B\n", tmp_path)
+
+    saved = manager.save_user.call_args[0][0]
+    assert [task.title for task in saved.tasks] == ["A", "B"]
+
+
+def test_batch_save_failure(manager: MagicMock, tmp_path: Any, capsys: Any) -> None:
+    """Test a failing final save exits with an error."""
+    manager.save_user.side_effect = IOError("disk full")
+    with pytest.raises(SystemExit):
+        _run_batch(manager, User(username="u"), "create --title A\n", tmp_path)
+    assert "Error saving changes: disk full" in capsys.readouterr().out
+
+
+def test_deferred_manager_delegates(manager: MagicMock) -> None:
+    """Test the deferred manager passes everything but saves through."""
+    manager.backend_type.return_value = "json"
+    manager.save_user_progress = MagicMock()
+    deferred = cli_main._DeferredSaveManager(manager)
+
+    deferred.initialize()
+    deferred.load_user("someone")
+    deferred.flush()  # nothing pending
+    deferred.archive_tasks(User(username="someone"), [])
+    deferred.load_archived_tasks("someone")
+    deferred.list_usernames()
+    deferred.rebuild_daily_summary("someone")
+
+    assert deferred.backend_type() == "json"
+    assert deferred.save_user_progress is manager.save_user_progress
+    manager.initialize.assert_called_once()
+    manager.load_user.assert_called_once_with("someone")
+    manager.archive_tasks.assert_called_once()
+    manager.list_usernames.assert_called_once()
+    manager.rebuild_daily_summary.assert_called_once_with("someone")
+    manager.load_archived_tasks.assert_called_once_with("someone")
+    manager.save_user.assert_not_called()
+
+
+def test_deferred_manager_xp_log(manager: MagicMock) -> None:
+    """Test the XP log comes from storage unless a save is pending."""
+    deferred = cli_main._DeferredSaveManager(manager)
+    user = User(
+        username="u",
+        xp_transactions=[
+            XPTransaction(amount=1, source="task_completion", timestamp=datetime.now())
+        ],
+    )
+
+    deferred.load_xp_log("u", limit=10)
+    manager.load_xp_log.assert_called_once_with("u", limit=10, offset=0)
+
+    deferred.save_user(user)
+    assert deferred.load_xp_log("u", limit=10) == user.xp_transactions
+    manager.load_xp_log.assert_called_once()
+    deferred.load_xp_log("other", limit=10)
+    manager.load_xp_log.assert_called_with("other", limit=10, offset=0)
+
+
+def test_main_dispatches_batch(mocker: Any, tmp_path: Any) -> None:
+    """Test `motido batch -f` loads the user once and runs the file."""
+    user = User(username="default_user")
+    manager = MagicMock(spec=DataManager)
+    manager.load_user.return_value = user
+    mocker.patch("motido.cli.main.get_data_manager", return_value=manager)
+    batch_file = tmp_path / "commands.txt"
+    batch_file.write_text("create --title A\ncreate --title B\n", encoding="utf-8")
+    mocker.patch("sys.argv", ["motido", "batch", "-f", str(batch_file)])
+
+    cli_main.main()
+
+    manager.load_user.assert_called_once()
+    manager.save_user.assert_called_once_with(user)
+    assert len(user.tasks) == 2
@@ -0,0 +1,442 @@
+"""Tests for the CLI daemon (warm state, socket protocol and forwarding)."""
+
+# pylint: disable=redefined-outer-name,protected-access
+
+import json
+import os
+import socket
+import tempfile
+import threading
+from collections.abc import Generator
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from motido.cli import daemon
+from motido.cli import main as cli_main
+from motido.cli.daemon import CliDaemon, forward_command, send_request
+from motido.core.models import User
+from motido.data.abstraction import DataManager
+
+
+class FakeManager(DataManager):
+    """In-memory manager that reports a data version like the file backends."""
+
+    def __init__(self, user: User) -> None:
+        self.user = user
+        self.version = 1
+        self.loads = 0
+        self.saves = 0
+
+    def initialize(self) -> None:
+        pass
+
+    def load_user(self, username: str = "default_user") -> User | None:
+        self.loads += 1
+        return self.user
+
+    def save_user(self, user: User) -> None:
+        self.saves += 1
+        self.version += 1
+
+    def backend_type(self) -> str:
+        return "fake"
+
+    def data_version(self) -> int:
+        """Current store version."""
+        return self.version
+
+
+@pytest.fixture
+def fake_manager(sample_user: User) -> Generator[FakeManager, None, None]:
+    """Route the daemon's get_data_manager to an in-memory manager."""
+    manager = FakeManager(sample_user)
+    with patch("motido.cli.daemon.get_data_manager", return_value=manager), patch(
+        "motido.cli.daemon.get_config_path", return_value="/nonexistent/config.json"
+    ):
+        yield manager
+
+
+@pytest.fixture
+def socket_path() -> Generator[str, None, None]:
+    """A short socket path (AF_UNIX paths are limited to ~100 bytes)."""
+    with tempfile.TemporaryDirectory(prefix="motido") as tmp:
+        yield os.path.join(tmp, "d.sock")
+
+
+@pytest.fixture
+def running_daemon(
+    fake_manager: FakeManager,  # pylint: disable=unused-argument
+    socket_path: str,
+    monkeypatch: Any,
+) -> Generator[CliDaemon, None, None]:
+    """Serve a daemon on a background thread."""
+    monkeypatch.setenv(daemon.SOCKET_ENV, socket_path)
+    monkeypatch.delenv(daemon.DISABLE_ENV, raising=False)
+    cli_daemon = CliDaemon(socket_path)
+    thread = threading.Thread(target=cli_daemon.serve_forever, daemon=True)
+    thread.start()
+    for _ in range(200):
+        if os.path.exists(socket_path):
+            break
+        threading.Event().wait(0.01)
+    yield cli_daemon
+    if os.path.exists(socket_path):
+        send_request({"control": "stop"}, socket_path, timeout=5)
+    thread.join(5)
+
+
+class TestWarmState:
+    """Tests for command execution against the cached manager and user."""
+
+    def test_user_loaded_once_across_commands(self, fake_manager: FakeManager) -> None:
+        """Test consecutive commands reuse the loaded user."""
+        cli_daemon = CliDaemon("/unused")
+        first = cli_daemon.run_argv(["list"])
+        second = cli_daemon.run_argv(["list"])
+
+        assert first["exit_code"] == 0
+        assert "Total tasks: 2" in second["stdout"]
+        assert fake_manager.loads == 1
+        assert cli_daemon.requests_served == 2
+
+    def test_own_saves_keep_cache_external_writes_reload(
+        self, fake_manager: FakeManager
+    ) -> None:
+        """Test the daemon reloads only when someone else changed the store."""
+        cli_daemon = CliDaemon("/unused")
+        result = cli_daemon.run_argv(["create", "--title", "Warm task"])
+        assert result["exit_code"] == 0
+        assert fake_manager.saves == 1
+
+        cli_daemon.run_argv(["list"])
+        assert fake_manager.loads == 1
+
+        fake_manager.version += 1  # another process wrote the store
+        cli_daemon.run_argv(["list"])
+        assert fake_manager.loads == 2
+
+    def test_failed_command_invalidates_user(self, fake_manager: FakeManager) -> None:
+        """Test a failing command drops the possibly half-mutated user."""
+        cli_daemon = CliDaemon("/unused")
+        cli_daemon.run_argv(["list"])
+        result = cli_daemon.run_argv(["complete", "--id", "no-such-task"])
+
+        assert result["exit_code"] == 1
+        cli_daemon.run_argv(["list"])
+        assert fake_manager.loads == 2
+
+    def test_argparse_errors_are_returned(
+        self, fake_manager: FakeManager  # pylint: disable=unused-argument
+    ) -> None:
+        """Test usage errors come back as exit code 2 with stderr output."""
+        result = CliDaemon("/unused").run_argv(["list", "--bogus"])
+        assert result["exit_code"] == 2
+        assert "unrecognized arguments" in result["stderr"]
+
+    def test_unexpected_errors_do_not_stop_daemon(self) -> None:
+        """Test errors outside the command handler are reported per request."""
+        with patch(
+            "motido.cli.daemon.get_data_manager", side_effect=RuntimeError("boom")
+        ):
+            result = CliDaemon("/unused").run_argv(["list"])
+        assert result["exit_code"] == 1
+        assert "boom" in result["stderr"]
+
+    def test_config_change_rebuilds_manager(
+        self, fake_manager: FakeManager, tmp_path: Any
+    ) -> None:
+        """Test a changed config file makes the daemon pick a new backend."""
+        config = tmp_path / "config.json"
+        config.write_text("{}")
+        cli_daemon = CliDaemon("/unused")
+        with patch("motido.cli.daemon.get_config_path", return_value=str(config)):
+            cli_daemon.run_argv(["list"])
+            os.utime(config, ns=(1, 1))
+            cli_daemon.run_argv(["list"])
+        assert fake_manager.loads == 2
+
+    def test_request_env_rebuilds_manager(
+        self, fake_manager: FakeManager, monkeypatch: Any
+    ) -> None:
+        """Test a client with other backend settings gets a rebuilt manager."""
+        monkeypatch.delenv("DATABASE_URL", raising=False)
+        monkeypatch.delenv("MOTIDO_SQLITE_PRAGMAS", raising=False)
+        cli_daemon = CliDaemon("/unused")
+        cli_daemon.run_argv(["list"], env={"DATABASE_URL": None})
+        cli_daemon.run_argv(["list"], env={})
+        assert fake_manager.loads == 1
+
+        cli_daemon.run_argv(["list"], env={"MOTIDO_SQLITE_PRAGMAS": "cache_size=1"})
+        assert os.environ["MOTIDO_SQLITE_PRAGMAS"] == "cache_size=1"
+        assert fake_manager.loads == 2
+        cli_daemon.run_argv(["list"], env={})
+        assert "MOTIDO_SQLITE_PRAGMAS" not in os.environ
+        assert fake_manager.loads == 3
+
+    def test_backends_without_version_always_reload(self, sample_user: User) -> None:
+        """Test the user is reloaded when the backend can't report changes."""
+        manager = MagicMock(spec=["initialize", "load_user", "save_user"])
+        manager.load_user.return_value = sample_user
+        with patch("motido.cli.daemon.get_data_manager", return_value=manager):
+            cli_daemon = CliDaemon("/unused")
+            cli_daemon.run_argv(["list"])
+            cli_daemon.run_argv(["list"])
+        assert manager.load_user.call_count == 2
+
+    def test_terminal_env_is_restored(self, monkeypatch: Any) -> None:
+        """Test the client's terminal settings only apply during a request."""
+        monkeypatch.setenv("COLUMNS", "33")
+        monkeypatch.delenv("FORCE_COLOR", raising=False)
+        with daemon._TerminalEnv(tty=True, columns=120):
+            assert os.environ["COLUMNS"] == "120"
+            assert os.environ["FORCE_COLOR"] == "1"
+        assert os.environ["COLUMNS"] == "33"
+        assert "FORCE_COLOR" not in os.environ
+
+
+class TestSocketProtocol:
+    """Tests for the daemon served over a real Unix socket."""
+
+    def test_forward_command_round_trip(
+        self, running_daemon: CliDaemon, capsys: Any
+    ) -> None:
+        """Test the CLI forwards commands and echoes the daemon's output."""
+        assert forward_command(["list"]) == 0
+        assert "Total tasks: 2" in capsys.readouterr().out
+        assert forward_command(["list", "--bogus"]) == 2
+        assert running_daemon.requests_served == 2
+
+    def test_ping_reports_status(self, running_daemon: CliDaemon) -> None:
+        """Test ping returns pid, uptime and request count."""
+        info = send_request({"control": "ping"}, running_daemon.socket_path)
+        assert info["pid"] == os.getpid()
+        assert info["requests"] == 0
+        assert os.stat(running_daemon.socket_path).st_mode & 0o777 == 0o600
+
+    def test_invalid_requests(self, running_daemon: CliDaemon) -> None:
+        """Test malformed requests get an error response, not a crash."""
+        bad_argv = send_request({"argv": "list"}, running_daemon.socket_path)
+        assert bad_argv["exit_code"] == 2
+        bad_env = send_request(
+            {"argv": ["list"], "env": "x"}, running_daemon.socket_path
+        )
+        assert bad_env["exit_code"] == 2
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(running_daemon.socket_path)
+            sock.sendall(b"[1, 2]\n")
+            response = json.loads(sock.makefile().readline())
+        assert response["exit_code"] == 2
+        assert "JSON object" in response["stderr"]
+
+    def test_second_daemon_refuses_to_start(self, running_daemon: CliDaemon) -> None:
+        """Test a live socket is not taken over by another daemon."""
+        with pytest.raises(RuntimeError, match="already running"):
+            CliDaemon(running_daemon.socket_path).serve_forever()
+
+    def test_stale_socket_file_is_replaced(
+        self, fake_manager: FakeManager, socket_path: str  # pylint: disable=W0613
+    ) -> None:
+        """Test a socket left by a dead daemon is removed on start."""
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(socket_path)
+        stale.close()
+
+        cli_daemon = CliDaemon(socket_path)
+        thread = threading.Thread(target=cli_daemon.serve_forever, daemon=True)
+        thread.start()
+        for _ in range(200):
+            try:
+                send_request({"control": "stop"}, socket_path, timeout=1)
+                break
+            except ConnectionError:
+                threading.Event().wait(0.01)
+        thread.join(5)
+        assert not os.path.exists(socket_path)
+
+
+class TestForwarding:
+    """Tests for deciding whether to forward a command."""
+
+    def test_runs_locally_without_daemon(
+        self, socket_path: str, monkeypatch: Any
+    ) -> None:
+        """Test commands run in-process when no socket exists or is stale."""
+        monkeypatch.setenv(daemon.SOCKET_ENV, socket_path)
+        monkeypatch.delenv(daemon.DISABLE_ENV, raising=False)
+        assert forward_command(["list"]) is None
+
+        with open(socket_path, "w", encoding="utf-8"):
+            pass  # not a socket: connecting fails
+        assert forward_command(["list"]) is None
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            [],
+            ["init"],
+            ["daemon", "status"],
+            ["batch-complete", "--status", "active"],
+            ["--profile", "list"],
+        ],
+    )
+    def test_local_only_commands(
+        self, argv: list[str], socket_path: str, monkeypatch: Any
+    ) -> None:
+        """Test init, daemon, prompting and profiled commands never forward."""
+        monkeypatch.setenv(daemon.SOCKET_ENV, socket_path)
+        monkeypatch.delenv(daemon.DISABLE_ENV, raising=False)
+        with open(socket_path, "w", encoding="utf-8"):
+            pass
+        assert not daemon._should_forward(argv)
+        assert daemon._should_forward(["batch-complete", "-y"])
+
+    def test_forwards_backend_env_and_config_path(
+        self, running_daemon: CliDaemon, monkeypatch: Any
+    ) -> None:
+        """Test requests carry the client's backend settings and config file."""
+        monkeypatch.setenv("MOTIDO_SQLITE_PRAGMAS", "cache_size=1")
+        with patch("motido.cli.daemon.send_request", wraps=daemon.send_request) as send:
+            assert forward_command(["list"]) == 0
+        request = send.call_args[0][0]
+        assert request["env"]["MOTIDO_SQLITE_PRAGMAS"] == "cache_size=1"
+        assert request["config_path"] == daemon.get_config_path()
+        assert running_daemon.requests_served == 1
+
+    def test_other_config_path_runs_locally(self, running_daemon: CliDaemon) -> None:
+        """Test a daemon of another install refuses, so the client runs it."""
+        refused = send_request(
+            {"argv": ["list"], "config_path": "/other/config.json"},
+            running_daemon.socket_path,
+        )
+        assert "refused" in refused
+        assert running_daemon.requests_served == 0
+
+        with patch("motido.cli.daemon.send_request", return_value=refused):
+            assert forward_command(["list"]) is None
+
+    def test_disabled_by_env(self, monkeypatch: Any) -> None:
+        """Test MOTIDO_NO_DAEMON forces in-process execution."""
+        monkeypatch.setenv(daemon.DISABLE_ENV, "1")
+        assert forward_command(["list"]) is None
+
+    def test_lost_connection_does_not_rerun(
+        self, socket_path: str, monkeypatch: Any, capsys: Any
+    ) -> None:
+        """Test a broken exchange fails instead of running the command twice."""
+        monkeypatch.setenv(daemon.SOCKET_ENV, socket_path)
+        monkeypatch.delenv(daemon.DISABLE_ENV, raising=False)
+        with open(socket_path, "w", encoding="utf-8"):
+            pass
+        with patch("motido.cli.daemon.send_request", side_effect=ValueError("eof")):
+            assert forward_command(["list"]) == 1
+        assert "lost connection" in capsys.readouterr().err
+
+    def test_oversized_message_rejected(self) -> None:
+        """Test messages over the size limit are refused."""
+        sock = MagicMock()
+        sock.recv.side_effect = [b"x" * 10, b""]
+        with patch("motido.cli.daemon.MAX_REQUEST_BYTES", 5):
+            with pytest.raises(ValueError, match="too large"):
+                daemon._read_message(sock)
+
+    def test_message_without_newline(self) -> None:
+        """Test a message ends at EOF even without a trailing newline."""
+        sock = MagicMock()
+        sock.recv.side_effect = [b'{"control": "ping"}', b""]
+        assert daemon._read_message(sock) == {"control": "ping"}
+
+    def test_non_user_commands_load_no_user(self) -> None:
+        """Test load_command_user skips commands that don't need a user."""
+        manager = MagicMock()
+        args = cli_main.setup_parser("badges").parse_args(["badges"])
+        assert cli_main.load_command_user(args, manager) is None
+        manager.load_user.assert_not_called()
+
+    def test_terminal_columns(self) -> None:
+        """Test the client's width is sent, defaulting to 80 off a terminal."""
+        assert daemon._terminal_columns() == 80
+        with patch("motido.cli.daemon.sys.stdout"), patch(
+            "motido.cli.daemon.os.get_terminal_size",
+            return_value=os.terminal_size((132, 40)),
+        ):
+            assert daemon._terminal_columns() == 132
+
+    def test_main_uses_forwarded_result(self, mocker: Any) -> None:
+        """Test main() exits with the daemon's code and skips local parsing."""
+        mocker.patch("sys.argv", ["motido", "list"])
+        mocker.patch("motido.cli.main.forward_command", return_value=0)
+        setup = mocker.patch("motido.cli.main.setup_parser")
+        cli_main.main()
+        setup.assert_not_called()
+
+        mocker.patch("motido.cli.main.forward_command", return_value=3)
+        with pytest.raises(SystemExit) as excinfo:
+            cli_main.main()
+        assert excinfo.value.code == 3
+
+
+class TestDaemonCommand:
+    """Tests for `motido daemon start|stop|status|run`."""
+
+    def _run(self, action: str, path: str) -> None:
+        args = cli_main.setup_parser("daemon").parse_args(
+            ["daemon", action, "--socket", path]
+        )
+        cli_main.handle_daemon(args)
+
+    def test_status_start_stop(self, running_daemon: CliDaemon, capsys: Any) -> None:
+        """Test status/start/stop against a running daemon."""
+        path = running_daemon.socket_path
+        self._run("status", path)
+        assert "Daemon running" in capsys.readouterr().out
+        self._run("start", path)
+        assert "already running" in capsys.readouterr().out
+        self._run("stop", path)
+        assert "Daemon stopped" in capsys.readouterr().out
+
+    def test_commands_without_daemon(self, socket_path: str, capsys: Any) -> None:
+        """Test status and stop report a daemon that isn't running."""
+        self._run("status", socket_path)
+        self._run("stop", socket_path)
+        assert capsys.readouterr().out.count("not running") == 2
+
+    def test_start_launches_background_process(
+        self, socket_path: str, capsys: Any
+    ) -> None:
+        """Test start spawns the daemon module and waits for it to answer."""
+        with patch("subprocess.Popen") as popen, patch(
+            "motido.cli.daemon.send_request",
+            side_effect=[ConnectionError(), ConnectionError(), {"pid": 42}],
+        ):
+            self._run("start", socket_path)
+        assert popen.call_args[0][0][-1] == "motido.cli.daemon"
+        assert popen.call_args[1]["env"][daemon.SOCKET_ENV] == socket_path
+        assert "Daemon started (pid 42)" in capsys.readouterr().out
+
+    def test_start_times_out(self, socket_path: str) -> None:
+        """Test start fails when the daemon never answers."""
+        with patch("subprocess.Popen"), patch("motido.cli.daemon.START_TIMEOUT", 0.05):
+            with pytest.raises(SystemExit):
+                self._run("start", socket_path)
+
+    def test_run_serves_in_foreground(self, socket_path: str) -> None:
+        """Test run serves on the requested socket."""
+        with patch.object(CliDaemon, "serve_forever") as serve:
+            self._run("run", socket_path)
+        serve.assert_called_once()
+
+    def test_unsupported_platform(self, socket_path: str) -> None:
+        """Test the command exits cleanly without Unix socket support."""
+        with patch("motido.cli.daemon.daemon_supported", return_value=False):
+            with pytest.raises(SystemExit):
+                self._run("status", socket_path)
+            assert not daemon._should_forward(["list"])
+
+    def test_default_socket_path(self, monkeypatch: Any) -> None:
+        """Test the socket defaults to a per-user path in the runtime dir."""
+        monkeypatch.delenv(daemon.SOCKET_ENV, raising=False)
+        monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+        assert daemon.get_socket_path() == (f"/run/user/1000/motido-{os.getuid()}.sock")
@@ -0,0 +1,69 @@
+"""Tests for the `motido db` command."""
+
+from argparse import Namespace
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from motido.cli import main as cli_main
+from motido.data.database_manager import DatabaseDataManager
+from motido.data.json_manager import JsonDataManager
+
+
+def _run_db(manager: Any, *argv: str) -> None:
+    args = cli_main.setup_parser("db").parse_args(["db", *argv])
+    cli_main.handle_db(args, manager, None)
+
+
+def test_db_explain_shows_index_use(tmp_path: Any, mocker: Any, capsys: Any) -> None:
+    """Test explain prints each access pattern's plan on SQLite."""
+    mocker.patch.object(
+        DatabaseDataManager, "_get_db_path", return_value=str(tmp_path / "motido.db")
+    )
+    manager = DatabaseDataManager()
+    manager.initialize()
+
+    _run_db(manager, "explain", "--username", "someone")
+
+    out = capsys.readouterr().out
+    assert (
+        "open tasks due:\n  SEARCH tasks USING INDEX idx_tasks_user_complete_due"
+        in (out)
+    )
+    assert "habit series:\n  SEARCH tasks USING INDEX idx_tasks_user_parent_habit" in (
+        out
+    )
+    assert "USING INDEX idx_task_tags_user_tag" in out
+
+
+def test_db_explain_without_planner(capsys: Any) -> None:
+    """Test backends without a query planner say so."""
+    _run_db(JsonDataManager(), "explain")
+
+    assert "The json backend has no query plans to show." in capsys.readouterr().out
+
+
+def test_db_rebuild_summary(tmp_path: Any, mocker: Any, capsys: Any) -> None:
+    """Test rebuild-summary recounts the user's daily summary."""
+    mocker.patch.object(
+        DatabaseDataManager, "_get_db_path", return_value=str(tmp_path / "motido.db")
+    )
+    manager = DatabaseDataManager()
+    manager.initialize()
+
+    _run_db(manager, "rebuild-summary", "--username", "someone")
+
+    assert (
+        "Rebuilt the daily summary of user 'someone': 0 day counts."
+        in capsys.readouterr().out
+    )
+
+
+def test_db_unknown_command(capsys: Any) -> None:
+    """Test an unknown db subcommand exits 1."""
+    with pytest.raises(SystemExit) as exc_info:
+        cli_main.handle_db(Namespace(db_command="vacuum"), MagicMock(), None)
+
+    assert exc_info.value.code == 1
+    assert "Unknown db command 'vacuum'" in capsys.readouterr().out
@@ -0,0 +1,76 @@
+"""Tests for the `motido generate` command (synthetic accounts)."""
+
+# pylint: disable=redefined-outer-name
+
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from motido.cli import main as cli_main
+from motido.core.models import User
+from motido.data.abstraction import DataManager
+
+
+@pytest.fixture
+def manager() -> MagicMock:
+    """Provides a mocked DataManager with no existing users."""
+    mock = MagicMock(spec=DataManager)
+    mock.load_user.return_value = None
+    return mock
+
+
+def _run_generate(manager: MagicMock, *options: str) -> None:
+    args = cli_main.setup_parser("generate").parse_args(["generate", *options])
+    cli_main.handle_generate(args, manager, None)
+
+
+def test_generate_writes_user(manager: MagicMock, capsys: Any) -> None:
+    """Test every knob reaches the generator and the user is saved."""
+    _run_generate(
+        manager,
+        "--username",
+        "bench",
+        "--tasks",
+        "12",
+        "--habits",
+        "2",
+        "--habit-instances",
+        "5",
+        "--xp-days",
+        "3",
+        "--xp-per-day",
+        "2",
+        "--history",
+        "1",
+        "--subtasks",
+        "0",
+        "--completed-ratio",
+        "0.5",
+        "--seed",
+        "9",
+        "--end-date",
+        "2025-06-30",
+    )
+
+    user = manager.save_user.call_args[0][0]
+    assert user.username == "bench"
+    assert len(user.tasks) == 12 + 2 * 5
+    assert len(user.xp_transactions) == 6
+    assert str(user.last_processed_date) == "2025-06-30"
+    assert "Generated user 'bench': 22 tasks, 6 XP transactions" in (
+        capsys.readouterr().out
+    )
+
+
+def test_generate_refuses_to_replace_user(manager: MagicMock, capsys: Any) -> None:
+    """Test an existing user is only replaced with --force."""
+    manager.load_user.return_value = User(username="default_user")
+
+    with pytest.raises(SystemExit):
+        _run_generate(manager, "--tasks", "1")
+    assert "already exists" in capsys.readouterr().out
+    manager.save_user.assert_not_called()
+
+    _run_generate(manager, "--tasks", "1", "--habits", "0", "--force")
+    manager.save_user.assert_called_once()
@@ -12,7 +12,7 @@ import pytest
 # pylint: disable=protected-access
 # pyright: reportPrivateUsage=false
 from motido.cli.main import _record_history, handle_history, handle_undo
-from motido.core.models import Difficulty, Duration, Priority, Task, User
+from motido.core.models import Difficulty, Duration, LazyTasks, Priority, Task, User
 from motido.data.abstraction import DEFAULT_USERNAME, DataManager
 
 
@@ -453,3 +453,23 @@ def test_undo_ambiguous_id(user_with_task_and_history: User, capsys: Any) -> Non
     assert exc_info.value.code == 1
     captured = capsys.readouterr()
     assert "Error" in captured.out
+
+
+def test_history_and_undo_archived_task(
+    user_with_task_and_history: User, capsys: Any
+) -> None:
+    """Test archived tasks show their history but cannot be undone."""
+    user = User(username=DEFAULT_USERNAME)
+    user.archived_tasks = LazyTasks.of(user_with_task_and_history.tasks, frozenset())
+    manager = MagicMock(spec=DataManager)
+    args = create_mock_args(id="uuid-aaaa")
+
+    handle_history(args, manager, user)
+    assert "Original Title" in capsys.readouterr().out
+
+    with pytest.raises(SystemExit) as exc_info:
+        handle_undo(args, manager, user)
+
+    assert exc_info.value.code == 1
+    assert "archived and read-only" in capsys.readouterr().out
+    manager.save_user.assert_not_called()
@@ -32,6 +32,9 @@ def create_mock_args(**kwargs: Any) -> argparse.Namespace:
     # Ensure 'verbose' is present, defaulting to False if not provided
     if "verbose" not in kwargs:
         kwargs["verbose"] = False
+    # Global --profile flag defaults to off
+    if "profile" not in kwargs:
+        kwargs["profile"] = False
     # Ensure 'priority' is present for create/edit commands
     if "priority" not in kwargs:
         kwargs["priority"] = None
@@ -0,0 +1,83 @@
+"""Tests for the `motido migrate` command."""
+
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from motido.cli import main as cli_main
+from motido.data.migration import MigrationResult, UserDigest
+
+
+def _run_migrate(*options: str) -> None:
+    args = cli_main.setup_parser("migrate").parse_args(["migrate", *options])
+    cli_main.dispatch_command(args)
+
+
+def test_migrate_reports_progress_and_verification(mocker: Any, capsys: Any) -> None:
+    """Test a migration prints each copied user and the verification."""
+    managers = {"json": MagicMock(), "db": MagicMock()}
+    mocker.patch.object(cli_main, "create_data_manager", side_effect=managers.get)
+
+    def migrate(source: Any, target: Any, checkpoint: str, on_user: Any) -> Any:
+        assert (source, target) == (managers["json"], managers["db"])
+        assert checkpoint == "motido-migrate-json-db.json"
+        on_user("alice", UserDigest(3, 1, 2, "abc"))
+        return MigrationResult(migrated=["alice"], skipped=["bob"])
+
+    mocker.patch.object(cli_main, "migrate_backend", side_effect=migrate)
+
+    _run_migrate("--from", "json", "--to", "db")
+
+    managers["json"].initialize.assert_called_once()
+    managers["db"].initialize.assert_called_once()
+    out = capsys.readouterr().out
+    assert (
+        "Copied user 'alice': 3 tasks, 1 archived, 2 XP transactions." in out
+        and "Migrated 1 users from json to db (1 already copied)." in out
+        and "Verified 2 users: row counts and checksums match." in out
+    )
+
+
+def test_migrate_verification_failure(mocker: Any, capsys: Any) -> None:
+    """Test users failing verification are listed and exit 1."""
+    mocker.patch.object(cli_main, "create_data_manager")
+    mocker.patch.object(
+        cli_main,
+        "migrate_backend",
+        return_value=MigrationResult(
+            migrated=["alice"], mismatches={"alice": "checksum mismatch"}
+        ),
+    )
+
+    with pytest.raises(SystemExit) as exc_info:
+        _run_migrate("--from", "db", "--to", "json", "--checkpoint", "cp.json")
+
+    assert exc_info.value.code == 1
+    assert "Verification failed for user 'alice': checksum mismatch" in (
+        capsys.readouterr().out
+    )
+
+
+def test_migrate_error_points_to_resume(mocker: Any, capsys: Any) -> None:
+    """Test a failing backend exits 1 with the checkpoint to resume from."""
+    mocker.patch.object(
+        cli_main, "create_data_manager", side_effect=ImportError("no psycopg2")
+    )
+
+    with pytest.raises(SystemExit) as exc_info:
+        _run_migrate("--from", "json", "--to", "postgres")
+
+    assert exc_info.value.code == 1
+    out = capsys.readouterr().out
+    assert "Error: Migration stopped: no psycopg2" in out
+    assert "resume from 'motido-migrate-json-postgres.json'" in out
+
+
+def test_migrate_same_backend(capsys: Any) -> None:
+    """Test migrating a backend onto itself exits 1."""
+    with pytest.raises(SystemExit) as exc_info:
+        _run_migrate("--from", "db", "--to", "db")
+
+    assert exc_info.value.code == 1
+    assert "must differ" in capsys.readouterr().out
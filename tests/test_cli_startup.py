@@ -0,0 +1,118 @@
+"""Startup benchmark and lazy-loading tests for the CLI entry point."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import motido
+from motido.cli.lazy import LazyImport
+from motido.cli.main import _COMMAND_PARSERS, _requested_command, setup_parser
+
+# Cumulative import time budget for motido.cli.main, in milliseconds.
+# Measured at ~30-60ms locally with bytecode cached. Wall-clock timing is
+# noisy on shared runners, so the budget is only checked when
+# MOTIDO_CLI_IMPORT_BUDGET_MS is set (e.g. 400).
+CLI_IMPORT_BUDGET_MS = os.getenv("MOTIDO_CLI_IMPORT_BUDGET_MS")
+
+# Modules that must only load when a command needs them
+DEFERRED_MODULES = (
+    "rich",
+    "dateutil",
+    "sqlite3",
+    "motido.cli.views",
+    "motido.data.json_manager",
+    "motido.data.database_manager",
+    "motido.data.postgres_manager",
+)
+
+_PROBE = """
+import sys
+import motido.cli.main
+print(",".join(m for m in {modules!r} if m in sys.modules))
+"""
+
+
+def _run_cli_import() -> subprocess.CompletedProcess:
+    """Import the CLI in a fresh interpreter with import timing enabled."""
+    env = {k: v for k, v in os.environ.items() if not k.startswith("COV_CORE")}
+    env["PYTHONPATH"] = str(Path(motido.__file__).parent.parent)
+    return subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            _PROBE.format(modules=DEFERRED_MODULES),
+        ],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+        timeout=60,
+    )
+
+
+def test_cli_import_defers_modules() -> None:
+    """Test importing the CLI leaves command-only modules unimported."""
+    result = _run_cli_import()
+
+    assert result.stdout.strip() == "", f"Eagerly imported: {result.stdout}"
+
+
+@pytest.mark.skipif(
+    CLI_IMPORT_BUDGET_MS is None, reason="MOTIDO_CLI_IMPORT_BUDGET_MS is not set"
+)
+def test_cli_import_within_budget() -> None:
+    """Test importing the CLI stays within the startup budget."""
+    budget_ms = int(CLI_IMPORT_BUDGET_MS or 0)
+    result = _run_cli_import()
+
+    cumulative_us = next(
+        int(line.split("|")[1])
+        for line in result.stderr.splitlines()
+        if line.rstrip().endswith("| motido.cli.main")
+    )
+    assert cumulative_us / 1000 < budget_ms, (
+        f"motido.cli.main import took {cumulative_us / 1000:.0f}ms "
+        f"(budget {budget_ms}ms)"
+    )
+
+
+@pytest.mark.parametrize(
+    "argv, expected",
+    [
+        (["list"], "list"),
+        (["-v", "complete", "--id", "abc"], "complete"),
+        (["--help"], None),
+        ([], None),
+    ],
+)
+def test_requested_command(argv: list[str], expected: str | None) -> None:
+    """Test the subcommand is the first non-option argument."""
+    assert _requested_command(argv) == expected
+
+
+def test_setup_parser_builds_only_requested_command() -> None:
+    """Test a known command builds a single subparser; others build all."""
+    single = setup_parser("list")
+    args = single.parse_args(["list", "--sort-by", "score"])
+    assert args.command == "list"
+    with pytest.raises(SystemExit):
+        single.parse_args(["create", "--title", "x"])
+
+    full = setup_parser("unknown")
+    assert full.parse_args(["create", "--title", "x"]).command == "create"
+    assert len(_COMMAND_PARSERS) >= 25
+
+
+def test_lazy_import_resolves_once() -> None:
+    """Test LazyImport imports on first use and proxies calls and attributes."""
+    lazy_path = LazyImport("pathlib", "PurePosixPath")
+    assert "pathlib.PurePosixPath" in repr(lazy_path)
+
+    assert str(lazy_path("a", "b")) == "a/b"
+    assert lazy_path.resolve() is lazy_path.resolve()
+    assert lazy_path.__name__ == "PurePosixPath"
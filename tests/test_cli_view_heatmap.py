@@ -164,6 +164,11 @@ def test_handle_view_heatmap(user_with_habits: User, capsys: Any) -> None:
 def test_handle_view_heatmap_with_habit_id(user_with_habits: User, capsys: Any) -> None:
     """Test handle_view with heatmap mode and specific habit."""
     mock_manager = MagicMock(spec=DataManager)
+    today = date.today()
+    mock_manager.completion_counts_by_day.return_value = {
+        today - timedelta(days=1): (1, 1),
+        today: (0, 1),
+    }
     args = Namespace(
         view_mode="heatmap",
         habit_id="habit-001",
@@ -178,6 +183,12 @@ def test_handle_view_heatmap_with_habit_id(user_with_habits: User, capsys: Any)
 
     captured = capsys.readouterr()
     assert "Daily Exercise" in captured.out
+    # Day counts come from the backend, completed days only
+    assert captured.out.count("▪") == 2  # Yesterday and the legend
+    start = today - timedelta(days=today.weekday(), weeks=3)
+    mock_manager.completion_counts_by_day.assert_called_once_with(
+        user_with_habits.username, start, today, "habit-001"
+    )
 
 
 def test_handle_view_heatmap_no_user(capsys: Any) -> None:
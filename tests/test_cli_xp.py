@@ -1,13 +1,14 @@
 """Tests for the XP CLI commands."""
 
 import argparse
+from datetime import datetime, timedelta
 from typing import Any
 from unittest.mock import MagicMock
 
 import pytest
 
 from motido.cli.main import handle_xp
-from motido.core.models import User
+from motido.core.models import User, XPTransaction
 from motido.data.abstraction import DEFAULT_USERNAME, DataManager
 
 
@@ -85,3 +86,69 @@ def test_handle_xp_no_user(capsys: Any) -> None:
     assert excinfo.value.code == 1
     captured = capsys.readouterr()
     assert "Error: User not found" in captured.out
+
+
+def test_handle_xp_rollup(capsys: Any) -> None:
+    """Test `xp rollup` compacts old transactions and saves the user."""
+    args = create_mock_args(xp_command="rollup", daily_after=30, monthly_after=365)
+    mock_manager = MagicMock(spec=DataManager)
+    old = datetime.now() - timedelta(days=40)
+    user = User(
+        username=DEFAULT_USERNAME,
+        xp_transactions=[
+            XPTransaction(amount=10, source="task_completion", timestamp=old),
+            XPTransaction(amount=-4, source="penalty", timestamp=old),
+            XPTransaction(amount=6, source="task_completion", timestamp=old),
+        ],
+    )
+
+    handle_xp(args, mock_manager, user)
+
+    assert sorted(t.source for t in user.xp_transactions) == [
+        "daily_earned",
+        "daily_lost",
+    ]
+    mock_manager.save_user.assert_called_once_with(user)
+    assert "Rolled up 3 XP transaction(s) into 2 aggregate(s); 2 remain." in (
+        capsys.readouterr().out
+    )
+
+    handle_xp(args, mock_manager, user)
+    assert "Nothing to roll up." in capsys.readouterr().out
+    mock_manager.save_user.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "daily_after, monthly_after, save_error, message",
+    [
+        (0, 365, None, "at least 1 day"),
+        (30, 365, IOError("disk full"), "Error saving changes: disk full"),
+    ],
+)
+def test_handle_xp_rollup_errors(
+    capsys: Any,
+    daily_after: int,
+    monthly_after: int,
+    save_error: Exception | None,
+    message: str,
+) -> None:
+    """Test bad horizons and failing saves exit 1."""
+    args = create_mock_args(
+        xp_command="rollup", daily_after=daily_after, monthly_after=monthly_after
+    )
+    mock_manager = MagicMock(spec=DataManager)
+    mock_manager.save_user.side_effect = save_error
+    old = datetime.now() - timedelta(days=40)
+    user = User(
+        username=DEFAULT_USERNAME,
+        xp_transactions=[
+            XPTransaction(amount=1, source="task_completion", timestamp=old),
+            XPTransaction(amount=2, source="task_completion", timestamp=old),
+        ],
+    )
+
+    with pytest.raises(SystemExit) as exc_info:
+        handle_xp(args, mock_manager, user)
+
+    assert exc_info.value.code == 1
+    assert message in capsys.readouterr().out
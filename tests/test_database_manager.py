@@ -10,7 +10,14 @@ from unittest.mock import MagicMock, call
 import pytest
 
 from motido.core.models import Priority, Task, User
-from motido.data.database_manager import DB_NAME, DEFAULT_USERNAME, DatabaseDataManager
+from motido.data.database_manager import (
+    DB_NAME,
+    DEFAULT_PRAGMAS,
+    DEFAULT_USERNAME,
+    PRAGMAS_ENV,
+    TASK_SELECT_COLUMNS,
+    DatabaseDataManager,
+)
 
 # pylint: disable=protected-access,redefined-outer-name,unused-argument
 
@@ -120,10 +127,72 @@ def test_get_connection_success(
     conn = manager._get_connection()
 
     mock_ensure_dir.assert_called_once()
-    mock_connect.assert_called_once_with(db_path, isolation_level=None)
+    mock_connect.assert_called_once_with(
+        db_path, isolation_level=None, check_same_thread=False
+    )
     assert conn == mock_conn_instance
     # Check that row_factory was set on the mocked instance
     assert mock_conn_instance.row_factory == sqlite3.Row
+    mock_conn_instance.execute.assert_any_call("PRAGMA journal_mode = wal")
+    mock_conn_instance.execute.assert_any_call("PRAGMA mmap_size = 268435456")
+
+    # The connection is kept for the thread until closed
+    assert manager._get_connection() is conn
+    mock_connect.assert_called_once()
+    manager.close()
+    mock_conn_instance.close.assert_called_once()
+    manager._get_connection()
+    assert mock_connect.call_count == 2
+    manager.close()
+    manager.close()  # Nothing left to close
+
+
+def test_pragmas_from_env_and_arguments(
+    mock_db_path: Tuple[str, str], monkeypatch: Any, caplog: Any
+) -> None:
+    """Test MOTIDO_SQLITE_PRAGMAS and explicit pragmas override the defaults."""
+    monkeypatch.setenv(
+        PRAGMAS_ENV, "mmap_size=0, synchronous=FULL,, cache_size=-2000;drop"
+    )
+
+    manager = DatabaseDataManager(pragmas={"synchronous": "extra"})
+
+    assert manager._pragmas == {
+        **DEFAULT_PRAGMAS,
+        "mmap_size": "0",
+        "synchronous": "extra",
+    }
+    assert "Ignoring invalid SQLite pragma 'cache_size=-2000;drop'" in caplog.text
+
+
+def test_save_user_is_one_transaction(tmp_path: Any, mocker: Any) -> None:
+    """Test a failing save rolls back to the previously saved tasks."""
+    mocker.patch.object(
+        DatabaseDataManager, "_get_db_path", return_value=str(tmp_path / DB_NAME)
+    )
+    manager = DatabaseDataManager()
+    manager.initialize()
+    assert (
+        manager._get_connection().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    )
+    created = datetime(2025, 1, 1, 9, 0)
+    manager.save_user(
+        User(username="u", tasks=[Task(title="Kept", creation_date=created)])
+    )
+
+    mocker.patch.object(
+        DatabaseDataManager,
+        "_insert_task_lists",
+        side_effect=sqlite3.OperationalError("disk I/O error"),
+    )
+    manager.save_user(
+        User(username="u", tasks=[Task(title="Lost", creation_date=created)])
+    )
+
+    loaded = manager.load_user("u")
+    assert loaded is not None
+    assert [task.title for task in loaded.tasks] == ["Kept"]
+    assert not manager._get_connection().in_transaction
 
 
 def test_get_connection_error(
@@ -186,7 +255,7 @@ def test_create_tables(
 def test_create_tables_error(
     manager: DatabaseDataManager,
     mock_conn_fixture: Tuple[Any, Any, Any],
-    capsys: Any,
+    caplog: Any,
 ) -> None:
     """Test _create_tables handles sqlite3.Error using mocked connection."""
     _, connection, cursor = mock_conn_fixture
@@ -195,8 +264,7 @@ def test_create_tables_error(
     manager._create_tables(connection)
 
     connection.commit.assert_not_called()
-    captured = capsys.readouterr()
-    assert "Error creating database tables: Table creation failed" in captured.out
+    assert "Error creating database tables: Table creation failed" in caplog.text
 
 
 def test_initialize_success(
@@ -219,10 +287,28 @@ def test_initialize_success(
     mock_create_tables.assert_called_once_with(mock_conn_instance)
 
 
+def test_initialize_runs_once_per_manager(
+    manager: DatabaseDataManager,
+    mocker: Any,
+    mock_conn_fixture: Tuple[Any, Any, Any],
+) -> None:
+    """Test only a successful initialize is skipped afterwards."""
+    del mock_conn_fixture
+    mock_create_tables = mocker.patch.object(
+        manager, "_create_tables", side_effect=[False, True]
+    )
+
+    manager.initialize()  # Failed: retried by the next call
+    manager.initialize()
+    manager.initialize()
+
+    assert mock_create_tables.call_count == 2
+
+
 def test_initialize_connection_error(
     manager: DatabaseDataManager,
     mocker: Any,
-    capsys: Any,
+    caplog: Any,
 ) -> None:
     """Test initialize handles errors when _get_connection (mocked) fails."""
     # Explicitly mock _get_connection *within this test* to raise error
@@ -239,9 +325,8 @@ def test_initialize_connection_error(
     manager._get_connection.assert_called_once()  # type: ignore [attr-defined]
     # create_tables shouldn't be called if conn fails
     mock_create_tables.assert_not_called()
-    captured = capsys.readouterr()
     error_msg = "Database initialization failed: Initial connection failed"
-    assert error_msg in captured.out
+    assert error_msg in caplog.text
 
 
 def test_load_user_success(
@@ -353,7 +438,8 @@ def test_load_user_not_found(
     assert loaded_user is None
     cursor.execute.assert_called_once_with(
         "SELECT username, total_xp, last_processed_date, vacation_mode, "
-        "defined_tags, defined_projects FROM users WHERE username = ?",
+        "defined_tags, defined_projects, archive_summary "
+        "FROM users WHERE username = ?",
         (username,),
     )
     cursor.fetchall.assert_not_called()
@@ -380,16 +466,12 @@ def test_load_user_no_tasks(
     expected_calls = [
         call(
             "SELECT username, total_xp, last_processed_date, vacation_mode, "
-            "defined_tags, defined_projects FROM users WHERE username = ?",
+            "defined_tags, defined_projects, archive_summary "
+            "FROM users WHERE username = ?",
             (username,),
         ),
         call(
-            "SELECT id, title, text_description, priority, difficulty, duration, "
-            "is_complete, creation_date, due_date, start_date, icon, tags, "
-            "project, subtasks, dependencies, history, is_habit, recurrence_rule, "
-            "recurrence_type, streak_current, streak_best, parent_habit_id, "
-            "recurrence_ended_at, defer_until FROM tasks "
-            "WHERE user_username = ?",
+            f"SELECT {TASK_SELECT_COLUMNS} FROM tasks WHERE user_username = ?",
             (username,),
         ),
     ]
@@ -399,7 +481,7 @@ def test_load_user_no_tasks(
 def test_load_user_db_error(
     manager: DatabaseDataManager,
     mock_conn_fixture: Tuple[Any, Any, Any],
-    capsys: Any,
+    caplog: Any,
 ) -> None:
     """Test load_user handles database errors during query using mocked connection."""
     _, _, cursor = mock_conn_fixture
@@ -409,11 +491,10 @@ def test_load_user_db_error(
     loaded_user = manager.load_user(username)
 
     assert loaded_user is None
-    captured = capsys.readouterr()
     error_msg = (
         f"Error loading user '{username}' from motido.database: " f"Query failed"
     )
-    assert error_msg in captured.out
+    assert error_msg in caplog.text
 
 
 def test_ensure_user_exists(
@@ -439,7 +520,7 @@ def test_ensure_user_exists(
 def test_ensure_user_exists_db_error(
     manager: DatabaseDataManager,
     mock_conn_fixture: Tuple[Any, Any, Any],
-    capsys: Any,
+    caplog: Any,
 ) -> None:
     """Test _ensure_user_exists handles database errors using mocked connection."""
     _, connection, cursor = mock_conn_fixture
@@ -448,11 +529,7 @@ def test_ensure_user_exists_db_error(
     cursor.execute.side_effect = sqlite3.Error("Insert failed")
 
     manager._ensure_user_exists(connection, user)
-
-    captured = capsys.readouterr()
-    assert (
-        f"Error ensuring user '{user.username}' exists: Insert failed" in captured.out
-    )
+    assert f"Error ensuring user '{user.username}' exists: Insert failed" in caplog.text
 
 
 def test_save_user(
@@ -561,8 +638,9 @@ def test_save_user_no_tasks(
 
     # Check that _ensure_user_exists was called correctly (without self)
     mock_ensure_user.assert_called_once_with(connection, user_no_tasks)
-    # Should have 2 execute calls: UPDATE total_xp and DELETE tasks
-    assert cursor.execute.call_count == 2
+    # UPDATE total_xp, read the stored rows' summary keys and DELETE tasks;
+    # with no rows changed daily_summary is left alone
+    assert cursor.execute.call_count == 3
     cursor.executemany.assert_not_called()
 
 
@@ -571,7 +649,7 @@ def test_save_user_db_error_on_delete(
     mocker: Any,
     mock_conn_fixture: Tuple[Any, Any, Any],
     sample_user_db: User,
-    capsys: Any,
+    caplog: Any,
 ) -> None:
     """Test save_user handles DB error during DELETE using mocked connection."""
     _, connection, cursor = mock_conn_fixture
@@ -587,11 +665,10 @@ def test_save_user_db_error_on_delete(
     mock_ensure_user.assert_called_once_with(connection, sample_user_db)
     cursor.execute.assert_called_once()
     cursor.executemany.assert_not_called()
-    captured = capsys.readouterr()
     db_error = "Delete failed"
     user = sample_user_db.username
     error_msg = f"Error saving user '{user}' to database: {db_error}"
-    assert error_msg in captured.out
+    assert error_msg in caplog.text
 
 
 def test_save_user_db_error_on_insert(
@@ -599,28 +676,29 @@ def test_save_user_db_error_on_insert(
     mocker: Any,
     mock_conn_fixture: Tuple[Any, Any, Any],
     sample_user_db: User,
-    capsys: Any,
+    caplog: Any,
 ) -> None:
     """Test save_user handles DB error during INSERT using mocked connection."""
     _, connection, cursor = mock_conn_fixture
     mock_ensure_user = mocker.patch.object(
         manager, "_ensure_user_exists", autospec=True
     )
-    # Let DELETE succeed (first execute call), but INSERT fail (executemany)
-    cursor.execute.return_value = None
+    # Let DELETE succeed (no rows stored), but INSERT fail (executemany)
+    cursor.execute.return_value = []
     cursor.executemany.side_effect = sqlite3.Error("Insert failed")
 
     manager.save_user(sample_user_db)
 
     # Check that _ensure_user_exists was called correctly (without self)
     mock_ensure_user.assert_called_once_with(connection, sample_user_db)
-    assert cursor.execute.call_count == 2  # UPDATE and DELETE calls
+    # UPDATE, read the stored rows' summary keys, the new rows' daily_summary
+    # counts out (none were stored) and DELETE
+    assert cursor.execute.call_count == 4
     assert cursor.executemany.call_count == 1  # INSERT is attempted once
-    captured = capsys.readouterr()
     db_error = "Insert failed"
     user = sample_user_db.username
     error_msg = f"Error saving user '{user}' to database: {db_error}"
-    assert error_msg in captured.out
+    assert error_msg in caplog.text
 
 
 def test_backend_type(manager: DatabaseDataManager) -> None:
@@ -628,6 +706,25 @@ def test_backend_type(manager: DatabaseDataManager) -> None:
     assert manager.backend_type() == "db"
 
 
+def test_data_version_tracks_file_mtime(
+    manager: DatabaseDataManager, tmp_path: Any
+) -> None:
+    """Test data_version is None until the database exists, then its mtime."""
+    db_file = tmp_path / "motido.db"
+    manager._db_path = str(db_file)
+    assert manager.data_version() is None
+
+    db_file.write_bytes(b"")
+    assert manager.data_version() == db_file.stat().st_mtime_ns
+
+    # Commits not checkpointed yet only touch the write-ahead log
+    wal_file = tmp_path / "motido.db-wal"
+    wal_file.write_bytes(b"")
+    later = db_file.stat().st_mtime_ns + 10**9
+    os.utime(wal_file, ns=(later, later))
+    assert manager.data_version() == later
+
+
 # Note: _connect and _close methods seem unused by the main logic
 # (_get_connection is used). If they are indeed unused, they could be removed from the
 # source code. We are not testing them here as they aren't part of the current public
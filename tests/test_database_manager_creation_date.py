@@ -10,7 +10,7 @@ from motido.data.abstraction import DEFAULT_USERNAME
 from motido.data.database_manager import DatabaseDataManager
 
 
-def test_load_user_invalid_creation_date_format(mocker: Any) -> None:
+def test_load_user_invalid_creation_date_format(mocker: Any, caplog: Any) -> None:
     """Test load_user handles invalid creation_date format."""
     # Mock the database connection and cursor
     mock_conn = MagicMock()
@@ -36,9 +36,6 @@ def test_load_user_invalid_creation_date_format(mocker: Any) -> None:
         }
     ]
 
-    # Mock print to verify warning message
-    mock_print = mocker.patch("builtins.print")
-
     # Create the manager and load the user
     manager = DatabaseDataManager()
     loaded_user = manager.load_user(DEFAULT_USERNAME)
@@ -55,7 +52,8 @@ def test_load_user_invalid_creation_date_format(mocker: Any) -> None:
     assert task.priority == Priority.LOW
     assert isinstance(task.creation_date, datetime)
 
-    # Verify the warning message was printed
-    mock_print.assert_any_call(
-        "Warning: Invalid creation_date format for task task-123, using current time."
+    # Verify the warning message was logged
+    assert (
+        "Invalid creation_date format for task task-123, using current time."
+        in caplog.text
     )
@@ -2,15 +2,25 @@
 
 import json
 import sqlite3
+import threading
+from datetime import datetime
 from typing import Any, Generator
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from motido.data.database_manager import DB_NAME, DatabaseDataManager
+from motido.core.models import Task, User
+from motido.data.abstraction import DataManager
+from motido.data.database_manager import (
+    DB_NAME,
+    DatabaseDataManager,
+    _materialized_hint,
+)
 
 # pylint: disable=protected-access,redefined-outer-name
 
+CREATED = datetime(2025, 1, 1, 9, 0)
+
 
 @pytest.fixture
 def mock_db_path(tmp_path: Any) -> str:
@@ -70,7 +80,7 @@ def test_get_db_path() -> None:
     ), f"Path structure is unexpected: {db_path}"
 
 
-def test_load_user_invalid_due_date_format(tmp_path, capsys):  # type: ignore
+def test_load_user_invalid_due_date_format(tmp_path, caplog):  # type: ignore
     """Test that load_user handles invalid due_date format gracefully."""
     db_path = tmp_path / "test.db"
 
@@ -128,12 +138,11 @@ def test_load_user_invalid_due_date_format(tmp_path, capsys):  # type: ignore
         assert len(user.tasks) == 1
         assert user.tasks[0].due_date is None  # Should be None due to invalid format
 
-        # Check that warning was printed
-        captured = capsys.readouterr()
-        assert "Warning: Invalid due_date format" in captured.out
+        # Check that warning was logged
+        assert "Invalid due_date format" in caplog.text
 
 
-def test_load_user_invalid_start_date_format(tmp_path, capsys):  # type: ignore
+def test_load_user_invalid_start_date_format(tmp_path, caplog):  # type: ignore
     """Test that load_user handles invalid start_date format gracefully."""
     db_path = tmp_path / "test.db"
 
@@ -191,12 +200,11 @@ def test_load_user_invalid_start_date_format(tmp_path, capsys):  # type: ignore
         assert len(user.tasks) == 1
         assert user.tasks[0].start_date is None  # Should be None due to invalid format
 
-        # Check that warning was printed
-        captured = capsys.readouterr()
-        assert "Warning: Invalid start_date format" in captured.out
+        # Check that warning was logged
+        assert "Invalid start_date format" in caplog.text
 
 
-def test_load_user_invalid_tags_json(tmp_path, capsys):  # type: ignore
+def test_load_user_invalid_tags_json(tmp_path, caplog):  # type: ignore
     """Test that load_user handles invalid tags JSON gracefully."""
     db_path = tmp_path / "test.db"
 
@@ -254,12 +262,11 @@ def test_load_user_invalid_tags_json(tmp_path, capsys):  # type: ignore
         assert len(user.tasks) == 1
         assert user.tasks[0].tags == []  # Should be empty list due to invalid JSON
 
-        # Check that warning was printed
-        captured = capsys.readouterr()
-        assert "Warning: Invalid JSON in tags" in captured.out
+        # Check that warning was logged
+        assert "Invalid JSON in tags" in caplog.text
 
 
-def test_load_user_invalid_subtasks_json(tmp_path, capsys):  # type: ignore
+def test_load_user_invalid_subtasks_json(tmp_path, caplog):  # type: ignore
     """Test that load_user handles invalid subtasks JSON gracefully."""
     db_path = tmp_path / "test.db"
 
@@ -317,12 +324,11 @@ def test_load_user_invalid_subtasks_json(tmp_path, capsys):  # type: ignore
         assert len(user.tasks) == 1
         assert user.tasks[0].subtasks == []  # Should be empty list due to invalid JSON
 
-        # Check that warning was printed
-        captured = capsys.readouterr()
-        assert "Warning: Invalid JSON in subtasks" in captured.out
+        # Check that warning was logged
+        assert "Invalid JSON in subtasks" in caplog.text
 
 
-def test_load_user_invalid_dependencies_json(tmp_path, capsys):  # type: ignore
+def test_load_user_invalid_dependencies_json(tmp_path, caplog):  # type: ignore
     """Test that load_user handles invalid dependencies JSON gracefully."""
     db_path = tmp_path / "test.db"
 
@@ -382,12 +388,11 @@ def test_load_user_invalid_dependencies_json(tmp_path, capsys):  # type: ignore
             user.tasks[0].dependencies == []
         )  # Should be empty list due to invalid JSON
 
-        # Check that warning was printed
-        captured = capsys.readouterr()
-        assert "Warning: Invalid JSON in dependencies" in captured.out
+        # Check that warning was logged
+        assert "Invalid JSON in dependencies" in caplog.text
 
 
-def test_load_user_invalid_history_json(tmp_path, capsys):  # type: ignore
+def test_load_user_invalid_history_json(tmp_path, caplog):  # type: ignore
     """Test that load_user handles invalid history JSON gracefully."""
     db_path = tmp_path / "test.db"
 
@@ -445,9 +450,8 @@ def test_load_user_invalid_history_json(tmp_path, capsys):  # type: ignore
         assert len(user.tasks) == 1
         assert user.tasks[0].history == []  # Should be empty list due to invalid JSON
 
-        # Check that warning was printed
-        captured = capsys.readouterr()
-        assert "Warning: Invalid JSON in history" in captured.out
+        # Check that warning was logged
+        assert "Invalid JSON in history" in caplog.text
 
 
 def test_load_task_invalid_recurrence_type(manager: DatabaseDataManager) -> None:
@@ -527,3 +531,155 @@ def test_load_task_invalid_recurrence_type(manager: DatabaseDataManager) -> None
     assert user is not None
     assert len(user.tasks) == 1
     assert user.tasks[0].recurrence_type is None  # Should be None
+
+
+def test_task_lists_round_trip_and_queries(tmp_path):  # type: ignore
+    """Test list items live in the task_* tables and answer indexed lookups."""
+    db_path = tmp_path / "test.db"
+
+    with patch.object(DatabaseDataManager, "_get_db_path", return_value=str(db_path)):
+        manager = DatabaseDataManager()
+        manager.initialize()
+        user = User(
+            username="test_user",
+            tasks=[
+                Task(
+                    title="A",
+                    creation_date=CREATED,
+                    id="a",
+                    tags=["work", "home"],
+                    subtasks=[{"text": "one", "complete": True}, {"text": "two"}],
+                    dependencies=["b", "gone"],
+                ),
+                Task(title="B", creation_date=CREATED, id="b", tags=["work"]),
+                Task(
+                    title="C",
+                    creation_date=CREATED,
+                    id="c",
+                    is_complete=True,
+                    dependencies=["b"],
+                ),
+                Task(title="D", creation_date=CREATED, id="d", dependencies=["c"]),
+            ],
+        )
+        manager.save_user(user)
+
+        loaded = manager.load_user("test_user")
+        assert loaded is not None
+        task_a = loaded.find_task_by_id("a")
+        assert task_a is not None
+        assert task_a.tags == ["work", "home"]
+        assert task_a.subtasks == [
+            {"text": "one", "complete": True},
+            {"text": "two", "complete": False},
+        ]
+        assert task_a.dependencies == ["b", "gone"]
+
+        # The indexed queries agree with the in-memory defaults
+        for method, args in (
+            ("tagged_task_ids", ("work",)),
+            ("dependent_task_ids", ("b",)),
+            ("blocked_task_ids", ()),
+        ):
+            expected = getattr(DataManager, method)(manager, loaded, *args)
+            assert getattr(manager, method)(loaded, *args) == expected
+        assert manager.blocked_task_ids(loaded) == {"a"}
+
+        # Deleting a task row deletes its list rows
+        loaded.tasks = [task for task in loaded.tasks if task.id != "a"]
+        manager.save_user(loaded)
+        conn = sqlite3.connect(str(db_path))
+        for table in ("task_tags", "task_subtasks", "task_dependencies"):
+            assert not conn.execute(
+                f"SELECT 1 FROM {table} WHERE task_id = 'a'"
+            ).fetchall()
+        assert conn.execute("SELECT tags FROM tasks WHERE id = 'b'").fetchone() == (
+            None,
+        )
+        conn.close()
+
+
+def test_task_lists_migrated_from_json_columns(tmp_path):  # type: ignore
+    """Test initialize moves JSON list columns into the task_* tables."""
+    db_path = tmp_path / "test.db"
+
+    with patch.object(DatabaseDataManager, "_get_db_path", return_value=str(db_path)):
+        manager = DatabaseDataManager()
+        manager.initialize()
+
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("INSERT INTO users (username) VALUES ('test_user')")
+        conn.execute(
+            "INSERT INTO tasks (id, user_username, title, tags, subtasks, "
+            "dependencies) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                "legacy",
+                "test_user",
+                "Legacy",
+                json.dumps(["work"]),
+                json.dumps([{"text": "done", "complete": True}, "plain", 3]),
+                json.dumps(["other"]),
+            ),
+        )
+        conn.commit()
+
+        # The migration runs when the next process initializes the database
+        manager.initialize()  # Already initialized: nothing happens
+        assert conn.execute("SELECT tags FROM tasks").fetchone() == ('["work"]',)
+        manager = DatabaseDataManager()
+        manager.initialize()
+        DatabaseDataManager().initialize()  # Idempotent
+
+        assert conn.execute(
+            "SELECT tags, subtasks, dependencies FROM tasks"
+        ).fetchone() == (None, None, None)
+        assert conn.execute(
+            "SELECT position, text, complete FROM task_subtasks ORDER BY position"
+        ).fetchall() == [(0, "done", 1), (1, "plain", 0)]
+        conn.close()
+
+        user = manager.load_user("test_user")
+        assert user is not None
+        assert user.tasks[0].tags == ["work"]
+        assert user.tasks[0].subtasks == [
+            {"text": "done", "complete": True},
+            {"text": "plain", "complete": False},
+        ]
+        assert manager.dependent_task_ids(user, "other") == {"legacy"}
+
+
+def test_close_reaches_every_threads_connection(
+    manager: DatabaseDataManager, mocker: Any
+) -> None:
+    """Test connections of exited threads are pruned and close() closes all."""
+    mocker.patch.object(manager, "_ensure_data_dir_exists", autospec=True)
+    exited, own, waiting = (MagicMock(spec=sqlite3.Connection) for _ in range(3))
+    mocker.patch("sqlite3.connect", side_effect=[exited, own, waiting])
+
+    worker = threading.Thread(target=manager._get_connection)
+    worker.start()
+    worker.join()
+    assert manager._get_connection() is own
+    exited.close.assert_called_once()  # Its thread had exited
+
+    opened, release = threading.Event(), threading.Event()
+
+    def hold_connection() -> None:
+        manager._get_connection()
+        opened.set()
+        release.wait()
+
+    holder = threading.Thread(target=hold_connection)
+    holder.start()
+    opened.wait()
+    manager.close()
+    release.set()
+    holder.join()
+    own.close.assert_called_once()
+    waiting.close.assert_called_once()  # Closed from this thread
+
+
+def test_materialized_hint_needs_sqlite_3_35() -> None:
+    """Test the CTE hint is left out on SQLite versions without it."""
+    assert _materialized_hint((3, 35, 0)) == "MATERIALIZED "
+    assert _materialized_hint((3, 31, 1)) == ""
@@ -0,0 +1,229 @@
+"""Tests for background job persistence."""
+
+# pylint: disable=import-outside-toplevel,protected-access,redefined-outer-name
+
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from motido.data.job_store import (
+    INTERRUPTED_ERROR,
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+    InMemoryJobStore,
+    JobRecord,
+    PostgresJobStore,
+    SqliteJobStore,
+)
+
+
+@pytest.fixture
+def sqlite_store(tmp_path: Any) -> SqliteJobStore:
+    """Provides an initialized SQLite job store in a temporary file."""
+    db_path = str(tmp_path / "jobs.db")
+
+    def connect() -> sqlite3.Connection:
+        conn = sqlite3.connect(db_path, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    store = SqliteJobStore(connect)
+    store.initialize()
+    return store
+
+
+def test_job_record_defaults() -> None:
+    """Test a new job is queued and unfinished."""
+    job = JobRecord(username="u", kind="export")
+    assert job.status == JOB_QUEUED
+    assert not job.is_finished
+    job.status = JOB_FAILED
+    assert job.is_finished
+
+
+def test_in_memory_store_lists_newest_first() -> None:
+    """Test the in-memory store filters by user and orders by creation time."""
+    store = InMemoryJobStore()
+    store.initialize()
+    older = JobRecord(
+        username="u", kind="export", created_at=datetime.now() - timedelta(hours=1)
+    )
+    newer = JobRecord(username="u", kind="advance")
+    store.save(older)
+    store.save(newer)
+    store.save(JobRecord(username="other", kind="export"))
+
+    assert [job.id for job in store.list_for_user("u")] == [newer.id, older.id]
+    assert store.list_for_user("u", limit=1) == [newer]
+    assert store.get(older.id) is older
+    assert store.get("missing") is None
+
+
+def test_sqlite_store_round_trip(sqlite_store: SqliteJobStore) -> None:
+    """Test jobs survive a save/load cycle including JSON fields."""
+    job = JobRecord(username="u", kind="advance", params={"days": 3})
+    sqlite_store.save(job)
+
+    job.status = JOB_SUCCEEDED
+    job.progress = 3
+    job.total = 3
+    job.result = {"days_processed": 3}
+    sqlite_store.save(job)
+
+    loaded = sqlite_store.get(job.id)
+    assert loaded is not None
+    assert loaded.status == JOB_SUCCEEDED
+    assert loaded.params == {"days": 3}
+    assert loaded.result == {"days_processed": 3}
+    assert loaded.created_at == job.created_at
+    assert sqlite_store.get("missing") is None
+    assert [j.id for j in sqlite_store.list_for_user("u")] == [job.id]
+    assert not sqlite_store.list_for_user("other")
+
+
+def test_sqlite_store_fails_interrupted_jobs(sqlite_store: SqliteJobStore) -> None:
+    """Test initializing fails the jobs a stopped process left unfinished."""
+    queued = JobRecord(username="u", kind="export")
+    running = JobRecord(username="u", kind="advance", status=JOB_RUNNING)
+    done = JobRecord(username="u", kind="rescore", status=JOB_SUCCEEDED)
+    for job in (queued, running, done):
+        sqlite_store.save(job)
+
+    sqlite_store.initialize()
+
+    for job in (queued, running):
+        loaded = sqlite_store.get(job.id)
+        assert loaded is not None
+        assert (loaded.status, loaded.error) == (JOB_FAILED, INTERRUPTED_ERROR)
+        assert loaded.updated_at > job.updated_at
+    finished = sqlite_store.get(done.id)
+    assert finished is not None
+    assert (finished.status, finished.error) == (JOB_SUCCEEDED, None)
+
+
+def _old_finished_jobs() -> tuple[list[JobRecord], list[JobRecord]]:
+    """Jobs a prune a day ago should drop, and jobs it should keep."""
+    old = datetime.now() - timedelta(days=2)
+    dropped = [
+        JobRecord(username="u", kind="export", status=JOB_SUCCEEDED, updated_at=old),
+        JobRecord(username="u", kind="advance", status=JOB_FAILED, updated_at=old),
+    ]
+    kept = [
+        JobRecord(username="u", kind="export", status=JOB_RUNNING, updated_at=old),
+        JobRecord(username="u", kind="export", status=JOB_SUCCEEDED),
+    ]
+    return dropped, kept
+
+
+def test_in_memory_store_prunes_old_finished_jobs() -> None:
+    """Test pruning drops only finished jobs last updated before the cutoff."""
+    store = InMemoryJobStore()
+    dropped, kept = _old_finished_jobs()
+    for job in dropped + kept:
+        store.save(job)
+
+    pruned = store.prune(datetime.now() - timedelta(days=1))
+
+    assert {job.id for job in pruned} == {job.id for job in dropped}
+    assert all(store.get(job.id) is None for job in dropped)
+    assert all(store.get(job.id) is job for job in kept)
+
+
+def test_sqlite_store_prunes_old_finished_jobs(sqlite_store: SqliteJobStore) -> None:
+    """Test the SQLite store deletes and returns the pruned jobs."""
+    dropped, kept = _old_finished_jobs()
+    for job in dropped + kept:
+        sqlite_store.save(job)
+
+    pruned = sqlite_store.prune(datetime.now() - timedelta(days=1))
+
+    assert {job.id for job in pruned} == {job.id for job in dropped}
+    assert all(sqlite_store.get(job.id) is None for job in dropped)
+    assert all(sqlite_store.get(job.id) is not None for job in kept)
+    assert not sqlite_store.prune(datetime.now() - timedelta(days=1))
+
+
+def _mock_pg_connection(rows: list[dict]) -> tuple[MagicMock, MagicMock]:
+    """Build a psycopg2-like connection whose cursor returns rows."""
+    cursor = MagicMock()
+    cursor.__enter__.return_value = cursor
+    cursor.fetchone.return_value = rows[0] if rows else None
+    cursor.fetchall.return_value = rows
+    conn = MagicMock()
+    conn.__enter__.return_value = conn
+    conn.cursor.return_value = cursor
+    return conn, cursor
+
+
+def test_postgres_store_statements() -> None:
+    """Test the Postgres store issues upserts and decodes JSONB rows."""
+    job = JobRecord(username="u", kind="export", result={"ok": True})
+    row = {
+        "id": job.id,
+        "username": "u",
+        "kind": "export",
+        "status": JOB_SUCCEEDED,
+        "progress": 1,
+        "total": 1,
+        "message": None,
+        "params": {},
+        "result": {"ok": True},
+        "error": None,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+    }
+    conn, cursor = _mock_pg_connection([row])
+    store = PostgresJobStore(lambda: conn)
+
+    store.initialize()
+    assert "CREATE TABLE IF NOT EXISTS jobs" in cursor.execute.call_args_list[0][0][0]
+    sql, params = cursor.execute.call_args[0]
+    assert sql.startswith("UPDATE jobs SET status = 'failed'")
+    assert params[0] == INTERRUPTED_ERROR
+
+    store.save(job)
+    assert "ON CONFLICT (id)" in cursor.execute.call_args[0][0]
+    conn.commit.assert_called()
+
+    loaded = store.get(job.id)
+    assert loaded is not None and loaded.result == {"ok": True}
+    assert [j.id for j in store.list_for_user("u")] == [job.id]
+
+    cursor.fetchone.return_value = None
+    assert store.get("missing") is None
+
+    cutoff = datetime.now()
+    assert [j.id for j in store.prune(cutoff)] == [job.id]
+    sql, params = cursor.execute.call_args[0]
+    assert sql.startswith("DELETE FROM jobs WHERE status IN")
+    assert "RETURNING" in sql and params == (cutoff.isoformat(),)
+
+
+def test_database_manager_creates_sqlite_job_store(tmp_path: Any) -> None:
+    """Test DatabaseDataManager exposes a job store on its own database."""
+    from motido.data.database_manager import DatabaseDataManager
+
+    with patch.object(
+        DatabaseDataManager, "_get_db_path", return_value=str(tmp_path / "m.db")
+    ):
+        manager = DatabaseDataManager()
+    store = manager.create_job_store()
+    store.initialize()
+    job = JobRecord(username="u", kind="export")
+    store.save(job)
+    assert isinstance(store, SqliteJobStore)
+    assert store.get(job.id) is not None
+
+
+@patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
+def test_postgres_manager_creates_postgres_job_store() -> None:
+    """Test PostgresDataManager exposes a job store on its own database."""
+    from motido.data.postgres_manager import PostgresDataManager
+
+    manager = PostgresDataManager("postgresql://test")
+    assert isinstance(manager.create_job_store(), PostgresJobStore)
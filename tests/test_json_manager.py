@@ -3,6 +3,7 @@
 # pylint: disable=redefined-outer-name, protected-access
 
 import json
+import logging
 from datetime import date
 from typing import Any, Dict, Tuple
 from unittest.mock import mock_open
@@ -137,7 +138,7 @@ def test_read_data_json_decode_error(
     manager: JsonDataManager,
     mocker: Any,
     mock_config_path: Tuple[str, str, str],
-    capsys: Any,
+    caplog: Any,
 ) -> None:
     """Test _read_data handles JSONDecodeError gracefully."""
     # pylint: disable=unused-argument
@@ -152,15 +153,14 @@ def test_read_data_json_decode_error(
     data = manager._read_data()
 
     assert data == {}
-    captured = capsys.readouterr()
-    assert "Error decoding JSON data" in captured.out
+    assert "Error decoding JSON data" in caplog.text
 
 
 def test_read_data_io_error(
     manager: JsonDataManager,
     mocker: Any,
     mock_config_path: Tuple[str, str, str],
-    capsys: Any,
+    caplog: Any,
 ) -> None:
     """Test _read_data handles IOError gracefully."""
     # pylint: disable=unused-argument
@@ -175,8 +175,7 @@ def test_read_data_io_error(
     data = manager._read_data()
 
     assert data == {}
-    captured = capsys.readouterr()
-    assert f"Error reading data file: {error_message}" in captured.out
+    assert f"Error reading data file: {error_message}" in caplog.text
 
 
 def test_write_data_success(
@@ -207,7 +206,7 @@ def test_write_data_io_error(
     manager: JsonDataManager,
     mocker: Any,
     sample_user_data: Dict[str, Dict[str, Any]],
-    capsys: Any,
+    caplog: Any,
 ) -> None:
     """Test _write_data handles IOError during write."""
     mock_ensure_dir = mocker.patch.object(manager, "_ensure_data_dir_exists")
@@ -226,8 +225,7 @@ def test_write_data_io_error(
     mock_json_dump.assert_not_called()
 
     # Check error was logged
-    captured = capsys.readouterr()
-    assert "Error writing to data file: Disk full" in captured.out
+    assert "Error writing to data file: Disk full" in caplog.text
 
 
 def test_load_user_success(
@@ -294,9 +292,10 @@ def test_load_user_not_found(manager: JsonDataManager, mocker: Any) -> None:
 
 
 def test_load_user_deserialization_error(
-    manager: JsonDataManager, mocker: Any, capsys: Any
+    manager: JsonDataManager, mocker: Any, caplog: Any
 ) -> None:
     """Test load_user handles errors during Task deserialization."""
+    caplog.set_level(logging.DEBUG, logger="motido")
     corrupted_data = {
         DEFAULT_USERNAME: {
             "username": DEFAULT_USERNAME,
@@ -314,10 +313,9 @@ def test_load_user_deserialization_error(
 
     mock_read.assert_called_once()
 
-    # Verify error messages were printed
-    captured = capsys.readouterr()
-    assert "Loading user 'default_user' from JSON..." in captured.out
-    assert "Error deserializing user data" in captured.out
+    # Verify error messages were logged
+    assert "Loading user 'default_user' from JSON..." in caplog.text
+    assert "Error deserializing user data" in caplog.text
 
 
 def test_load_user_default_username(
@@ -391,6 +389,18 @@ def test_backend_type(manager: JsonDataManager) -> None:
     assert manager.backend_type() == "json"
 
 
+def test_data_version_tracks_file_mtime(
+    manager: JsonDataManager, tmp_path: Any
+) -> None:
+    """Test data_version is None until the file exists, then its mtime."""
+    data_file = tmp_path / "users.json"
+    manager._data_path = str(data_file)
+    assert manager.data_version() is None
+
+    data_file.write_text("{}")
+    assert manager.data_version() == data_file.stat().st_mtime_ns
+
+
 def test_load_user_invalid_priority(
     manager: JsonDataManager,
     mocker: Any,
@@ -452,9 +462,10 @@ def test_load_user_missing_priority(
 
 
 def test_save_user_io_error(
-    manager: JsonDataManager, mocker: Any, sample_user: User, capsys: Any
+    manager: JsonDataManager, mocker: Any, sample_user: User, caplog: Any
 ) -> None:
     """Test save_user handles IOError."""
+    caplog.set_level(logging.DEBUG, logger="motido")
     mock_read_data = mocker.patch.object(
         manager, "_read_data", return_value={"default_user": {}}
     )
@@ -471,14 +482,13 @@ def test_save_user_io_error(
     mock_write_data.assert_called_once()
 
     # Check messages
-    captured = capsys.readouterr()
-    assert "Saving user 'default_user' to JSON..." in captured.out
+    assert "Saving user 'default_user' to JSON..." in caplog.text
 
 
-def test_load_user_io_error_on_read(mocker: Any) -> None:
+def test_load_user_io_error_on_read(mocker: Any, caplog: Any) -> None:
     """Test load_user handles generic IOError during file read."""
     manager = JsonDataManager()
-    mock_print = mocker.patch("builtins.print")
+    caplog.set_level(logging.INFO, logger="motido")
     mocker.patch("os.path.exists", return_value=True)  # Simulate file exists
 
     # Mock open to raise IOError specifically on read
@@ -490,11 +500,11 @@ def test_load_user_io_error_on_read(mocker: Any) -> None:
     user = manager.load_user("testuser")
     assert user is None
 
-    # Check that the specific IOError print from _read_data was called
-    mock_print.assert_any_call(f"Error reading data file: {error_message}")
+    # Check that the specific IOError from _read_data was logged
+    assert f"Error reading data file: {error_message}" in caplog.text
     # Check that the "user not found" message is also
-    # printed because _read_data returned {}
-    mock_print.assert_any_call("User 'testuser' not found in JSON data.")
+    # logged because _read_data returned {}
+    assert "User 'testuser' not found in JSON data." in caplog.text
 
 
 def test_deserialize_tag(manager: JsonDataManager) -> None:
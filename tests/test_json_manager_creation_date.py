@@ -11,7 +11,7 @@ from motido.data.json_manager import (
 
 
 def test_load_user_invalid_creation_date_format(
-    manager: JsonDataManager, mocker: Any
+    manager: JsonDataManager, mocker: Any, caplog: Any
 ) -> None:
     """Test load_user handles invalid creation_date format."""
     # Create data with an invalid creation_date format
@@ -31,7 +31,6 @@ def test_load_user_invalid_creation_date_format(
     mock_read = mocker.patch.object(
         manager, "_read_data", return_value=data_with_invalid_date
     )
-    mock_print = mocker.patch("builtins.print")
 
     # Load the user
     loaded_user = manager.load_user(DEFAULT_USERNAME)
@@ -49,7 +48,5 @@ def test_load_user_invalid_creation_date_format(
     assert task.priority == Priority.LOW
     assert isinstance(task.creation_date, datetime)
 
-    # Verify the warning message was printed
-    mock_print.assert_any_call(
-        "Warning: Invalid creation_date format for task task-123, ignoring."
-    )
+    # Verify the warning message was logged
+    assert "Invalid creation_date format for task task-123, ignoring." in caplog.text
@@ -12,7 +12,7 @@ from motido.data.json_manager import JsonDataManager
 def test_load_user_invalid_due_date_format(
     manager: JsonDataManager,
     mocker: Any,
-    capsys: Any,
+    caplog: Any,
 ) -> None:
     """Test that load_user handles invalid due_date format gracefully."""
     user_data = {
@@ -50,15 +50,14 @@ def test_load_user_invalid_due_date_format(
     assert len(user.tasks) == 1
     assert user.tasks[0].due_date is None  # Should be None due to invalid format
 
-    # Check that warning was printed
-    captured = capsys.readouterr()
-    assert "Invalid due_date format" in captured.out
+    # Check that warning was logged
+    assert "Invalid due_date format" in caplog.text
 
 
 def test_load_user_invalid_start_date_format(
     manager: JsonDataManager,
     mocker: Any,
-    capsys: Any,
+    caplog: Any,
 ) -> None:
     """Test that load_user handles invalid start_date format gracefully."""
     user_data = {
@@ -96,9 +95,8 @@ def test_load_user_invalid_start_date_format(
     assert len(user.tasks) == 1
     assert user.tasks[0].start_date is None  # Should be None due to invalid format
 
-    # Check that warning was printed
-    captured = capsys.readouterr()
-    assert "Invalid start_date format" in captured.out
+    # Check that warning was logged
+    assert "Invalid start_date format" in caplog.text
 
 
 def test_load_user_invalid_recurrence_type(
@@ -156,6 +156,15 @@ def test_save_user_update_existing(
         "badges": [],
         "defined_tags": [],
         "defined_projects": [],
+        "task_summary": {
+            "total": 3,
+            "completed": 0,
+            "habits": 0,
+            "current_streak": 0,
+            "best_streak": 0,
+            "daily_summary": {},
+            "archived_daily_summary": {},
+        },
     }
     expected_final_data = {  # type: ignore[assignment]
         updated_user.username: expected_user_data
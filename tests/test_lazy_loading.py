@@ -0,0 +1,187 @@
+"""Tests for active-set loading (load_active_user) on the file backends."""
+
+# pylint: disable=redefined-outer-name
+
+from datetime import datetime
+from typing import Any
+
+import pytest
+
+from motido.core.models import LazyTasks, Task, User
+from motido.data.abstraction import DataManager
+from motido.data.database_manager import DatabaseDataManager
+from motido.data.json_manager import JsonDataManager
+
+CREATED = datetime(2025, 1, 1, 9, 0)
+ENDED = datetime(2025, 3, 1, 9, 0)
+
+
+def _task(task_id: str, **fields: Any) -> Task:
+    return Task(title=task_id, creation_date=CREATED, id=task_id, **fields)
+
+
+def _habit(task_id: str, parent: str | None = None, **fields: Any) -> Task:
+    return _task(
+        task_id,
+        is_habit=True,
+        recurrence_rule="daily",
+        parent_habit_id=parent,
+        **fields,
+    )
+
+
+ACTIVE = {"open", "root", "inst-2", "root-b", "inst-b1"}
+INACTIVE = {"done", "inst-1", "ended", "ended-1"}
+
+
+@pytest.fixture(params=["json", "db"])
+def manager(request: pytest.FixtureRequest, tmp_path: Any, mocker: Any) -> DataManager:
+    """An initialized file-backed manager holding a user with history."""
+    backend: DataManager
+    if request.param == "json":
+        mocker.patch(
+            "motido.data.json_manager.get_config_path",
+            return_value=str(tmp_path / "config.json"),
+        )
+        backend = JsonDataManager()
+    else:
+        mocker.patch.object(
+            DatabaseDataManager,
+            "_get_db_path",
+            return_value=str(tmp_path / "motido.db"),
+        )
+        backend = DatabaseDataManager()
+    backend.initialize()
+    backend.save_user(
+        User(
+            username="lazy",
+            tasks=[
+                _task("open"),
+                _task("done", is_complete=True),
+                # A running series: root, completed instance, open instance
+                _habit("root", is_complete=True),
+                _habit("inst-1", "root", is_complete=True),
+                _habit("inst-2", "inst-1"),
+                # A series whose latest instance is already completed
+                _habit("root-b", is_complete=True),
+                _habit("inst-b1", "root-b", is_complete=True),
+                # An ended series
+                _habit("ended", is_complete=True, recurrence_ended_at=ENDED),
+                _habit("ended-1", "ended", is_complete=True, recurrence_ended_at=ENDED),
+            ],
+        )
+    )
+    return backend
+
+
+def _ids(tasks: Any) -> set[str]:
+    return {task.id for task in tasks}
+
+
+def test_loads_only_active_set(manager: DataManager) -> None:
+    """Test open tasks, habit roots and series heads load; history waits."""
+    user = manager.load_active_user("lazy")
+
+    assert user is not None
+    assert _ids(user.tasks) == ACTIVE
+    assert not user.inactive_tasks.loaded
+    assert _ids(user.inactive_tasks) == INACTIVE
+    assert _ids(user.all_tasks()) == ACTIVE | INACTIVE
+    assert manager.load_active_user("nobody") is None
+
+
+def test_save_keeps_unfetched_history(manager: DataManager) -> None:
+    """Test saving an active-set user leaves the unloaded rows untouched."""
+    user = manager.load_active_user("lazy")
+    assert user is not None
+    user.tasks[0].title = "renamed"
+    assert user.remove_task("inst-2")
+    user.add_task(_task("new"))
+    manager.save_user(user)
+    manager.save_user(user)  # Saving twice must not duplicate or drop rows
+
+    stored = manager.load_user("lazy")
+    assert stored is not None
+    assert _ids(stored.tasks) == (ACTIVE - {"inst-2"}) | INACTIVE | {"new"}
+    assert "renamed" in {task.title for task in stored.tasks}
+    # Fetching after a save still yields exactly the skipped history
+    assert _ids(user.inactive_tasks) == INACTIVE
+
+
+def test_fetch_after_save_skips_tasks_already_loaded(manager: DataManager) -> None:
+    """Test tasks that became inactive during the request are not fetched twice."""
+    user = manager.load_active_user("lazy")
+    assert user is not None
+    head = user.find_task_by_id("inst-2")
+    assert head is not None
+    head.is_complete = True
+    user.add_task(_habit("inst-3", "inst-2"))
+    manager.save_user(user)
+
+    assert _ids(user.inactive_tasks) == INACTIVE
+    assert len(user.all_tasks()) == len(ACTIVE | INACTIVE) + 1
+
+
+@pytest.mark.parametrize("active_set", [True, False])
+def test_prefix_lookup_is_ambiguous_across_both_sets(active_set: bool) -> None:
+    """Test a prefix matching active and inactive tasks is ambiguous either way."""
+    active, inactive = _task("abc-1"), _task("abc-2", is_complete=True)
+    if active_set:
+        user = User(username="u", tasks=[active])
+        user.inactive_tasks = LazyTasks(lambda: [inactive], frozenset({"abc-1"}))
+    else:
+        user = User(username="u", tasks=[active, inactive])
+
+    with pytest.raises(ValueError, match="Ambiguous ID prefix"):
+        user.find_task_by_id("abc")
+    assert user.find_task_by_id("abc-2") is inactive
+
+
+def test_full_active_id_lookup_skips_history() -> None:
+    """Test a full active ID resolves without fetching the inactive tasks."""
+    user = User(username="u", tasks=[_task("abc-1")])
+    user.inactive_tasks = LazyTasks(lambda: pytest.fail("history fetched"))
+
+    assert user.find_task_by_id("abc-1") is user.tasks[0]
+    assert not user.inactive_tasks.loaded
+
+
+def test_fetched_history_is_saved_in_full(manager: DataManager) -> None:
+    """Test once history is fetched, edits and deletions in it persist."""
+    user = manager.load_active_user("lazy")
+    assert user is not None
+    done = user.find_task_by_id("done")  # Not active: fetches the history
+    assert done is not None and user.inactive_tasks.loaded
+    done.title = "edited"
+    assert user.remove_task("inst-1")
+    manager.save_user(user)
+
+    stored = manager.load_user("lazy")
+    assert stored is not None
+    assert _ids(stored.tasks) == (ACTIVE | INACTIVE) - {"inst-1"}
+    edited = stored.find_task_by_id("done")
+    assert edited is not None and edited.title == "edited"
+
+
+def test_default_active_load_is_eager() -> None:
+    """Test backends without an active-set query load everything."""
+
+    class EagerManager(DataManager):
+        """A backend implementing only the abstract interface."""
+
+        def initialize(self) -> None:
+            """Nothing to set up."""
+
+        def load_user(self, username: str = "default_user") -> User | None:
+            return User(username=username, tasks=[_task("done", is_complete=True)])
+
+        def save_user(self, user: User) -> None:
+            """Nothing to save."""
+
+        def backend_type(self) -> str:
+            return "eager"
+
+    user = EagerManager().load_active_user("someone")
+    assert user is not None
+    assert _ids(user.tasks) == {"done"}
+    assert user.inactive_tasks.loaded
@@ -0,0 +1,127 @@
+"""Tests for the logging setup in motido.core.logs."""
+
+# pylint: disable=redefined-outer-name,protected-access
+
+import io
+import json
+import logging
+from typing import Any, Generator
+
+import pytest
+
+from motido.core import logs
+from motido.core.logs import JsonFormatter, RateLimitFilter, configure_logging
+
+
+@pytest.fixture
+def restore_logging() -> Generator[logging.Logger, None, None]:
+    """Restore the motido logger's handler and level after a test."""
+    logger = logging.getLogger(logs.LOGGER_NAME)
+    previous_handler, previous_level = logs._handler, logger.level
+    yield logger
+    if logs._handler is not None:
+        logger.removeHandler(logs._handler)
+    if previous_handler is not None:
+        logger.addHandler(previous_handler)
+    logs._handler = previous_handler
+    logger.setLevel(previous_level)
+
+
+def _record(
+    msg: str = "hello %s",
+    args: Any = ("world",),
+    level: int = logging.INFO,
+    lineno: int = 10,
+) -> logging.LogRecord:
+    return logging.LogRecord("motido.test", level, "mod.py", lineno, msg, args, None)
+
+
+def test_json_formatter_includes_extra_fields() -> None:
+    """Test records become one JSON object carrying their extra fields."""
+    record = _record()
+    record.elapsed_ms = 12
+
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert payload["message"] == "hello world"
+    assert payload["level"] == "info"
+    assert payload["logger"] == "motido.test"
+    assert payload["elapsed_ms"] == 12
+    assert payload["ts"].endswith("+00:00")
+
+
+def test_json_formatter_includes_exception() -> None:
+    """Test exception tracebacks are serialized."""
+    with pytest.raises(ValueError) as excinfo:
+        raise ValueError("boom")
+    exc_info = (excinfo.type, excinfo.value, excinfo.tb)
+    record = logging.LogRecord(
+        "motido.test", logging.ERROR, "mod.py", 1, "failed", None, exc_info
+    )
+    payload = json.loads(JsonFormatter().format(record))
+    assert "ValueError: boom" in payload["exc_info"]
+
+
+def test_rate_limit_filter_drops_and_reports() -> None:
+    """Test a call site is capped per window and drops are reported later."""
+    now = [0.0]
+    rate_filter = RateLimitFilter(limit=2, window=60.0, clock=lambda: now[0])
+
+    passed = [rate_filter.filter(_record()) for _ in range(5)]
+    assert passed == [True, True, False, False, False]
+    # Other call sites and warnings are not affected
+    assert rate_filter.filter(_record(lineno=99))
+    assert rate_filter.filter(_record(level=logging.WARNING))
+
+    now[0] = 61.0
+    record = _record()
+    assert rate_filter.filter(record)
+    assert getattr(record, "suppressed") == 3
+
+    now[0] = 122.0
+    record = _record()
+    assert rate_filter.filter(record)
+    assert not hasattr(record, "suppressed")
+
+
+def test_configure_logging_json_with_rate_limit(
+    restore_logging: logging.Logger, monkeypatch: Any
+) -> None:
+    """Test configure_logging installs a single JSON handler with a rate limit."""
+    monkeypatch.setenv(logs.RATE_LIMIT_ENV, "1")
+    stream = io.StringIO()
+    configure_logging(level="INFO", fmt="json", stream=stream)
+    handler = configure_logging(level="INFO", fmt="json", stream=stream)
+
+    assert restore_logging.handlers.count(handler) == 1
+    assert len(restore_logging.handlers) == 1
+    assert isinstance(handler.filters[0], RateLimitFilter)
+
+    log = logging.getLogger("motido.data.example")
+    for _ in range(3):
+        log.info("saved %d tasks", 4, extra={"tasks": 4})
+    log.debug("hidden")
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["tasks"] == 4
+
+
+def test_configure_logging_defaults_to_current_stderr(
+    restore_logging: logging.Logger, monkeypatch: Any, capsys: Any
+) -> None:
+    """Test the default handler writes text to sys.stderr as it is at emit time."""
+    monkeypatch.delenv(logs.LEVEL_ENV, raising=False)
+    monkeypatch.delenv(logs.FORMAT_ENV, raising=False)
+    handler = configure_logging()
+    # Assigning a stream is ignored: the handler always follows sys.stderr
+    handler.stream = io.StringIO()  # type: ignore[attr-defined]
+
+    assert restore_logging.level == logging.WARNING
+    log = logging.getLogger("motido.data.example")
+    log.info("not shown")
+    log.warning("disk nearly full")
+
+    err = capsys.readouterr().err
+    assert "WARNING motido.data.example: disk nearly full" in err
+    assert "not shown" not in err
@@ -0,0 +1,122 @@
+"""Tests for the in-process metrics registry in motido.core.metrics."""
+
+# pylint: disable=redefined-outer-name
+
+from datetime import date, datetime
+from typing import Generator
+
+import pytest
+
+from motido.core.metrics import (
+    CACHE_HITS,
+    CACHE_MISSES,
+    PHASE_LATENCY,
+    TASKS_SCORED,
+    MetricsRegistry,
+    collect_request_timings,
+    format_server_timing,
+    get_metrics,
+    record_cache,
+    set_metrics,
+    timed,
+)
+from motido.core.models import Task
+from motido.core.scoring import (
+    calculate_task_scores,
+    get_default_scoring_config,
+)
+
+
+@pytest.fixture
+def registry() -> Generator[MetricsRegistry, None, None]:
+    """Install an empty process-wide registry for one test."""
+    fresh = MetricsRegistry(buckets=(0.1, 1.0))
+    set_metrics(fresh)
+    yield fresh
+    set_metrics(None)
+
+
+def test_counter_and_histogram_render(registry: MetricsRegistry) -> None:
+    """Test the Prometheus text rendering of counters and histograms."""
+    registry.inc(TASKS_SCORED, 2)
+    registry.inc("custom_total", 0.5, label='quote"d')
+    registry.observe(PHASE_LATENCY, 0.05, phase="load_user")
+    registry.observe(PHASE_LATENCY, 0.5, phase="load_user")
+
+    text = registry.render()
+
+    assert f"# TYPE {TASKS_SCORED} counter\n{TASKS_SCORED} 2\n" in text
+    assert 'custom_total{label="quote\\"d"} 0.5' in text
+    assert "# TYPE custom_total counter" in text
+    assert f"# HELP {PHASE_LATENCY}" in text
+    assert f'{PHASE_LATENCY}_bucket{{phase="load_user",le="0.1"}} 1' in text
+    assert f'{PHASE_LATENCY}_bucket{{phase="load_user",le="1"}} 2' in text
+    assert f'{PHASE_LATENCY}_bucket{{phase="load_user",le="+Inf"}} 2' in text
+    assert f'{PHASE_LATENCY}_sum{{phase="load_user"}} 0.55' in text
+    assert f'{PHASE_LATENCY}_count{{phase="load_user"}} 2' in text
+    assert registry.histogram_count(PHASE_LATENCY, phase="load_user") == 2
+    assert registry.histogram_count(PHASE_LATENCY, phase="other") == 0
+
+
+def test_empty_registry_renders_nothing() -> None:
+    """Test an unused registry renders an empty document."""
+    assert not MetricsRegistry().render()
+
+
+def test_get_metrics_creates_singleton() -> None:
+    """Test get_metrics lazily creates one shared registry."""
+    set_metrics(None)
+    assert get_metrics() is get_metrics()
+    set_metrics(None)
+
+
+def test_timed_records_phases_in_request(registry: MetricsRegistry) -> None:
+    """Test timed works as context manager and decorator inside a request."""
+
+    @timed("load_user")
+    def load() -> str:
+        return "user"
+
+    with collect_request_timings() as timings:
+        assert load() == "user"
+        with timed("scoring"):
+            pass
+    load()  # outside a request: histogram only
+
+    assert [phase for phase, _ in timings] == ["load_user", "scoring"]
+    assert registry.histogram_count(PHASE_LATENCY, phase="load_user") == 2
+
+
+def test_format_server_timing_sums_repeated_phases() -> None:
+    """Test repeated phases are summed and total is appended last."""
+    header = format_server_timing(
+        [("scoring", 0.001), ("load_user", 0.002), ("scoring", 0.003)], 0.01
+    )
+    assert header == "scoring;dur=4.0, load_user;dur=2.0, total;dur=10.0"
+
+
+def test_record_cache(registry: MetricsRegistry) -> None:
+    """Test cache hits and misses are counted per cache."""
+    record_cache("daemon_user", True)
+    record_cache("daemon_user", True)
+    record_cache("daemon_user", False)
+    assert registry.counter_value(CACHE_HITS, cache="daemon_user") == 2
+    assert registry.counter_value(CACHE_MISSES, cache="daemon_user") == 1
+
+
+def test_scoring_counts_top_level_tasks_only(registry: MetricsRegistry) -> None:
+    """Test dependency-chain recursion does not inflate tasks scored."""
+    blocker = Task(title="Blocker", creation_date=datetime(2025, 1, 1))
+    dependent = Task(
+        title="Dependent",
+        creation_date=datetime(2025, 1, 1),
+        dependencies=[blocker.id],
+    )
+    all_tasks = {blocker.id: blocker, dependent.id: dependent}
+
+    calculate_task_scores(
+        blocker, all_tasks, get_default_scoring_config(), date(2025, 1, 2)
+    )
+
+    assert registry.counter_value(TASKS_SCORED) == 1
+    assert registry.histogram_count(PHASE_LATENCY, phase="scoring") == 1
@@ -0,0 +1,214 @@
+"""Tests for backend-to-backend migration (motido.data.migration)."""
+
+# pylint: disable=redefined-outer-name
+
+import json
+from datetime import date, datetime
+from typing import Any
+
+import pytest
+
+from motido.core.models import (
+    ArchiveSummary,
+    Project,
+    RecurrenceType,
+    Tag,
+    Task,
+    User,
+    XPTransaction,
+)
+from motido.data.abstraction import DataManager
+from motido.data.database_manager import DatabaseDataManager
+from motido.data.json_manager import JsonDataManager
+from motido.data.migration import (
+    UserDigest,
+    digest_user,
+    migrate_backend,
+    verify_user,
+)
+
+CREATED = datetime(2025, 1, 2, 9, 30)
+
+
+@pytest.fixture
+def backends(tmp_path: Any, mocker: Any) -> tuple[JsonDataManager, DatabaseDataManager]:
+    """An initialized JSON source and SQLite target in tmp_path."""
+    mocker.patch.object(
+        JsonDataManager,
+        "_get_data_path",
+        return_value=str(tmp_path / "data" / "users.json"),
+    )
+    mocker.patch.object(
+        DatabaseDataManager, "_get_db_path", return_value=str(tmp_path / "motido.db")
+    )
+    source, target = JsonDataManager(), DatabaseDataManager()
+    source.initialize()
+    target.initialize()
+    return source, target
+
+
+def _user(username: str) -> User:
+    return User(
+        username=username,
+        total_xp=42,
+        last_processed_date=date(2025, 3, 1),
+        defined_tags=[Tag(id="t1", name="work", color="#ff0000")],
+        defined_projects=[Project(id="p1", name="Home")],
+        tasks=[
+            Task(
+                title="Write report",
+                id=f"{username}-report",
+                creation_date=CREATED,
+                due_date=datetime(2025, 1, 9),
+                tags=["work", "urgent"],
+                subtasks=[{"text": "Outline", "complete": True}],
+                dependencies=[f"{username}-habit"],
+                project="Home",
+            ),
+            Task(
+                title="Stretch",
+                id=f"{username}-habit",
+                creation_date=CREATED,
+                is_habit=True,
+                recurrence_rule="daily",
+                recurrence_type=RecurrenceType.STRICT,
+                streak_current=3,
+                streak_best=5,
+                history=[{"timestamp": "2025-01-03T08:00:00", "action": "done"}],
+            ),
+        ],
+        archive_summary=ArchiveSummary(completed_tasks=1, best_streak=5),
+    )
+
+
+def _save_with_archive(manager: Any, username: str) -> None:
+    old = Task(
+        title="Old", id=f"{username}-old", creation_date=CREATED, is_complete=True
+    )
+    manager.archive_tasks(_user(username), [old])
+
+
+def test_migrate_copies_and_verifies_users(backends: Any, tmp_path: Any) -> None:
+    """Test every user, archive included, is copied and verified."""
+    source, target = backends
+    for username in ("bob", "alice"):
+        _save_with_archive(source, username)
+    copied: list[tuple[str, int]] = []
+    checkpoint = str(tmp_path / "checkpoint.json")
+
+    result = migrate_backend(
+        source,
+        target,
+        checkpoint,
+        on_user=lambda name, digest: copied.append((name, digest.tasks)),
+    )
+
+    assert (result.migrated, result.skipped, result.mismatches) == (
+        ["alice", "bob"],
+        [],
+        {},
+    )
+    assert copied == [("alice", 2), ("bob", 2)]
+    assert target.list_usernames() == ["alice", "bob"]
+    alice = target.load_user("alice")
+    assert alice is not None and alice.total_xp == 42
+    assert [t.id for t in target.load_archived_tasks("alice")] == ["alice-old"]
+    with open(checkpoint, "r", encoding="utf-8") as f:
+        saved = json.load(f)
+    assert (saved["source"], saved["target"]) == ("json", "db")
+    assert saved["users"]["bob"]["archived_tasks"] == 1
+
+
+def test_migrate_resumes_from_checkpoint(backends: Any, tmp_path: Any) -> None:
+    """Test a rerun skips copied users and archives nothing twice."""
+    source, target = backends
+    _save_with_archive(source, "alice")
+    checkpoint = str(tmp_path / "checkpoint.json")
+    migrate_backend(source, target, checkpoint)
+
+    # An interruption after the archive copy but before the checkpoint
+    _save_with_archive(source, "bob")
+    _save_with_archive(target, "bob")
+
+    result = migrate_backend(source, target, checkpoint)
+
+    assert (result.migrated, result.skipped, result.mismatches) == (
+        ["bob"],
+        ["alice"],
+        {},
+    )
+    assert len(target.load_archived_tasks("bob")) == 1
+
+
+def test_migrate_rejects_foreign_checkpoint(backends: Any, tmp_path: Any) -> None:
+    """Test a checkpoint of another migration is not resumed."""
+    source, target = backends
+    checkpoint = tmp_path / "checkpoint.json"
+    checkpoint.write_text(json.dumps({"source": "db", "target": "json"}))
+
+    with pytest.raises(ValueError, match="from db to json"):
+        migrate_backend(source, target, str(checkpoint))
+
+
+def test_migrate_skips_users_deleted_while_listed(
+    backends: Any, tmp_path: Any, mocker: Any
+) -> None:
+    """Test a listed user that no longer loads is not copied."""
+    source, target = backends
+    mocker.patch.object(source, "list_usernames", return_value=["ghost"])
+
+    result = migrate_backend(source, target, str(tmp_path / "checkpoint.json"))
+
+    assert not result.migrated and not result.mismatches
+
+
+def test_verify_user_reports_differences(backends: Any) -> None:
+    """Test verification names the first difference it finds."""
+    _, target = backends
+    user = _user("alice")
+    target.save_user(user)
+    digest = digest_user(user, [])
+
+    assert verify_user(target, "alice", digest) is None
+    assert verify_user(target, "nobody", digest) == "missing from the target"
+    more_tasks = UserDigest(3, 0, 0, digest.checksum)
+    assert verify_user(target, "alice", more_tasks) == "tasks: expected 3, found 2"
+    other_data = UserDigest(2, 0, 0, "0" * 64)
+    assert verify_user(target, "alice", other_data) == "checksum mismatch"
+
+
+def test_migrate_reports_data_the_target_drops(backends: Any, tmp_path: Any) -> None:
+    """Test XP transactions SQLite does not store fail verification."""
+    source, target = backends
+    user = _user("alice")
+    user.xp_transactions.append(
+        XPTransaction(amount=5, source="task_completion", timestamp=CREATED)
+    )
+    source.save_user(user)
+
+    result = migrate_backend(source, target, str(tmp_path / "checkpoint.json"))
+
+    assert result.migrated == ["alice"]
+    assert result.mismatches == {"alice": "xp transactions: expected 1, found 0"}
+
+
+def test_list_usernames_default_not_implemented() -> None:
+    """Test backends that cannot list users say so."""
+
+    class MemoryManager(DataManager):  # pylint: disable=abstract-method
+        """A backend implementing only the abstract methods."""
+
+        def initialize(self) -> None:
+            pass
+
+        def load_user(self, username: str = "default_user") -> User | None:
+            return None
+
+        def save_user(self, user: User) -> None:
+            pass
+
+        def backend_type(self) -> str:
+            return "memory"
+
+    with pytest.raises(NotImplementedError, match="memory backend cannot list"):
+        MemoryManager().list_usernames()
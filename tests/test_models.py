@@ -1,5 +1,7 @@
 """Tests for the core application models (Task and User)."""
 
+import copy
+import pickle
 import uuid
 from datetime import date, datetime
 from typing import List
@@ -9,12 +11,14 @@ import pytest
 from motido.core.models import (  # Added Duration
     Difficulty,
     Duration,
+    LazyTasks,
     Priority,
     Project,
     RecurrenceType,
     Tag,
     Task,
     User,
+    XPTransaction,
 )
 
 # pylint: disable=redefined-outer-name
@@ -121,6 +125,68 @@ def test_task_initialization_with_all_fields() -> None:
     assert task.duration == duration
 
 
+def test_task_is_slotted() -> None:
+    """Test Task instances carry no per-instance __dict__."""
+    task = Task(title="Slotted", creation_date=datetime.now())
+    assert not hasattr(task, "__dict__")
+    with pytest.raises(AttributeError):
+        task.not_a_field = 1  # type: ignore[attr-defined]
+
+
+def test_task_interns_repeated_strings() -> None:
+    """Test tags, project, rule and lineage strings are shared between tasks."""
+
+    def make() -> Task:
+        # Build the values at runtime, as a loader would, so they start distinct
+        return Task(
+            title="Habit",
+            creation_date=datetime.now(),
+            tags=["".join(["deep", "-work"])],
+            project="".join(["Home", "work"]),
+            recurrence_rule="".join(["every ", "3 days"]),
+            parent_habit_id=str(uuid.UUID(int=7)),
+            icon=None,
+        )
+
+    first, second = make(), make()
+    assert first.tags[0] is second.tags[0]
+    assert first.project is second.project
+    assert first.recurrence_rule is second.recurrence_rule
+    assert first.parent_habit_id is second.parent_habit_id
+    assert first.icon is None
+
+
+def test_task_keeps_callers_tags_list() -> None:
+    """Test interning tags does not rewrite the list the caller passed in."""
+    tags = ["".join(["deep", "-work"])]
+    original = tags[0]
+
+    task = Task(title="Tagged", creation_date=datetime.now(), tags=tags)
+
+    assert task.tags is not tags
+    assert tags[0] is original
+    assert task.tags == tags
+
+
+def test_models_pickle_and_copy() -> None:
+    """Test slotted models survive pickling and deep copies unchanged."""
+    task = Task(
+        title="Pickled",
+        creation_date=datetime(2025, 1, 1, 9, 0),
+        tags=["a"],
+        subtasks=[{"text": "step", "complete": False}],
+        score=3.5,
+    )
+    trans = XPTransaction(amount=5, source="task_completion", timestamp=datetime.now())
+    user = User(username="pickle", tasks=[task], xp_transactions=[trans])
+    user.defined_tags.append(Tag(name="a"))
+    user.defined_projects.append(Project(name="p"))
+
+    assert pickle.loads(pickle.dumps(user)) == user
+    assert copy.deepcopy(user) == user
+    assert pickle.loads(pickle.dumps(task)).score == 3.5
+
+
 def test_task_str_representation() -> None:
     """Test the string representation of a Task."""
     desc = "Another task"
@@ -542,3 +608,75 @@ def test_user_get_or_create_project_existing(empty_user: User) -> None:
     project = empty_user.get_or_create_project("Work")
     assert project.color == "#CUSTOM"  # Keeps original color
     assert len(empty_user.defined_projects) == 1  # No new project added
+
+
+# --- LazyTasks Tests ---
+
+
+@pytest.fixture
+def lazy_user() -> tuple[User, List[int]]:
+    """A user whose inactive tasks come from a loader counting its calls."""
+    active = Task(title="Open", creation_date=datetime.now(), id="active-1")
+    done = Task(
+        title="Done", creation_date=datetime.now(), id="done-1", is_complete=True
+    )
+    calls: List[int] = []
+
+    def loader() -> List[Task]:
+        calls.append(1)
+        return [done]
+
+    user = User(username="lazy", tasks=[active])
+    user.inactive_tasks = LazyTasks(loader, frozenset({"active-1"}))
+    return user, calls
+
+
+def test_lazy_tasks_fetch_once_on_first_use(lazy_user: tuple[User, List[int]]) -> None:
+    """Test the loader runs only when the inactive tasks are first iterated."""
+    user, calls = lazy_user
+    # A full active ID cannot be ambiguous, so the history stays in storage
+    assert user.find_task_by_id("active-1") is user.tasks[0]
+    assert not user.inactive_tasks.loaded
+    assert not calls
+
+    assert [task.id for task in user.all_tasks()] == ["active-1", "done-1"]
+    assert len(user.inactive_tasks) == 1
+    assert user.inactive_tasks.loaded
+    assert calls == [1]
+
+
+def test_lazy_tasks_find_and_remove_fall_back(
+    lazy_user: tuple[User, List[int]],
+) -> None:
+    """Test lookups and removals reach inactive tasks by fetching them."""
+    user, calls = lazy_user
+    found = user.find_task_by_id("done")
+    assert found is not None and found.id == "done-1"
+    assert calls == [1]
+
+    assert user.remove_task("done-1")
+    assert not user.remove_task("missing")
+    assert not list(user.inactive_tasks)
+    assert user.remove_task("active-1")
+
+
+def test_lazy_tasks_copy_and_pickle(lazy_user: tuple[User, List[int]]) -> None:
+    """Test copies share the unfetched loader and pickles carry the tasks."""
+    user, calls = lazy_user
+    copied = copy.deepcopy(user)
+    assert not copied.inactive_tasks.loaded
+    assert [task.id for task in copied.inactive_tasks] == ["done-1"]
+
+    restored = pickle.loads(pickle.dumps(user))
+    assert restored.inactive_tasks.loaded
+    assert restored.inactive_tasks.active_ids == {"active-1"}
+    assert [task.id for task in restored.inactive_tasks] == ["done-1"]
+    assert copy.deepcopy(restored).inactive_tasks.loaded
+    assert calls == [1, 1]
+
+
+def test_eager_user_has_loaded_empty_inactive_tasks() -> None:
+    """Test users built directly have nothing left to fetch."""
+    user = User(username="eager")
+    assert user.inactive_tasks.loaded
+    assert not list(user.inactive_tasks)
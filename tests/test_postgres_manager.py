@@ -6,6 +6,7 @@ Tests use mocks to avoid requiring an actual database connection.
 """
 
 # pylint: disable=import-outside-toplevel,protected-access,unused-argument
+# pylint: disable=too-many-lines
 
 from datetime import date, datetime
 from types import SimpleNamespace
@@ -106,8 +107,8 @@ def test_get_connection_success(mock_psycopg2: Any) -> None:
 
 @patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
 @patch("motido.data.postgres_manager.psycopg2")
-@patch("motido.data.postgres_manager.print")
-def test_get_connection_error(mock_print: Any, mock_psycopg2: Any) -> None:
+@patch("motido.data.postgres_manager.logger")
+def test_get_connection_error(mock_logger: Any, mock_psycopg2: Any) -> None:
     """Test database connection error handling."""
     from motido.data.postgres_manager import PostgresDataManager
 
@@ -121,8 +122,10 @@ def test_get_connection_error(mock_print: Any, mock_psycopg2: Any) -> None:
     with pytest.raises(Exception):
         manager._get_connection()
 
-    # Should print error message
-    assert any("Error connecting" in str(call) for call in mock_print.call_args_list)
+    # Should log error message
+    assert any(
+        "Error connecting" in str(call) for call in mock_logger.error.call_args_list
+    )
 
 
 @patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
@@ -141,12 +144,20 @@ def test_create_tables_success(mock_psycopg2: Any) -> None:
     # Verify tables were created
     assert mock_cursor.execute.call_count >= 3  # users table, tasks table, index
     mock_conn.commit.assert_called_once()
+    # JSON nulls in legacy list columns must not reach the NOT NULL columns
+    migrations = [
+        call.args[0]
+        for call in mock_cursor.execute.call_args_list
+        if "jsonb_array_elements_text" in call.args[0]
+    ]
+    assert len(migrations) == 2
+    assert all("WHERE item.value IS NOT NULL" in sql for sql in migrations)
 
 
 @patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
 @patch("motido.data.postgres_manager.psycopg2")
-@patch("motido.data.postgres_manager.print")
-def test_create_tables_error(mock_print: Any, mock_psycopg2: Any) -> None:
+@patch("motido.data.postgres_manager.logger")
+def test_create_tables_error(mock_logger: Any, mock_psycopg2: Any) -> None:
     """Test table creation error handling."""
     from motido.data.postgres_manager import PostgresDataManager
 
@@ -169,8 +180,8 @@ def test_create_tables_error(mock_print: Any, mock_psycopg2: Any) -> None:
 
 @patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
 @patch("motido.data.postgres_manager.psycopg2")
-@patch("motido.data.postgres_manager.print")
-def test_initialize_success(mock_print: Any, mock_psycopg2: Any) -> None:
+@patch("motido.data.postgres_manager.logger")
+def test_initialize_success(mock_logger: Any, mock_psycopg2: Any) -> None:
     """Test successful database initialization."""
     from motido.data.postgres_manager import PostgresDataManager
 
@@ -180,13 +191,13 @@ def test_initialize_success(mock_print: Any, mock_psycopg2: Any) -> None:
     manager = PostgresDataManager("postgresql://test")
     manager.initialize()
 
-    mock_print.assert_any_call("Initializing PostgreSQL database...")
+    mock_logger.info.assert_any_call("Initializing PostgreSQL database...")
 
 
 @patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
 @patch("motido.data.postgres_manager.psycopg2")
-@patch("motido.data.postgres_manager.print")
-def test_initialize_error(mock_print: Any, mock_psycopg2: Any) -> None:
+@patch("motido.data.postgres_manager.logger")
+def test_initialize_error(mock_logger: Any, mock_psycopg2: Any) -> None:
     """Test database initialization error handling - should raise exception."""
     from motido.data.postgres_manager import PostgresDataManager
 
@@ -200,14 +211,14 @@ def test_initialize_error(mock_print: Any, mock_psycopg2: Any) -> None:
     with pytest.raises(Exception, match="Init failed"):
         manager.initialize()
 
-    mock_print.assert_any_call("Initializing PostgreSQL database...")
+    mock_logger.info.assert_any_call("Initializing PostgreSQL database...")
 
 
 @patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
 @patch("motido.data.postgres_manager.psycopg2")
-@patch("motido.data.postgres_manager.print")
+@patch("motido.data.postgres_manager.logger")
 def test_initialize_skips_when_already_initialized(
-    mock_print: Any, mock_psycopg2: Any
+    mock_logger: Any, mock_psycopg2: Any
 ) -> None:
     """Test that initialize() returns early when already initialized."""
     from motido.data.postgres_manager import PostgresDataManager
@@ -227,15 +238,17 @@ def test_initialize_skips_when_already_initialized(
 
     # Connection should not be called again on second initialization
     assert second_call_count == first_call_count
-    # "Initializing" message should only be printed once
-    init_calls = [c for c in mock_print.call_args_list if "Initializing" in str(c)]
+    # "Initializing" message should only be logged once
+    init_calls = [
+        c for c in mock_logger.info.call_args_list if "Initializing" in str(c)
+    ]
     assert len(init_calls) == 1
 
 
 @patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
 @patch("motido.data.postgres_manager.psycopg2")
-@patch("motido.data.postgres_manager.print")
-def test_load_user_success(mock_print: Any, mock_psycopg2: Any) -> None:
+@patch("motido.data.postgres_manager.logger")
+def test_load_user_success(mock_logger: Any, mock_psycopg2: Any) -> None:
     """Test successful user loading."""
     from motido.data.postgres_manager import PostgresDataManager
 
@@ -312,8 +325,8 @@ def test_load_user_success(mock_print: Any, mock_psycopg2: Any) -> None:
 
 @patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
 @patch("motido.data.postgres_manager.psycopg2")
-@patch("motido.data.postgres_manager.print")
-def test_load_user_not_found(mock_print: Any, mock_psycopg2: Any) -> None:
+@patch("motido.data.postgres_manager.logger")
+def test_load_user_not_found(mock_logger: Any, mock_psycopg2: Any) -> None:
     """Test loading non-existent user returns None."""
     from motido.data.postgres_manager import PostgresDataManager
 
@@ -328,13 +341,15 @@ def test_load_user_not_found(mock_print: Any, mock_psycopg2: Any) -> None:
     user = manager.load_user("nonexistent")
 
     assert user is None
-    mock_print.assert_any_call("User 'nonexistent' not found in PostgreSQL.")
+    mock_logger.info.assert_any_call(
+        "User '%s' not found in PostgreSQL.", "nonexistent"
+    )
 
 
 @patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
 @patch("motido.data.postgres_manager.psycopg2")
-@patch("motido.data.postgres_manager.print")
-def test_load_user_error(mock_print: Any, mock_psycopg2: Any) -> None:
+@patch("motido.data.postgres_manager.logger")
+def test_load_user_error(mock_logger: Any, mock_psycopg2: Any) -> None:
     """Test user loading error handling."""
     from motido.data.postgres_manager import PostgresDataManager
 
@@ -347,8 +362,10 @@ def test_load_user_error(mock_print: Any, mock_psycopg2: Any) -> None:
     user = manager.load_user("testuser")
 
     assert user is None
-    # Should print error message
-    assert any("Error loading user" in str(call) for call in mock_print.call_args_list)
+    # Should log error message
+    assert any(
+        "Error loading user" in str(call) for call in mock_logger.error.call_args_list
+    )
 
 
 @patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
@@ -414,6 +431,56 @@ def test_bulk_upsert_uses_execute_values_when_possible(
     cursor.execute.assert_not_called()
 
 
+@patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
+@patch("motido.data.postgres_manager.COPY_THRESHOLD", 2)
+@patch("motido.data.postgres_manager.execute_values")
+@patch("motido.data.postgres_manager.psycopg2")
+def test_bulk_upsert_copies_large_batches(
+    mock_psycopg2: Any, mock_execute_values: Any
+) -> None:
+    """Test that batches over the threshold stream through COPY and merge."""
+    from motido.data.postgres_manager import PostgresDataManager
+
+    manager = PostgresDataManager("postgresql://test")
+    copied: list[str] = []
+    cursor = SimpleNamespace(
+        connection=SimpleNamespace(encoding="UTF8"),
+        execute=MagicMock(),
+        copy_expert=MagicMock(side_effect=lambda sql, file: copied.append(file.read())),
+    )
+    rows = [
+        ("a", "tab\there\nnew \\ line", True, date(2025, 1, 2)),
+        ("b", None, False, datetime(2025, 1, 2, 3, 4)),
+    ]
+
+    manager._bulk_upsert(
+        cursor,
+        "INSERT INTO t (id, text, done, day) VALUES %s ON CONFLICT (id) DO NOTHING",
+        "unused",
+        rows,
+    )
+
+    mock_execute_values.assert_not_called()
+    cursor.copy_expert.assert_called_once()
+    assert cursor.copy_expert.call_args.args[0] == (
+        "COPY staging_t (id, text, done, day) FROM STDIN"
+    )
+    assert copied == [
+        "a\ttab\\there\\nnew \\\\ line\tt\t2025-01-02\n"
+        "b\t\\N\tf\t2025-01-02T03:04:00\n"
+    ]
+    assert [c.args[0] for c in cursor.execute.call_args_list] == [
+        "CREATE TEMP TABLE staging_t (LIKE t INCLUDING DEFAULTS) ON COMMIT DROP",
+        "INSERT INTO t (id, text, done, day) SELECT id, text, done, day "
+        "FROM staging_t ON CONFLICT (id) DO NOTHING",
+        "DROP TABLE staging_t",
+    ]
+
+    # Below the threshold, execute_values is used as before
+    manager._bulk_upsert(cursor, "INSERT INTO t (id) VALUES %s", "unused", [("a",)])
+    mock_execute_values.assert_called_once()
+
+
 @patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
 @patch("motido.data.postgres_manager.psycopg2")
 def test_save_user_deletes_xp_when_no_transactions(mock_psycopg2: Any) -> None:
@@ -438,8 +505,8 @@ def test_save_user_deletes_xp_when_no_transactions(mock_psycopg2: Any) -> None:
 
 @patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
 @patch("motido.data.postgres_manager.psycopg2")
-@patch("motido.data.postgres_manager.print")
-def test_save_user_progress_error(mock_print: Any, mock_psycopg2: Any) -> None:
+@patch("motido.data.postgres_manager.logger")
+def test_save_user_progress_error(mock_logger: Any, mock_psycopg2: Any) -> None:
     """Test save_user_progress error handling."""
     from motido.data.postgres_manager import PostgresDataManager
 
@@ -457,7 +524,8 @@ def test_save_user_progress_error(mock_print: Any, mock_psycopg2: Any) -> None:
         manager.save_user_progress(user)
 
     assert any(
-        "Error saving user progress" in str(call) for call in mock_print.call_args_list
+        "Error saving user progress" in str(call)
+        for call in mock_logger.error.call_args_list
     )
 
 
@@ -492,8 +560,8 @@ def test_save_user_progress_success(mock_psycopg2: Any) -> None:
 
 @patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
 @patch("motido.data.postgres_manager.psycopg2")
-@patch("motido.data.postgres_manager.print")
-def test_save_user_success(mock_print: Any, mock_psycopg2: Any) -> None:
+@patch("motido.data.postgres_manager.logger")
+def test_save_user_success(mock_logger: Any, mock_psycopg2: Any) -> None:
     """Test successful user saving."""
     from motido.data.postgres_manager import PostgresDataManager
 
@@ -530,9 +598,9 @@ def test_save_user_success(mock_print: Any, mock_psycopg2: Any) -> None:
 
 @patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
 @patch("motido.data.postgres_manager.psycopg2")
-@patch("motido.data.postgres_manager.print")
+@patch("motido.data.postgres_manager.logger")
 def test_save_user_with_tasks_uses_row_fallback_for_bulk_upsert(
-    mock_print: Any, mock_psycopg2: Any
+    mock_logger: Any, mock_psycopg2: Any
 ) -> None:
     """Test save_user with tasks triggers row-by-row fallback under mocked cursor."""
     from motido.data.postgres_manager import PostgresDataManager
@@ -600,8 +668,8 @@ def test_bulk_upsert_empty_rows_is_noop(mock_psycopg2: Any) -> None:
 
 @patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
 @patch("motido.data.postgres_manager.psycopg2")
-@patch("motido.data.postgres_manager.print")
-def test_save_user_error(mock_print: Any, mock_psycopg2: Any) -> None:
+@patch("motido.data.postgres_manager.logger")
+def test_save_user_error(mock_logger: Any, mock_psycopg2: Any) -> None:
     """Test user saving error handling."""
     from motido.data.postgres_manager import PostgresDataManager
 
@@ -622,8 +690,10 @@ def test_save_user_error(mock_print: Any, mock_psycopg2: Any) -> None:
     with pytest.raises(Exception):
         manager.save_user(user)
 
-    # Should print error message
-    assert any("Error saving user" in str(call) for call in mock_print.call_args_list)
+    # Should log error message
+    assert any(
+        "Error saving user" in str(call) for call in mock_logger.error.call_args_list
+    )
 
 
 @patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
@@ -891,3 +961,445 @@ def test_row_to_task_with_string_subtasks() -> None:
         {"text": "Day 2", "complete": False},
         {"text": "Day 3", "complete": False},
     ]
+
+
+def _task_row(task_id: str, **fields: Any) -> dict[str, Any]:
+    """A minimal tasks row as RealDictCursor returns it."""
+    return {
+        "id": task_id,
+        "title": task_id,
+        "creation_date": datetime(2025, 1, 1),
+        "is_complete": False,
+        **fields,
+    }
+
+
+@patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
+@patch("motido.data.postgres_manager.psycopg2")
+def test_load_active_user_defers_inactive_tasks(mock_psycopg2: Any) -> None:
+    """Test load_active_user filters tasks in SQL and fetches the rest on use."""
+    from motido.data.postgres_manager import ACTIVE_TASK_CONDITION, PostgresDataManager
+
+    mock_conn = MagicMock()
+    mock_cursor = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_psycopg2.connect.return_value.__enter__.return_value = mock_conn
+    mock_cursor.fetchone.return_value = {"username": "u", "total_xp": 0}
+    mock_cursor.fetchall.side_effect = [
+        [_task_row("open")],  # Active tasks
+        [],  # XP transactions
+        [_task_row("done", is_complete=True)],  # Inactive fetch
+    ]
+
+    manager = PostgresDataManager("postgresql://test")
+    user = manager.load_active_user("u")
+
+    assert user is not None
+    assert [task.id for task in user.tasks] == ["open"]
+    task_query = mock_cursor.execute.call_args_list[1].args[0]
+    assert task_query.endswith(ACTIVE_TASK_CONDITION)
+    assert not user.inactive_tasks.loaded
+
+    assert [task.id for task in user.inactive_tasks] == ["done"]
+    fetch_sql, fetch_params = mock_cursor.execute.call_args.args
+    assert "NOT (id = ANY(%s))" in fetch_sql
+    assert fetch_params == ("u", ["open"])
+
+
+@patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
+@patch("motido.data.postgres_manager.psycopg2")
+def test_load_inactive_tasks_without_active_set(mock_psycopg2: Any) -> None:
+    """Test the inactive fetch reads every row when nothing was loaded eagerly."""
+    from motido.core.models import LazyTasks
+    from motido.data.postgres_manager import TASK_SELECT, PostgresDataManager
+
+    mock_conn = MagicMock()
+    mock_cursor = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_psycopg2.connect.return_value.__enter__.return_value = mock_conn
+    mock_cursor.fetchall.return_value = [_task_row("done", is_complete=True)]
+
+    manager = PostgresDataManager("postgresql://test")
+    user = User(username="u")
+    user.inactive_tasks = LazyTasks(lambda: manager._load_inactive_tasks(user))
+
+    assert [task.id for task in user.inactive_tasks] == ["done"]
+    mock_cursor.execute.assert_called_once_with(
+        f"{TASK_SELECT} WHERE user_username = %s", ("u",)
+    )
+
+
+@patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
+@patch("motido.data.postgres_manager.psycopg2")
+@pytest.mark.parametrize("removed", [True, False])
+def test_sync_tasks_active_set_only_touches_loaded_rows(
+    mock_psycopg2: Any, removed: bool
+) -> None:
+    """Test saving an active-set user deletes only active rows it dropped."""
+    from motido.core.models import LazyTasks
+    from motido.data.postgres_manager import PostgresDataManager
+
+    mock_cursor = MagicMock()
+    user = User(
+        username="u", tasks=[Task(title="kept", creation_date=datetime.now(), id="a")]
+    )
+    active_ids = frozenset({"a", "gone"} if removed else {"a"})
+    user.inactive_tasks = LazyTasks(lambda: [], active_ids)
+
+    PostgresDataManager("postgresql://test")._sync_tasks(mock_cursor, user)
+
+    statements = [c.args[0] for c in mock_cursor.execute.call_args_list]
+    deletes = [sql for sql in statements if sql.startswith("DELETE")]
+    if removed:
+        assert deletes == [
+            "DELETE FROM tasks WHERE user_username = %s AND id = ANY(%s)"
+        ]
+        assert mock_cursor.execute.call_args_list[0].args[1] == ("u", ["gone"])
+    else:
+        assert not deletes
+    assert not user.inactive_tasks.loaded
+
+
+@patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
+@patch("motido.data.postgres_manager.psycopg2")
+def test_archive_tasks_and_load_back(mock_psycopg2: Any) -> None:
+    """Test archiving copies rows, saves the user in one commit, and reads back."""
+    from motido.data.postgres_manager import PostgresDataManager
+
+    mock_conn = MagicMock()
+    mock_cursor = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_psycopg2.connect.return_value.__enter__.return_value = mock_conn
+    mock_cursor.fetchone.return_value = {
+        "username": "u",
+        "total_xp": 0,
+        "archive_summary": '{"completed_tasks": 3, "best_streak": 5}',
+    }
+    mock_cursor.fetchall.side_effect = [
+        [],  # Tasks
+        [],  # XP transactions
+        [_task_row("done", is_complete=True)],  # Archived fetch
+    ]
+    manager = PostgresDataManager("postgresql://test")
+    user = manager.load_user("u")
+    assert user is not None
+    assert user.archive_summary.completed_tasks == 3
+    assert user.archive_summary.best_streak == 5
+
+    assert [task.id for task in user.archived_tasks] == ["done"]
+    mock_cursor.execute.assert_called_with(
+        "SELECT * FROM archived_tasks WHERE user_username = %s", ("u",)
+    )
+
+    mock_cursor.reset_mock()
+    task = Task(title="old", creation_date=datetime.now(), id="old")
+    manager.archive_tasks(user, [task])
+
+    statements = [c.args[0] for c in mock_cursor.execute.call_args_list]
+    assert statements[0].startswith("INSERT INTO archived_tasks")
+    assert statements[0].endswith("ON CONFLICT (id) DO NOTHING")
+    assert any(sql.lstrip().startswith("INSERT INTO users") for sql in statements)
+    mock_conn.commit.assert_called_once()
+
+    # Restoring a backup replaces the whole archive first
+    mock_cursor.reset_mock()
+    manager.archive_tasks(user, [task], replace=True)
+    mock_cursor.execute.assert_any_call(
+        "DELETE FROM archived_tasks WHERE user_username = %s", ("u",)
+    )
+    first = mock_cursor.execute.call_args_list[0].args[0]
+    assert first.startswith("DELETE FROM archived_tasks")
+
+
+@patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
+@patch("motido.data.postgres_manager.psycopg2")
+def test_load_xp_log_pages_in_sql(mock_psycopg2: Any) -> None:
+    """Test the XP log page is read with ORDER BY ... LIMIT ... OFFSET."""
+    from motido.data.postgres_manager import PostgresDataManager
+
+    mock_conn = MagicMock()
+    mock_cursor = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_psycopg2.connect.return_value.__enter__.return_value = mock_conn
+    mock_cursor.fetchall.return_value = [
+        {
+            "id": "t1",
+            "amount": 5,
+            "source": "daily_earned",
+            "timestamp": datetime(2025, 1, 2, 9),
+            "game_date": date(2025, 1, 2),
+        }
+    ]
+
+    manager = PostgresDataManager("postgresql://test")
+    page = manager.load_xp_log("u", limit=20, offset=40)
+
+    assert [t.id for t in page] == ["t1"]
+    sql, params = mock_cursor.execute.call_args.args
+    assert "ORDER BY timestamp DESC" in sql and "LIMIT %s OFFSET %s" in sql
+    assert params == ("u", 20, 40)
+
+
+@patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
+@patch("motido.data.postgres_manager.psycopg2")
+def test_task_lists_saved_to_tables_and_loaded_back(mock_psycopg2: Any) -> None:
+    """Test list items go to the task_* tables and are read from them first."""
+    from motido.data.postgres_manager import PostgresDataManager
+
+    mock_conn = MagicMock()
+    mock_cursor = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_psycopg2.connect.return_value.__enter__.return_value = mock_conn
+
+    task = Task(
+        title="t",
+        creation_date=datetime.now(),
+        id="t",
+        tags=["work"],
+        subtasks=[{"text": "step", "complete": True}, {"text": "next"}],
+        dependencies=["other"],
+    )
+    manager = PostgresDataManager("postgresql://test")
+    manager.save_user(User(username="u", tasks=[task]))
+
+    calls = [c.args for c in mock_cursor.execute.call_args_list]
+
+    def rows(table: str) -> list[Any]:
+        return [
+            p for sql, p in calls if sql.lstrip().startswith(f"INSERT INTO {table} ")
+        ]
+
+    assert rows("tasks")[0][11] is None and rows("tasks")[0][13:15] == (None, None)
+    assert any("DELETE FROM task_tags" in sql for sql, _ in calls)
+    assert rows("task_tags") == [("t", 0, "work", "u")]
+    assert rows("task_dependencies") == [("t", 0, "other", "u")]
+    assert rows("task_subtasks") == [
+        ("t", 0, "step", True, "u"),
+        ("t", 1, "next", False, "u"),
+    ]
+
+    # Lists from the tables win; rows not migrated yet use their JSON columns
+    loaded = manager._row_to_task(
+        _task_row(
+            "t",
+            tag_list=["work"],
+            tags='["stale"]',
+            subtask_list=[{"text": "step", "complete": True}],
+            dependency_list=None,
+            dependencies='["old"]',
+        )
+    )
+    assert loaded.tags == ["work"]
+    assert loaded.subtasks == [{"text": "step", "complete": True}]
+    assert loaded.dependencies == ["old"]
+
+
+@pytest.mark.parametrize(
+    "method, args, sql_part, params",
+    [
+        ("tagged_task_ids", ("work",), "FROM task_tags", ("u", "work")),
+        ("dependent_task_ids", ("t",), "depends_on_id = %s", ("u", "t")),
+        ("blocked_task_ids", (), "NOT needed.is_complete", ("u",)),
+    ],
+)
+@patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
+@patch("motido.data.postgres_manager.psycopg2")
+def test_task_list_queries_run_in_sql(
+    mock_psycopg2: Any,
+    method: str,
+    args: tuple[str, ...],
+    sql_part: str,
+    params: tuple[str, ...],
+) -> None:
+    """Test tag, dependent and blocked lookups query the task_* tables."""
+    from motido.data.postgres_manager import PostgresDataManager
+
+    mock_conn = MagicMock()
+    mock_cursor = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_psycopg2.connect.return_value.__enter__.return_value = mock_conn
+    mock_cursor.fetchall.return_value = [{"task_id": "a"}, {"task_id": "b"}]
+
+    manager = PostgresDataManager("postgresql://test")
+    result = getattr(manager, method)(User(username="u"), *args)
+
+    assert result == {"a", "b"}
+    sql, sql_params = mock_cursor.execute.call_args.args
+    assert sql_part in sql
+    assert sql_params == params
+
+
+@patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
+@patch("motido.data.postgres_manager.psycopg2")
+def test_explain_queries_runs_explain(mock_psycopg2: Any) -> None:
+    """Test each access pattern is run through EXPLAIN."""
+    from motido.data.postgres_manager import PostgresDataManager
+
+    mock_conn = MagicMock()
+    mock_cursor = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_psycopg2.connect.return_value.__enter__.return_value = mock_conn
+    mock_cursor.fetchall.return_value = [{"QUERY PLAN": "Index Scan using idx"}]
+
+    plans = PostgresDataManager("postgresql://test").explain_queries("u")
+
+    assert plans["XP by game day"] == ["Index Scan using idx"]
+    assert "blocked tasks" in plans
+    statements = [c.args[0] for c in mock_cursor.execute.call_args_list]
+    assert len(statements) == len(plans)
+    assert all(sql.startswith("EXPLAIN ") for sql in statements)
+
+
+@patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
+@patch("motido.data.postgres_manager.psycopg2")
+def test_list_usernames(mock_psycopg2: Any) -> None:
+    """Test usernames are read from the users table."""
+    from motido.data.postgres_manager import PostgresDataManager
+
+    mock_conn = MagicMock()
+    mock_cursor = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_psycopg2.connect.return_value.__enter__.return_value = mock_conn
+    mock_cursor.fetchall.return_value = [{"username": "alice"}, {"username": "bob"}]
+
+    assert PostgresDataManager("postgresql://test").list_usernames() == [
+        "alice",
+        "bob",
+    ]
+    mock_cursor.execute.assert_called_once_with(
+        "SELECT username FROM users ORDER BY username"
+    )
+
+
+@patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
+@patch("motido.data.postgres_manager.psycopg2")
+def test_aggregate_queries_run_in_sql(mock_psycopg2: Any) -> None:
+    """Test task counts come from a GROUP BY query, day counts from daily_summary."""
+    from motido.data.postgres_manager import (
+        DAILY_SUMMARY_SQL,
+        TASK_COUNTS_SQL,
+        PostgresDataManager,
+    )
+
+    mock_conn = MagicMock()
+    mock_cursor = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_psycopg2.connect.return_value.__enter__.return_value = mock_conn
+    mock_cursor.fetchone.return_value = {
+        "total": 4,
+        "completed": 2,
+        "habits": 0,
+        "current_streak": None,
+        "best_streak": None,
+    }
+    mock_cursor.fetchall.return_value = [
+        {"day": date(2025, 1, 2), "completed": 1, "total": 3}
+    ]
+    manager = PostgresDataManager("postgresql://test")
+    user = User(username="u")
+
+    counts = manager.task_counts(user)
+    by_day = manager.completion_counts_by_day("u", date(2025, 1, 1), date(2025, 1, 4))
+    manager.completion_counts_by_day(
+        "u", date(2025, 1, 1), date(2025, 1, 4), habit_id="h"
+    )
+
+    assert (counts.total, counts.completed, counts.best_streak) == (4, 2, 0)
+    assert by_day == {date(2025, 1, 2): (1, 3)}
+    window = (date(2025, 1, 1), date(2025, 1, 4))
+    assert [c.args for c in mock_cursor.execute.call_args_list] == [
+        (TASK_COUNTS_SQL, ("u",)),
+        (DAILY_SUMMARY_SQL, ("u", "", *window)),
+        (DAILY_SUMMARY_SQL, ("u", "h", *window)),
+    ]
+
+
+@patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
+@patch("motido.data.postgres_manager.psycopg2")
+def test_load_archive_summary(mock_psycopg2: Any) -> None:
+    """Test the archive summary is read from the user row alone."""
+    from motido.data.postgres_manager import PostgresDataManager
+
+    mock_conn = MagicMock()
+    mock_cursor = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_psycopg2.connect.return_value.__enter__.return_value = mock_conn
+    manager = PostgresDataManager("postgresql://test")
+
+    mock_cursor.fetchone.return_value = {"archive_summary": {"completed_tasks": 2}}
+    assert manager.load_archive_summary("u").completed_tasks == 2
+    assert mock_cursor.execute.call_args.args == (
+        "SELECT archive_summary FROM users WHERE username = %s",
+        ("u",),
+    )
+    mock_cursor.fetchone.return_value = {"archive_summary": '{"best_streak": 4}'}
+    assert manager.load_archive_summary("u").best_streak == 4
+    mock_cursor.fetchone.return_value = None
+    assert manager.load_archive_summary("nobody").completed_tasks == 0
+
+
+@patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
+@patch("motido.data.postgres_manager.psycopg2")
+def test_rebuild_daily_summary(mock_psycopg2: Any) -> None:
+    """Test a rebuild replaces the user's rows with a fresh GROUP BY count."""
+    from motido.data.postgres_manager import (
+        DAILY_SUMMARY_REBUILD_SQL,
+        PostgresDataManager,
+    )
+
+    mock_conn = MagicMock()
+    mock_cursor = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_psycopg2.connect.return_value.__enter__.return_value = mock_conn
+    mock_cursor.rowcount = 7
+
+    assert PostgresDataManager("postgresql://test").rebuild_daily_summary("u") == 7
+    assert [c.args for c in mock_cursor.execute.call_args_list] == [
+        ("DELETE FROM daily_summary WHERE user_username = %s", ("u",)),
+        (DAILY_SUMMARY_REBUILD_SQL, {"username": "u"}),
+    ]
+    mock_conn.commit.assert_called_once()
+
+
+def test_daily_summary_trigger_recounts_only_changed_updates() -> None:
+    """Test updated rows are only recounted when their summary columns differ."""
+    from motido.data.postgres_manager import DAILY_SUMMARY_FUNCTION
+
+    update_branch = DAILY_SUMMARY_FUNCTION.split("ELSIF", maxsplit=1)[0]
+    assert "FROM old_rows EXCEPT SELECT" in update_branch
+    assert "FROM new_rows EXCEPT SELECT" in update_branch
+    assert "due_date::date AS due_date, is_complete, is_habit" in update_branch
+
+
+@patch("motido.data.postgres_manager.POSTGRES_AVAILABLE", True)
+@patch("motido.data.postgres_manager.psycopg2")
+def test_create_tables_counts_existing_tasks_into_daily_summary(
+    mock_psycopg2: Any,
+) -> None:
+    """Test daily_summary is counted for every user when it is first created."""
+    from motido.data.postgres_manager import (
+        DAILY_SUMMARY_FUNCTION,
+        DAILY_SUMMARY_REBUILD_SQL,
+        DAILY_SUMMARY_TRIGGERS,
+        PostgresDataManager,
+    )
+
+    mock_conn = MagicMock()
+    mock_cursor = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_cursor.fetchall.return_value = [{"username": "alice"}, {"username": "bob"}]
+
+    for missing, rebuilt in ((True, ["alice", "bob"]), (False, [])):
+        mock_cursor.reset_mock()
+        mock_cursor.fetchone.return_value = {"missing": missing}
+        PostgresDataManager("postgresql://test")._create_tables(mock_conn)
+
+        calls = mock_cursor.execute.call_args_list
+        statements = [c.args[0] for c in calls]
+        assert DAILY_SUMMARY_FUNCTION in statements
+        assert set(DAILY_SUMMARY_TRIGGERS) <= set(statements)
+        assert [
+            c.args[1]["username"]
+            for c in calls
+            if c.args[0] == DAILY_SUMMARY_REBUILD_SQL
+        ] == rebuilt
@@ -0,0 +1,112 @@
+"""Tests for opt-in profiling in motido.core.profiling and `motido --profile`."""
+
+# pylint: disable=redefined-outer-name
+
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from motido.cli import main as cli_main
+from motido.core.metrics import timed
+from motido.core.profiling import PROFILE_DIR_ENV, ProfileSession, get_profile_dir
+from motido.data.abstraction import DataManager
+
+
+@pytest.fixture
+def profile_dir(tmp_path: Path, monkeypatch: Any) -> Path:
+    """Point MOTIDO_PROFILE_DIR at a temp dir."""
+    monkeypatch.setenv(PROFILE_DIR_ENV, str(tmp_path))
+    return tmp_path
+
+
+def _allocate_in_phase(phase: str) -> list[bytes]:
+    with timed(phase):
+        return [bytes(1024) for _ in range(64)]
+
+
+def test_session_attributes_phases(profile_dir: Path) -> None:
+    """Test timed phases are reported separately with time and memory."""
+    with ProfileSession("cli list/all") as session:
+        kept = _allocate_in_phase("load_user")
+        _allocate_in_phase("scoring")
+        _allocate_in_phase("scoring")
+
+    assert len(kept) == 64
+    assert session.phases["load_user"].calls == 1
+    assert session.phases["load_user"].allocated_bytes >= 64 * 1024
+    assert session.phases["scoring"].calls == 2
+    assert session.wall_seconds > 0
+    assert session.peak_bytes >= 64 * 1024
+    assert not tracemalloc.is_tracing()
+
+    prof_path, txt_path = session.write()
+    assert Path(prof_path).parent == profile_dir
+    assert txt_path.endswith("-cli-list-all.txt")
+    report = Path(txt_path).read_text(encoding="utf-8")
+    assert "load_user" in report
+    assert "Top functions (cumulative):" in report
+    assert "Top allocations:" in report
+    assert "load_user=" in session.summary()
+    assert "scoring=" in session.summary()
+
+
+def test_session_without_phases_keeps_existing_tracing(tmp_path: Path) -> None:
+    """Test an already running tracemalloc is left on and no phases is fine."""
+    tracemalloc.start()
+    try:
+        with ProfileSession("!!!") as session:
+            pass
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+    assert session.label == "profile"
+    assert "(no timed phases ran)" in session.report()
+    assert session.summary().startswith("wall=")
+    # A phase finishing without a recorded start counts from zero
+    session.phase_finished("orphan", 0.5)
+    assert session.phases["orphan"].calls == 1
+    _, txt_path = session.write(str(tmp_path / "nested"))
+    assert Path(txt_path).exists()
+
+
+def test_default_profile_dir(monkeypatch: Any) -> None:
+    """Test reports default to a directory under the system temp dir."""
+    monkeypatch.delenv(PROFILE_DIR_ENV, raising=False)
+    assert get_profile_dir().endswith("motido-profiles")
+
+
+def test_cli_profile_flag_writes_report(
+    mocker: Any, profile_dir: Path, capsys: Any
+) -> None:
+    """Test `motido --profile list` profiles the command and reports the path."""
+    mocker.patch("sys.argv", ["motido", "--profile", "list"])
+    manager = mocker.MagicMock(spec=DataManager)
+    mocker.patch("motido.cli.main.get_data_manager", return_value=manager)
+
+    def fake_list(*_: Any) -> None:
+        _allocate_in_phase("scoring")
+
+    mocker.patch("motido.cli.main.handle_list", side_effect=fake_list)
+
+    cli_main.main()
+
+    err = capsys.readouterr().err
+    assert "Profile (wall=" in err
+    assert "scoring=" in err
+    reports = list(profile_dir.glob("*-cli-list.txt"))
+    assert len(reports) == 1
+    assert str(reports[0]) in err
+
+
+def test_cli_profile_written_when_command_fails(mocker: Any, profile_dir: Path) -> None:
+    """Test the report is still written when the profiled command exits."""
+    mocker.patch("sys.argv", ["motido", "--profile", "init"])
+    mocker.patch("motido.cli.main.handle_init", side_effect=SystemExit(1))
+
+    with pytest.raises(SystemExit):
+        cli_main.main()
+
+    assert len(list(profile_dir.glob("*-cli-init.prof"))) == 1
@@ -175,6 +175,17 @@ def test_load_scoring_config_missing_file() -> None:
         assert "due_date_proximity" in config
 
 
+def test_load_scoring_config_missing_file_read_only() -> None:
+    """Test a missing config on a read-only filesystem returns the default."""
+    with patch("os.path.exists", return_value=False), patch(
+        "builtins.open", side_effect=OSError("Read-only file system")
+    ):
+        config = load_scoring_config()
+
+    assert config["base_score"] == 10
+    assert "habit_streak_bonus" in config
+
+
 def test_load_scoring_config_invalid_json() -> None:
     """Test loading with invalid JSON in the configuration file."""
     with patch("os.path.exists", return_value=True), patch(
@@ -0,0 +1,146 @@
+"""Tests for the synthetic account generator in motido.data.synthetic."""
+
+# pylint: disable=redefined-outer-name
+
+from datetime import date, timedelta
+from typing import Any
+
+import pytest
+
+from motido.data.abstraction import DataManager
+from motido.data.database_manager import DatabaseDataManager
+from motido.data.json_manager import JsonDataManager
+from motido.data.synthetic import SyntheticSpec, generate_user, populate
+
+END = date(2025, 6, 30)
+
+
+@pytest.fixture
+def spec() -> SyntheticSpec:
+    """A small account with every dimension populated."""
+    return SyntheticSpec(
+        tasks=200,
+        dependency_ratio=0.5,
+        dependency_depth=4,
+        habits=3,
+        habit_instances=30,
+        xp_days=60,
+        xp_per_day=4,
+        seed=42,
+        end_date=END,
+    )
+
+
+def test_generation_is_seeded(spec: SyntheticSpec) -> None:
+    """Test the same spec yields the same user and another seed does not."""
+    assert generate_user(spec) == generate_user(spec)
+    spec_other = SyntheticSpec(**{**vars(spec), "seed": 43})
+    assert generate_user(spec_other) != generate_user(spec)
+
+
+def test_dimensions_follow_spec(spec: SyntheticSpec) -> None:
+    """Test each knob controls its dimension of the account."""
+    user = generate_user(spec, username="bench")
+    one_off = [task for task in user.tasks if not task.is_habit]
+    habits = [task for task in user.tasks if task.is_habit]
+
+    assert user.username == "bench"
+    assert user.last_processed_date == END
+    assert len(one_off) == 200
+    assert len(habits) == 3 * 30
+    assert len(user.xp_transactions) == 60 * 4
+    assert user.total_xp == max(0, sum(t.amount for t in user.xp_transactions))
+    game_dates = sorted({t.game_date for t in user.xp_transactions if t.game_date})
+    assert len(game_dates) == 60
+    assert game_dates[0] == END - timedelta(days=59)
+    assert game_dates[-1] == END
+    assert len(user.defined_tags) == 10
+    assert len(user.defined_projects) == 5
+    assert any(task.history for task in user.tasks)
+    assert any(task.subtasks for task in one_off)
+
+
+def test_dependency_chains(spec: SyntheticSpec) -> None:
+    """Test open tasks are chained up to dependency_depth long."""
+    user = generate_user(spec)
+    by_id = {task.id: task for task in user.tasks}
+
+    def depth(task_id: str) -> int:
+        task = by_id[task_id]
+        return 1 + (depth(task.dependencies[0]) if task.dependencies else 0)
+
+    chained = [task for task in user.tasks if task.dependencies]
+    assert chained
+    assert all(not by_id[task.dependencies[0]].is_complete for task in chained)
+    assert max(depth(task.id) for task in chained) == 4
+
+
+def test_habit_lineages(spec: SyntheticSpec) -> None:
+    """Test each habit series is one parent_habit_id chain ending open today."""
+    user = generate_user(spec)
+    habits = [task for task in user.tasks if task.is_habit]
+    roots = [task for task in habits if task.parent_habit_id is None]
+    children = {task.parent_habit_id: task for task in habits if task.parent_habit_id}
+
+    assert len(roots) == 3
+    for root in roots:
+        lineage = [root]
+        while lineage[-1].id in children:
+            lineage.append(children[lineage[-1].id])
+        assert len(lineage) == 30
+        assert lineage[-1].due_date is not None
+        assert lineage[-1].due_date.date() == END
+        assert not lineage[-1].is_complete
+        assert {task.title for task in lineage} == {root.title}
+
+
+def test_empty_spec() -> None:
+    """Test a spec with every dimension at zero still builds a valid user."""
+    user = generate_user(
+        SyntheticSpec(
+            tasks=0,
+            habits=0,
+            xp_days=1,
+            xp_per_day=2,
+            history_per_task=0,
+            tags=0,
+            projects=0,
+        )
+    )
+    assert not user.tasks
+    assert user.last_processed_date == date.today()
+    # Without completed tasks, completions reference no task
+    assert all(t.task_id is None for t in user.xp_transactions)
+
+
+@pytest.mark.parametrize("backend", ["json", "db"])
+def test_populate_round_trips(
+    backend: str, spec: SyntheticSpec, tmp_path: Any, mocker: Any
+) -> None:
+    """Test a generated user is saved through a manager and loads back intact."""
+    manager: DataManager
+    if backend == "json":
+        mocker.patch(
+            "motido.data.json_manager.get_config_path",
+            return_value=str(tmp_path / "config.json"),
+        )
+        manager = JsonDataManager()
+    else:
+        mocker.patch.object(
+            DatabaseDataManager,
+            "_get_db_path",
+            return_value=str(tmp_path / "motido.db"),
+        )
+        manager = DatabaseDataManager()
+    manager.initialize()
+
+    saved = populate(manager, spec, username="bench")
+    loaded = manager.load_user("bench")
+
+    assert loaded is not None
+    assert len(loaded.tasks) == len(saved.tasks)
+    assert loaded.total_xp == saved.total_xp
+    if backend == "json":  # The SQLite schema keeps no XP log
+        assert len(loaded.xp_transactions) == len(saved.xp_transactions)
+    loaded_parents = {task.id: task.parent_habit_id for task in loaded.tasks}
+    assert loaded_parents == {task.id: task.parent_habit_id for task in saved.tasks}
@@ -6,7 +6,14 @@ from typing import Any, List
 
 import pytest
 
-from motido.core.models import Difficulty, Duration, Priority, RecurrenceType, Task
+from motido.core.models import (
+    ArchiveSummary,
+    Difficulty,
+    Duration,
+    Priority,
+    RecurrenceType,
+    Task,
+)
 from motido.core.utils import (
     _recover_orphaned_from_completion,
     generate_uuid,
@@ -161,6 +168,7 @@ def test_process_recurrences_duplicate_prevention() -> None:
 
         def __init__(self) -> None:
             self.tasks = [task1, task2]
+            self.archive_summary = ArchiveSummary()
             self.added_tasks: List[Task] = []
 
         def add_task(self, task: Task) -> None:
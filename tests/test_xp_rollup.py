@@ -0,0 +1,177 @@
+"""Tests for XP log rollups (motido.core.xp_rollup) and XP log paging."""
+
+from datetime import date, datetime
+from typing import Any
+
+import pytest
+
+from motido.core.models import User, XPTransaction
+from motido.core.xp_rollup import rollup_xp_transactions
+from motido.data.abstraction import DataManager
+from motido.data.database_manager import DatabaseDataManager
+from motido.data.json_manager import JsonDataManager
+
+TODAY = date(2025, 6, 30)
+
+
+def _xp(amount: int, when: datetime, source: Any = "task_completion") -> XPTransaction:
+    return XPTransaction(
+        amount=amount, source=source, timestamp=when, game_date=when.date()
+    )
+
+
+def _user() -> User:
+    return User(
+        username="u",
+        xp_transactions=[
+            # January: rolled into monthly entries
+            _xp(10, datetime(2025, 1, 3, 9)),
+            _xp(20, datetime(2025, 1, 20, 9), "habit_completion"),
+            _xp(-5, datetime(2025, 1, 21, 9), "penalty"),
+            # May 10th: rolled into daily entries
+            _xp(7, datetime(2025, 5, 10, 9)),
+            _xp(8, datetime(2025, 5, 10, 18), "daily_earned"),
+            # Withdrawals and recent transactions stay
+            _xp(-50, datetime(2025, 1, 5, 9), "withdrawal"),
+            _xp(3, datetime(2025, 6, 25, 9)),
+        ],
+    )
+
+
+def _entries(user: User) -> list[tuple[str, date | None, int]]:
+    return [(t.source, t.game_date, t.amount) for t in user.xp_transactions]
+
+
+def test_rollup_compacts_old_transactions() -> None:
+    """Test old XP becomes daily and monthly aggregates with the same sums."""
+    user = _user()
+    total = sum(t.amount for t in user.xp_transactions)
+
+    result = rollup_xp_transactions(
+        user, daily_after_days=30, monthly_after_days=120, today=TODAY
+    )
+
+    assert (result.compacted, result.aggregates) == (5, 3)
+    assert _entries(user) == [
+        ("withdrawal", date(2025, 1, 5), -50),
+        ("monthly_earned", date(2025, 1, 1), 30),
+        ("monthly_lost", date(2025, 1, 1), -5),
+        ("daily_earned", date(2025, 5, 10), 15),
+        ("task_completion", date(2025, 6, 25), 3),
+    ]
+    assert sum(t.amount for t in user.xp_transactions) == total
+    descriptions = [t.description for t in user.xp_transactions[1:4]]
+    assert descriptions == [
+        "Earned 30 XP in 2025-01",
+        "Lost 5 XP in 2025-01",
+        "Earned 15 XP on 2025-05-10",
+    ]
+
+
+def test_rollup_reuses_aggregates_and_marks_them_dirty() -> None:
+    """Test existing aggregates are updated in place and rerunning is a no-op."""
+    user = _user()
+    daily = user.xp_transactions[4]
+
+    rollup_xp_transactions(
+        user, daily_after_days=30, monthly_after_days=120, today=TODAY
+    )
+
+    assert daily in user.xp_transactions
+    dirty = getattr(user, "_dirty_xp_transaction_ids")
+    assert daily.id in dirty and len(dirty) == 3
+    before = _entries(user)
+    again = rollup_xp_transactions(
+        user, daily_after_days=30, monthly_after_days=120, today=TODAY
+    )
+    assert (again.compacted, again.aggregates) == (0, 0)
+    assert _entries(user) == before
+
+
+def test_rollup_only_whole_months() -> None:
+    """Test the month containing the monthly horizon stays daily."""
+    user = _user()
+
+    # The monthly horizon falls on January 21st: January stays daily
+    rollup_xp_transactions(
+        user, daily_after_days=30, monthly_after_days=160, today=TODAY
+    )
+
+    assert ("daily_lost", date(2025, 1, 21), -5) in _entries(user)
+    assert not any(t.source.startswith("monthly") for t in user.xp_transactions)
+
+
+@pytest.mark.parametrize(
+    "daily_after, monthly_after, message",
+    [(0, 365, "at least 1 day"), (30, 29, "must not be shorter")],
+)
+def test_rollup_rejects_bad_horizons(
+    daily_after: int, monthly_after: int, message: str
+) -> None:
+    """Test horizons are validated before anything changes."""
+    user = _user()
+    with pytest.raises(ValueError, match=message):
+        rollup_xp_transactions(
+            user, daily_after_days=daily_after, monthly_after_days=monthly_after
+        )
+    assert len(user.xp_transactions) == 7
+
+
+def test_default_xp_log_pages_newest_first() -> None:
+    """Test the default load_xp_log loads the user and pages by timestamp."""
+
+    class MemoryManager(DataManager):  # pylint: disable=abstract-method
+        """A backend implementing only the abstract methods."""
+
+        def initialize(self) -> None:
+            pass
+
+        def load_user(self, username: str = "default_user") -> User | None:
+            return _user() if username == "u" else None
+
+        def save_user(self, user: User) -> None:
+            pass
+
+        def backend_type(self) -> str:
+            return "memory"
+
+    manager = MemoryManager()
+
+    page = manager.load_xp_log("u", limit=2, offset=1)
+
+    assert [t.timestamp for t in page] == [
+        datetime(2025, 5, 10, 18),
+        datetime(2025, 5, 10, 9),
+    ]
+    assert not manager.load_xp_log("u", limit=5, offset=10)
+    assert not manager.load_xp_log("nobody", limit=5)
+
+
+def test_json_xp_log_pages_stored_transactions(tmp_path: Any, mocker: Any) -> None:
+    """Test the JSON backend pages the stored log without loading tasks."""
+    mocker.patch(
+        "motido.data.json_manager.get_config_path",
+        return_value=str(tmp_path / "config.json"),
+    )
+    manager = JsonDataManager()
+    manager.initialize()
+    manager.save_user(_user())
+    deserialize_task = mocker.patch.object(manager, "_deserialize_task")
+
+    page = manager.load_xp_log("u", limit=2)
+
+    assert [t.amount for t in page] == [3, 8]
+    assert not manager.load_xp_log("nobody", limit=2)
+    deserialize_task.assert_not_called()
+
+
+def test_sqlite_xp_log_is_empty(tmp_path: Any, mocker: Any) -> None:
+    """Test SQLite, which stores no XP log, answers without loading the user."""
+    mocker.patch.object(
+        DatabaseDataManager, "_get_db_path", return_value=str(tmp_path / "m.db")
+    )
+    manager = DatabaseDataManager()
+    load_user = mocker.patch.object(manager, "load_user")
+
+    assert not manager.load_xp_log("u", limit=10)
+    load_user.assert_not_called()